@@ -0,0 +1,25 @@
+"""
+Batch analytics for the Barbershop SaaS.
+
+Loads bookings, services and barber schedules for many tenants at once,
+turns them into NumPy grids (barber x minute-of-week slot) and computes
+utilisation, cancellation and no-show rates, demand heatmaps and peak-hour
+forecasts without looping over individual bookings in Python.
+
+Usage:
+    python -m analytics --mongo-url mongodb://localhost:27017 --db barbearia_saas \\
+        --from 2025-01-01 --to 2025-06-30 --out report.csv
+"""
+
+from .grid import SLOT_MINUTES, SLOTS_PER_DAY, SLOTS_PER_WEEK
+from .loader import load_from_export, load_from_mongo
+from .metrics import run_batch
+
+__all__ = [
+    "SLOT_MINUTES",
+    "SLOTS_PER_DAY",
+    "SLOTS_PER_WEEK",
+    "load_from_export",
+    "load_from_mongo",
+    "run_batch",
+]
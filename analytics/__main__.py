@@ -0,0 +1,73 @@
+"""Command line entry point: python -m analytics"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from .loader import load_from_export, load_from_mongo
+from .metrics import run_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m analytics",
+        description="Utilisation, cancellation/no-show rates, demand heatmaps and peak forecasts per barbershop",
+    )
+    parser.add_argument("--from", dest="date_from", required=True, help="First day (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", required=True, help="Last day (YYYY-MM-DD)")
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL"), help="MongoDB URL (default: $MONGO_URL)")
+    parser.add_argument("--db", default=os.environ.get("DB_NAME", "barbearia_saas"),
+                        help="Database name (default: $DB_NAME or barbearia_saas)")
+    parser.add_argument("--barbearia", action="append", help="Only this barbearia_id (repeatable)")
+    parser.add_argument("--no-archive", action="store_true", help="Skip the marcacoes_arquivo collection")
+    parser.add_argument("--export-url", help="Read one tenant through the NDJSON export API instead of MongoDB")
+    parser.add_argument("--token", default=os.environ.get("CUTHUB_TOKEN"),
+                        help="Bearer token for --export-url (default: $CUTHUB_TOKEN)")
+    parser.add_argument("--today", help="Reference date for no-shows (default: today)")
+    parser.add_argument("--halflife-weeks", type=float, default=4.0,
+                        help="EWMA half-life of the peak forecast (default: 4)")
+    parser.add_argument("--out", help="Write the summary to a .csv or .json file")
+    parser.add_argument("--heatmaps", help="Write demand/occupancy heatmaps and forecasts to a .npz file")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.export_url:
+        if not args.token:
+            parser.error("--export-url needs --token")
+        dataset = load_from_export(args.export_url, args.token, args.date_from, args.date_to)
+    elif args.mongo_url:
+        dataset = load_from_mongo(args.mongo_url, args.db, args.date_from, args.date_to,
+                                  barbearia_ids=args.barbearia, include_archive=not args.no_archive)
+    else:
+        parser.error("pass --mongo-url (or set MONGO_URL) or --export-url")
+    loaded = time.perf_counter()
+
+    result = run_batch(dataset, args.date_from, args.date_to, today=args.today,
+                       halflife_weeks=args.halflife_weeks)
+    computed = time.perf_counter()
+
+    print(
+        f"{len(dataset.bookings)} bookings, {len(result.tenants)} tenants: "
+        f"load {loaded - started:.2f}s, compute {computed - loaded:.2f}s",
+        file=sys.stderr,
+    )
+
+    if args.out:
+        if args.out.endswith(".json"):
+            result.summary.to_json(args.out, orient="records", indent=2)
+        else:
+            result.summary.to_csv(args.out, index=False)
+    if args.heatmaps:
+        result.save_heatmaps(args.heatmaps)
+
+    if args.json:
+        print(json.dumps(json.loads(result.summary.to_json(orient="records")), indent=2))
+    elif not args.out:
+        print(result.summary.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Minute-of-week grids.
+
+A week is cut into SLOTS_PER_WEEK slots of SLOT_MINUTES, indexed as
+weekday * SLOTS_PER_DAY + slot_of_day with the JavaScript weekday numbering
+used by the API (0 = Sunday). Bookings become slot indices with vectorised
+string/date parsing; schedules become 0/1 capacity rows per barber.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOTS_PER_WEEK = 7 * SLOTS_PER_DAY
+
+WEEKDAY_NAMES = ["domingo", "segunda", "terca", "quarta", "quinta", "sexta", "sabado"]
+
+# Same as DAY_OFF_TYPES in lib/schedule-exceptions.js
+DAY_OFF_TYPES = {"folga", "feriado"}
+
+
+def _to_minutes(value, default=None):
+    """'HH:MM' -> minutes since midnight"""
+    if not value:
+        return default
+    hours, minutes = str(value).split(":")[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+def js_weekday(dates):
+    """pandas datetimes -> 0 = Sunday ... 6 = Saturday"""
+    return ((dates.dt.dayofweek + 1) % 7).to_numpy()
+
+
+def booking_start_slots(bookings):
+    """Vectorised start slot (minute-of-week) and a validity mask for each booking"""
+    dates = pd.to_datetime(bookings["data"], format="%Y-%m-%d", errors="coerce")
+    hora = bookings["hora"].fillna("").astype(str)
+    hours = pd.to_numeric(hora.str.slice(0, 2), errors="coerce")
+    minutes = pd.to_numeric(hora.str.slice(3, 5), errors="coerce")
+
+    valid = (dates.notna() & hours.notna() & minutes.notna()).to_numpy()
+    weekday = np.where(valid, js_weekday(dates.fillna(pd.Timestamp(0))), 0)
+    minute_of_day = (hours.fillna(0) * 60 + minutes.fillna(0)).to_numpy().astype(np.int64)
+    start = weekday * SLOTS_PER_DAY + np.clip(minute_of_day, 0, 24 * 60 - 1) // SLOT_MINUTES
+    return start.astype(np.int64), valid
+
+
+def expand_intervals(start_slots, slot_counts):
+    """
+    Every slot covered by each interval, without a Python loop.
+
+    Returns (owner, slot): owner[i] is the interval that covers slot[i].
+    Intervals that run past Saturday night wrap to Sunday.
+    """
+    slot_counts = np.maximum(slot_counts.astype(np.int64), 1)
+    owner = np.repeat(np.arange(len(start_slots)), slot_counts)
+    first = np.repeat(np.cumsum(slot_counts) - slot_counts, slot_counts)
+    offsets = np.arange(len(owner)) - first
+    slots = (np.repeat(start_slots, slot_counts) + offsets) % SLOTS_PER_WEEK
+    return owner, slots
+
+
+def day_occurrences(date_from, date_to):
+    """How many times each weekday (0 = Sunday) occurs in [date_from, date_to]"""
+    days = pd.date_range(date_from, date_to, freq="D")
+    return np.bincount((days.dayofweek + 1) % 7, minlength=7)
+
+
+def _window(row, start, end):
+    """Mark [start, end) minutes of one day as available in a capacity row slice"""
+    if start is None or end is None or end <= start:
+        return
+    row[start // SLOT_MINUTES:-(-end // SLOT_MINUTES)] = 1
+
+
+def _working_day(day, entry, schedule, override=None):
+    """Fill one day from a horario_semanal entry (optionally a 'parcial' exception), minus lunch"""
+    override = override or {}
+    start = _to_minutes(override.get("inicio") or entry.get("inicio"), 9 * 60)
+    end = _to_minutes(override.get("fim") or entry.get("fim"), 19 * 60)
+    _window(day, start, end)
+    lunch_start = _to_minutes(schedule.get("hora_almoco_inicio"))
+    lunch_end = _to_minutes(schedule.get("hora_almoco_fim"))
+    if lunch_start is not None and lunch_end is not None:
+        day[lunch_start // SLOT_MINUTES:-(-lunch_end // SLOT_MINUTES)] = 0
+
+
+def _weekly_entry(weekly, weekday):
+    # Mongo stores the weekday keys as strings
+    entry = weekly.get(str(weekday)) or weekly.get(weekday)
+    return entry if entry and entry.get("ativo") else None
+
+
+def _barber_week(schedule, opening_by_day):
+    """0/1 capacity row (SLOTS_PER_WEEK) from a barber's horario_trabalho"""
+    week = np.zeros(SLOTS_PER_WEEK, dtype=np.uint8)
+    weekly = (schedule or {}).get("horario_semanal")
+
+    for weekday in range(7):
+        day = week[weekday * SLOTS_PER_DAY:(weekday + 1) * SLOTS_PER_DAY]
+        if weekly:
+            entry = _weekly_entry(weekly, weekday)
+            if entry:
+                _working_day(day, entry, schedule)
+        else:
+            # Fallback: the shop's opening hours, as in lib/schedule.js
+            opening = opening_by_day.get(WEEKDAY_NAMES[weekday])
+            if opening is not None:
+                _window(day, _to_minutes(opening[0]), _to_minutes(opening[1]))
+    return week
+
+
+def _exception_adjustment(schedule, week, date_from, date_to):
+    """Available slots removed (folga/feriado) or changed (parcial) by dated exceptions"""
+    weekly = (schedule or {}).get("horario_semanal")
+    if not weekly:
+        return 0
+
+    delta = 0
+    for exception in schedule.get("excepcoes") or []:
+        day_str = exception.get("data")
+        if not day_str or not (date_from <= day_str <= date_to):
+            continue
+        weekday = (date.fromisoformat(day_str).weekday() + 1) % 7
+        entry = _weekly_entry(weekly, weekday)
+        if entry is None:
+            # Exceptions only apply to working days
+            continue
+        usual = int(week[weekday * SLOTS_PER_DAY:(weekday + 1) * SLOTS_PER_DAY].sum())
+        if exception.get("tipo") in DAY_OFF_TYPES:
+            delta -= usual
+        elif exception.get("tipo") == "parcial":
+            partial = np.zeros(SLOTS_PER_DAY, dtype=np.uint8)
+            _working_day(partial, entry, schedule, override=exception)
+            delta += int(partial.sum()) - usual
+    return delta
+
+
+def capacity_grid(barbers, opening_hours, date_from, date_to):
+    """
+    Weekly capacity template per barber plus dated corrections.
+
+    Returns (template[B, SLOTS_PER_WEEK] uint8, exception_slots[B] int64),
+    rows in the order of `barbers`. Loops over barbers, never over bookings.
+    """
+    opening = {}
+    active = opening_hours[opening_hours["ativo"].fillna(False).astype(bool)] if not opening_hours.empty else opening_hours
+    for record in active.itertuples(index=False):
+        opening.setdefault(record.barbearia_id, {})[record.dia_semana] = (record.hora_inicio, record.hora_fim)
+
+    template = np.zeros((len(barbers), SLOTS_PER_WEEK), dtype=np.uint8)
+    exception_slots = np.zeros(len(barbers), dtype=np.int64)
+    for i, record in enumerate(barbers.itertuples(index=False)):
+        schedule = record.horario_trabalho if isinstance(record.horario_trabalho, dict) else None
+        template[i] = _barber_week(schedule, opening.get(record.barbearia_id, {}))
+        exception_slots[i] = _exception_adjustment(schedule, template[i], date_from, date_to)
+    return template, exception_slots
@@ -0,0 +1,163 @@
+"""
+Data loading: bulk MongoDB cursors or the streaming NDJSON export.
+
+Both loaders return a `Dataset` of pandas DataFrames with the same columns,
+so the metrics do not care where the data came from.
+"""
+
+import json
+from dataclasses import dataclass
+
+import pandas as pd
+
+BOOKING_COLUMNS = ["barbearia_id", "barbeiro_id", "servico_id", "data", "hora", "status"]
+CURSOR_BATCH_SIZE = 10_000
+
+
+@dataclass
+class Dataset:
+    """Raw inputs for one batch run"""
+    bookings: pd.DataFrame   # BOOKING_COLUMNS + duracao, preco
+    barbers: pd.DataFrame    # barbeiro_id, barbearia_id, horario_trabalho
+    opening_hours: pd.DataFrame  # barbearia_id, dia_semana, hora_inicio, hora_fim, ativo
+
+
+def _attach_services(bookings, services):
+    """Add duracao/preco from servicos (missing services count as 0)"""
+    if services.empty:
+        bookings["duracao"] = 0
+        bookings["preco"] = 0.0
+        return bookings
+    merged = bookings.merge(services, how="left", on="servico_id")
+    merged["duracao"] = merged["duracao"].fillna(0).astype("int32")
+    merged["preco"] = merged["preco"].fillna(0).astype("float64")
+    return merged
+
+
+def _tenant_sources(client, db, barbearia_ids):
+    """
+    (database, filter) pairs covering the tenant collections, as
+    tenantDatabases does in lib/tenant-db.js: the shared database without the
+    tenants placed elsewhere, plus each dedicated tenant database.
+    """
+    wanted = set(barbearia_ids) if barbearia_ids else None
+    dedicated = [
+        (placement["_id"], placement["database"])
+        for placement in db["tenant_placements"].find({"database": {"$ne": None}}, {"database": 1})
+    ]
+
+    shared_filter = {"$nin": [barbearia_id for barbearia_id, _ in dedicated]}
+    if wanted is not None:
+        shared_filter["$in"] = list(wanted)
+    sources = [(db, {"barbearia_id": shared_filter})]
+    sources += [
+        (client[database], {"barbearia_id": barbearia_id})
+        for barbearia_id, database in dedicated
+        if wanted is None or barbearia_id in wanted
+    ]
+    return sources
+
+
+def _find_all(sources, name, query, projection):
+    """One projected cursor per tenant source, chained"""
+    for database, tenant_filter in sources:
+        yield from database[name].find({**query, **tenant_filter}, projection).batch_size(CURSOR_BATCH_SIZE)
+
+
+def load_from_mongo(mongo_url, db_name, date_from, date_to, barbearia_ids=None, include_archive=True):
+    """Read every tenant (or `barbearia_ids`) with projected bulk cursors (needs pymongo)"""
+    try:
+        from pymongo import MongoClient
+    except ImportError as exc:
+        raise SystemExit("pymongo is required to read from MongoDB (pip install pymongo)") from exc
+
+    tenant_filter = {"barbearia_id": {"$in": list(barbearia_ids)}} if barbearia_ids else {}
+    date_filter = {"data": {"$gte": date_from, "$lte": date_to}}
+    projection = {"_id": 0, **{column: 1 for column in BOOKING_COLUMNS}}
+
+    client = MongoClient(mongo_url)
+    try:
+        db = client[db_name]
+        # Tenant collections may live in dedicated databases (lib/tenant-migration.js)
+        sources = _tenant_sources(client, db, barbearia_ids)
+        collections = ["marcacoes", "marcacoes_arquivo"] if include_archive else ["marcacoes"]
+        frames = [
+            pd.DataFrame.from_records(
+                _find_all(sources, name, date_filter, projection),
+                columns=BOOKING_COLUMNS,
+            )
+            for name in collections
+        ]
+        bookings = pd.concat(frames, ignore_index=True)
+
+        services = pd.DataFrame.from_records(
+            ({"servico_id": str(s["_id"]), "duracao": s.get("duracao"), "preco": s.get("preco")}
+             for s in _find_all(sources, "servicos", {}, {"duracao": 1, "preco": 1})),
+            columns=["servico_id", "duracao", "preco"],
+        )
+
+        barbers = pd.DataFrame.from_records(
+            ({"barbeiro_id": str(b["_id"]), "barbearia_id": b.get("barbearia_id"),
+              "horario_trabalho": b.get("horario_trabalho")}
+             for b in db["utilizadores"].find(
+                 {**tenant_filter, "tipo": "barbeiro", "ativo": {"$ne": False}},
+                 {"barbearia_id": 1, "horario_trabalho": 1})),
+            columns=["barbeiro_id", "barbearia_id", "horario_trabalho"],
+        )
+
+        # Dated exceptions live in horario_excecoes; attach them where the
+        # grid expects them (horario_trabalho["excepcoes"])
+        exceptions = {}
+        for exception in _find_all(
+                sources, "horario_excecoes", date_filter,
+                {"_id": 0, "barbeiro_id": 1, "data": 1, "tipo": 1, "inicio": 1, "fim": 1}):
+            exceptions.setdefault(exception["barbeiro_id"], []).append(exception)
+        barbers["horario_trabalho"] = [
+            {**schedule, "excepcoes": exceptions.get(barber_id, [])} if isinstance(schedule, dict) else schedule
+            for barber_id, schedule in zip(barbers["barbeiro_id"], barbers["horario_trabalho"])
+        ]
+
+        opening_hours = pd.DataFrame.from_records(
+            _find_all(
+                sources, "horarios_funcionamento", {},
+                {"_id": 0, "barbearia_id": 1, "dia_semana": 1, "hora_inicio": 1, "hora_fim": 1, "ativo": 1}),
+            columns=["barbearia_id", "dia_semana", "hora_inicio", "hora_fim", "ativo"],
+        )
+    finally:
+        client.close()
+
+    return Dataset(_attach_services(bookings, services), barbers, opening_hours)
+
+
+def load_from_export(base_url, token, date_from, date_to):
+    """
+    Read one tenant through GET /api/export/marcacoes (NDJSON, streamed).
+
+    The export has names rather than ids and no schedules, so utilisation
+    needs `load_from_mongo`; rates, heatmaps and forecasts work from this.
+    """
+    import requests
+
+    response = requests.get(
+        f"{base_url.rstrip('/')}/api/export/marcacoes",
+        params={"formato": "ndjson", "de": date_from, "ate": date_to},
+        headers={"Authorization": f"Bearer {token}"},
+        stream=True,
+        timeout=(10, 300),
+    )
+    response.raise_for_status()
+
+    rows = (json.loads(line) for line in response.iter_lines() if line)
+    bookings = pd.DataFrame.from_records(
+        ({"barbearia_id": "export", "barbeiro_id": r.get("barbeiro"), "servico_id": r.get("servico"),
+          "data": r.get("data"), "hora": r.get("hora"), "status": r.get("status"),
+          "preco": r.get("preco") or 0.0}
+         for r in rows),
+        columns=BOOKING_COLUMNS + ["preco"],
+    )
+    # The export has no duration: each booking counts as a single slot
+    bookings["duracao"] = 0
+
+    empty_barbers = pd.DataFrame(columns=["barbeiro_id", "barbearia_id", "horario_trabalho"])
+    empty_hours = pd.DataFrame(columns=["barbearia_id", "dia_semana", "hora_inicio", "hora_fim", "ativo"])
+    return Dataset(bookings, empty_barbers, empty_hours)
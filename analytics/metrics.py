@@ -0,0 +1,191 @@
+"""
+Batch metrics over every tenant at once.
+
+Every per-tenant figure is a `np.bincount` over integer tenant codes, and
+every per-slot figure is a bincount over flattened (tenant, slot) indices,
+so the cost is a handful of vectorised passes regardless of how many
+bookings or tenants are loaded. The only Python loop is over barbers, to
+turn their schedules into capacity rows.
+
+There is no "no-show" status in the API: a booking whose date has passed and
+that is still `pendente` or `aceita` (never marked `concluida`) is counted as
+a no-show.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from .grid import (
+    SLOT_MINUTES,
+    SLOTS_PER_DAY,
+    SLOTS_PER_WEEK,
+    WEEKDAY_NAMES,
+    booking_start_slots,
+    capacity_grid,
+    day_occurrences,
+    expand_intervals,
+)
+
+# Same as NAO_OCUPA in lib/rollups.js
+NOT_OCCUPYING = ["cancelada", "rejeitada"]
+OPEN_STATUSES = ["pendente", "aceita"]
+
+HOURS_PER_WEEK = 7 * 24
+SLOTS_PER_HOUR = 60 // SLOT_MINUTES
+
+
+@dataclass
+class BatchResult:
+    """Output of `run_batch`"""
+    summary: pd.DataFrame    # one row per tenant
+    tenants: np.ndarray      # barbearia_id for axis 0 of the arrays below
+    demand: np.ndarray       # [T, 7, SLOTS_PER_DAY] average bookings in progress per slot
+    occupancy: np.ndarray    # [T, 7, SLOTS_PER_DAY] booked / available barber slots (nan if closed)
+    forecast: np.ndarray     # [T, 168] expected bookings starting per hour of next week
+
+    def save_heatmaps(self, path):
+        """Write the arrays to a compressed .npz file"""
+        np.savez_compressed(
+            path,
+            tenants=self.tenants.astype(str),
+            demand=self.demand,
+            occupancy=self.occupancy,
+            forecast=self.forecast,
+        )
+
+
+def _ratio(numerator, denominator):
+    """Element-wise numerator / denominator, nan where the denominator is 0"""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    out = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def _count(codes, mask, size, weights=None):
+    """Per-tenant bincount of the rows selected by `mask`"""
+    return np.bincount(codes[mask], weights=None if weights is None else weights[mask], minlength=size)
+
+
+def _hour_label(hour_of_week):
+    weekday, hour = divmod(int(hour_of_week), 24)
+    return f"{WEEKDAY_NAMES[weekday]} {hour:02d}:00"
+
+
+def peak_forecast(codes, start_slots, dates, mask, n_tenants, date_from, halflife_weeks):
+    """
+    EWMA of weekly (tenant x hour-of-week) booking counts.
+
+    Week 0 starts on `date_from`; the most recent week weighs most, with the
+    weight halving every `halflife_weeks`.
+    """
+    week = ((dates - pd.Timestamp(date_from)).dt.days.to_numpy() // 7)
+    mask = mask & (week >= 0)
+    n_weeks = int(week[mask].max()) + 1 if mask.any() else 1
+
+    hour_of_week = start_slots // SLOTS_PER_HOUR
+    flat = (week[mask] * n_tenants + codes[mask]) * HOURS_PER_WEEK + hour_of_week[mask]
+    weekly = np.bincount(flat, minlength=n_weeks * n_tenants * HOURS_PER_WEEK)
+    weekly = weekly.reshape(n_weeks, n_tenants, HOURS_PER_WEEK).astype(np.float64)
+
+    decay = 0.5 ** (1.0 / halflife_weeks)
+    weights = decay ** np.arange(n_weeks - 1, -1, -1)
+    return np.tensordot(weights / weights.sum(), weekly, axes=1)
+
+
+def run_batch(dataset, date_from, date_to, today=None, halflife_weeks=4.0, top_peaks=3):
+    """
+    Compute per-tenant metrics, heatmaps and peak-hour forecasts for [date_from, date_to].
+
+    `today` (YYYY-MM-DD, default: the current date) separates past bookings,
+    which can be no-shows, from future ones.
+    """
+    today = today or date.today().isoformat()
+    bookings = dataset.bookings
+    barbers = dataset.barbers
+
+    tenants = pd.Index(sorted(
+        set(bookings["barbearia_id"].dropna()) | set(barbers["barbearia_id"].dropna())
+    ))
+    n_tenants = len(tenants)
+
+    codes = tenants.get_indexer(bookings["barbearia_id"])
+    start, valid = booking_start_slots(bookings)
+    day = bookings["data"].fillna("").astype(str).to_numpy()
+    status = bookings["status"].fillna("").astype(str).to_numpy()
+    duration = bookings["duracao"].fillna(0).to_numpy().astype(np.int64)
+    price = bookings["preco"].fillna(0).to_numpy().astype(np.float64)
+
+    rows = valid & (codes >= 0) & (day >= date_from) & (day <= date_to)
+    codes = np.where(rows, codes, 0)
+    occupying = rows & ~np.isin(status, NOT_OCCUPYING)
+    completed = rows & (status == "concluida")
+    past = rows & (day < today)
+
+    total = _count(codes, rows, n_tenants)
+    cancelled = _count(codes, rows & (status == "cancelada"), n_tenants)
+    rejected = _count(codes, rows & (status == "rejeitada"), n_tenants)
+    no_shows = _count(codes, past & np.isin(status, OPEN_STATUSES), n_tenants)
+    past_due = _count(codes, past & np.isin(status, OPEN_STATUSES + ["concluida"]), n_tenants)
+    revenue = _count(codes, completed, n_tenants, weights=price)
+    booked_minutes = _count(codes, occupying, n_tenants, weights=duration)
+
+    # Capacity: weekly template x weekday occurrences in the range, plus exceptions
+    template, exception_slots = capacity_grid(barbers, dataset.opening_hours, date_from, date_to)
+    occurrences = day_occurrences(date_from, date_to)
+    barber_codes = tenants.get_indexer(barbers["barbearia_id"])
+    known = barber_codes >= 0
+
+    per_weekday = template.reshape(len(barbers), 7, SLOTS_PER_DAY).sum(axis=2)
+    available_slots = per_weekday @ occurrences + exception_slots
+    available_minutes = np.bincount(
+        barber_codes[known], weights=available_slots[known] * SLOT_MINUTES, minlength=n_tenants
+    )
+
+    # Slots in progress: each booking covers ceil(duracao / SLOT_MINUTES) slots
+    slot_counts = -(-duration[occupying] // SLOT_MINUTES)
+    owner, slots = expand_intervals(start[occupying], slot_counts)
+    flat = codes[occupying][owner] * SLOTS_PER_WEEK + slots
+    booked = np.bincount(flat, minlength=n_tenants * SLOTS_PER_WEEK).reshape(n_tenants, SLOTS_PER_WEEK)
+
+    capacity = np.zeros((n_tenants, SLOTS_PER_WEEK), dtype=np.int64)
+    np.add.at(capacity, barber_codes[known], template[known])
+    slot_occurrences = np.repeat(occurrences, SLOTS_PER_DAY)
+
+    demand = _ratio(booked, np.broadcast_to(slot_occurrences, booked.shape))
+    occupancy = _ratio(booked, capacity * slot_occurrences)
+
+    dates = pd.to_datetime(bookings["data"], format="%Y-%m-%d", errors="coerce")
+    forecast = peak_forecast(codes, start, dates, occupying, n_tenants, date_from, halflife_weeks)
+    peaks = np.argsort(-forecast, axis=1, kind="stable")[:, :top_peaks]
+
+    summary = pd.DataFrame({
+        "barbearia_id": tenants,
+        "total": total,
+        "concluida": _count(codes, completed, n_tenants),
+        "cancelada": cancelled,
+        "rejeitada": rejected,
+        "taxa_cancelamento": _ratio(cancelled, total),
+        "no_show": no_shows,
+        "taxa_no_show": _ratio(no_shows, past_due),
+        "receita": revenue,
+        "minutos_marcados": booked_minutes,
+        "minutos_disponiveis": available_minutes,
+        "ocupacao": _ratio(booked_minutes, available_minutes),
+        "picos_previstos": [
+            ", ".join(_hour_label(h) for h in tenant_peaks if forecast[i, h] > 0)
+            for i, tenant_peaks in enumerate(peaks)
+        ],
+    })
+
+    return BatchResult(
+        summary=summary,
+        tenants=tenants.to_numpy(),
+        demand=demand.reshape(n_tenants, 7, SLOTS_PER_DAY),
+        occupancy=occupancy.reshape(n_tenants, 7, SLOTS_PER_DAY),
+        forecast=forecast,
+    )
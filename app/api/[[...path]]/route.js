@@ -1,35 +1,87 @@
 import { NextResponse } from 'next/server';
-import { MongoClient, ObjectId } from 'mongodb';
-import bcrypt from 'bcryptjs';
+import { ObjectId } from 'mongodb';
 import jwt from 'jsonwebtoken';
-import Stripe from 'stripe';
-import twilio from 'twilio';
+import { connectToDatabase, DB_NAME } from '@/lib/mongodb';
+import { instrumentRoute } from '@/lib/metrics';
+import { withAdmissionControl } from '@/lib/admission-control';
+import { hashPassword, verifyPassword, rehashInBackground } from '@/lib/password-hasher';
+import { SESSION_VERSION_PROJECTION, getAuthContext, signSessionToken, userFromClaims } from '@/lib/auth';
+import { getStripeClient, getTwilioClient } from '@/lib/integrations';
+import { cachedJson, CACHE_POLICIES } from '@/lib/http-cache';
+import { jsonResponse } from '@/lib/json-response';
+import { toMarcacaoDTO, toClienteDTO, toBarbeiroDTO, parseFields, applyFields } from '@/lib/dto';
+import { loadPublicBarbearia, revalidatePublicBarbearia } from '@/lib/public-barbearia';
+import { findMarcacoes, countMarcacoes, rangeNeedsArchive } from '@/lib/marcacoes-archive';
+import { resolveWorkingHours, toMinutes, WORKING_HOURS_PROJECTION } from '@/lib/schedule';
+import { getLoader, PROJECTIONS } from '@/lib/loaders';
+import { getTenantDb, tenantDatabases, findAcrossTenants } from '@/lib/tenant-db';
+import {
+  listScheduleExceptions,
+  upsertScheduleException,
+  removeScheduleException,
+  replaceScheduleExceptions,
+  migrateBarberExceptions,
+  migrateBarberExceptionsById,
+  isValidException
+} from '@/lib/schedule-exceptions';
+import {
+  searchClientes,
+  attachClienteStats,
+  parseSearchLimit,
+  indexClienteForBarbearia,
+  indexClienteIdForBarbearia,
+  reindexCliente
+} from '@/lib/client-search';
+import {
+  scheduleRollupRefresh,
+  scheduleRollupScheduleRefresh,
+  scheduleRollupRefreshForMarcacao,
+  queryReport,
+  isValidReportGrouping,
+  planIncludesReports
+} from '@/lib/rollups';
+import {
+  getOrCreateCalendarFeed,
+  rotateCalendarFeed,
+  deleteCalendarFeed,
+  calendarFeedUrl,
+  touchCalendarFeeds,
+  touchCalendarFeedsForMarcacao
+} from '@/lib/calendar-feeds';
+import {
+  barbeariaKey,
+  ownerKey,
+  getEntitlements,
+  refreshEntitlements,
+  refreshEntitlementsForSubscription,
+  reserveUsage,
+  confirmUsage,
+  releaseUsage
+} from '@/lib/entitlements';
 
 const JWT_SECRET = process.env.JWT_SECRET;
 if (!JWT_SECRET) {
   throw new Error('JWT_SECRET environment variable is required');
 }
-const MONGO_URL = process.env.MONGO_URL;
+// Leituras de barbeiros que não precisam do horário de trabalho
+const BARBEIRO_SEM_HORARIO = PROJECTIONS.barbeiroSemHorario;
 
 // Twilio WhatsApp Configuration
 const TWILIO_ACCOUNT_SID = process.env.TWILIO_ACCOUNT_SID;
 const TWILIO_AUTH_TOKEN = process.env.TWILIO_AUTH_TOKEN;
 const TWILIO_WHATSAPP_FROM = process.env.TWILIO_WHATSAPP_FROM || 'whatsapp:+14155238886';
 
-// Initialize Twilio client
-let twilioClient = null;
-if (TWILIO_ACCOUNT_SID && TWILIO_AUTH_TOKEN) {
-  twilioClient = twilio(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN);
-}
-
 // Function to send WhatsApp notification
+// (o SDK do Twilio só é carregado no primeiro envio, ver lib/integrations.js)
 async function sendWhatsAppNotification(to, message) {
-  if (!twilioClient) {
+  if (!TWILIO_ACCOUNT_SID || !TWILIO_AUTH_TOKEN) {
     console.log('[WhatsApp] Twilio not configured. Skipping WhatsApp notification.');
     return { success: false, error: 'Twilio not configured' };
   }
 
   try {
+    const twilioClient = await getTwilioClient(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN);
+
     // Ensure phone number has whatsapp: prefix and country code
     let formattedPhone = to;
     if (!formattedPhone.startsWith('whatsapp:')) {
@@ -56,25 +108,6 @@ async function sendWhatsAppNotification(to, message) {
   }
 }
 
-let cachedClient = null;
-
-async function connectToDatabase() {
-  if (cachedClient) {
-    return cachedClient;
-  }
-  const client = await MongoClient.connect(MONGO_URL);
-  cachedClient = client;
-  return client;
-}
-
-function verifyToken(token) {
-  try {
-    return jwt.verify(token, JWT_SECRET);
-  } catch (error) {
-    return null;
-  }
-}
-
 function generateTimeSlots(startTime, endTime, duration) {
   const slots = [];
   let current = startTime;
@@ -89,12 +122,12 @@ function generateTimeSlots(startTime, endTime, duration) {
   return slots;
 }
 
-export async function POST(request, { params }) {
+async function handlePOST(request, { params }) {
   try {
     const path = params?.path ? params.path.join('/') : '';
     const body = await request.json();
     const client = await connectToDatabase();
-    const db = client.db(process.env.DB_NAME);
+    const db = client.db(DB_NAME);
 
     // AUTH - Register
     if (path === 'auth/register') {
@@ -105,7 +138,7 @@ export async function POST(request, { params }) {
         return NextResponse.json({ error: 'Email já registado' }, { status: 400 });
       }
 
-      const hashedPassword = await bcrypt.hash(password, 10);
+      const hashedPassword = await hashPassword(password);
       const user = {
         email,
         password: hashedPassword,
@@ -118,11 +151,16 @@ export async function POST(request, { params }) {
       };
 
       const result = await db.collection('utilizadores').insertOne(user);
-      const token = jwt.sign(
-        { userId: result.insertedId.toString(), email, tipo: user.tipo, barbearia_id: user.barbearia_id },
-        JWT_SECRET,
-        { expiresIn: '7d' }
-      );
+      if (user.tipo === 'cliente' && user.barbearia_id) {
+        await indexClienteForBarbearia(db, user.barbearia_id, { ...user, _id: result.insertedId });
+      }
+      const token = signSessionToken({
+        userId: result.insertedId.toString(),
+        email,
+        tipo: user.tipo,
+        barbearia_id: user.barbearia_id,
+        nome: user.nome
+      });
 
       return NextResponse.json({ token, user: { ...user, _id: result.insertedId, password: undefined } });
     }
@@ -136,16 +174,22 @@ export async function POST(request, { params }) {
         return NextResponse.json({ error: 'Credenciais inválidas' }, { status: 401 });
       }
 
-      const validPassword = await bcrypt.compare(password, user.password);
+      const validPassword = await verifyPassword(password, user.password);
       if (!validPassword) {
         return NextResponse.json({ error: 'Credenciais inválidas' }, { status: 401 });
       }
 
-      const token = jwt.sign(
-        { userId: user._id.toString(), email: user.email, tipo: user.tipo, barbearia_id: user.barbearia_id },
-        JWT_SECRET,
-        { expiresIn: '7d' }
-      );
+      // Atualizar o hash se o custo calibrado mudou (não bloqueia o login)
+      rehashInBackground(db, user._id, password, user.password);
+
+      const token = signSessionToken({
+        userId: user._id.toString(),
+        email: user.email,
+        tipo: user.tipo,
+        barbearia_id: user.barbearia_id,
+        nome: user.nome,
+        sessao_versao: user.sessao_versao
+      });
 
       return NextResponse.json({ token, user: { ...user, password: undefined } });
     }
@@ -164,49 +208,7 @@ export async function POST(request, { params }) {
       const { nome, descricao, email_admin, password_admin } = body;
       
       let userId = null;
-      
-      // Verificar se usuário tem subscription ativa
-      const authHeader = request.headers.get('authorization');
-      if (authHeader && authHeader.startsWith('Bearer ')) {
-        const token = authHeader.substring(7);
-        const decodedToken = verifyToken(token);
-        
-        if (decodedToken) {
-          userId = decodedToken.userId;
-          
-          // Verificar subscription
-          const subscription = await db.collection('subscriptions').findOne({
-            user_id: userId,
-            status: { $in: ['active', 'trialing'] }
-          });
-
-          if (!subscription) {
-            return NextResponse.json({ 
-              error: 'Precisa de uma assinatura ativa para criar uma barbearia',
-              requires_subscription: true 
-            }, { status: 403 });
-          }
-
-          // Buscar limites do plano
-          const plano = await db.collection('planos').findOne({ id: subscription.plano });
-          
-          if (plano && plano.limite_barbearias !== -1) {
-            // Verificar limite de barbearias do plano
-            const existingBarbearias = await db.collection('barbearias')
-              .countDocuments({ owner_id: userId });
-
-            if (existingBarbearias >= plano.limite_barbearias) {
-              return NextResponse.json({ 
-                error: 'Limite de barbearias atingido',
-                message: `O seu plano ${plano.nome} permite apenas ${plano.limite_barbearias} barbearia(s). Para criar mais barbearias, atualize o seu plano.`,
-                upgrade_required: true,
-                current_plan: plano.nome,
-                limit: plano.limite_barbearias
-              }, { status: 403 });
-            }
-          }
-        }
-      }
+      let entitlementKey = null;
       
       const slug = nome.toLowerCase()
         .normalize('NFD')
@@ -219,6 +221,39 @@ export async function POST(request, { params }) {
         return NextResponse.json({ error: 'Já existe uma barbearia com este nome' }, { status: 400 });
       }
 
+      // Verificar se usuário tem subscription ativa
+      const decodedToken = getAuthContext(request)?.decoded;
+      if (decodedToken) {
+        userId = decodedToken.userId;
+        entitlementKey = ownerKey(userId);
+        
+        // Verificar subscription (a cache pode não ter visto uma ativação recente)
+        let current = await getEntitlements(db, entitlementKey);
+        if (current.status === 'none') {
+          current = await refreshEntitlements(db, entitlementKey);
+        }
+
+        if (current.status === 'none') {
+          return NextResponse.json({ 
+            error: 'Precisa de uma assinatura ativa para criar uma barbearia',
+            requires_subscription: true 
+          }, { status: 403 });
+        }
+
+        // Reservar uma barbearia no limite do plano (atómico)
+        const { allowed, entitlements } = await reserveUsage(db, entitlementKey, 'barbearias');
+        if (!allowed) {
+          const planoNome = entitlements.plano?.nome;
+          return NextResponse.json({ 
+            error: 'Limite de barbearias atingido',
+            message: `O seu plano ${planoNome} permite apenas ${entitlements.limits.barbearias} barbearia(s). Para criar mais barbearias, atualize o seu plano.`,
+            upgrade_required: true,
+            current_plan: planoNome,
+            limit: entitlements.limits.barbearias
+          }, { status: 403 });
+        }
+      }
+
       const barbearia = {
         nome,
         slug,
@@ -228,7 +263,14 @@ export async function POST(request, { params }) {
         criado_em: new Date()
       };
 
-      const barbeariaResult = await db.collection('barbearias').insertOne(barbearia);
+      let barbeariaResult;
+      try {
+        barbeariaResult = await db.collection('barbearias').insertOne(barbearia);
+      } catch (error) {
+        if (entitlementKey) await releaseUsage(db, entitlementKey, 'barbearias');
+        throw error;
+      }
+      if (entitlementKey) await confirmUsage(db, entitlementKey);
       const barbeariaId = barbeariaResult.insertedId.toString();
 
       // Atualizar o owner com o barbearia_id
@@ -245,7 +287,7 @@ export async function POST(request, { params }) {
         );
       }
 
-      const hashedPassword = await bcrypt.hash(password_admin, 10);
+      const hashedPassword = await hashPassword(password_admin);
       const admin = {
         email: email_admin,
         password: hashedPassword,
@@ -290,19 +332,17 @@ export async function POST(request, { params }) {
         ativo: dia !== 'domingo'
       }));
 
-      await db.collection('horarios_funcionamento').insertMany(horariosPadrao);
+      const tenantDb = await getTenantDb(db, barbeariaId);
+      await tenantDb.collection('horarios_funcionamento').insertMany(horariosPadrao);
 
       // Gerar token para o admin criado (para login automático)
-      const adminToken = jwt.sign(
-        { 
-          userId: adminId,
-          email: admin.email,
-          tipo: admin.tipo,
-          barbearia_id: barbeariaId
-        },
-        JWT_SECRET,
-        { expiresIn: '7d' }
-      );
+      const adminToken = signSessionToken({
+        userId: adminId,
+        email: admin.email,
+        tipo: admin.tipo,
+        barbearia_id: barbeariaId,
+        nome: admin.nome
+      });
 
       return NextResponse.json({ 
         barbearia: { ...barbearia, _id: barbeariaId },
@@ -312,52 +352,26 @@ export async function POST(request, { params }) {
     }
 
     // Protected routes - require authentication
-    const authHeader = request.headers.get('authorization');
-    if (!authHeader || !authHeader.startsWith('Bearer ')) {
+    const auth = getAuthContext(request);
+    if (!auth) {
       return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
     }
 
-    const token = authHeader.substring(7);
-    const decoded = verifyToken(token);
+    const { decoded } = auth;
     if (!decoded) {
       return NextResponse.json({ error: 'Token inválido' }, { status: 401 });
     }
 
+    // Coleções da barbearia do token: sempre filtradas por barbearia_id e na
+    // base de dados onde o tenant está (lib/tenant-db.js)
+    const tdb = decoded.barbearia_id ? await getTenantDb(db, decoded.barbearia_id) : db;
+
     // BARBEIROS - Add (Admin only)
     if (path === 'barbeiros') {
       if (decoded.tipo !== 'admin' && decoded.tipo !== 'owner') {
         return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
       }
 
-      // Verificar limite de barbeiros do plano
-      const subscription = await db.collection('subscriptions').findOne({
-        barbearia_id: decoded.barbearia_id,
-        status: { $in: ['active', 'trialing'] }
-      });
-
-      if (subscription) {
-        const plano = await db.collection('planos').findOne({ id: subscription.plano });
-        
-        if (plano && plano.limite_barbeiros !== -1) {
-          // Contar barbeiros ativos
-          const totalBarbeiros = await db.collection('utilizadores').countDocuments({
-            barbearia_id: decoded.barbearia_id,
-            tipo: 'barbeiro',
-            ativo: { $ne: false }
-          });
-
-          if (totalBarbeiros >= plano.limite_barbeiros) {
-            return NextResponse.json({ 
-              error: 'Limite de barbeiros atingido',
-              message: `O seu plano ${plano.nome} permite apenas ${plano.limite_barbeiros} barbeiro(s). Para adicionar mais barbeiros, atualize o seu plano.`,
-              upgrade_required: true,
-              current_plan: plano.nome,
-              limit: plano.limite_barbeiros
-            }, { status: 403 });
-          }
-        }
-      }
-
       const { email, password, nome, telemovel, biografia, especialidades, local_id } = body;
       
       const existingUser = await db.collection('utilizadores').findOne({ email });
@@ -365,7 +379,27 @@ export async function POST(request, { params }) {
         return NextResponse.json({ error: 'Email já registado' }, { status: 400 });
       }
 
-      const hashedPassword = await bcrypt.hash(password, 10);
+      // Reservar um lugar no limite de barbeiros do plano (atómico)
+      const entitlementKey = barbeariaKey(decoded.barbearia_id);
+      const { allowed, entitlements } = await reserveUsage(db, entitlementKey, 'barbeiros');
+      if (!allowed) {
+        const planoNome = entitlements.plano?.nome;
+        return NextResponse.json({ 
+          error: 'Limite de barbeiros atingido',
+          message: `O seu plano ${planoNome} permite apenas ${entitlements.limits.barbeiros} barbeiro(s). Para adicionar mais barbeiros, atualize o seu plano.`,
+          upgrade_required: true,
+          current_plan: planoNome,
+          limit: entitlements.limits.barbeiros
+        }, { status: 403 });
+      }
+
+      let hashedPassword;
+      try {
+        hashedPassword = await hashPassword(password);
+      } catch (error) {
+        await releaseUsage(db, entitlementKey, 'barbeiros');
+        throw error;
+      }
       const barbeiro = {
         email,
         password: hashedPassword,
@@ -380,7 +414,15 @@ export async function POST(request, { params }) {
         criado_em: new Date()
       };
 
-      const result = await db.collection('utilizadores').insertOne(barbeiro);
+      let result;
+      try {
+        result = await db.collection('utilizadores').insertOne(barbeiro);
+      } catch (error) {
+        await releaseUsage(db, entitlementKey, 'barbeiros');
+        throw error;
+      }
+      await confirmUsage(db, entitlementKey);
+      await revalidatePublicBarbearia(db, decoded.barbearia_id);
       return NextResponse.json({ barbeiro: { ...barbeiro, _id: result.insertedId, password: undefined } });
     }
 
@@ -399,7 +441,8 @@ export async function POST(request, { params }) {
         criado_em: new Date()
       };
 
-      const result = await db.collection('servicos').insertOne(servico);
+      const result = await tdb.collection('servicos').insertOne(servico);
+      await revalidatePublicBarbearia(db, decoded.barbearia_id);
       return NextResponse.json({ servico: { ...servico, _id: result.insertedId } });
     }
 
@@ -419,7 +462,8 @@ export async function POST(request, { params }) {
         criado_em: new Date()
       };
 
-      const result = await db.collection('produtos').insertOne(produto);
+      const result = await tdb.collection('produtos').insertOne(produto);
+      await revalidatePublicBarbearia(db, decoded.barbearia_id);
       return NextResponse.json({ produto: { ...produto, _id: result.insertedId } });
     }
 
@@ -429,40 +473,26 @@ export async function POST(request, { params }) {
         return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
       }
 
-      // Verificar limite de locais do plano
-      const subscription = await db.collection('subscriptions').findOne({
-        barbearia_id: decoded.barbearia_id,
-        status: { $in: ['active', 'trialing'] }
-      });
-
-      if (subscription) {
-        const plano = await db.collection('planos').findOne({ id: subscription.plano });
-        
-        if (plano && plano.limite_barbearias !== -1) {
-          // Contar locais ativos
-          const totalLocais = await db.collection('locais').countDocuments({
-            barbearia_id: decoded.barbearia_id,
-            ativo: { $ne: false }
-          });
-
-          if (totalLocais >= plano.limite_barbearias) {
-            return NextResponse.json({ 
-              error: 'Limite de locais atingido',
-              message: `O seu plano ${plano.nome} permite apenas ${plano.limite_barbearias} local(is). Para adicionar mais locais, atualize o seu plano.`,
-              upgrade_required: true,
-              current_plan: plano.nome,
-              limit: plano.limite_barbearias
-            }, { status: 403 });
-          }
-        }
-      }
-
       const { nome, morada, telefone, email, horarios } = body;
 
       if (!nome || !morada) {
         return NextResponse.json({ error: 'Nome e morada são obrigatórios' }, { status: 400 });
       }
 
+      // Reservar um lugar no limite de locais do plano (atómico)
+      const entitlementKey = barbeariaKey(decoded.barbearia_id);
+      const { allowed, entitlements } = await reserveUsage(db, entitlementKey, 'locais');
+      if (!allowed) {
+        const planoNome = entitlements.plano?.nome;
+        return NextResponse.json({ 
+          error: 'Limite de locais atingido',
+          message: `O seu plano ${planoNome} permite apenas ${entitlements.limits.locais} local(is). Para adicionar mais locais, atualize o seu plano.`,
+          upgrade_required: true,
+          current_plan: planoNome,
+          limit: entitlements.limits.locais
+        }, { status: 403 });
+      }
+
       // Horários padrão se não fornecidos
       const horariosDefault = {
         segunda: { inicio: '09:00', fim: '19:00', ativo: true },
@@ -485,7 +515,15 @@ export async function POST(request, { params }) {
         criado_em: new Date()
       };
 
-      const result = await db.collection('locais').insertOne(local);
+      let result;
+      try {
+        result = await tdb.collection('locais').insertOne(local);
+      } catch (error) {
+        await releaseUsage(db, entitlementKey, 'locais');
+        throw error;
+      }
+      await confirmUsage(db, entitlementKey);
+      await revalidatePublicBarbearia(db, decoded.barbearia_id);
       return NextResponse.json({ local: { ...local, _id: result.insertedId } });
     }
 
@@ -505,7 +543,8 @@ export async function POST(request, { params }) {
         criado_em: new Date()
       };
 
-      const result = await db.collection('planos_cliente').insertOne(plano);
+      const result = await tdb.collection('planos_cliente').insertOne(plano);
+      await revalidatePublicBarbearia(db, decoded.barbearia_id);
       return NextResponse.json({ plano: { ...plano, _id: result.insertedId } });
     }
 
@@ -555,12 +594,13 @@ export async function POST(request, { params }) {
     if (path === 'marcacoes') {
       const { barbeiro_id, servico_id, data, hora, local_id } = body;
 
-      const servicoObj = await db.collection('servicos').findOne({ _id: new ObjectId(servico_id) });
+      const servicoObj = await findAcrossTenants(db, 'servicos', { _id: new ObjectId(servico_id) });
       if (!servicoObj) {
         return NextResponse.json({ error: 'Serviço não encontrado' }, { status: 404 });
       }
 
-      const existingMarcacao = await db.collection('marcacoes').findOne({
+      const marcacaoDb = await getTenantDb(db, decoded.barbearia_id || servicoObj.barbearia_id);
+      const existingMarcacao = await marcacaoDb.collection('marcacoes').findOne({
         barbeiro_id,
         data,
         hora,
@@ -584,25 +624,28 @@ export async function POST(request, { params }) {
         atualizado_em: new Date()
       };
 
-      const result = await db.collection('marcacoes').insertOne(marcacao);
+      const result = await marcacaoDb.collection('marcacoes').insertOne(marcacao);
+      scheduleRollupRefresh(marcacaoDb, marcacao.barbearia_id, marcacao.data);
+      await touchCalendarFeeds(marcacaoDb, marcacao);
+      await indexClienteIdForBarbearia(db, marcacao.barbearia_id, decoded.userId);
+
+      // Cliente, barbeiro, barbearia e local para as notificações (o loader
+      // faz uma query por coleção e o email reutiliza o que o WhatsApp leu)
+      const loader = getLoader(marcacaoDb);
+      const loadNotificationData = () => Promise.all([
+        loader.load('utilizadores', decoded.userId, { projection: PROJECTIONS.utilizadorContacto }),
+        barbeiro_id ? loader.load('utilizadores', barbeiro_id, { projection: PROJECTIONS.utilizadorResumo }) : null,
+        loader.load('barbearias', marcacao.barbearia_id, { projection: PROJECTIONS.barbeariaResumo }),
+        local_id ? loader.load('locais', local_id, { projection: PROJECTIONS.localResumo }) : null
+      ]);
 
       // Send WhatsApp notification
       try {
-        // Get client info
-        const cliente = await db.collection('utilizadores').findOne({ _id: new ObjectId(decoded.userId) });
-        
-        // Get barbeiro info
-        const barbeiro = await db.collection('utilizadores').findOne({ _id: new ObjectId(barbeiro_id) });
-        
-        // Get barbearia info
-        const barbearia = await db.collection('barbearias').findOne({ 
-          _id: new ObjectId(marcacao.barbearia_id) 
-        });
+        const [cliente, barbeiro, barbearia, local] = await loadNotificationData();
 
         // Get local info if exists
         let localInfo = '';
         if (local_id) {
-          const local = await db.collection('locais').findOne({ _id: new ObjectId(local_id) });
           if (local && local.morada) {
             localInfo = `\n📍 Local: ${local.morada}`;
           }
@@ -637,10 +680,7 @@ Até breve!`;
         const { EmailService } = await import('@/lib/email-service');
         
         // Buscar dados já obtidos acima
-        const cliente = await db.collection('utilizadores').findOne({ _id: new ObjectId(decoded.userId) });
-        const barbeiro = barbeiro_id ? await db.collection('utilizadores').findOne({ _id: new ObjectId(barbeiro_id) }) : null;
-        const barbearia = await db.collection('barbearias').findOne({ _id: new ObjectId(marcacao.barbearia_id) });
-        const local = local_id ? await db.collection('locais').findOne({ _id: new ObjectId(local_id) }) : null;
+        const [cliente, barbeiro, barbearia, local] = await loadNotificationData();
         
         if (cliente?.email) {
           await EmailService.sendBookingConfirmation(cliente.email, {
@@ -669,12 +709,13 @@ Até breve!`;
       const { horarios } = body;
       
       for (const horario of horarios) {
-        await db.collection('horarios_funcionamento').updateOne(
+        await tdb.collection('horarios_funcionamento').updateOne(
           { barbearia_id: decoded.barbearia_id, dia_semana: horario.dia_semana },
           { $set: horario },
           { upsert: true }
         );
       }
+      scheduleRollupScheduleRefresh(db, decoded.barbearia_id);
 
       return NextResponse.json({ success: true });
     }
@@ -727,6 +768,7 @@ Até breve!`;
       };
 
       const result = await db.collection('subscriptions').insertOne(subscription);
+      await refreshEntitlementsForSubscription(db, subscription);
 
       // Send emails (non-blocking)
       try {
@@ -782,6 +824,7 @@ Até breve!`;
           } 
         }
       );
+      await refreshEntitlementsForSubscription(db, subscription);
 
       return NextResponse.json({ message: 'Assinatura cancelada com sucesso' });
     }
@@ -828,6 +871,8 @@ Até breve!`;
         }
       );
 
+      await refreshEntitlementsForSubscription(db, currentSubscription);
+
       return NextResponse.json({ 
         success: true, 
         message: `Plano alterado para ${plano} com sucesso` 
@@ -861,6 +906,8 @@ Até breve!`;
         }
       );
 
+      await refreshEntitlementsForSubscription(db, currentSubscription);
+
       return NextResponse.json({ 
         success: true, 
         message: 'Subscrição cancelada com sucesso' 
@@ -890,6 +937,7 @@ Até breve!`;
         }
       );
 
+      await revalidatePublicBarbearia(db, decoded.barbearia_id);
       return NextResponse.json({ success: true, message: 'Configurações atualizadas' });
     }
 
@@ -930,6 +978,7 @@ Até breve!`;
         { $set: updateData }
       );
 
+      await revalidatePublicBarbearia(db, decoded.barbearia_id);
       return NextResponse.json({ success: true, message: 'Configuração do Stripe guardada com sucesso' });
     }
 
@@ -996,7 +1045,8 @@ Até breve!`;
         criado_em: new Date()
       };
 
-      const result = await db.collection('planos_cliente').insertOne(plano);
+      const result = await tdb.collection('planos_cliente').insertOne(plano);
+      await revalidatePublicBarbearia(db, decoded.barbearia_id);
       return NextResponse.json({ plano: { ...plano, _id: result.insertedId } });
     }
 
@@ -1036,6 +1086,7 @@ Até breve!`;
       };
 
       const result = await db.collection('utilizadores').insertOne(cliente);
+      await indexClienteForBarbearia(db, decoded.barbearia_id, { ...cliente, _id: result.insertedId });
       
       console.log(`[MOCK EMAIL] Novo cliente criado manualmente: ${nome}`);
 
@@ -1064,7 +1115,10 @@ Até breve!`;
       }
 
       // Verificar se o barbeiro existe
-      const barbeiro = await db.collection('utilizadores').findOne({ _id: new ObjectId(barbeiro_id), tipo: 'barbeiro' });
+      const barbeiro = await db.collection('utilizadores').findOne(
+        { _id: new ObjectId(barbeiro_id), tipo: 'barbeiro' },
+        { projection: BARBEIRO_SEM_HORARIO }
+      );
       if (!barbeiro) {
         return NextResponse.json({ error: 'Barbeiro não encontrado' }, { status: 404 });
       }
@@ -1075,13 +1129,14 @@ Até breve!`;
       }
 
       // Verificar se o serviço existe
-      const servico = await db.collection('servicos').findOne({ _id: new ObjectId(servico_id) });
+      const servico = await findAcrossTenants(db, 'servicos', { _id: new ObjectId(servico_id) });
       if (!servico) {
         return NextResponse.json({ error: 'Serviço não encontrado' }, { status: 404 });
       }
 
       // Verificar se o horário está disponível
-      const existingMarcacao = await db.collection('marcacoes').findOne({
+      const marcacaoDb = await getTenantDb(db, decoded.barbearia_id || servico.barbearia_id);
+      const existingMarcacao = await marcacaoDb.collection('marcacoes').findOne({
         barbeiro_id,
         data,
         hora,
@@ -1107,7 +1162,10 @@ Até breve!`;
         atualizado_em: new Date()
       };
 
-      const result = await db.collection('marcacoes').insertOne(marcacao);
+      const result = await marcacaoDb.collection('marcacoes').insertOne(marcacao);
+      scheduleRollupRefresh(marcacaoDb, marcacao.barbearia_id, marcacao.data);
+      await touchCalendarFeeds(marcacaoDb, marcacao);
+      await indexClienteForBarbearia(db, marcacao.barbearia_id, cliente);
 
       // Enviar notificação WhatsApp se configurado
       const barbearia = await db.collection('barbearias').findOne({ _id: new ObjectId(decoded.barbearia_id || servico.barbearia_id) });
@@ -1140,16 +1198,6 @@ Até breve!`;
         return NextResponse.json({ error: 'plano_id e barbearia_id são obrigatórios' }, { status: 400 });
       }
 
-      // Verificar autenticação do cliente
-      const authHeader = request.headers.get('authorization');
-      if (!authHeader) {
-        return NextResponse.json({ error: 'Token necessário' }, { status: 401 });
-      }
-      const decoded = verifyToken(authHeader.replace('Bearer ', ''));
-      if (!decoded) {
-        return NextResponse.json({ error: 'Token inválido' }, { status: 401 });
-      }
-
       // Buscar a barbearia para obter as chaves Stripe
       const barbearia = await db.collection('barbearias').findOne({ _id: new ObjectId(barbearia_id) });
       if (!barbearia) {
@@ -1160,8 +1208,9 @@ Até breve!`;
         return NextResponse.json({ error: 'Esta barbearia ainda não configurou o Stripe' }, { status: 400 });
       }
 
-      // Buscar o plano
-      const plano = await db.collection('planos_cliente').findOne({ _id: new ObjectId(plano_id) });
+      // Buscar o plano (da barbearia do checkout)
+      const barbeariaDb = await getTenantDb(db, barbearia_id);
+      const plano = await barbeariaDb.collection('planos_cliente').findOne({ _id: new ObjectId(plano_id) });
       if (!plano) {
         return NextResponse.json({ error: 'Plano não encontrado' }, { status: 404 });
       }
@@ -1170,7 +1219,7 @@ Até breve!`;
       const cliente = await db.collection('utilizadores').findOne({ _id: new ObjectId(decoded.userId) });
 
       // Criar instância do Stripe com a chave secreta da barbearia
-      const stripe = new Stripe(barbearia.stripe_secret_key);
+      const stripe = await getStripeClient(barbearia.stripe_secret_key);
 
       // Criar sessão de checkout
       const session = await stripe.checkout.sessions.create({
@@ -1248,22 +1297,34 @@ Até breve!`;
 
       // Estrutura do horario_semanal: { 0: {ativo: false}, 1: {ativo: true, inicio: "09:00", fim: "19:00"}, ... }
       // Exceções: [{ data: "2026-01-30", tipo: "folga" }, { data: "2026-01-31", inicio: "09:00", fim: "13:00", motivo: "Só manhã" }]
+      // As exceções ficam em horario_excecoes (ver lib/schedule-exceptions.js)
 
       await db.collection('utilizadores').updateOne(
         { _id: new ObjectId(decoded.userId) },
         { 
           $set: { 
-            horario_trabalho: {
-              horario_semanal: horario_semanal || {},
-              hora_almoco_inicio: hora_almoco_inicio || null,
-              hora_almoco_fim: hora_almoco_fim || null,
-              excepcoes: excepcoes || [],
-              atualizado_em: new Date()
-            }
+            'horario_trabalho.horario_semanal': horario_semanal || {},
+            'horario_trabalho.hora_almoco_inicio': hora_almoco_inicio || null,
+            'horario_trabalho.hora_almoco_fim': hora_almoco_fim || null,
+            'horario_trabalho.atualizado_em': new Date()
           } 
         }
       );
 
+      // O formulário mostra as exceções de hoje em diante (ver GET barbeiro/horarios);
+      // o array antigo, se ainda existir, é migrado antes de ser substituído
+      await migrateBarberExceptionsById(db, decoded.userId);
+      if (Array.isArray(excepcoes)) {
+        await replaceScheduleExceptions(tdb, decoded.userId, decoded.barbearia_id, excepcoes, {
+          desde: new Date().toISOString().split('T')[0]
+        });
+      }
+      // Minutos disponíveis dos dias seguintes, incluindo as exceções guardadas
+      const ultimaExcecao = Array.isArray(excepcoes)
+        ? excepcoes.map(e => e?.data).filter(d => /^\d{4}-\d{2}-\d{2}$/.test(d || '')).sort().pop()
+        : null;
+      scheduleRollupScheduleRefresh(db, decoded.barbearia_id, { ate: ultimaExcecao });
+
       return NextResponse.json({ success: true, message: 'Horários guardados com sucesso' });
     }
 
@@ -1279,20 +1340,21 @@ Até breve!`;
         return NextResponse.json({ error: 'Data e tipo são obrigatórios' }, { status: 400 });
       }
 
-      // tipo: 'folga' (dia inteiro off), 'parcial' (horário diferente), 'extra' (trabalha num dia que normalmente não trabalha)
-      const excecao = {
+      // tipo: 'folga' (dia inteiro off), 'feriado', 'parcial' (horário diferente), 'extra' (trabalha num dia que normalmente não trabalha)
+      if (!isValidException({ data, tipo })) {
+        return NextResponse.json({ error: 'Data ou tipo de exceção inválido' }, { status: 400 });
+      }
+
+      // Uma exceção por dia: uma nova substitui a anterior
+      await migrateBarberExceptionsById(db, decoded.userId);
+      const excecao = await upsertScheduleException(tdb, decoded.userId, decoded.barbearia_id, {
         data,
         tipo,
-        inicio: inicio || null,
-        fim: fim || null,
-        motivo: motivo || '',
-        criado_em: new Date()
-      };
-
-      await db.collection('utilizadores').updateOne(
-        { _id: new ObjectId(decoded.userId) },
-        { $push: { 'horario_trabalho.excepcoes': excecao } }
-      );
+        inicio,
+        fim,
+        motivo
+      });
+      scheduleRollupRefresh(db, decoded.barbearia_id, data);
 
       return NextResponse.json({ success: true, excecao });
     }
@@ -1305,28 +1367,307 @@ Até breve!`;
 
       const { data } = body;
 
-      await db.collection('utilizadores').updateOne(
-        { _id: new ObjectId(decoded.userId) },
-        { $pull: { 'horario_trabalho.excepcoes': { data } } }
-      );
+      await migrateBarberExceptionsById(db, decoded.userId);
+      await removeScheduleException(tdb, decoded.userId, data);
+      scheduleRollupRefresh(db, decoded.barbearia_id, data);
 
       return NextResponse.json({ success: true });
     }
 
+    // CALENDÁRIO - Novo URL do feed .ics (o anterior deixa de funcionar)
+    if (path === 'barbeiro/calendario/regenerar') {
+      if (decoded.tipo !== 'barbeiro') {
+        return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
+      }
+
+      const feed = await rotateCalendarFeed(db, { tipo: 'barbeiro', refId: decoded.userId, barbeariaId: decoded.barbearia_id });
+      return NextResponse.json({ url: calendarFeedUrl(feed), atualizado_em: feed.atualizado_em });
+    }
+
+    if (path.startsWith('locais/') && path.endsWith('/calendario/regenerar')) {
+      if (decoded.tipo !== 'admin' && decoded.tipo !== 'owner') {
+        return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
+      }
+
+      const localId = path.split('/')[1];
+      const local = await tdb.collection('locais').findOne(
+        { _id: new ObjectId(localId), barbearia_id: decoded.barbearia_id },
+        { projection: { _id: 1 } }
+      );
+      if (!local) {
+        return NextResponse.json({ error: 'Local não encontrado' }, { status: 404 });
+      }
+
+      const feed = await rotateCalendarFeed(db, { tipo: 'local', refId: localId, barbeariaId: decoded.barbearia_id });
+      return NextResponse.json({ url: calendarFeedUrl(feed), atualizado_em: feed.atualizado_em });
+    }
+
     return NextResponse.json({ error: 'Rota não encontrada' }, { status: 404 });
 
   } catch (error) {
     console.error('API Error:', error);
-    return NextResponse.json({ error: error.message }, { status: 500 });
+    return NextResponse.json({ error: error.message }, { status: error.status || 500 });
+  }
+}
+
+// ==================== LEITURAS PARTILHADAS ====================
+// Usadas pelas rotas individuais e pelo GET admin/bootstrap, para que as
+// duas devolvam exatamente os mesmos dados. As que recebem barbeariaId leem
+// as coleções da barbearia através do TenantDb (getTenantDb é idempotente).
+
+// Soma de uma contagem na base partilhada e nas bases dedicadas
+async function sumAcrossTenants(db, count) {
+  const totais = await Promise.all((await tenantDatabases(db)).map(count));
+  return totais.reduce((a, b) => a + b, 0);
+}
+
+async function getCurrentUser(db, decoded) {
+  return db.collection('utilizadores').findOne(
+    { _id: new ObjectId(decoded.userId) },
+    { projection: { password: 0 } }
+  );
+}
+
+async function listBarbeiros(db, barbeariaId) {
+  const barbeiros = await db.collection('utilizadores')
+    .find({ barbearia_id: barbeariaId, tipo: 'barbeiro' })
+    .project(BARBEIRO_SEM_HORARIO)
+    .toArray();
+
+  // Adicionar informações do local a cada barbeiro
+  const loader = getLoader(await getTenantDb(db, barbeariaId));
+  return Promise.all(
+    barbeiros.map(async (barbeiro) => {
+      if (barbeiro.local_id) {
+        const local = await loader.load('locais', barbeiro.local_id, { projection: PROJECTIONS.localResumo });
+        return { ...barbeiro, local };
+      }
+      return { ...barbeiro, local: null };
+    })
+  );
+}
+
+async function listServicos(db, barbeariaId) {
+  const tenantDb = await getTenantDb(db, barbeariaId);
+  return tenantDb.collection('servicos').find({ barbearia_id: barbeariaId }).toArray();
+}
+
+async function listProdutos(db, barbeariaId) {
+  const tenantDb = await getTenantDb(db, barbeariaId);
+  return tenantDb.collection('produtos').find({ barbearia_id: barbeariaId }).toArray();
+}
+
+async function listPlanosCliente(db, barbeariaId) {
+  const tenantDb = await getTenantDb(db, barbeariaId);
+  return tenantDb.collection('planos_cliente').find({ barbearia_id: barbeariaId }).toArray();
+}
+
+async function listHorarios(db, barbeariaId) {
+  const tenantDb = await getTenantDb(db, barbeariaId);
+  return tenantDb.collection('horarios_funcionamento').find({ barbearia_id: barbeariaId }).toArray();
+}
+
+async function getBarbeariaSettings(db, barbeariaId) {
+  const barbearia = await db.collection('barbearias').findOne({
+    _id: new ObjectId(barbeariaId)
+  });
+
+  if (!barbearia) {
+    return { barbearia: null, subscription: null };
   }
+
+  // Buscar subscription por barbearia_id
+  let subscription = await db.collection('subscriptions').findOne({
+    barbearia_id: barbeariaId,
+    status: { $in: ['active', 'trialing'] }
+  });
+
+  // Fallback: buscar por user_id se owner_id existir
+  if (!subscription && barbearia.owner_id) {
+    subscription = await db.collection('subscriptions').findOne({
+      user_id: barbearia.owner_id,
+      status: { $in: ['active', 'trialing'] }
+    });
+  }
+
+  return { barbearia, subscription };
 }
 
-export async function GET(request, { params }) {
+async function listLocais(db, barbeariaId) {
+  const tenantDb = await getTenantDb(db, barbeariaId);
+  const locais = await tenantDb.collection('locais')
+    .find({ barbearia_id: barbeariaId, ativo: { $ne: false } })
+    .sort({ criado_em: 1 })
+    .toArray();
+
+  // Adicionar contagem de barbeiros por local
+  return Promise.all(
+    locais.map(async (local) => {
+      const totalBarbeiros = await db.collection('utilizadores').countDocuments({
+        barbearia_id: barbeariaId,
+        tipo: 'barbeiro',
+        local_id: local._id.toString(),
+        ativo: { $ne: false }
+      });
+      return { ...local, totalBarbeiros };
+    })
+  );
+}
+
+async function listSuporteTickets(db, decoded, status) {
+  let query = {};
+
+  // Super admin vê todos os tickets
+  if (decoded.tipo === 'super_admin') {
+    // Pode filtrar por status
+    if (status && status !== 'todos') {
+      query.status = status;
+    }
+  } else {
+    // Outros utilizadores veem apenas os seus tickets
+    query.user_id = decoded.userId;
+  }
+
+  return db.collection('suporte_tickets')
+    .find(query)
+    .sort({ criado_em: -1 })
+    .toArray();
+}
+
+// de/ate (YYYY-MM-DD) filtram pela data; o arquivo frio só é consultado com
+// arquivo=true ou quando o intervalo começa antes do horizonte de arquivo
+async function listMarcacoes(db, decoded, { de, ate, arquivo = false } = {}) {
+  let query = {};
+
+  if (decoded.tipo === 'cliente') {
+    query.cliente_id = decoded.userId;
+  } else if (decoded.tipo === 'barbeiro') {
+    query.barbeiro_id = decoded.userId;
+  } else if (decoded.tipo === 'admin' || decoded.tipo === 'owner') {
+    query.barbearia_id = decoded.barbearia_id;
+  }
+
+  if (de || ate) {
+    query.data = {};
+    if (de) query.data.$gte = de;
+    if (ate) query.data.$lte = ate;
+  }
+
+  // Cliente (e super admin) vê marcações de todas as barbearias: base
+  // partilhada e bases dedicadas; os restantes só a da sua barbearia
+  const databases = decoded.barbearia_id && decoded.tipo !== 'cliente'
+    ? [await getTenantDb(db, decoded.barbearia_id)]
+    : await tenantDatabases(db);
+
+  const porBase = await Promise.all(databases.map(async (database) => {
+    const marcacoes = await findMarcacoes(database, query, {
+      includeArchive: arquivo || rangeNeedsArchive(de)
+    });
+
+    // Os load() de todas as marcações juntam-se numa query por coleção
+    const loader = getLoader(database);
+    return Promise.all(
+      marcacoes.map(async (m) => {
+        const [cliente, barbeiro, servico, local] = await Promise.all([
+          loader.load('utilizadores', m.cliente_id, { projection: PROJECTIONS.clienteMarcacao }),
+          loader.load('utilizadores', m.barbeiro_id, { projection: PROJECTIONS.utilizadorResumo }),
+          loader.load('servicos', m.servico_id, { projection: PROJECTIONS.servicoResumo }),
+          m.local_id ? loader.load('locais', m.local_id, { projection: PROJECTIONS.localResumo }) : null
+        ]);
+
+        return {
+          ...m,
+          cliente,
+          barbeiro,
+          servico,
+          local
+        };
+      })
+    );
+  }));
+
+  if (porBase.length === 1) return porBase[0];
+  const marcacoesComDetalhes = porBase.flat().sort((a, b) =>
+    (b.data || '').localeCompare(a.data || '') || (b.hora || '').localeCompare(a.hora || '')
+  );
+  return marcacoesComDetalhes;
+}
+
+// Com historicoCompleto, as estatísticas incluem as marcações arquivadas
+async function listClientesComStats(db, barbeariaId, { historicoCompleto = false } = {}) {
+  db = await getTenantDb(db, barbeariaId);
+  // Buscar TODOS os clientes registrados nesta barbearia (não apenas os com marcações)
+  const todosClientes = await db.collection('utilizadores')
+    .find({ 
+      barbearia_id: barbeariaId, 
+      tipo: 'cliente'
+    })
+    .project({ password: 0 })
+    .toArray();
+
+  // Também buscar clientes que fizeram marcações (podem não ter barbearia_id definido)
+  const marcacoes = await findMarcacoes(db, { barbearia_id: barbeariaId }, {
+    includeArchive: historicoCompleto
+  });
+
+  const clienteIdsComMarcacoes = [...new Set(marcacoes.map(m => m.cliente_id))];
+
+  // Buscar clientes que têm marcações mas podem não ter barbearia_id
+  const clientesComMarcacoes = await db.collection('utilizadores')
+    .find({ 
+      _id: { $in: clienteIdsComMarcacoes.map(id => {
+        try { return new ObjectId(id); } catch { return null; }
+      }).filter(id => id !== null) },
+      tipo: 'cliente'
+    })
+    .project({ password: 0 })
+    .toArray();
+
+  // Combinar listas sem duplicatas
+  const clientesMap = new Map();
+  todosClientes.forEach(c => clientesMap.set(c._id.toString(), c));
+  clientesComMarcacoes.forEach(c => clientesMap.set(c._id.toString(), c));
+
+  const clientes = Array.from(clientesMap.values());
+
+  // Adicionar estatísticas de cada cliente
+  const loader = getLoader(db);
+  const clientesComStats = await Promise.all(
+    clientes.map(async (cliente) => {
+      const clienteMarcacoes = await findMarcacoes(db, {
+        cliente_id: cliente._id.toString(),
+        barbearia_id: barbeariaId
+      }, { includeArchive: historicoCompleto });
+
+      const totalGasto = await Promise.all(
+        clienteMarcacoes
+          .filter(m => m.status === 'concluida')
+          .map(async (m) => {
+            const servico = await loader.load('servicos', m.servico_id, { projection: PROJECTIONS.servicoResumo });
+            return servico ? servico.preco : 0;
+          })
+      );
+
+      return {
+        ...cliente,
+        total_marcacoes: clienteMarcacoes.length,
+        marcacoes_concluidas: clienteMarcacoes.filter(m => m.status === 'concluida').length,
+        total_gasto: totalGasto.reduce((a, b) => a + b, 0),
+        ultima_visita: clienteMarcacoes.length > 0 
+          ? clienteMarcacoes.sort((a, b) => new Date(b.data) - new Date(a.data))[0].data
+          : null
+      };
+    })
+  );
+  return clientesComStats;
+}
+
+async function handleGET(request, { params }) {
   try {
     const path = params?.path ? params.path.join('/') : '';
     const { searchParams } = new URL(request.url);
     const client = await connectToDatabase();
-    const db = client.db(process.env.DB_NAME);
+    const db = client.db(DB_NAME);
 
     // Public routes
     // GET Available Plans (public - no auth required)
@@ -1389,59 +1730,19 @@ export async function GET(request, { params }) {
         }
       ];
 
-      return NextResponse.json({ plans });
+      return cachedJson(request, { plans }, { cacheControl: CACHE_POLICIES.static });
     }
 
     // GET Barbearia by slug (public)
     if (path.startsWith('barbearias/')) {
       const slug = path.split('/')[1];
-      const barbearia = await db.collection('barbearias').findOne({ slug });
-      
-      if (!barbearia) {
+      const data = await loadPublicBarbearia(db, slug);
+
+      if (!data) {
         return NextResponse.json({ error: 'Barbearia não encontrada' }, { status: 404 });
       }
 
-      const servicos = await db.collection('servicos')
-        .find({ barbearia_id: barbearia._id.toString() })
-        .toArray();
-
-      const produtos = await db.collection('produtos')
-        .find({ barbearia_id: barbearia._id.toString() })
-        .toArray();
-
-      // Buscar planos de cliente (para assinaturas dos clientes)
-      const planos = await db.collection('planos_cliente')
-        .find({ barbearia_id: barbearia._id.toString(), ativo: { $ne: false } })
-        .toArray();
-
-      // Buscar locais ativos
-      const locais = await db.collection('locais')
-        .find({ barbearia_id: barbearia._id.toString(), ativo: { $ne: false } })
-        .toArray();
-
-      // Buscar apenas barbeiros ativos
-      const barbeiros = await db.collection('utilizadores')
-        .find({ barbearia_id: barbearia._id.toString(), tipo: 'barbeiro', ativo: { $ne: false } })
-        .project({ password: 0 })
-        .toArray();
-
-      // Adicionar informações do local a cada barbeiro
-      const barbeirosComLocal = barbeiros.map(barbeiro => {
-        if (barbeiro.local_id) {
-          const local = locais.find(l => l._id.toString() === barbeiro.local_id);
-          return { ...barbeiro, local: local ? { _id: local._id, nome: local.nome } : null };
-        }
-        return { ...barbeiro, local: null };
-      });
-
-      return NextResponse.json({
-        barbearia,
-        servicos,
-        produtos,
-        planos,
-        locais,
-        barbeiros: barbeirosComLocal
-      });
+      return cachedJson(request, data, { cacheControl: CACHE_POLICIES.publicTenant });
     }
 
     // GET Planos - Rota pública para obter todos os planos do SaaS
@@ -1450,87 +1751,146 @@ export async function GET(request, { params }) {
         .find({ ativo: true })
         .toArray();
 
-      return NextResponse.json({ planos });
+      return cachedJson(request, { planos }, { cacheControl: CACHE_POLICIES.publicTenant });
     }
 
     // Protected routes
-    const authHeader = request.headers.get('authorization');
-    if (!authHeader || !authHeader.startsWith('Bearer ')) {
+    const auth = getAuthContext(request);
+    if (!auth) {
       return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
     }
 
-    const token = authHeader.substring(7);
-    const decoded = verifyToken(token);
+    const { decoded } = auth;
     if (!decoded) {
       return NextResponse.json({ error: 'Token inválido' }, { status: 401 });
     }
 
+    // Coleções da barbearia do token (lib/tenant-db.js)
+    const tdb = decoded.barbearia_id ? await getTenantDb(db, decoded.barbearia_id) : db;
+
     // GET Current User
     if (path === 'auth/me') {
-      const user = await db.collection('utilizadores').findOne(
-        { _id: new ObjectId(decoded.userId) },
-        { projection: { password: 0 } }
-      );
+      // ?source=token: responder com as claims do token, lendo do utilizador só
+      // a sessao_versao (suficiente para guards de navegação e navbar)
+      if (searchParams.get('source') === 'token') {
+        const current = await db.collection('utilizadores').findOne(
+          { _id: new ObjectId(decoded.userId) },
+          { projection: SESSION_VERSION_PROJECTION }
+        );
+        const claimsUser = userFromClaims(decoded, current);
+        if (claimsUser) {
+          return NextResponse.json({ user: claimsUser, source: 'token' });
+        }
+      }
+
+      const user = await getCurrentUser(db, decoded);
       return NextResponse.json({ user });
     }
 
-    // GET Barbeiros (Admin)
-    if (path === 'barbeiros') {
-      const barbeiros = await db.collection('utilizadores')
-        .find({ barbearia_id: decoded.barbearia_id, tipo: 'barbeiro' })
-        .project({ password: 0 })
-        .toArray();
+    // GET Bootstrap do painel admin: todas as leituras iniciais num só pedido.
+    // ?sections=barbeiros,servicos limita as secções devolvidas.
+    if (path === 'admin/bootstrap') {
+      const user = await getCurrentUser(db, decoded);
+      if (!user) {
+        return NextResponse.json({ error: 'Utilizador não encontrado' }, { status: 404 });
+      }
+
+      // Email por confirmar: o painel só precisa do utilizador
+      if (user.email_confirmado === false) {
+        return NextResponse.json({ user });
+      }
+
+      if (user.tipo !== 'admin' && user.tipo !== 'owner') {
+        return NextResponse.json({ error: 'Acesso negado', tipo: user.tipo }, { status: 403 });
+      }
+
+      const barbeariaId = decoded.barbearia_id;
+      const readers = {
+        barbeiros: async () => (await listBarbeiros(db, barbeariaId)).map(toBarbeiroDTO),
+        servicos: () => listServicos(db, barbeariaId),
+        produtos: () => listProdutos(db, barbeariaId),
+        marcacoes: async () => (await listMarcacoes(db, decoded)).map(toMarcacaoDTO),
+        horarios: () => listHorarios(db, barbeariaId),
+        settings: () => getBarbeariaSettings(db, barbeariaId),
+        clientes: async () => (await listClientesComStats(db, barbeariaId)).map(toClienteDTO),
+        planos: () => listPlanosCliente(db, barbeariaId),
+        locais: () => listLocais(db, barbeariaId),
+        tickets: () => listSuporteTickets(db, decoded)
+      };
+
+      const sectionsParam = searchParams.get('sections');
+      const sections = sectionsParam
+        ? sectionsParam.split(',').map(s => s.trim()).filter(Boolean)
+        : Object.keys(readers);
+
+      const invalidas = sections.filter(s => !readers[s]);
+      if (invalidas.length > 0) {
+        return NextResponse.json(
+          { error: `Secções inválidas: ${invalidas.join(', ')}` },
+          { status: 400 }
+        );
+      }
+
+      // Uma falha numa secção não invalida as restantes
+      const results = await Promise.allSettled(sections.map(s => readers[s]()));
 
-      // Adicionar informações do local a cada barbeiro
-      const barbeirosComLocal = await Promise.all(
-        barbeiros.map(async (barbeiro) => {
-          if (barbeiro.local_id) {
-            const local = await db.collection('locais').findOne(
-              { _id: new ObjectId(barbeiro.local_id) },
-              { projection: { nome: 1, morada: 1 } }
-            );
-            return { ...barbeiro, local };
+      const payload = { user };
+      const errors = {};
+      results.forEach((result, i) => {
+        const section = sections[i];
+        if (result.status === 'fulfilled') {
+          if (section === 'settings') {
+            payload.barbearia = result.value.barbearia;
+            payload.subscription = result.value.subscription;
+          } else {
+            payload[section] = result.value;
           }
-          return { ...barbeiro, local: null };
-        })
-      );
+        } else {
+          console.error(`Bootstrap admin: erro na secção ${section}:`, result.reason);
+          errors[section] = 'Erro ao carregar';
+        }
+      });
+
+      if (Object.keys(errors).length > 0) {
+        payload.errors = errors;
+      }
+
+      return jsonResponse(request, payload);
+    }
 
-      return NextResponse.json({ barbeiros: barbeirosComLocal });
+    // GET Barbeiros (Admin)
+    if (path === 'barbeiros') {
+      const barbeiros = await listBarbeiros(db, decoded.barbearia_id);
+      return jsonResponse(request, {
+        barbeiros: applyFields(barbeiros.map(toBarbeiroDTO), parseFields(searchParams.get('fields')))
+      });
     }
 
     // GET Serviços
     if (path === 'servicos') {
       const barbeariaId = searchParams.get('barbearia_id') || decoded.barbearia_id;
-      const servicos = await db.collection('servicos')
-        .find({ barbearia_id: barbeariaId })
-        .toArray();
-      return NextResponse.json({ servicos });
+      const servicos = await listServicos(db, barbeariaId);
+      return cachedJson(request, { servicos: applyFields(servicos, parseFields(searchParams.get('fields'))) });
     }
 
     // GET Produtos
     if (path === 'produtos') {
       const barbeariaId = searchParams.get('barbearia_id') || decoded.barbearia_id;
-      const produtos = await db.collection('produtos')
-        .find({ barbearia_id: barbeariaId })
-        .toArray();
-      return NextResponse.json({ produtos });
+      const produtos = await listProdutos(db, barbeariaId);
+      return cachedJson(request, { produtos: applyFields(produtos, parseFields(searchParams.get('fields'))) });
     }
 
     // GET Planos Cliente
     if (path === 'planos-cliente') {
       const barbeariaId = searchParams.get('barbearia_id') || decoded.barbearia_id;
-      const planos = await db.collection('planos_cliente')
-        .find({ barbearia_id: barbeariaId })
-        .toArray();
+      const planos = await listPlanosCliente(db, barbeariaId);
       return NextResponse.json({ planos });
     }
 
     // GET Horários da Barbearia
     if (path === 'horarios') {
-      const horarios = await db.collection('horarios_funcionamento')
-        .find({ barbearia_id: decoded.barbearia_id })
-        .toArray();
-      return NextResponse.json({ horarios });
+      const horarios = await listHorarios(db, decoded.barbearia_id);
+      return cachedJson(request, { horarios });
     }
 
     // GET Horários do Barbeiro (individual)
@@ -1543,13 +1903,18 @@ export async function GET(request, { params }) {
       
       const barbeiro = await db.collection('utilizadores').findOne(
         { _id: new ObjectId(barbeiroId) },
-        { projection: { horario_trabalho: 1, nome: 1 } }
+        { projection: { ...WORKING_HOURS_PROJECTION, nome: 1 } }
       );
 
       if (!barbeiro) {
         return NextResponse.json({ error: 'Barbeiro não encontrado' }, { status: 404 });
       }
 
+      // Exceções ainda no array antigo passam para horario_excecoes antes de as listar
+      await migrateBarberExceptions(db, barbeiro);
+      const { excepcoes: _embebidas, ...horarioTrabalho } = barbeiro.horario_trabalho || {};
+      const excepcoes = await listScheduleExceptions(tdb, { barbeiroId, de: new Date().toISOString().split('T')[0] });
+
       // Se não tem horário definido, retornar horário padrão
       const horarioPadrao = {
         horario_semanal: {
@@ -1567,11 +1932,41 @@ export async function GET(request, { params }) {
       };
 
       return NextResponse.json({ 
-        horario: barbeiro.horario_trabalho || horarioPadrao,
+        horario: barbeiro.horario_trabalho ? { ...horarioTrabalho, excepcoes } : { ...horarioPadrao, excepcoes },
         barbeiro_nome: barbeiro.nome
       });
     }
 
+    // GET URL do feed .ics da agenda do barbeiro (ver lib/calendar-feeds.js)
+    if (path === 'barbeiro/calendario') {
+      if (decoded.tipo !== 'barbeiro') {
+        return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
+      }
+
+      const feed = await getOrCreateCalendarFeed(db, { tipo: 'barbeiro', refId: decoded.userId, barbeariaId: decoded.barbearia_id });
+      return NextResponse.json({ url: calendarFeedUrl(feed), atualizado_em: feed.atualizado_em });
+    }
+
+    // GET Exceções de horário num intervalo (vistas de calendário)
+    // ?de=YYYY-MM-DD&ate=YYYY-MM-DD[&barbeiro_id=...]; admin sem barbeiro_id = toda a barbearia
+    if (path === 'barbeiro/horarios/excecoes') {
+      if (decoded.tipo !== 'barbeiro' && decoded.tipo !== 'admin' && decoded.tipo !== 'owner') {
+        return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
+      }
+
+      const de = searchParams.get('de');
+      const ate = searchParams.get('ate');
+      if (!de || !ate || de > ate) {
+        return NextResponse.json({ error: 'Intervalo de datas inválido' }, { status: 400 });
+      }
+
+      // Barbeiro: só as suas; admin/owner: as da sua barbearia
+      const excepcoes = await listScheduleExceptions(tdb, decoded.tipo === 'barbeiro'
+        ? { barbeiroId: decoded.userId, de, ate }
+        : { barbeiroId: searchParams.get('barbeiro_id'), barbeariaId: decoded.barbearia_id, de, ate });
+      return NextResponse.json({ excepcoes });
+    }
+
     // GET Subscription Status
     if (path === 'subscriptions/status') {
       const subscription = await db.collection('subscriptions').findOne({
@@ -1616,28 +2011,12 @@ export async function GET(request, { params }) {
         return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
       }
 
-      const barbearia = await db.collection('barbearias').findOne({
-        _id: new ObjectId(decoded.barbearia_id)
-      });
+      const { barbearia, subscription } = await getBarbeariaSettings(db, decoded.barbearia_id);
 
       if (!barbearia) {
         return NextResponse.json({ error: 'Barbearia não encontrada' }, { status: 404 });
       }
 
-      // Buscar subscription por barbearia_id
-      let subscription = await db.collection('subscriptions').findOne({
-        barbearia_id: decoded.barbearia_id,
-        status: { $in: ['active', 'trialing'] }
-      });
-
-      // Fallback: buscar por user_id se owner_id existir
-      if (!subscription && barbearia.owner_id) {
-        subscription = await db.collection('subscriptions').findOne({
-          user_id: barbearia.owner_id,
-          status: { $in: ['active', 'trialing'] }
-        });
-      }
-
       return NextResponse.json({ 
         barbearia,
         subscription 
@@ -1650,12 +2029,18 @@ export async function GET(request, { params }) {
         return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
       }
 
-      const subscription = await db.collection('subscriptions').findOne({
-        barbearia_id: decoded.barbearia_id,
-        status: { $in: ['active', 'trialing'] }
-      });
+      const [subscription, entitlements] = await Promise.all([
+        db.collection('subscriptions').findOne({
+          barbearia_id: decoded.barbearia_id,
+          status: { $in: ['active', 'trialing'] }
+        }),
+        getEntitlements(db, barbeariaKey(decoded.barbearia_id))
+      ]);
 
-      return NextResponse.json({ subscription });
+      return NextResponse.json({
+        subscription,
+        entitlements: { limits: entitlements.limits, usage: entitlements.usage }
+      });
     }
 
     // ==================== LOCAIS (Múltiplas Localizações) ====================
@@ -1666,49 +2051,33 @@ export async function GET(request, { params }) {
         return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
       }
 
-      const locais = await db.collection('locais')
-        .find({ barbearia_id: decoded.barbearia_id, ativo: { $ne: false } })
-        .sort({ criado_em: 1 })
-        .toArray();
-
-      // Adicionar contagem de barbeiros por local
-      const locaisComStats = await Promise.all(
-        locais.map(async (local) => {
-          const totalBarbeiros = await db.collection('utilizadores').countDocuments({
-            barbearia_id: decoded.barbearia_id,
-            tipo: 'barbeiro',
-            local_id: local._id.toString(),
-            ativo: { $ne: false }
-          });
-          return { ...local, totalBarbeiros };
-        })
-      );
-
-      return NextResponse.json({ locais: locaisComStats });
+      const locais = await listLocais(db, decoded.barbearia_id);
+      return cachedJson(request, { locais });
     }
 
     // GET Suporte Tickets
     if (path === 'suporte') {
-      let query = {};
-      
-      // Super admin vê todos os tickets
-      if (decoded.tipo === 'super_admin') {
-        // Pode filtrar por status
-        const status = searchParams.get('status');
-        if (status && status !== 'todos') {
-          query.status = status;
-        }
-      } else {
-        // Outros utilizadores veem apenas os seus tickets
-        query.user_id = decoded.userId;
+      const tickets = await listSuporteTickets(db, decoded, searchParams.get('status'));
+      return NextResponse.json({ tickets });
+    }
+
+    // GET URL do feed .ics da agenda de um local (ver lib/calendar-feeds.js)
+    if (path.startsWith('locais/') && path.endsWith('/calendario')) {
+      if (decoded.tipo !== 'admin' && decoded.tipo !== 'owner') {
+        return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
       }
 
-      const tickets = await db.collection('suporte_tickets')
-        .find(query)
-        .sort({ criado_em: -1 })
-        .toArray();
+      const localId = path.split('/')[1];
+      const local = await tdb.collection('locais').findOne(
+        { _id: new ObjectId(localId), barbearia_id: decoded.barbearia_id },
+        { projection: { _id: 1 } }
+      );
+      if (!local) {
+        return NextResponse.json({ error: 'Local não encontrado' }, { status: 404 });
+      }
 
-      return NextResponse.json({ tickets });
+      const feed = await getOrCreateCalendarFeed(db, { tipo: 'local', refId: localId, barbeariaId: decoded.barbearia_id });
+      return NextResponse.json({ url: calendarFeedUrl(feed), atualizado_em: feed.atualizado_em });
     }
 
     // GET Local por ID
@@ -1719,7 +2088,7 @@ export async function GET(request, { params }) {
         return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
       }
 
-      const local = await db.collection('locais').findOne({
+      const local = await tdb.collection('locais').findOne({
         _id: new ObjectId(localId),
         barbearia_id: decoded.barbearia_id
       });
@@ -1742,78 +2111,34 @@ export async function GET(request, { params }) {
       return NextResponse.json({ local, barbeiros });
     }
 
-    // GET Clientes (CRM)
-    if (path === 'clientes') {
+    // GET Pesquisa de clientes (typeahead do CRM e das marcações manuais)
+    if (path === 'clientes/search') {
       if (decoded.tipo !== 'admin' && decoded.tipo !== 'barbeiro' && decoded.tipo !== 'owner') {
         return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
       }
 
-      // Buscar TODOS os clientes registrados nesta barbearia (não apenas os com marcações)
-      const todosClientes = await db.collection('utilizadores')
-        .find({ 
-          barbearia_id: decoded.barbearia_id, 
-          tipo: 'cliente'
-        })
-        .project({ password: 0 })
-        .toArray();
-
-      // Também buscar clientes que fizeram marcações (podem não ter barbearia_id definido)
-      const marcacoes = await db.collection('marcacoes')
-        .find({ barbearia_id: decoded.barbearia_id })
-        .toArray();
-
-      const clienteIdsComMarcacoes = [...new Set(marcacoes.map(m => m.cliente_id))];
-
-      // Buscar clientes que têm marcações mas podem não ter barbearia_id
-      const clientesComMarcacoes = await db.collection('utilizadores')
-        .find({ 
-          _id: { $in: clienteIdsComMarcacoes.map(id => {
-            try { return new ObjectId(id); } catch { return null; }
-          }).filter(id => id !== null) },
-          tipo: 'cliente'
-        })
-        .project({ password: 0 })
-        .toArray();
-
-      // Combinar listas sem duplicatas
-      const clientesMap = new Map();
-      todosClientes.forEach(c => clientesMap.set(c._id.toString(), c));
-      clientesComMarcacoes.forEach(c => clientesMap.set(c._id.toString(), c));
-      
-      const clientes = Array.from(clientesMap.values());
-
-      // Adicionar estatísticas de cada cliente
-      const clientesComStats = await Promise.all(
-        clientes.map(async (cliente) => {
-          const clienteMarcacoes = await db.collection('marcacoes')
-            .find({ 
-              cliente_id: cliente._id.toString(),
-              barbearia_id: decoded.barbearia_id 
-            })
-            .toArray();
-
-          const totalGasto = await Promise.all(
-            clienteMarcacoes
-              .filter(m => m.status === 'concluida')
-              .map(async (m) => {
-                const servico = await db.collection('servicos').findOne({ _id: new ObjectId(m.servico_id) });
-                return servico ? servico.preco : 0;
-              })
-          );
+      const q = searchParams.get('q') || '';
+      let clientes = await searchClientes(db, decoded.barbearia_id, q, {
+        limit: parseSearchLimit(searchParams.get('limit'))
+      });
+      if (searchParams.get('stats') === 'true') {
+        clientes = await attachClienteStats(db, decoded.barbearia_id, clientes);
+      }
+      return jsonResponse(request, { clientes: applyFields(clientes, parseFields(searchParams.get('fields'))) });
+    }
 
-          return {
-            ...cliente,
-            total_marcacoes: clienteMarcacoes.length,
-            marcacoes_concluidas: clienteMarcacoes.filter(m => m.status === 'concluida').length,
-            total_gasto: totalGasto.reduce((a, b) => a + b, 0),
-            ultima_visita: clienteMarcacoes.length > 0 
-              ? clienteMarcacoes.sort((a, b) => new Date(b.data) - new Date(a.data))[0].data
-              : null
-          };
-        })
-      );
+    // GET Clientes (CRM)
+    if (path === 'clientes') {
+      if (decoded.tipo !== 'admin' && decoded.tipo !== 'barbeiro' && decoded.tipo !== 'owner') {
+        return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
+      }
 
-      return NextResponse.json({ clientes: clientesComStats });
+      const clientes = await listClientesComStats(db, decoded.barbearia_id, {
+        historicoCompleto: searchParams.get('historico') === 'completo'
+      });
+      return jsonResponse(request, {
+        clientes: applyFields(clientes.map(toClienteDTO), parseFields(searchParams.get('fields')))
+      });
     }
 
     // GET Planos Cliente (para barbearia)
@@ -1822,7 +2147,7 @@ export async function GET(request, { params }) {
         return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
       }
 
-      const planos = await db.collection('planos_cliente')
+      const planos = await tdb.collection('planos_cliente')
         .find({ barbearia_id: decoded.barbearia_id })
         .toArray();
 
@@ -1849,19 +2174,21 @@ export async function GET(request, { params }) {
       const totalClientes = await db.collection('utilizadores').countDocuments({ tipo: 'cliente' });
       const totalOwners = await db.collection('utilizadores').countDocuments({ tipo: 'owner' });
 
-      // Total de marcações
-      const totalMarcacoes = await db.collection('marcacoes').countDocuments();
-      const marcacoesPendentes = await db.collection('marcacoes').countDocuments({ status: 'pendente' });
-      const marcacoesAceitas = await db.collection('marcacoes').countDocuments({ status: 'aceita' });
-      const marcacoesConcluidas = await db.collection('marcacoes').countDocuments({ status: 'concluida' });
-      const marcacoesCanceladas = await db.collection('marcacoes').countDocuments({ status: { $in: ['cancelada', 'rejeitada'] } });
+      // Total de marcações (totais de sempre incluem o arquivo; pendentes e
+      // aceites nunca são arquivadas)
+      // (somadas na base partilhada e nas dedicadas)
+      const totalMarcacoes = await sumAcrossTenants(db, d => countMarcacoes(d, {}, { includeArchive: true }));
+      const marcacoesPendentes = await sumAcrossTenants(db, d => d.collection('marcacoes').countDocuments({ status: 'pendente' }));
+      const marcacoesAceitas = await sumAcrossTenants(db, d => d.collection('marcacoes').countDocuments({ status: 'aceita' }));
+      const marcacoesConcluidas = await sumAcrossTenants(db, d => countMarcacoes(d, { status: 'concluida' }, { includeArchive: true }));
+      const marcacoesCanceladas = await sumAcrossTenants(db, d => countMarcacoes(d, { status: { $in: ['cancelada', 'rejeitada'] } }, { includeArchive: true }));
 
       // Marcações dos últimos 7 dias
       const seteDiasAtras = new Date();
       seteDiasAtras.setDate(seteDiasAtras.getDate() - 7);
-      const marcacoesUltimos7Dias = await db.collection('marcacoes').countDocuments({
+      const marcacoesUltimos7Dias = await sumAcrossTenants(db, d => d.collection('marcacoes').countDocuments({
         criado_em: { $gte: seteDiasAtras }
-      });
+      }));
 
       // Novas barbearias nos últimos 30 dias
       const trintaDiasAtras = new Date();
@@ -1926,7 +2253,7 @@ export async function GET(request, { params }) {
       const barbeariasComDados = await Promise.all(
         barbearias.map(async (b) => {
           const totalUtilizadores = await db.collection('utilizadores').countDocuments({ barbearia_id: b._id.toString() });
-          const totalMarcacoes = await db.collection('marcacoes').countDocuments({ barbearia_id: b._id.toString() });
+          const totalMarcacoes = await countMarcacoes(await getTenantDb(db, b._id.toString()), { barbearia_id: b._id.toString() }, { includeArchive: true });
           
           // Buscar subscription - primeiro por barbearia_id, depois por user_id do owner
           let subscription = await db.collection('subscriptions').findOne({ barbearia_id: b._id.toString() });
@@ -1975,13 +2302,14 @@ export async function GET(request, { params }) {
         .project({ password: 0 })
         .toArray();
 
-      const marcacoes = await db.collection('marcacoes')
+      const barbeariaDb = await getTenantDb(db, barbeariaId);
+      const marcacoes = await barbeariaDb.collection('marcacoes')
         .find({ barbearia_id: barbeariaId })
         .sort({ data: -1 })
         .limit(50)
         .toArray();
 
-      const servicos = await db.collection('servicos')
+      const servicos = await barbeariaDb.collection('servicos')
         .find({ barbearia_id: barbeariaId })
         .toArray();
 
@@ -2003,21 +2331,24 @@ export async function GET(request, { params }) {
         return NextResponse.json({ error: 'Acesso negado. Apenas super_admin.' }, { status: 403 });
       }
 
-      // Últimas marcações
-      const ultimasMarcacoes = await db.collection('marcacoes')
+      // Últimas marcações (as 20 mais recentes de cada base, juntas)
+      const porBase = await Promise.all((await tenantDatabases(db)).map(d => d.collection('marcacoes')
         .find({})
         .sort({ criado_em: -1 })
         .limit(20)
-        .toArray();
+        .toArray()));
+      const ultimasMarcacoes = porBase.flat()
+        .sort((a, b) => new Date(b.criado_em) - new Date(a.criado_em))
+        .slice(0, 20);
 
       // Enriquecer com dados
+      const loader = getLoader(db);
       const marcacoesComDados = await Promise.all(
         ultimasMarcacoes.map(async (m) => {
-          const barbearia = await db.collection('barbearias').findOne({ _id: new ObjectId(m.barbearia_id) });
-          const cliente = await db.collection('utilizadores').findOne(
-            { _id: new ObjectId(m.cliente_id) },
-            { projection: { nome: 1, email: 1 } }
-          );
+          const [barbearia, cliente] = await Promise.all([
+            loader.load('barbearias', m.barbearia_id, { projection: PROJECTIONS.barbeariaResumo }),
+            loader.load('utilizadores', m.cliente_id, { projection: PROJECTIONS.utilizadorContacto })
+          ]);
           return {
             ...m,
             barbearia_nome: barbearia?.nome,
@@ -2040,58 +2371,47 @@ export async function GET(request, { params }) {
       });
     }
 
-    // GET Marcações
-    if (path === 'marcacoes') {
-      let query = {};
-      
-      if (decoded.tipo === 'cliente') {
-        query.cliente_id = decoded.userId;
-      } else if (decoded.tipo === 'barbeiro') {
-        query.barbeiro_id = decoded.userId;
-      } else if (decoded.tipo === 'admin' || decoded.tipo === 'owner') {
-        query.barbearia_id = decoded.barbearia_id;
+    // GET Relatórios avançados (planos Pro/Enterprise)
+    // ?de=YYYY-MM-DD&ate=YYYY-MM-DD&agrupar=dia|mes|total&por=barbeiro|servico|local
+    if (path === 'relatorios') {
+      if (decoded.tipo !== 'admin' && decoded.tipo !== 'owner') {
+        return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
       }
 
-      const marcacoes = await db.collection('marcacoes')
-        .find(query)
-        .sort({ data: -1, hora: -1 })
-        .toArray();
+      const entitlements = await getEntitlements(db, barbeariaKey(decoded.barbearia_id));
+      if (!planIncludesReports(entitlements.plano)) {
+        return NextResponse.json({
+          error: 'Os relatórios avançados estão disponíveis nos planos Pro e Enterprise',
+          requires_upgrade: true
+        }, { status: 403 });
+      }
 
-      const marcacoesComDetalhes = await Promise.all(
-        marcacoes.map(async (m) => {
-          const cliente = await db.collection('utilizadores').findOne(
-            { _id: new ObjectId(m.cliente_id) },
-            { projection: { password: 0 } }
-          );
-          const barbeiro = await db.collection('utilizadores').findOne(
-            { _id: new ObjectId(m.barbeiro_id) },
-            { projection: { nome: 1, foto: 1 } }
-          );
-          const servico = await db.collection('servicos').findOne(
-            { _id: new ObjectId(m.servico_id) },
-            { projection: { nome: 1, preco: 1, duracao: 1 } }
-          );
-          
-          // Get local information if exists
-          let local = null;
-          if (m.local_id) {
-            local = await db.collection('locais').findOne(
-              { _id: new ObjectId(m.local_id) },
-              { projection: { nome: 1, morada: 1 } }
-            );
-          }
+      const de = searchParams.get('de');
+      const ate = searchParams.get('ate');
+      const agrupar = searchParams.get('agrupar') || 'dia';
+      const por = searchParams.get('por');
 
-          return {
-            ...m,
-            cliente,
-            barbeiro,
-            servico,
-            local
-          };
-        })
-      );
+      if (!/^\d{4}-\d{2}-\d{2}$/.test(de || '') || !/^\d{4}-\d{2}-\d{2}$/.test(ate || '') || de > ate) {
+        return NextResponse.json({ error: 'Intervalo de datas inválido (de/ate no formato YYYY-MM-DD)' }, { status: 400 });
+      }
+      if (!isValidReportGrouping(agrupar, por)) {
+        return NextResponse.json({ error: 'Agrupamento inválido' }, { status: 400 });
+      }
 
-      return NextResponse.json({ marcacoes: marcacoesComDetalhes });
+      const linhas = await queryReport(db, decoded.barbearia_id, { de, ate, agrupar, por });
+      return NextResponse.json({ de, ate, agrupar, por, linhas });
+    }
+
+    // GET Marcações
+    if (path === 'marcacoes') {
+      const marcacoes = await listMarcacoes(db, decoded, {
+        de: searchParams.get('de'),
+        ate: searchParams.get('ate'),
+        arquivo: searchParams.get('arquivo') === 'true'
+      });
+      return jsonResponse(request, {
+        marcacoes: applyFields(marcacoes.map(toMarcacaoDTO), parseFields(searchParams.get('fields')))
+      });
     }
 
     // GET Available Slots
@@ -2104,92 +2424,42 @@ export async function GET(request, { params }) {
         return NextResponse.json({ error: 'Parâmetros inválidos' }, { status: 400 });
       }
 
-      const servico = await db.collection('servicos').findOne({ _id: new ObjectId(servico_id) });
+      const barbeiro = await db.collection('utilizadores').findOne(
+        { _id: new ObjectId(barbeiro_id) },
+        { projection: WORKING_HOURS_PROJECTION }
+      );
+
+      // Serviço, horário e marcações vêm da base da barbearia do barbeiro
+      const barbeiroDb = barbeiro?.barbearia_id ? await getTenantDb(db, barbeiro.barbearia_id) : db;
+      const servico = await barbeiroDb.collection('servicos').findOne({ _id: new ObjectId(servico_id) });
       if (!servico) {
         return NextResponse.json({ error: 'Serviço não encontrado' }, { status: 404 });
       }
-
-      const barbeiro = await db.collection('utilizadores').findOne({ _id: new ObjectId(barbeiro_id) });
       if (!barbeiro) {
         return NextResponse.json({ error: 'Barbeiro não encontrado' }, { status: 404 });
       }
 
-      const dataObj = new Date(data);
-      const diaSemanaNum = dataObj.getDay(); // 0 = Domingo, 6 = Sábado
-      const diasSemana = ['domingo', 'segunda', 'terca', 'quarta', 'quinta', 'sexta', 'sabado'];
-      const diaSemana = diasSemana[diaSemanaNum];
-
-      // Verificar se o barbeiro tem horário individual definido
-      const horarioBarbeiro = barbeiro.horario_trabalho;
-      let horaInicio, horaFim, horaAlmocoInicio, horaAlmocoFim;
-      let trabalhaNestesDia = true;
-
-      if (horarioBarbeiro && horarioBarbeiro.horario_semanal) {
-        const horarioDia = horarioBarbeiro.horario_semanal[diaSemanaNum];
-        
-        if (!horarioDia || !horarioDia.ativo) {
-          // Barbeiro não trabalha neste dia
-          return NextResponse.json({ slots: [], message: 'Barbeiro não trabalha neste dia' });
-        }
-
-        horaInicio = horarioDia.inicio || '09:00';
-        horaFim = horarioDia.fim || '19:00';
-        horaAlmocoInicio = horarioBarbeiro.hora_almoco_inicio;
-        horaAlmocoFim = horarioBarbeiro.hora_almoco_fim;
-
-        // Verificar exceções para esta data específica
-        if (horarioBarbeiro.excepcoes && horarioBarbeiro.excepcoes.length > 0) {
-          const excecao = horarioBarbeiro.excepcoes.find(e => e.data === data);
-          if (excecao) {
-            if (excecao.tipo === 'folga') {
-              return NextResponse.json({ slots: [], message: 'Barbeiro de folga neste dia' });
-            } else if (excecao.tipo === 'parcial') {
-              // Horário diferente para este dia
-              horaInicio = excecao.inicio || horaInicio;
-              horaFim = excecao.fim || horaFim;
-            }
-          }
-        }
-      } else {
-        // Usar horário de funcionamento da barbearia como fallback
-        const horarioFuncionamento = await db.collection('horarios_funcionamento').findOne({
-          barbearia_id: barbeiro.barbearia_id,
-          dia_semana: diaSemana,
-          ativo: true
-        });
-
-        if (!horarioFuncionamento || !horarioFuncionamento.hora_inicio) {
-          return NextResponse.json({ slots: [] });
-        }
-
-        horaInicio = horarioFuncionamento.hora_inicio;
-        horaFim = horarioFuncionamento.hora_fim;
+      const horas = await resolveWorkingHours(barbeiroDb, barbeiro, data);
+      if (horas.fechado) {
+        return NextResponse.json(horas.message ? { slots: [], message: horas.message } : { slots: [] });
       }
 
-      const [horaInicioH, horaInicioM] = horaInicio.split(':').map(Number);
-      const [horaFimH, horaFimM] = horaFim.split(':').map(Number);
-      const startMinutes = horaInicioH * 60 + horaInicioM;
-      const endMinutes = horaFimH * 60 + horaFimM;
+      const startMinutes = horas.inicio;
+      const endMinutes = horas.fim;
 
       let allSlots = generateTimeSlots(startMinutes, endMinutes, servico.duracao);
 
       // Remover slots durante o horário de almoço
-      if (horaAlmocoInicio && horaAlmocoFim) {
-        const [almocoInicioH, almocoInicioM] = horaAlmocoInicio.split(':').map(Number);
-        const [almocoFimH, almocoFimM] = horaAlmocoFim.split(':').map(Number);
-        const almocoInicioMin = almocoInicioH * 60 + almocoInicioM;
-        const almocoFimMin = almocoFimH * 60 + almocoFimM;
-
+      if (horas.almocoInicio !== null && horas.almocoFim !== null) {
         allSlots = allSlots.filter(slot => {
-          const [slotH, slotM] = slot.split(':').map(Number);
-          const slotMin = slotH * 60 + slotM;
+          const slotMin = toMinutes(slot);
           // Slot não pode começar durante o almoço
-          return slotMin < almocoInicioMin || slotMin >= almocoFimMin;
+          return slotMin < horas.almocoInicio || slotMin >= horas.almocoFim;
         });
       }
 
       // Remover slots já ocupados por marcações
-      const marcacoesExistentes = await db.collection('marcacoes')
+      const marcacoesExistentes = await barbeiroDb.collection('marcacoes')
         .find({
           barbeiro_id,
           data,
@@ -2207,28 +2477,30 @@ export async function GET(request, { params }) {
 
   } catch (error) {
     console.error('API Error:', error);
-    return NextResponse.json({ error: error.message }, { status: 500 });
+    return NextResponse.json({ error: error.message }, { status: error.status || 500 });
   }
 }
 
-export async function PUT(request, { params }) {
+async function handlePUT(request, { params }) {
   try {
     const path = params?.path ? params.path.join('/') : '';
     const body = await request.json();
     const client = await connectToDatabase();
-    const db = client.db('barbearia_saas');
+    const db = client.db(DB_NAME);
 
-    const authHeader = request.headers.get('authorization');
-    if (!authHeader || !authHeader.startsWith('Bearer ')) {
+    const auth = getAuthContext(request);
+    if (!auth) {
       return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
     }
 
-    const token = authHeader.substring(7);
-    const decoded = verifyToken(token);
+    const { decoded } = auth;
     if (!decoded) {
       return NextResponse.json({ error: 'Token inválido' }, { status: 401 });
     }
 
+    // Coleções da barbearia do token (lib/tenant-db.js)
+    const tdb = decoded.barbearia_id ? await getTenantDb(db, decoded.barbearia_id) : db;
+
     // UPDATE Marcação Status
     if (path.startsWith('marcacoes/')) {
       const marcacaoId = path.split('/')[1];
@@ -2255,10 +2527,19 @@ export async function PUT(request, { params }) {
         updateData.atualizado_por = 'admin';
       }
 
-      const result = await db.collection('marcacoes').updateOne(
+      // O cliente pode ter marcações em qualquer barbearia
+      let marcacaoDb = tdb;
+      if (!decoded.barbearia_id || decoded.tipo === 'cliente') {
+        const marcacao = await findAcrossTenants(db, 'marcacoes', { _id: new ObjectId(marcacaoId) }, { projection: { barbearia_id: 1 } });
+        if (marcacao?.barbearia_id) marcacaoDb = await getTenantDb(db, marcacao.barbearia_id);
+      }
+
+      const result = await marcacaoDb.collection('marcacoes').updateOne(
         { _id: new ObjectId(marcacaoId) },
         { $set: updateData }
       );
+      await scheduleRollupRefreshForMarcacao(marcacaoDb, marcacaoId);
+      await touchCalendarFeedsForMarcacao(marcacaoDb, marcacaoId);
 
       console.log(`[MOCK EMAIL] Marcação ${status} - Cliente será notificado`);
 
@@ -2274,11 +2555,12 @@ export async function PUT(request, { params }) {
       const servicoId = path.split('/')[1];
       const { nome, preco, duracao } = body;
 
-      await db.collection('servicos').updateOne(
+      await tdb.collection('servicos').updateOne(
         { _id: new ObjectId(servicoId) },
         { $set: { nome, preco: parseFloat(preco), duracao: parseInt(duracao) } }
       );
 
+      await revalidatePublicBarbearia(db, decoded.barbearia_id);
       return NextResponse.json({ success: true });
     }
 
@@ -2302,13 +2584,17 @@ export async function PUT(request, { params }) {
       if (horarios !== undefined) updateData.horarios = horarios;
       if (ativo !== undefined) updateData.ativo = ativo;
 
-      await db.collection('locais').updateOne(
+      await tdb.collection('locais').updateOne(
         { _id: new ObjectId(localId), barbearia_id: decoded.barbearia_id },
         { $set: updateData }
       );
 
-      const updatedLocal = await db.collection('locais').findOne({ _id: new ObjectId(localId) });
+      const updatedLocal = await tdb.collection('locais').findOne({ _id: new ObjectId(localId) });
 
+      await revalidatePublicBarbearia(db, decoded.barbearia_id);
+      if (ativo !== undefined) {
+        await refreshEntitlements(db, barbeariaKey(decoded.barbearia_id));
+      }
       return NextResponse.json({ local: updatedLocal, success: true });
     }
 
@@ -2321,11 +2607,12 @@ export async function PUT(request, { params }) {
       const planoId = path.split('/')[1];
       const { nome, preco, duracao, descricao } = body;
 
-      await db.collection('planos_cliente').updateOne(
+      await tdb.collection('planos_cliente').updateOne(
         { _id: new ObjectId(planoId) },
         { $set: { nome, preco: parseFloat(preco), duracao: parseInt(duracao), descricao } }
       );
 
+      await revalidatePublicBarbearia(db, decoded.barbearia_id);
       return NextResponse.json({ success: true });
     }
 
@@ -2355,7 +2642,7 @@ export async function PUT(request, { params }) {
 
       // Se uma nova password foi fornecida, hash e atualizar
       if (password && password.length >= 6) {
-        updateData.password = await bcrypt.hash(password, 10);
+        updateData.password = await hashPassword(password);
       }
 
       // Verificar se o email já existe em outro utilizador
@@ -2369,7 +2656,7 @@ export async function PUT(request, { params }) {
 
       await db.collection('utilizadores').updateOne(
         { _id: new ObjectId(barbeiroId) },
-        { $set: updateData }
+        { $set: updateData, $inc: { sessao_versao: 1 } }
       );
 
       const updatedBarbeiro = await db.collection('utilizadores').findOne(
@@ -2377,6 +2664,9 @@ export async function PUT(request, { params }) {
         { projection: { password: 0 } }
       );
 
+      await revalidatePublicBarbearia(db, decoded.barbearia_id);
+      // ativo pode ter mudado: recontar barbeiros ativos
+      await refreshEntitlements(db, barbeariaKey(decoded.barbearia_id));
       return NextResponse.json({ barbeiro: updatedBarbeiro, success: true });
     }
 
@@ -2399,12 +2689,12 @@ export async function PUT(request, { params }) {
 
       // Se uma nova password foi fornecida, hash e atualizar
       if (password && password.length >= 6) {
-        updateData.password = await bcrypt.hash(password, 10);
+        updateData.password = await hashPassword(password);
       }
 
       await db.collection('utilizadores').updateOne(
         { _id: new ObjectId(decoded.userId) },
-        { $set: updateData }
+        { $set: updateData, $inc: { sessao_versao: 1 } }
       );
 
       const updatedBarbeiro = await db.collection('utilizadores').findOne(
@@ -2412,6 +2702,7 @@ export async function PUT(request, { params }) {
         { projection: { password: 0 } }
       );
 
+      await revalidatePublicBarbearia(db, decoded.barbearia_id);
       return NextResponse.json({ user: updatedBarbeiro, success: true });
     }
 
@@ -2431,18 +2722,19 @@ export async function PUT(request, { params }) {
 
       // Se uma nova password foi fornecida, hash e atualizar
       if (password && password.length >= 6) {
-        updateData.password = await bcrypt.hash(password, 10);
+        updateData.password = await hashPassword(password);
       }
 
       await db.collection('utilizadores').updateOne(
         { _id: new ObjectId(decoded.userId) },
-        { $set: updateData }
+        { $set: updateData, $inc: { sessao_versao: 1 } }
       );
 
       const updatedCliente = await db.collection('utilizadores').findOne(
         { _id: new ObjectId(decoded.userId) },
         { projection: { password: 0 } }
       );
+      await reindexCliente(db, updatedCliente);
 
       return NextResponse.json({ user: updatedCliente, success: true });
     }
@@ -2475,6 +2767,7 @@ export async function PUT(request, { params }) {
         }
       );
 
+      await revalidatePublicBarbearia(db, barbeariaId);
       return NextResponse.json({ 
         success: true, 
         ativa: novoStatus,
@@ -2507,6 +2800,7 @@ export async function PUT(request, { params }) {
 
       const updatedBarbearia = await db.collection('barbearias').findOne({ _id: new ObjectId(barbeariaId) });
 
+      await revalidatePublicBarbearia(db, barbeariaId);
       return NextResponse.json({ barbearia: updatedBarbearia, success: true });
     }
 
@@ -2563,23 +2857,22 @@ export async function PUT(request, { params }) {
 
   } catch (error) {
     console.error('API Error:', error);
-    return NextResponse.json({ error: error.message }, { status: 500 });
+    return NextResponse.json({ error: error.message }, { status: error.status || 500 });
   }
 }
 
-export async function DELETE(request, { params }) {
+async function handleDELETE(request, { params }) {
   try {
     const path = params?.path ? params.path.join('/') : '';
     const client = await connectToDatabase();
-    const db = client.db('barbearia_saas');
+    const db = client.db(DB_NAME);
 
-    const authHeader = request.headers.get('authorization');
-    if (!authHeader || !authHeader.startsWith('Bearer ')) {
+    const auth = getAuthContext(request);
+    if (!auth) {
       return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
     }
 
-    const token = authHeader.substring(7);
-    const decoded = verifyToken(token);
+    const { decoded } = auth;
     if (!decoded) {
       return NextResponse.json({ error: 'Token inválido' }, { status: 401 });
     }
@@ -2588,17 +2881,22 @@ export async function DELETE(request, { params }) {
       return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
     }
 
+    // Coleções da barbearia do token (lib/tenant-db.js)
+    const tdb = await getTenantDb(db, decoded.barbearia_id);
+
     // DELETE Serviço
     if (path.startsWith('servicos/')) {
       const servicoId = path.split('/')[1];
-      await db.collection('servicos').deleteOne({ _id: new ObjectId(servicoId) });
+      await tdb.collection('servicos').deleteOne({ _id: new ObjectId(servicoId) });
+      await revalidatePublicBarbearia(db, decoded.barbearia_id);
       return NextResponse.json({ success: true });
     }
 
     // DELETE Plano Cliente
     if (path.startsWith('planos-cliente/')) {
       const planoId = path.split('/')[1];
-      await db.collection('planos_cliente').deleteOne({ _id: new ObjectId(planoId) });
+      await tdb.collection('planos_cliente').deleteOne({ _id: new ObjectId(planoId) });
+      await revalidatePublicBarbearia(db, decoded.barbearia_id);
       return NextResponse.json({ success: true });
     }
 
@@ -2606,6 +2904,9 @@ export async function DELETE(request, { params }) {
     if (path.startsWith('barbeiros/')) {
       const barbeiroId = path.split('/')[1];
       await db.collection('utilizadores').deleteOne({ _id: new ObjectId(barbeiroId) });
+      await deleteCalendarFeed(db, { tipo: 'barbeiro', refId: barbeiroId });
+      await revalidatePublicBarbearia(db, decoded.barbearia_id);
+      await refreshEntitlements(db, barbeariaKey(decoded.barbearia_id));
       return NextResponse.json({ success: true });
     }
 
@@ -2629,7 +2930,7 @@ export async function DELETE(request, { params }) {
 
       // Verificar se há marcações futuras neste local
       const hoje = new Date().toISOString().split('T')[0];
-      const marcacoesFuturas = await db.collection('marcacoes').countDocuments({
+      const marcacoesFuturas = await tdb.collection('marcacoes').countDocuments({
         barbearia_id: decoded.barbearia_id,
         local_id: localId,
         data: { $gte: hoje },
@@ -2644,11 +2945,14 @@ export async function DELETE(request, { params }) {
       }
 
       // Desativar em vez de eliminar (soft delete)
-      await db.collection('locais').updateOne(
+      await tdb.collection('locais').updateOne(
         { _id: new ObjectId(localId), barbearia_id: decoded.barbearia_id },
         { $set: { ativo: false, desativado_em: new Date() } }
       );
+      await deleteCalendarFeed(db, { tipo: 'local', refId: localId });
 
+      await revalidatePublicBarbearia(db, decoded.barbearia_id);
+      await refreshEntitlements(db, barbeariaKey(decoded.barbearia_id));
       return NextResponse.json({ success: true, message: 'Local desativado com sucesso' });
     }
 
@@ -2656,6 +2960,11 @@ export async function DELETE(request, { params }) {
 
   } catch (error) {
     console.error('API Error:', error);
-    return NextResponse.json({ error: error.message }, { status: 500 });
+    return NextResponse.json({ error: error.message }, { status: error.status || 500 });
   }
-}
\ No newline at end of file
+}
+
+export const POST = instrumentRoute('POST', withAdmissionControl('POST', handlePOST));
+export const GET = instrumentRoute('GET', withAdmissionControl('GET', handleGET));
+export const PUT = instrumentRoute('PUT', withAdmissionControl('PUT', handlePUT));
+export const DELETE = instrumentRoute('DELETE', withAdmissionControl('DELETE', handleDELETE));
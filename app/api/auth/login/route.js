@@ -1,10 +1,11 @@
 import { NextResponse } from 'next/server';
+import { withAdmissionControl } from '@/lib/admission-control';
 import { MongoClient } from 'mongodb';
-import bcrypt from 'bcryptjs';
-import jwt from 'jsonwebtoken';
+import { verifyPassword, rehashInBackground } from '@/lib/password-hasher';
+import { signSessionToken } from '@/lib/auth';
+import { DB_NAME } from '@/lib/mongodb';
 
 const MONGO_URL = process.env.MONGO_URL;
-const JWT_SECRET = process.env.JWT_SECRET;
 
 let cachedClient = null;
 
@@ -15,7 +16,7 @@ async function connectToDatabase() {
   return client;
 }
 
-export async function POST(request) {
+async function handlePOST(request) {
   try {
     const { email, password } = await request.json();
 
@@ -27,7 +28,7 @@ export async function POST(request) {
     }
 
     const client = await connectToDatabase();
-    const db = client.db(process.env.DB_NAME);
+    const db = client.db(DB_NAME);
 
     const user = await db.collection('utilizadores').findOne({ email });
     if (!user) {
@@ -37,7 +38,7 @@ export async function POST(request) {
       );
     }
 
-    const validPassword = await bcrypt.compare(password, user.password);
+    const validPassword = await verifyPassword(password, user.password);
     if (!validPassword) {
       return NextResponse.json(
         { indication: 'Credenciais inválidas' },
@@ -45,15 +46,16 @@ export async function POST(request) {
       );
     }
 
-    const token = jwt.sign(
-      {
-        userId: user._id.toString(),
-        email: user.email,
-        tipo: user.tipo
-      },
-      JWT_SECRET,
-      { expiresIn: '7d' }
-    );
+    // Atualizar o hash se o custo calibrado mudou (não bloqueia o login)
+    rehashInBackground(db, user._id, password, user.password);
+
+    const token = signSessionToken({
+      userId: user._id.toString(),
+      email: user.email,
+      tipo: user.tipo,
+      nome: user.nome,
+      sessao_versao: user.sessao_versao
+    });
 
     return NextResponse.json({
       success: true,
@@ -63,8 +65,11 @@ export async function POST(request) {
   } catch (error) {
     console.error('[LOGIN ERROR]', error);
     return NextResponse.json(
-      { indication: 'Erro interno' },
-      { status: 500 }
+      { indication: error.status === 503 ? error.message : 'Erro interno' },
+      { status: error.status || 500 }
     );
   }
 }
+
+// Classe auth do controlo de admissão, limitada por IP
+export const POST = withAdmissionControl('POST', handlePOST, 'auth/login');
@@ -1,10 +1,11 @@
 import { NextResponse } from 'next/server';
+import { withAdmissionControl } from '@/lib/admission-control';
 import { MongoClient } from 'mongodb';
-import bcrypt from 'bcryptjs';
-import jwt from 'jsonwebtoken';
+import { hashPassword } from '@/lib/password-hasher';
+import { signSessionToken } from '@/lib/auth';
+import { DB_NAME } from '@/lib/mongodb';
 
 const MONGO_URL = process.env.MONGO_URL;
-const JWT_SECRET = process.env.JWT_SECRET;
 
 let cachedClient = null;
 
@@ -15,7 +16,7 @@ async function connectToDatabase() {
   return client;
 }
 
-export async function POST(request) {
+async function handlePOST(request) {
   try {
     const { nome, email, password, tipo } = await request.json();
 
@@ -27,7 +28,7 @@ export async function POST(request) {
     }
 
     const client = await connectToDatabase();
-    const db = client.db(process.env.DB_NAME);
+    const db = client.db(DB_NAME);
 
     // Verificar se já existe
     const existingUser = await db.collection('utilizadores').findOne({ email });
@@ -39,7 +40,7 @@ export async function POST(request) {
     }
 
     // Hash da password
-    const hashedPassword = await bcrypt.hash(password, 10);
+    const hashedPassword = await hashPassword(password);
 
     // Criar utilizador
     const result = await db.collection('utilizadores').insertOne({
@@ -54,11 +55,7 @@ export async function POST(request) {
     const userId = result.insertedId.toString();
 
     // Criar token JWT
-    const token = jwt.sign(
-      { userId, email, tipo: tipo || 'owner' },
-      JWT_SECRET,
-      { expiresIn: '7d' }
-    );
+    const token = signSessionToken({ userId, email, tipo: tipo || 'owner', nome });
 
     return NextResponse.json({
       success: true,
@@ -68,8 +65,10 @@ export async function POST(request) {
   } catch (error) {
     console.error('[REGISTER ERROR]', error);
     return NextResponse.json(
-      { error: 'Erro ao criar conta' },
-      { status: 500 }
+      { error: error.status === 503 ? error.message : 'Erro ao criar conta' },
+      { status: error.status || 500 }
     );
   }
 }
+
+export const POST = withAdmissionControl('POST', handlePOST, 'auth/register');
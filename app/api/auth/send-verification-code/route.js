@@ -1,7 +1,8 @@
 import { NextResponse } from 'next/server';
 import { MongoClient, ObjectId } from 'mongodb';
-import bcrypt from 'bcryptjs';
+import { hashPassword } from '@/lib/password-hasher';
 import { Resend } from 'resend';
+import { DB_NAME } from '@/lib/mongodb';
 
 const resend = new Resend(process.env.RESEND_API_KEY);
 const MONGO_URL = process.env.MONGO_URL;
@@ -32,7 +33,7 @@ export async function POST(request) {
     }
 
     const client = await connectToDatabase();
-    const db = client.db(process.env.DB_NAME || 'barbearia_saas');
+    const db = client.db(DB_NAME);
 
     // Verificar se email já existe
     const existingUser = await db.collection('utilizadores').findOne({ email });
@@ -42,7 +43,7 @@ export async function POST(request) {
 
     // Gerar código
     const code = generateVerificationCode();
-    const hashedCode = await bcrypt.hash(code, 10);
+    const hashedCode = await hashPassword(code);
 
     // Guardar código com expiração
     const expiresAt = new Date();
@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { MongoClient } from 'mongodb';
-import bcrypt from 'bcryptjs';
+import { verifyPassword } from '@/lib/password-hasher';
+import { DB_NAME } from '@/lib/mongodb';
 
 const MONGO_URL = process.env.MONGO_URL;
 
@@ -24,7 +25,7 @@ export async function POST(request) {
     }
 
     const client = await connectToDatabase();
-    const db = client.db(process.env.DB_NAME || 'barbearia_saas');
+    const db = client.db(DB_NAME);
 
     // Buscar código
     const verificationRecord = await db.collection('verification_codes').findOne({ email });
@@ -48,7 +49,7 @@ export async function POST(request) {
     }
 
     // Verificar código
-    const isValid = await bcrypt.compare(code, verificationRecord.code);
+    const isValid = await verifyPassword(code, verificationRecord.code);
 
     if (!isValid) {
       // Incrementar tentativas
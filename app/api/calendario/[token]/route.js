@@ -0,0 +1,51 @@
+import { NextResponse } from 'next/server';
+import { connectToDatabase, DB_NAME } from '@/lib/mongodb';
+import { computeETag, matchesIfNoneMatch } from '@/lib/http-cache';
+import { getCalendarFeed, renderCalendarFeed, CALENDAR_CACHE_CONTROL } from '@/lib/calendar-feeds';
+
+export const dynamic = 'force-dynamic';
+
+// GET /api/calendario/<token>.ics - agenda de um barbeiro ou local em
+// iCalendar (ver lib/calendar-feeds). A maioria das consultas das apps de
+// calendário acaba num 304: só se lê o documento do feed.
+export async function GET(request, { params }) {
+  const token = String(params?.token || '').replace(/\.ics$/, '');
+
+  try {
+    const client = await connectToDatabase();
+    const db = client.db(DB_NAME);
+
+    const current = await getCalendarFeed(db, token);
+    if (!current) {
+      return NextResponse.json({ error: 'Calendário não encontrado' }, { status: 404 });
+    }
+
+    const headers = {
+      ETag: computeETag(`${token}|${current.chave}`),
+      'Last-Modified': current.lastModified.toUTCString(),
+      'Cache-Control': CALENDAR_CACHE_CONTROL
+    };
+
+    // If-None-Match tem prioridade sobre If-Modified-Since (RFC 9110)
+    const ifModifiedSince = request.headers.get('if-modified-since');
+    const notModified = request.headers.get('if-none-match')
+      ? matchesIfNoneMatch(request, headers.ETag)
+      : Boolean(ifModifiedSince) && new Date(ifModifiedSince).getTime() >= current.lastModified.getTime();
+    if (notModified) {
+      return new NextResponse(null, { status: 304, headers });
+    }
+
+    const body = await renderCalendarFeed(db, current);
+    return new NextResponse(body, {
+      status: 200,
+      headers: {
+        ...headers,
+        'Content-Type': 'text/calendar; charset=utf-8',
+        'Content-Disposition': 'inline; filename="agenda.ics"'
+      }
+    });
+  } catch (error) {
+    console.error('Erro ao gerar calendário:', error);
+    return NextResponse.json({ error: 'Erro ao gerar calendário' }, { status: 500 });
+  }
+}
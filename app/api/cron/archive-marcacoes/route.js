@@ -0,0 +1,45 @@
+import { NextResponse } from 'next/server';
+import { connectToDatabase, DB_NAME } from '@/lib/mongodb';
+import { archiveMarcacoes } from '@/lib/marcacoes-archive';
+import { tenantDatabases } from '@/lib/tenant-db';
+
+export const dynamic = 'force-dynamic';
+
+const CRON_SECRET = process.env.CRON_SECRET;
+
+// GET /api/cron/archive-marcacoes?secret=... - move marcações terminadas
+// anteriores ao horizonte para marcacoes_arquivo
+// &dias=365 muda o horizonte; &dry_run=true só conta as candidatas
+export async function GET(request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const secret = searchParams.get('secret');
+
+    if (!CRON_SECRET || secret !== CRON_SECRET) {
+      return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
+    }
+
+    const client = await connectToDatabase();
+    const db = client.db(DB_NAME);
+
+    const options = { dryRun: searchParams.get('dry_run') === 'true' };
+    const dias = parseInt(searchParams.get('dias') || '', 10);
+    if (Number.isFinite(dias) && dias > 0) {
+      options.horizonDays = dias;
+    }
+
+    // Base partilhada e bases dedicadas de tenants grandes
+    const result = options.dryRun ? { arquivadas: 0, lotes: 0, candidatas: 0 } : { arquivadas: 0, lotes: 0 };
+    for (const database of await tenantDatabases(db)) {
+      const parcial = await archiveMarcacoes(database, options);
+      result.cutoff = parcial.cutoff;
+      result.arquivadas += parcial.arquivadas;
+      result.lotes += parcial.lotes;
+      if (options.dryRun) result.candidatas += parcial.candidatas;
+    }
+    return NextResponse.json({ success: true, ...result });
+  } catch (error) {
+    console.error('Erro ao arquivar marcações:', error);
+    return NextResponse.json({ error: 'Erro ao arquivar marcações' }, { status: 500 });
+  }
+}
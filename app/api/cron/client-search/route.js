@@ -0,0 +1,33 @@
+import { NextResponse } from 'next/server';
+import { connectToDatabase, DB_NAME } from '@/lib/mongodb';
+import { backfillClientSearch } from '@/lib/client-search';
+
+export const dynamic = 'force-dynamic';
+
+const CRON_SECRET = process.env.CRON_SECRET;
+
+// GET /api/cron/client-search?secret=... - (re)constrói o índice de pesquisa
+// de clientes (clientes_pesquisa) a partir de utilizadores e marcações.
+// Idempotente; &barbearia_id=... limita a uma barbearia.
+export async function GET(request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const secret = searchParams.get('secret');
+
+    if (!CRON_SECRET || secret !== CRON_SECRET) {
+      return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
+    }
+
+    const client = await connectToDatabase();
+    const db = client.db(DB_NAME);
+
+    const result = await backfillClientSearch(db, {
+      barbeariaId: searchParams.get('barbearia_id') || undefined
+    });
+
+    return NextResponse.json({ success: true, ...result });
+  } catch (error) {
+    console.error('Erro ao indexar clientes:', error);
+    return NextResponse.json({ error: error.message || 'Erro ao indexar clientes' }, { status: 500 });
+  }
+}
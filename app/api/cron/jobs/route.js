@@ -0,0 +1,36 @@
+import { NextResponse } from 'next/server';
+import { connectToDatabase, DB_NAME } from '@/lib/mongodb';
+import { runSchedulerTick, getJobStatus, getJobStats } from '@/lib/job-scheduler';
+
+export const dynamic = 'force-dynamic';
+
+const CRON_SECRET = process.env.CRON_SECRET;
+
+// GET /api/cron/jobs?secret=... - corre um tick do agendador (abre as ondas
+// devidas e trabalha partições), para deploys sem processo permanente
+// &status=true só devolve o estado dos jobs e das partições da última onda
+export async function GET(request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const secret = searchParams.get('secret');
+
+    if (!CRON_SECRET || secret !== CRON_SECRET) {
+      return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
+    }
+
+    const client = await connectToDatabase();
+    const db = client.db(DB_NAME);
+
+    const particoes = searchParams.get('status') === 'true' ? 0 : await runSchedulerTick(db);
+
+    return NextResponse.json({
+      success: true,
+      particoes,
+      jobs: await getJobStatus(db),
+      no: getJobStats()
+    });
+  } catch (error) {
+    console.error('Erro no agendador de jobs:', error);
+    return NextResponse.json({ error: 'Erro no agendador de jobs' }, { status: 500 });
+  }
+}
@@ -0,0 +1,32 @@
+import { NextResponse } from 'next/server';
+import { connectToDatabase, DB_NAME } from '@/lib/mongodb';
+import { migrateEmbeddedExceptions } from '@/lib/schedule-exceptions';
+
+export const dynamic = 'force-dynamic';
+
+const CRON_SECRET = process.env.CRON_SECRET;
+
+// GET /api/cron/migrate-schedule-exceptions?secret=... - migração única:
+// move horario_trabalho.excepcoes dos barbeiros para horario_excecoes.
+// Idempotente; &dry_run=true só conta barbeiros e exceções
+export async function GET(request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const secret = searchParams.get('secret');
+
+    if (!CRON_SECRET || secret !== CRON_SECRET) {
+      return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
+    }
+
+    const client = await connectToDatabase();
+    const db = client.db(DB_NAME);
+
+    const result = await migrateEmbeddedExceptions(db, {
+      dryRun: searchParams.get('dry_run') === 'true'
+    });
+    return NextResponse.json({ success: true, ...result });
+  } catch (error) {
+    console.error('Erro ao migrar exceções de horário:', error);
+    return NextResponse.json({ error: 'Erro ao migrar exceções de horário' }, { status: 500 });
+  }
+}
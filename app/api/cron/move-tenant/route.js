@@ -0,0 +1,72 @@
+import { NextResponse } from 'next/server';
+import { ObjectId } from 'mongodb';
+import { connectToDatabase, DB_NAME } from '@/lib/mongodb';
+import { runOutsideRequest } from '@/lib/metrics';
+import { moveTenant, getTenantMigrationStatus, dedicatedDatabaseName, retryTenantCleanup } from '@/lib/tenant-migration';
+
+export const dynamic = 'force-dynamic';
+
+// Apaga dados da origem: sem CRON_SECRET definido o endpoint fica fechado
+const CRON_SECRET = process.env.CRON_SECRET;
+
+// GET /api/cron/move-tenant?secret=...&barbearia_id=...&para=dedicada|partilhada
+// Inicia em segundo plano a migração online da barbearia para uma base
+// dedicada ou de volta à partilhada. Sem `para` devolve o estado atual
+// (progresso da cópia, erro da última tentativa). &manter_origem=true não
+// apaga os documentos da base de origem no fim; &limpar_origem=true repete a
+// limpeza de uma migração concluída que falhou nesse passo.
+// O processo que serve o pedido corre a migração com um lease; se morrer, o
+// job recuperar-migracoes repõe a colocação e o pedido pode ser repetido.
+export async function GET(request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const secret = searchParams.get('secret');
+
+    if (!CRON_SECRET || secret !== CRON_SECRET) {
+      return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
+    }
+
+    const barbeariaId = searchParams.get('barbearia_id');
+    if (!barbeariaId) {
+      return NextResponse.json({ error: 'barbearia_id é obrigatório' }, { status: 400 });
+    }
+
+    const client = await connectToDatabase();
+    const db = client.db(DB_NAME);
+
+    if (searchParams.get('limpar_origem') === 'true') {
+      const result = await retryTenantCleanup(db, barbeariaId);
+      return NextResponse.json({ success: !result.limpezaErro, barbearia_id: barbeariaId, ...result });
+    }
+
+    const para = searchParams.get('para');
+    if (!para) {
+      const estado = await getTenantMigrationStatus(db, barbeariaId);
+      return NextResponse.json({ success: true, barbearia_id: barbeariaId, colocacao: estado || { database: null, estado: 'estavel' } });
+    }
+    if (para !== 'dedicada' && para !== 'partilhada') {
+      return NextResponse.json({ error: 'para deve ser dedicada ou partilhada' }, { status: 400 });
+    }
+
+    const barbearia = ObjectId.isValid(barbeariaId)
+      ? await db.collection('barbearias').findOne({ _id: new ObjectId(barbeariaId) }, { projection: { _id: 1 } })
+      : null;
+    if (!barbearia) {
+      return NextResponse.json({ error: 'Barbearia não encontrada' }, { status: 404 });
+    }
+
+    const destino = para === 'dedicada' ? dedicatedDatabaseName(barbeariaId) : null;
+    const limparOrigem = searchParams.get('manter_origem') !== 'true';
+
+    // A cópia de um tenant grande demora mais do que um pedido: corre fora
+    // do contexto do pedido e o estado fica em tenant_placements
+    runOutsideRequest(() => moveTenant(db, barbeariaId, { destino, limparOrigem }))
+      .then(result => console.log(`Migração de ${barbeariaId}:`, result))
+      .catch(error => console.error(`Erro na migração de ${barbeariaId}:`, error));
+
+    return NextResponse.json({ success: true, iniciada: true, barbearia_id: barbeariaId, destino: destino || db.databaseName }, { status: 202 });
+  } catch (error) {
+    console.error('Erro ao migrar barbearia:', error);
+    return NextResponse.json({ error: error.message || 'Erro ao migrar barbearia' }, { status: 500 });
+  }
+}
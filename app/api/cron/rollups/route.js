@@ -0,0 +1,45 @@
+import { NextResponse } from 'next/server';
+import { connectToDatabase, DB_NAME } from '@/lib/mongodb';
+import { backfillRollups } from '@/lib/rollups';
+
+export const dynamic = 'force-dynamic';
+
+const CRON_SECRET = process.env.CRON_SECRET;
+const DATE_PATTERN = /^\d{4}-\d{2}-\d{2}$/;
+
+// GET /api/cron/rollups?secret=... - recalcula os rollups de ontem e hoje
+// (fecha o dia e apanha alterações de horários que não passam pelas marcações)
+// Backfill: &de=YYYY-MM-DD&ate=YYYY-MM-DD[&barbearia_id=...]
+export async function GET(request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const secret = searchParams.get('secret');
+
+    if (!CRON_SECRET || secret !== CRON_SECRET) {
+      return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
+    }
+
+    const hoje = new Date().toISOString().split('T')[0];
+    const ontem = new Date(Date.now() - 24 * 60 * 60 * 1000).toISOString().split('T')[0];
+    const de = searchParams.get('de') || ontem;
+    const ate = searchParams.get('ate') || hoje;
+
+    if (!DATE_PATTERN.test(de) || !DATE_PATTERN.test(ate) || de > ate) {
+      return NextResponse.json({ error: 'Intervalo de datas inválido' }, { status: 400 });
+    }
+
+    const client = await connectToDatabase();
+    const db = client.db(DB_NAME);
+
+    const result = await backfillRollups(db, {
+      de,
+      ate,
+      barbeariaId: searchParams.get('barbearia_id') || undefined
+    });
+
+    return NextResponse.json({ success: true, de, ate, ...result });
+  } catch (error) {
+    console.error('Erro ao calcular rollups:', error);
+    return NextResponse.json({ error: error.message || 'Erro ao calcular rollups' }, { status: 500 });
+  }
+}
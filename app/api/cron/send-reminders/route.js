@@ -1,23 +1,15 @@
 import { NextResponse } from 'next/server';
-import { MongoClient, ObjectId } from 'mongodb';
-import { EmailService } from '@/lib/email-service';
+import { connectToDatabase, DB_NAME } from '@/lib/mongodb';
+import { sendReminderWave } from '@/lib/reminders';
+import { tenantDatabases } from '@/lib/tenant-db';
 
 export const dynamic = 'force-dynamic';
 
-const MONGO_URL = process.env.MONGO_URL;
 const CRON_SECRET = process.env.CRON_SECRET || 'cron-secret-key';
 
-let cachedClient = null;
-
-async function connectToDatabase() {
-  if (cachedClient) {
-    return cachedClient;
-  }
-  const client = await MongoClient.connect(MONGO_URL);
-  cachedClient = client;
-  return client;
-}
-
+// GET /api/cron/send-reminders?secret=... - onda de lembretes manual. O
+// agendador (job "lembretes") já a corre periodicamente; cada marcação é
+// reclamada antes do envio, por isso as duas podem sobrepor-se sem duplicar
 export async function GET(request) {
   try {
     // Verificar secret do cron (segurança básica)
@@ -29,7 +21,7 @@ export async function GET(request) {
     }
 
     const client = await connectToDatabase();
-    const db = client.db(process.env.DB_NAME || 'barbearia_saas');
+    const db = client.db(DB_NAME);
 
     const now = new Date();
     let emailsSent = {
@@ -38,101 +30,12 @@ export async function GET(request) {
       errors: []
     };
 
-    // 1. LEMBRETES DE 24 HORAS
-    const tomorrow = new Date(now);
-    tomorrow.setDate(tomorrow.getDate() + 1);
-    const tomorrowDate = tomorrow.toISOString().split('T')[0];
-
-    const marcacoes24h = await db.collection('marcacoes')
-      .find({
-        data: tomorrowDate,
-        status: { $in: ['aceita', 'pendente'] },
-        lembrete_24h_enviado: { $ne: true }
-      })
-      .toArray();
-
-    for (const marcacao of marcacoes24h) {
-      try {
-        const cliente = await db.collection('utilizadores').findOne({ _id: new ObjectId(marcacao.cliente_id) });
-        const servico = await db.collection('servicos').findOne({ _id: new ObjectId(marcacao.servico_id) });
-        const barbearia = await db.collection('barbearias').findOne({ _id: new ObjectId(marcacao.barbearia_id) });
-        const profissional = marcacao.barbeiro_id 
-          ? await db.collection('utilizadores').findOne({ _id: new ObjectId(marcacao.barbeiro_id) })
-          : null;
-
-        if (cliente?.email) {
-          await EmailService.sendBookingReminder24h(cliente.email, {
-            clienteName: cliente.nome,
-            data: marcacao.data,
-            hora: marcacao.hora,
-            servicoName: servico?.nome || 'Serviço',
-            profissionalName: profissional?.nome || null,
-            barbeariaName: barbearia?.nome || 'CutHub'
-          });
-
-          // Marcar como enviado
-          await db.collection('marcacoes').updateOne(
-            { _id: marcacao._id },
-            { $set: { lembrete_24h_enviado: true, lembrete_24h_enviado_em: new Date() } }
-          );
-
-          emailsSent.reminders24h++;
-        }
-      } catch (error) {
-        console.error('[CRON] Error sending 24h reminder:', error);
-        emailsSent.errors.push({ type: '24h', marcacao_id: marcacao._id.toString(), error: error.message });
-      }
-    }
-
-    // 2. LEMBRETES DE 60 MINUTOS
-    const in60min = new Date(now.getTime() + 60 * 60 * 1000);
-    const in60minDate = in60min.toISOString().split('T')[0];
-    const in60minHour = `${String(in60min.getHours()).padStart(2, '0')}:${String(in60min.getMinutes()).padStart(2, '0')}`;
-
-    const marcacoes60min = await db.collection('marcacoes')
-      .find({
-        data: in60minDate,
-        hora: { $gte: in60minHour, $lte: `${String(in60min.getHours()).padStart(2, '0')}:59` },
-        status: { $in: ['aceita', 'pendente'] },
-        lembrete_60min_enviado: { $ne: true }
-      })
-      .toArray();
-
-    for (const marcacao of marcacoes60min) {
-      try {
-        const cliente = await db.collection('utilizadores').findOne({ _id: new ObjectId(marcacao.cliente_id) });
-        const servico = await db.collection('servicos').findOne({ _id: new ObjectId(marcacao.servico_id) });
-        const barbearia = await db.collection('barbearias').findOne({ _id: new ObjectId(marcacao.barbearia_id) });
-        const local = marcacao.local_id 
-          ? await db.collection('locais').findOne({ _id: new ObjectId(marcacao.local_id) })
-          : null;
-        const profissional = marcacao.barbeiro_id 
-          ? await db.collection('utilizadores').findOne({ _id: new ObjectId(marcacao.barbeiro_id) })
-          : null;
-
-        if (cliente?.email) {
-          await EmailService.sendBookingReminder60min(cliente.email, {
-            clienteName: cliente.nome,
-            data: marcacao.data,
-            hora: marcacao.hora,
-            servicoName: servico?.nome || 'Serviço',
-            profissionalName: profissional?.nome || null,
-            barbeariaName: barbearia?.nome || 'CutHub',
-            localMorada: local?.morada || null
-          });
-
-          // Marcar como enviado
-          await db.collection('marcacoes').updateOne(
-            { _id: marcacao._id },
-            { $set: { lembrete_60min_enviado: true, lembrete_60min_enviado_em: new Date() } }
-          );
-
-          emailsSent.reminders60min++;
-        }
-      } catch (error) {
-        console.error('[CRON] Error sending 60min reminder:', error);
-        emailsSent.errors.push({ type: '60min', marcacao_id: marcacao._id.toString(), error: error.message });
-      }
+    // Base partilhada e bases dedicadas de tenants grandes
+    for (const database of await tenantDatabases(db)) {
+      const parcial = await sendReminderWave(database, { now });
+      emailsSent.reminders24h += parcial.reminders24h;
+      emailsSent.reminders60min += parcial.reminders60min;
+      emailsSent.errors.push(...parcial.errors);
     }
 
     return NextResponse.json({
@@ -0,0 +1,37 @@
+import { NextResponse } from 'next/server';
+import { connectToDatabase, DB_NAME } from '@/lib/mongodb';
+import { processStripeEvents, requeueStripeEvents } from '@/lib/stripe-events';
+
+export const dynamic = 'force-dynamic';
+
+const CRON_SECRET = process.env.CRON_SECRET;
+
+// GET /api/cron/stripe-events?secret=... - processa eventos Stripe pendentes
+// (novas tentativas e o que o worker do webhook não chegou a fazer)
+// &requeue=evt_1,evt_2 ou &requeue=dead - volta a pôr eventos na fila antes
+export async function GET(request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const secret = searchParams.get('secret');
+
+    if (!CRON_SECRET || secret !== CRON_SECRET) {
+      return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
+    }
+
+    const client = await connectToDatabase();
+    const db = client.db(DB_NAME);
+
+    let requeued = 0;
+    const requeue = searchParams.get('requeue');
+    if (requeue) {
+      requeued = await requeueStripeEvents(db, requeue === 'dead' ? 'dead' : requeue.split(','));
+    }
+
+    const result = await processStripeEvents(db);
+
+    return NextResponse.json({ success: true, requeued, ...result });
+  } catch (error) {
+    console.error('Erro ao processar eventos Stripe:', error);
+    return NextResponse.json({ error: 'Erro ao processar eventos' }, { status: 500 });
+  }
+}
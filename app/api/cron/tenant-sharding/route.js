@@ -0,0 +1,33 @@
+import { NextResponse } from 'next/server';
+import { connectToDatabase, DB_NAME } from '@/lib/mongodb';
+import { ensureTenantSharding } from '@/lib/tenant-db';
+
+export const dynamic = 'force-dynamic';
+
+const CRON_SECRET = process.env.CRON_SECRET;
+
+// GET /api/cron/tenant-sharding?secret=... - ativa o sharding das coleções de
+// tenant com a shard key { barbearia_id, _id } (só ligado a um mongos).
+// &dry_run=true só verifica que coleções podem ser shardadas.
+export async function GET(request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const secret = searchParams.get('secret');
+
+    if (!CRON_SECRET || secret !== CRON_SECRET) {
+      return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
+    }
+
+    const client = await connectToDatabase();
+    const db = client.db(DB_NAME);
+
+    const result = await ensureTenantSharding(db, {
+      dryRun: searchParams.get('dry_run') === 'true'
+    });
+
+    return NextResponse.json({ success: true, ...result });
+  } catch (error) {
+    console.error('Erro ao ativar sharding:', error);
+    return NextResponse.json({ error: error.message || 'Erro ao ativar sharding' }, { status: 500 });
+  }
+}
@@ -0,0 +1,32 @@
+import { NextResponse } from 'next/server';
+import { connectToDatabase, DB_NAME } from '@/lib/mongodb';
+import { collectOrphanUploads } from '@/lib/upload-storage';
+
+export const dynamic = 'force-dynamic';
+
+const CRON_SECRET = process.env.CRON_SECRET;
+
+// GET /api/cron/uploads-gc?secret=... - apaga do armazenamento as imagens que
+// nenhum produto/barbearia usa há mais de uma hora (&dry_run=true só conta)
+export async function GET(request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const secret = searchParams.get('secret');
+
+    if (!CRON_SECRET || secret !== CRON_SECRET) {
+      return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
+    }
+
+    const client = await connectToDatabase();
+    const db = client.db(DB_NAME);
+
+    const result = await collectOrphanUploads(db, {
+      dryRun: searchParams.get('dry_run') === 'true'
+    });
+
+    return NextResponse.json({ success: true, ...result });
+  } catch (error) {
+    console.error('Erro na limpeza de uploads:', error);
+    return NextResponse.json({ error: error.message || 'Erro na limpeza de uploads' }, { status: 500 });
+  }
+}
@@ -0,0 +1,81 @@
+import { NextResponse } from 'next/server';
+import { connectToDatabase, DB_NAME } from '@/lib/mongodb';
+import { instrumentRoute } from '@/lib/metrics';
+import { admit } from '@/lib/admission-control';
+import { getAuthContext } from '@/lib/auth';
+import { createExportStream, isExportResource, EXPORT_FORMATS } from '@/lib/export';
+import { getTenantDb } from '@/lib/tenant-db';
+
+export const dynamic = 'force-dynamic';
+
+const DATE_PATTERN = /^\d{4}-\d{2}-\d{2}$/;
+
+// GET /api/export/marcacoes|clientes|receita?formato=csv|ndjson&de=YYYY-MM-DD&ate=YYYY-MM-DD
+// Opcionais: arquivo=true (inclui marcações arquivadas), status= (marcacoes),
+// agrupar=mes (receita). A resposta é enviada em streaming (chunked).
+async function handleExport(request, { params }) {
+  const resource = params.resource;
+  if (!isExportResource(resource)) {
+    return NextResponse.json({ error: 'Exportação não encontrada' }, { status: 404 });
+  }
+
+  const decoded = getAuthContext(request)?.decoded;
+  if (!decoded) {
+    return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
+  }
+  if ((decoded.tipo !== 'admin' && decoded.tipo !== 'owner') || !decoded.barbearia_id) {
+    return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
+  }
+
+  const { searchParams } = new URL(request.url);
+  const format = searchParams.get('formato') || 'csv';
+  if (!EXPORT_FORMATS[format]) {
+    return NextResponse.json({ error: 'Formato inválido (csv ou ndjson)' }, { status: 400 });
+  }
+
+  const filters = {
+    de: searchParams.get('de'),
+    ate: searchParams.get('ate'),
+    arquivo: searchParams.get('arquivo') === 'true',
+    status: searchParams.get('status'),
+    agrupar: searchParams.get('agrupar')
+  };
+  if ((filters.de && !DATE_PATTERN.test(filters.de)) || (filters.ate && !DATE_PATTERN.test(filters.ate))) {
+    return NextResponse.json({ error: 'Datas inválidas (formato YYYY-MM-DD)' }, { status: 400 });
+  }
+
+  // Exportações são trabalho do dashboard: entram no controlo de admissão e
+  // ocupam a vaga até o stream terminar, não só até a resposta começar
+  const { response, release } = admit(request, 'GET', `export/${resource}`);
+  if (response) return response;
+
+  try {
+    const client = await connectToDatabase();
+    const db = await getTenantDb(client.db(DB_NAME), decoded.barbearia_id);
+
+    const stream = createExportStream(db, {
+      resource,
+      barbeariaId: decoded.barbearia_id,
+      format,
+      filters,
+      onDone: release
+    });
+
+    const suffix = [filters.de, filters.ate].filter(Boolean).join('_') || new Date().toISOString().split('T')[0];
+    return new Response(stream, {
+      status: 200,
+      headers: {
+        'Content-Type': EXPORT_FORMATS[format],
+        'Content-Disposition': `attachment; filename="${resource}-${suffix}.${format}"`,
+        'Cache-Control': 'private, no-store',
+        'X-Content-Type-Options': 'nosniff'
+      }
+    });
+  } catch (error) {
+    release();
+    console.error('Erro ao exportar:', error);
+    return NextResponse.json({ error: 'Erro ao exportar dados' }, { status: 500 });
+  }
+}
+
+export const GET = instrumentRoute('GET', handleExport, 'export/:resource');
@@ -1,12 +1,15 @@
 import { NextResponse } from 'next/server';
 import { MongoClient } from 'mongodb';
-import { writeFile, unlink } from 'fs/promises';
-import { join } from 'path';
-import jwt from 'jsonwebtoken';
+import { verifyToken } from '@/lib/auth';
+import { storeUpload, releaseUpload, UploadTooLargeError } from '@/lib/upload-storage';
+import { DB_NAME } from '@/lib/mongodb';
 
-const JWT_SECRET = process.env.JWT_SECRET;
 const MONGO_URL = process.env.MONGO_URL;
 
+const MAX_IMAGE_SIZE = 10 * 1024 * 1024; // 10MB
+// Margem para os cabeçalhos multipart no Content-Length do pedido
+const MULTIPART_OVERHEAD = 64 * 1024;
+
 let cachedClient = null;
 
 async function connectToDatabase() {
@@ -18,14 +21,6 @@ async function connectToDatabase() {
   return client;
 }
 
-function verifyToken(token) {
-  try {
-    return jwt.verify(token, JWT_SECRET);
-  } catch (error) {
-    return null;
-  }
-}
-
 export async function POST(request) {
   try {
     // Verify authentication
@@ -41,6 +36,14 @@ export async function POST(request) {
       return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
     }
 
+    // Recusar pelo Content-Length antes de ler o corpo para memória
+    const contentLength = parseInt(request.headers.get('content-length') || '0', 10);
+    if (contentLength > MAX_IMAGE_SIZE + MULTIPART_OVERHEAD) {
+      return NextResponse.json({ 
+        error: 'Imagem muito grande. Máximo 10MB' 
+      }, { status: 400 });
+    }
+
     // Get the form data
     const formData = await request.formData();
     const file = formData.get('image');
@@ -58,8 +61,7 @@ export async function POST(request) {
     }
 
     // Validate file size (max 10MB for hero images)
-    const maxSize = 10 * 1024 * 1024; // 10MB
-    if (file.size > maxSize) {
+    if (file.size > MAX_IMAGE_SIZE) {
       return NextResponse.json({ 
         error: 'Imagem muito grande. Máximo 10MB' 
       }, { status: 400 });
@@ -67,31 +69,13 @@ export async function POST(request) {
 
     // Connect to database
     const client = await connectToDatabase();
-    const db = client.db(process.env.DB_NAME || 'barbearia_saas');
+    const db = client.db(DB_NAME);
 
-    // Get current settings to delete old image
+    // Get current settings (the old image is released after the update)
     const currentSettings = await db.collection('saas_settings').findOne({ type: 'global' });
-    
-    if (currentSettings && currentSettings.hero_image) {
-      try {
-        const oldPath = join(process.cwd(), 'public', currentSettings.hero_image);
-        await unlink(oldPath);
-      } catch (error) {
-        console.log('Old hero image not found or already deleted');
-      }
-    }
 
-    // Generate unique filename
-    const timestamp = Date.now();
-    const extension = file.name.split('.').pop();
-    const filename = `hero-${timestamp}.${extension}`;
-    const filepath = `/uploads/saas/${filename}`;
-    const fullPath = join(process.cwd(), 'public', filepath);
-
-    // Convert file to buffer and save
-    const bytes = await file.arrayBuffer();
-    const buffer = Buffer.from(bytes);
-    await writeFile(fullPath, buffer);
+    // Guardar a imagem (a chave é o hash do conteúdo, ver lib/upload-storage.js)
+    const { url: filepath } = await storeUpload(db, file, { maxSize: MAX_IMAGE_SIZE });
 
     // Update or create SaaS settings
     await db.collection('saas_settings').updateOne(
@@ -105,6 +89,9 @@ export async function POST(request) {
       { upsert: true }
     );
 
+    // A imagem anterior só é libertada depois de o documento apontar para a nova
+    await releaseUpload(db, currentSettings?.hero_image);
+
     return NextResponse.json({ 
       success: true,
       hero_image: filepath,
@@ -113,6 +100,9 @@ export async function POST(request) {
 
   } catch (error) {
     console.error('Upload error:', error);
+    if (error instanceof UploadTooLargeError) {
+      return NextResponse.json({ error: `Imagem muito grande. Máximo ${MAX_IMAGE_SIZE / 1024 / 1024}MB` }, { status: 400 });
+    }
     return NextResponse.json({ 
       error: 'Erro ao fazer upload da imagem' 
     }, { status: 500 });
@@ -136,19 +126,10 @@ export async function DELETE(request) {
 
     // Connect to database
     const client = await connectToDatabase();
-    const db = client.db(process.env.DB_NAME || 'barbearia_saas');
+    const db = client.db(DB_NAME);
 
     // Get current settings
     const currentSettings = await db.collection('saas_settings').findOne({ type: 'global' });
-    
-    if (currentSettings && currentSettings.hero_image) {
-      try {
-        const fullPath = join(process.cwd(), 'public', currentSettings.hero_image);
-        await unlink(fullPath);
-      } catch (error) {
-        console.log('Hero image file not found');
-      }
-    }
 
     // Remove hero image from settings
     await db.collection('saas_settings').updateOne(
@@ -159,6 +140,8 @@ export async function DELETE(request) {
       }
     );
 
+    await releaseUpload(db, currentSettings?.hero_image);
+
     return NextResponse.json({ 
       success: true,
       message: 'Imagem de capa removida com sucesso'
@@ -0,0 +1,44 @@
+import { NextResponse } from 'next/server';
+import { renderPrometheus, getRouteProfile } from '@/lib/metrics';
+import { renderAdmissionPrometheus, getAdmissionStats } from '@/lib/admission-control';
+import { renderInvalidationPrometheus, getInvalidationStats } from '@/lib/invalidation-bus';
+import { renderLoaderPrometheus, getLoaderStats } from '@/lib/loaders';
+import { renderJobPrometheus, getJobStats } from '@/lib/job-scheduler';
+
+export const dynamic = 'force-dynamic';
+
+const METRICS_TOKEN = process.env.METRICS_TOKEN;
+
+// GET /api/metrics - formato texto do Prometheus
+// GET /api/metrics?format=json - perfil por rota (pedidos, duração, comandos Mongo)
+// e estado do controlo de admissão, do barramento de invalidação, dos loaders e dos jobs
+export async function GET(request) {
+  const { searchParams } = new URL(request.url);
+
+  // Se METRICS_TOKEN estiver definido, exigir o token (header ou query string)
+  if (METRICS_TOKEN) {
+    const authHeader = request.headers.get('authorization');
+    const token = authHeader?.startsWith('Bearer ')
+      ? authHeader.substring(7)
+      : searchParams.get('token');
+
+    if (token !== METRICS_TOKEN) {
+      return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
+    }
+  }
+
+  if (searchParams.get('format') === 'json') {
+    return NextResponse.json({
+      ...getRouteProfile(),
+      admissao: getAdmissionStats(),
+      invalidacoes: getInvalidationStats(),
+      loaders: getLoaderStats(),
+      jobs: getJobStats()
+    });
+  }
+
+  return new Response(renderPrometheus() + renderAdmissionPrometheus() + renderInvalidationPrometheus() + renderLoaderPrometheus() + renderJobPrometheus(), {
+    status: 200,
+    headers: { 'Content-Type': 'text/plain; version=0.0.4; charset=utf-8' }
+  });
+}
@@ -1,12 +1,17 @@
 import { NextResponse } from 'next/server';
 import { MongoClient, ObjectId } from 'mongodb';
-import { writeFile, unlink } from 'fs/promises';
-import { join } from 'path';
-import jwt from 'jsonwebtoken';
+import { verifyToken } from '@/lib/auth';
+import { storeUpload, releaseUpload, UploadTooLargeError } from '@/lib/upload-storage';
+import { revalidatePublicBarbearia } from '@/lib/public-barbearia';
+import { getTenantDb } from '@/lib/tenant-db';
+import { DB_NAME } from '@/lib/mongodb';
 
-const JWT_SECRET = process.env.JWT_SECRET;
 const MONGO_URL = process.env.MONGO_URL;
 
+const MAX_IMAGE_SIZE = 5 * 1024 * 1024; // 5MB
+// Margem para os cabeçalhos multipart no Content-Length do pedido
+const MULTIPART_OVERHEAD = 64 * 1024;
+
 let cachedClient = null;
 
 async function connectToDatabase() {
@@ -18,14 +23,6 @@ async function connectToDatabase() {
   return client;
 }
 
-function verifyToken(token) {
-  try {
-    return jwt.verify(token, JWT_SECRET);
-  } catch (error) {
-    return null;
-  }
-}
-
 export async function POST(request, { params }) {
   try {
     const { id } = params;
@@ -48,6 +45,14 @@ export async function POST(request, { params }) {
       return NextResponse.json({ error: 'Acesso negado' }, { status: 403 });
     }
 
+    // Recusar pelo Content-Length antes de ler o corpo para memória
+    const contentLength = parseInt(request.headers.get('content-length') || '0', 10);
+    if (contentLength > MAX_IMAGE_SIZE + MULTIPART_OVERHEAD) {
+      return NextResponse.json({ 
+        error: 'Imagem muito grande. Máximo 5MB' 
+      }, { status: 400 });
+    }
+
     // Get the form data
     const formData = await request.formData();
     const file = formData.get('image');
@@ -65,8 +70,7 @@ export async function POST(request, { params }) {
     }
 
     // Validate file size (max 5MB)
-    const maxSize = 5 * 1024 * 1024; // 5MB
-    if (file.size > maxSize) {
+    if (file.size > MAX_IMAGE_SIZE) {
       return NextResponse.json({ 
         error: 'Imagem muito grande. Máximo 5MB' 
       }, { status: 400 });
@@ -74,10 +78,11 @@ export async function POST(request, { params }) {
 
     // Connect to database
     const client = await connectToDatabase();
-    const db = client.db(process.env.DB_NAME || 'barbearia_saas');
+    const db = client.db(DB_NAME);
 
     // Verify product exists and belongs to this barbearia
-    const produto = await db.collection('produtos').findOne({
+    const tenantDb = await getTenantDb(db, decoded.barbearia_id);
+    const produto = await tenantDb.collection('produtos').findOne({
       _id: new ObjectId(id),
       barbearia_id: decoded.barbearia_id
     });
@@ -86,34 +91,20 @@ export async function POST(request, { params }) {
       return NextResponse.json({ error: 'Produto não encontrado' }, { status: 404 });
     }
 
-    // Delete old image if exists
-    if (produto.imagem) {
-      try {
-        const oldPath = join(process.cwd(), 'public', produto.imagem);
-        await unlink(oldPath);
-      } catch (error) {
-        console.log('Old image not found or already deleted');
-      }
-    }
-
-    // Generate unique filename
-    const timestamp = Date.now();
-    const extension = file.name.split('.').pop();
-    const filename = `${id}-${timestamp}.${extension}`;
-    const filepath = `/uploads/produtos/${filename}`;
-    const fullPath = join(process.cwd(), 'public', filepath);
-
-    // Convert file to buffer and save
-    const bytes = await file.arrayBuffer();
-    const buffer = Buffer.from(bytes);
-    await writeFile(fullPath, buffer);
+    // Guardar a imagem (a chave é o hash do conteúdo, ver lib/upload-storage.js)
+    const { url: filepath } = await storeUpload(db, file, { maxSize: MAX_IMAGE_SIZE });
 
     // Update product with image path
-    await db.collection('produtos').updateOne(
+    await tenantDb.collection('produtos').updateOne(
       { _id: new ObjectId(id) },
       { $set: { imagem: filepath } }
     );
 
+    // A imagem anterior só é libertada depois de o documento apontar para a nova
+    await releaseUpload(db, produto.imagem);
+
+    await revalidatePublicBarbearia(db, decoded.barbearia_id);
+
     return NextResponse.json({ 
       success: true,
       imagem: filepath,
@@ -122,6 +113,9 @@ export async function POST(request, { params }) {
 
   } catch (error) {
     console.error('Upload error:', error);
+    if (error instanceof UploadTooLargeError) {
+      return NextResponse.json({ error: `Imagem muito grande. Máximo ${MAX_IMAGE_SIZE / 1024 / 1024}MB` }, { status: 400 });
+    }
     return NextResponse.json({ 
       error: 'Erro ao fazer upload da imagem' 
     }, { status: 500 });
@@ -152,10 +146,11 @@ export async function DELETE(request, { params }) {
 
     // Connect to database
     const client = await connectToDatabase();
-    const db = client.db(process.env.DB_NAME || 'barbearia_saas');
+    const db = client.db(DB_NAME);
 
     // Get product
-    const produto = await db.collection('produtos').findOne({
+    const tenantDb = await getTenantDb(db, decoded.barbearia_id);
+    const produto = await tenantDb.collection('produtos').findOne({
       _id: new ObjectId(id),
       barbearia_id: decoded.barbearia_id
     });
@@ -164,22 +159,16 @@ export async function DELETE(request, { params }) {
       return NextResponse.json({ error: 'Produto não encontrado' }, { status: 404 });
     }
 
-    // Delete image file if exists
-    if (produto.imagem) {
-      try {
-        const fullPath = join(process.cwd(), 'public', produto.imagem);
-        await unlink(fullPath);
-      } catch (error) {
-        console.log('Image file not found or already deleted');
-      }
-    }
-
     // Remove image from database
-    await db.collection('produtos').updateOne(
+    await tenantDb.collection('produtos').updateOne(
       { _id: new ObjectId(id) },
       { $unset: { imagem: '' } }
     );
 
+    await releaseUpload(db, produto.imagem);
+
+    await revalidatePublicBarbearia(db, decoded.barbearia_id);
+
     return NextResponse.json({ 
       success: true,
       message: 'Imagem removida com sucesso'
@@ -1,5 +1,6 @@
 import { NextResponse } from 'next/server';
 import { MongoClient } from 'mongodb';
+import { DB_NAME } from '@/lib/mongodb';
 
 export const dynamic = 'force-dynamic';
 
@@ -19,7 +20,7 @@ async function connectToDatabase() {
 export async function GET(request) {
   try {
     const client = await connectToDatabase();
-    const db = client.db(process.env.DB_NAME || 'barbearia_saas');
+    const db = client.db(DB_NAME);
 
     // Get SaaS settings (public)
     const settings = await db.collection('saas_settings').findOne({ type: 'global' });
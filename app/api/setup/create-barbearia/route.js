@@ -1,8 +1,9 @@
 import { NextResponse } from 'next/server';
-import jwt from 'jsonwebtoken';
 import { MongoClient } from 'mongodb';
+import { verifyToken } from '@/lib/auth';
+import { ownerKey, reserveUsage, confirmUsage, releaseUsage } from '@/lib/entitlements';
+import { DB_NAME } from '@/lib/mongodb';
 
-const JWT_SECRET = process.env.JWT_SECRET;
 const MONGO_URL = process.env.MONGO_URL;
 
 let cachedClient = null;
@@ -14,14 +15,6 @@ async function connectToDatabase() {
   return client;
 }
 
-function verifyToken(token) {
-  try {
-    return jwt.verify(token, JWT_SECRET);
-  } catch {
-    return null;
-  }
-}
-
 export async function POST(request) {
   try {
     const auth = request.headers.get('authorization');
@@ -61,7 +54,7 @@ export async function POST(request) {
     }
 
     const client = await connectToDatabase();
-    const db = client.db(process.env.DB_NAME || 'barbearia_saas');
+    const db = client.db(DB_NAME);
 
     // Verificar se já existe barbearia para este owner
     const existing = await db.collection('barbearias').findOne({
@@ -76,16 +69,38 @@ export async function POST(request) {
       });
     }
 
+    // Reservar uma barbearia no limite do plano (atómico)
+    const entitlementKey = ownerKey(decoded.userId);
+    const { allowed, entitlements } = await reserveUsage(db, entitlementKey, 'barbearias');
+    if (!allowed) {
+      return NextResponse.json(
+        {
+          error: 'Limite de barbearias atingido',
+          upgrade_required: true,
+          current_plan: entitlements.plano?.nome,
+          limit: entitlements.limits.barbearias
+        },
+        { status: 403 }
+      );
+    }
+
     // Criar nova barbearia
-    const result = await db.collection('barbearias').insertOne({
-      nome,
-      descricao: descricao || null,
-      email,
-      palavra_passe,
-      owner_id: decoded.userId,
-      ativo: true,
-      criado_em: new Date()
-    });
+    let result;
+    try {
+      result = await db.collection('barbearias').insertOne({
+        nome,
+        descricao: descricao || null,
+        email,
+        palavra_passe,
+        owner_id: decoded.userId,
+        ativo: true,
+        criado_em: new Date()
+      });
+    } catch (error) {
+      await releaseUsage(db, entitlementKey, 'barbearias');
+      throw error;
+    }
+    await confirmUsage(db, entitlementKey);
 
     return NextResponse.json({
       success: true,
@@ -1,13 +1,9 @@
 import { NextResponse } from 'next/server';
-import Stripe from 'stripe';
-import jwt from 'jsonwebtoken';
 import { MongoClient } from 'mongodb';
+import { verifyToken } from '@/lib/auth';
+import { getStripeClient } from '@/lib/integrations';
+import { DB_NAME } from '@/lib/mongodb';
 
-const stripe = new Stripe(process.env.STRIPE_SECRET_KEY, {
-  apiVersion: '2023-10-16',
-});
-
-const JWT_SECRET = process.env.JWT_SECRET;
 const MONGO_URL = process.env.MONGO_URL;
 const BASE_URL = process.env.NEXT_PUBLIC_BASE_URL || 'http://localhost:3000';
 
@@ -20,14 +16,6 @@ async function connectToDatabase() {
   return client;
 }
 
-function verifyToken(token) {
-  try {
-    return jwt.verify(token, JWT_SECRET);
-  } catch (error) {
-    return null;
-  }
-}
-
 export async function POST(request) {
   try {
     console.log('[STRIPE CHECKOUT] === Starting checkout session creation ===');
@@ -64,7 +52,7 @@ export async function POST(request) {
 
     // VERIFICAR SE EMAIL FOI VERIFICADO COM CÓDIGO
     const client = await connectToDatabase();
-    const db = client.db(process.env.DB_NAME || 'barbearia_saas');
+    const db = client.db(DB_NAME);
     
     const emailVerification = await db.collection('verified_emails').findOne({ 
       email: decoded.email 
@@ -118,6 +106,7 @@ export async function POST(request) {
     console.log('[STRIPE CHECKOUT] Creating Stripe session...');
 
     // Criar Checkout Session
+    const stripe = await getStripeClient(process.env.STRIPE_SECRET_KEY, { apiVersion: '2023-10-16' });
     const session = await stripe.checkout.sessions.create({
       mode: 'subscription',
       payment_method_types: ['card'],
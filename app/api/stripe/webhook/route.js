@@ -1,22 +1,12 @@
-import Stripe from 'stripe';
-import { MongoClient, ObjectId } from 'mongodb';
-
-const stripe = new Stripe(process.env.STRIPE_SECRET_KEY, {
-  apiVersion: '2023-10-16',
-});
+import { connectToDatabase, DB_NAME } from '@/lib/mongodb';
+import { getStripeClient } from '@/lib/integrations';
+import { recordStripeEvent, kickStripeEventsWorker } from '@/lib/stripe-events';
 
 const WEBHOOK_SECRET = process.env.STRIPE_WEBHOOK_SECRET;
-const MONGO_URL = process.env.MONGO_URL;
-
-let cachedClient = null;
-
-async function connectToDatabase() {
-  if (cachedClient) return cachedClient;
-  const client = await MongoClient.connect(MONGO_URL);
-  cachedClient = client;
-  return client;
-}
 
+// O processamento é feito pelo worker de lib/stripe-events: aqui só se
+// verifica a assinatura, grava o evento e responde. Reenvios do Stripe
+// (mesmo event.id) são descartados pelo índice único.
 export async function POST(request) {
   let event;
 
@@ -30,6 +20,7 @@ export async function POST(request) {
     }
 
     // 🔐 Verificar assinatura Stripe
+    const stripe = await getStripeClient(process.env.STRIPE_SECRET_KEY, { apiVersion: '2023-10-16' });
     event = stripe.webhooks.constructEvent(
       body,
       signature,
@@ -40,88 +31,19 @@ export async function POST(request) {
     return new Response(`Webhook Error: ${err.message}`, { status: 400 });
   }
 
-  const client = await connectToDatabase();
-  const db = client.db(process.env.DB_NAME || 'barbearia_saas');
-
   try {
-    switch (event.type) {
-
-      case 'checkout.session.completed': {
-        const session = event.data.object;
-
-        const subscription = await stripe.subscriptions.retrieve(
-          session.subscription
-        );
-
-        const userId =
-          session.metadata?.user_id ||
-          session.client_reference_id;
-
-        const planId = session.metadata?.plan_id;
+    const client = await connectToDatabase();
+    const db = client.db(DB_NAME);
 
-        if (!userId) {
-          console.error('[STRIPE WEBHOOK] userId ausente');
-          break;
-        }
-
-        // Guardar subscrição
-        await db.collection('subscriptions').updateOne(
-          { user_id: userId },
-          {
-            $set: {
-              user_id: userId,
-              plan_id: planId,
-              stripe_subscription_id: subscription.id,
-              stripe_customer_id: subscription.customer,
-              status: subscription.status,
-              current_period_start: new Date(subscription.current_period_start * 1000),
-              current_period_end: new Date(subscription.current_period_end * 1000),
-              created_at: new Date(),
-              updated_at: new Date(),
-            },
-          },
-          { upsert: true }
-        );
-
-        break;
-      }
-
-      case 'customer.subscription.updated': {
-        const subscription = event.data.object;
-
-        await db.collection('subscriptions').updateOne(
-          { stripe_subscription_id: subscription.id },
-          {
-            $set: {
-              status: subscription.status,
-              updated_at: new Date(),
-            },
-          }
-        );
-        break;
-      }
-
-      case 'customer.subscription.deleted': {
-        const subscription = event.data.object;
-
-        await db.collection('subscriptions').updateOne(
-          { stripe_subscription_id: subscription.id },
-          {
-            $set: {
-              status: 'cancelled',
-              updated_at: new Date(),
-            },
-          }
-        );
-        break;
-      }
+    const { duplicate } = await recordStripeEvent(db, event);
 
-      default:
-        console.log('[STRIPE WEBHOOK] Evento ignorado:', event.type);
+    // Processar depois de responder (o cron apanha o que ficar por fazer)
+    if (!duplicate) {
+      kickStripeEventsWorker(db);
     }
 
     return new Response(
-      JSON.stringify({ received: true }),
+      JSON.stringify({ received: true, duplicate }),
       {
         status: 200,
         headers: { 'Content-Type': 'application/json' },
@@ -129,7 +51,8 @@ export async function POST(request) {
     );
 
   } catch (err) {
-    console.error('[STRIPE WEBHOOK] Erro interno:', err);
+    // Sem o evento gravado o Stripe tem de voltar a enviar
+    console.error('[STRIPE WEBHOOK] Erro ao gravar evento:', err);
     return new Response('Webhook handler failed', { status: 500 });
   }
 }
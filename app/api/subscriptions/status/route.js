@@ -1,11 +1,12 @@
 import { NextResponse } from 'next/server';
-import jwt from 'jsonwebtoken';
 import { MongoClient } from 'mongodb';
+import { verifyToken } from '@/lib/auth';
+import { ownerKey, getEntitlements, refreshEntitlements } from '@/lib/entitlements';
+import { DB_NAME } from '@/lib/mongodb';
 
 // ✅ ADICIONADO: Forçar rota dinâmica
 export const dynamic = 'force-dynamic';
 
-const JWT_SECRET = process.env.JWT_SECRET;
 const MONGO_URL = process.env.MONGO_URL;
 
 let cachedClient = null;
@@ -17,14 +18,6 @@ async function connectToDatabase() {
   return client;
 }
 
-function verifyToken(token) {
-  try {
-    return jwt.verify(token, JWT_SECRET);
-  } catch {
-    return null;
-  }
-}
-
 export async function GET(request) {
   try {
     const auth = request.headers.get('authorization');
@@ -41,22 +34,25 @@ export async function GET(request) {
     }
 
     const client = await connectToDatabase();
-    const db = client.db(process.env.DB_NAME || 'barbearia_saas');
+    const db = client.db(DB_NAME);
 
-    const subscription = await db.collection('subscriptions').findOne({
-      user_id: decoded.userId,
-      status: { $in: ['trialing', 'active'] },
-    });
+    // Estado e uso do owner a partir dos entitlements (cache em memória).
+    // Os estados "ainda não" são os que o onboarding consulta em polling,
+    // por isso nesses casos lê-se sempre o valor atual.
+    const key = ownerKey(decoded.userId);
+    let entitlements = await getEntitlements(db, key);
+    if (entitlements.status === 'none' || entitlements.usage.barbearias === 0) {
+      entitlements = await refreshEntitlements(db, key);
+    }
 
-    const barbearia = await db.collection('barbearias').findOne({
-      owner_id: decoded.userId,
-    });
+    const hasSubscription = entitlements.status !== 'none';
+    const hasBarbearia = entitlements.usage.barbearias > 0;
 
     // ✅ AQUI É O LUGAR CERTO!
     return NextResponse.json({
-      has_subscription: !!subscription,
-      has_barbearia: !!barbearia,
-      ready: !!barbearia  // → LINHA ADICIONADA
+      has_subscription: hasSubscription,
+      has_barbearia: hasBarbearia,
+      ready: hasBarbearia  // → LINHA ADICIONADA
     });
 
   } catch (error) {
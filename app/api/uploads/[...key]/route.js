@@ -0,0 +1,43 @@
+import { NextResponse } from 'next/server';
+import { readUpload, isValidUploadKey, contentTypeForKey, IMMUTABLE_CACHE_CONTROL } from '@/lib/upload-storage';
+
+export const dynamic = 'force-dynamic';
+
+// GET /api/uploads/<aa>/<sha256>.<ext> - ficheiros de lib/upload-storage.
+// A chave é o hash do conteúdo, por isso a resposta nunca muda: o browser e a
+// CDN guardam-na para sempre e o ETag é o próprio hash.
+export async function GET(request, { params }) {
+  const key = (params?.key || []).join('/');
+  if (!isValidUploadKey(key)) {
+    return NextResponse.json({ error: 'Ficheiro não encontrado' }, { status: 404 });
+  }
+
+  const etag = `"${key.split('/')[1].split('.')[0]}"`;
+  const headers = {
+    'Cache-Control': IMMUTABLE_CACHE_CONTROL,
+    ETag: etag
+  };
+
+  if (request.headers.get('if-none-match') === etag) {
+    return new NextResponse(null, { status: 304, headers });
+  }
+
+  try {
+    const upload = await readUpload(key);
+    if (!upload) {
+      return NextResponse.json({ error: 'Ficheiro não encontrado' }, { status: 404 });
+    }
+
+    return new NextResponse(upload.body, {
+      status: 200,
+      headers: {
+        ...headers,
+        'Content-Type': contentTypeForKey(key),
+        ...(upload.size ? { 'Content-Length': String(upload.size) } : {})
+      }
+    });
+  } catch (error) {
+    console.error('Erro ao ler upload:', error);
+    return NextResponse.json({ error: 'Erro ao ler ficheiro' }, { status: 500 });
+  }
+}
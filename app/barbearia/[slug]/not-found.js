@@ -0,0 +1,23 @@
+import Link from 'next/link';
+import { Button } from '@/components/ui/button';
+import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
+
+export default function BarbeariaNotFound() {
+  return (
+    <div className="min-h-screen bg-zinc-950 flex items-center justify-center">
+      <Card className="bg-zinc-800 border-zinc-700 max-w-md">
+        <CardHeader>
+          <CardTitle className="text-white">Barbearia não encontrada</CardTitle>
+          <CardDescription className="text-zinc-400">
+            A barbearia que procuras não existe ou foi removida.
+          </CardDescription>
+        </CardHeader>
+        <CardContent>
+          <Button asChild className="w-full bg-amber-600 hover:bg-amber-700">
+            <Link href="/">Voltar ao Início</Link>
+          </Button>
+        </CardContent>
+      </Card>
+    </div>
+  );
+}
@@ -17,6 +17,7 @@ export default function GerirPlanoPage() {
   const [mounted, setMounted] = useState(false);
   const [user, setUser] = useState(null);
   const [subscription, setSubscription] = useState(null);
+  const [entitlements, setEntitlements] = useState(null);
   const [plans, setPlans] = useState([]);
   const [loading, setLoading] = useState(true);
   const [changingPlan, setChangingPlan] = useState(null);
@@ -64,6 +65,7 @@ export default function GerirPlanoPage() {
       if (subRes.ok) {
         const subData = await subRes.json();
         setSubscription(subData.subscription);
+        setEntitlements(subData.entitlements || null);
       }
 
       // Buscar planos disponíveis
@@ -286,6 +288,22 @@ export default function GerirPlanoPage() {
                 </div>
               </div>
 
+              {entitlements && (
+                <div className="grid grid-cols-1 md:grid-cols-2 gap-6 mt-6">
+                  {[
+                    { key: 'barbeiros', label: 'Barbeiros' },
+                    { key: 'locais', label: 'Locais' }
+                  ].map(({ key, label }) => (
+                    <div key={key} className="bg-zinc-800/50 rounded-lg p-4">
+                      <span className="text-zinc-400 text-sm">{label} em uso</span>
+                      <p className="text-white font-semibold">
+                        {entitlements.usage[key]} / {entitlements.limits[key] ?? 'ilimitado'}
+                      </p>
+                    </div>
+                  ))}
+                </div>
+              )}
+
               {subscription.status !== 'cancelled' && (
                 <div className="mt-6 pt-6 border-t border-zinc-800">
                   <Button
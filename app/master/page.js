@@ -80,7 +80,7 @@ export default function MasterBackoffice() {
     }
 
     try {
-      const res = await fetch('/api/auth/me', {
+      const res = await fetch('/api/auth/me?source=token', {
         headers: { 'Authorization': `Bearer ${token}` }
       });
 
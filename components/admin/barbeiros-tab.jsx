@@ -0,0 +1,432 @@
+'use client';
+
+import { useState, useEffect } from 'react';
+import { useRouter } from 'next/navigation';
+import { Button } from '@/components/ui/button';
+import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
+import { Input } from '@/components/ui/input';
+import { Label } from '@/components/ui/label';
+import { Plus, Trash2, Users, MapPin } from 'lucide-react';
+import { UpgradeModal } from '@/components/ui/modals';
+
+export function BarbeirosTab({ barbeiros, fetchBarbeiros }) {
+  const router = useRouter();
+  const [showForm, setShowForm] = useState(false);
+  const [editingBarbeiro, setEditingBarbeiro] = useState(null);
+  const [nome, setNome] = useState('');
+  const [email, setEmail] = useState('');
+  const [password, setPassword] = useState('');
+  const [telemovel, setTelemovel] = useState('');
+  const [biografia, setBiografia] = useState('');
+  const [especialidades, setEspecialidades] = useState('');
+  const [localId, setLocalId] = useState('');
+  const [locais, setLocais] = useState([]);
+  const [error, setError] = useState('');
+  const [loading, setLoading] = useState(false);
+  const [upgradeModal, setUpgradeModal] = useState({ isOpen: false, message: '', currentPlan: '', limit: 0 });
+
+  // Buscar locais disponíveis
+  useEffect(() => {
+    fetchLocais();
+  }, []);
+
+  const fetchLocais = async () => {
+    try {
+      const response = await fetch('/api/locais', {
+        headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
+      });
+      const data = await response.json();
+      setLocais(data.locais || []);
+    } catch (error) {
+      console.error('Erro ao carregar locais:', error);
+    }
+  };
+
+  const resetForm = () => {
+    setNome('');
+    setEmail('');
+    setPassword('');
+    setTelemovel('');
+    setBiografia('');
+    setEspecialidades('');
+    setLocalId('');
+    setEditingBarbeiro(null);
+    setError('');
+  };
+
+  const handleEdit = (barbeiro) => {
+    setEditingBarbeiro(barbeiro);
+    setNome(barbeiro.nome || '');
+    setEmail(barbeiro.email || '');
+    setPassword('');
+    setTelemovel(barbeiro.telemovel || '');
+    setBiografia(barbeiro.biografia || '');
+    setEspecialidades(Array.isArray(barbeiro.especialidades) ? barbeiro.especialidades.join(', ') : '');
+    setLocalId(barbeiro.local_id || '');
+    setShowForm(true);
+  };
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    setError('');
+    setLoading(true);
+
+    const especialidadesArray = especialidades
+      .split(',')
+      .map(e => e.trim())
+      .filter(e => e.length > 0);
+
+    try {
+      const url = editingBarbeiro 
+        ? `/api/barbeiros/${editingBarbeiro._id}`
+        : '/api/barbeiros';
+      
+      const method = editingBarbeiro ? 'PUT' : 'POST';
+      
+      const bodyData = {
+        nome,
+        email,
+        telemovel,
+        biografia,
+        especialidades: especialidadesArray,
+        local_id: localId || null
+      };
+
+      // Só incluir password se for novo barbeiro ou se foi preenchida na edição
+      if (!editingBarbeiro || password.length > 0) {
+        bodyData.password = password;
+      }
+
+      const response = await fetch(url, {
+        method,
+        headers: {
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${localStorage.getItem('token')}`
+        },
+        body: JSON.stringify(bodyData)
+      });
+
+      if (response.ok) {
+        resetForm();
+        setShowForm(false);
+        fetchBarbeiros();
+      } else {
+        const data = await response.json();
+        
+        // Verificar se é erro de limite de plano
+        if (data.upgrade_required) {
+          setUpgradeModal({
+            isOpen: true,
+            message: data.message,
+            currentPlan: data.current_plan,
+            limit: data.limit
+          });
+          setShowForm(false);
+        } else {
+          setError(data.error);
+        }
+      }
+    } catch (error) {
+      setError('Erro ao guardar barbeiro');
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const handleDelete = async (id) => {
+    if (!confirm('Tem certeza que deseja remover este barbeiro?')) return;
+
+    try {
+      await fetch(`/api/barbeiros/${id}`, {
+        method: 'DELETE',
+        headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
+      });
+      fetchBarbeiros();
+    } catch (error) {
+      console.error('Error:', error);
+    }
+  };
+
+  const handleToggleAtivo = async (barbeiro) => {
+    try {
+      await fetch(`/api/barbeiros/${barbeiro._id}`, {
+        method: 'PUT',
+        headers: {
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${localStorage.getItem('token')}`
+        },
+        body: JSON.stringify({
+          ...barbeiro,
+          ativo: !barbeiro.ativo
+        })
+      });
+      fetchBarbeiros();
+    } catch (error) {
+      console.error('Error:', error);
+    }
+  };
+
+  return (
+    <div className="space-y-4">
+      <Card className="bg-zinc-800 border-zinc-700">
+        <CardHeader>
+          <div className="flex justify-between items-center">
+            <div>
+              <CardTitle className="text-white">Profissionais</CardTitle>
+              <CardDescription className="text-zinc-400">Gerir equipa de profissionais - criar contas de acesso</CardDescription>
+            </div>
+            <Button
+              onClick={() => {
+                resetForm();
+                setShowForm(!showForm);
+              }}
+              className="bg-amber-600 hover:bg-amber-700"
+            >
+              <Plus className="mr-2 h-4 w-4" />
+              Adicionar Profissional
+            </Button>
+          </div>
+        </CardHeader>
+        <CardContent>
+          {showForm && (
+            <form onSubmit={handleSubmit} className="mb-6 space-y-4 p-4 bg-zinc-900 rounded-lg">
+              <h3 className="text-white font-semibold text-lg mb-4">
+                {editingBarbeiro ? 'Editar Profissional' : 'Novo Profissional'}
+              </h3>
+              {error && (
+                <div className="bg-red-900/20 border border-red-900 text-red-400 px-4 py-2 rounded">
+                  {error}
+                </div>
+              )}
+              
+              {/* Linha 1: Nome, Email */}
+              <div className="grid grid-cols-2 gap-4">
+                <div className="space-y-2">
+                  <Label className="text-zinc-300">Nome *</Label>
+                  <Input
+                    value={nome}
+                    onChange={(e) => setNome(e.target.value)}
+                    className="bg-zinc-800 border-zinc-700 text-white"
+                    placeholder="Ex: João Silva"
+                    required
+                  />
+                </div>
+                <div className="space-y-2">
+                  <Label className="text-zinc-300">Email *</Label>
+                  <Input
+                    type="email"
+                    value={email}
+                    onChange={(e) => setEmail(e.target.value)}
+                    className="bg-zinc-800 border-zinc-700 text-white"
+                    placeholder="joao@barbearia.pt"
+                    required
+                  />
+                </div>
+              </div>
+
+              {/* Linha 2: Password, Telemóvel */}
+              <div className="grid grid-cols-2 gap-4">
+                <div className="space-y-2">
+                  <Label className="text-zinc-300">
+                    {editingBarbeiro ? 'Nova Palavra-passe (deixe vazio para manter)' : 'Palavra-passe *'}
+                  </Label>
+                  <Input
+                    type="password"
+                    value={password}
+                    onChange={(e) => setPassword(e.target.value)}
+                    className="bg-zinc-800 border-zinc-700 text-white"
+                    placeholder="Mínimo 6 caracteres"
+                    minLength={editingBarbeiro ? 0 : 6}
+                    required={!editingBarbeiro}
+                  />
+                </div>
+                <div className="space-y-2">
+                  <Label className="text-zinc-300">Telemóvel</Label>
+                  <Input
+                    type="tel"
+                    value={telemovel}
+                    onChange={(e) => setTelemovel(e.target.value)}
+                    className="bg-zinc-800 border-zinc-700 text-white"
+                    placeholder="+351 912 345 678"
+                  />
+                </div>
+              </div>
+
+              {/* Linha 2.5: Local de Trabalho */}
+              {locais.length > 0 && (
+                <div className="space-y-2">
+                  <Label className="text-zinc-300 flex items-center gap-2">
+                    <MapPin className="h-4 w-4 text-amber-500" />
+                    Local de Trabalho
+                  </Label>
+                  <select
+                    value={localId}
+                    onChange={(e) => setLocalId(e.target.value)}
+                    className="w-full bg-zinc-800 border border-zinc-700 text-white rounded-md px-3 py-2"
+                  >
+                    <option value="">Sem local específico (todos os locais)</option>
+                    {locais.filter(l => l.ativo !== false).map(local => (
+                      <option key={local._id} value={local._id}>
+                        {local.nome} - {local.morada}
+                      </option>
+                    ))}
+                  </select>
+                  <p className="text-zinc-500 text-xs">
+                    Selecione o local onde este profissional trabalha. Se não selecionar, ele poderá atender em qualquer local.
+                  </p>
+                </div>
+              )}
+
+              {/* Linha 3: Especialidades */}
+              <div className="space-y-2">
+                <Label className="text-zinc-300">Especialidades</Label>
+                <Input
+                  value={especialidades}
+                  onChange={(e) => setEspecialidades(e.target.value)}
+                  className="bg-zinc-800 border-zinc-700 text-white"
+                  placeholder="Ex: Corte clássico, Barba, Degradê (separados por vírgula)"
+                />
+                <p className="text-zinc-500 text-xs">Separe as especialidades por vírgulas</p>
+              </div>
+
+              {/* Linha 4: Biografia */}
+              <div className="space-y-2">
+                <Label className="text-zinc-300">Biografia</Label>
+                <textarea
+                  value={biografia}
+                  onChange={(e) => setBiografia(e.target.value)}
+                  className="w-full bg-zinc-800 border border-zinc-700 text-white rounded-md px-3 py-2 min-h-[80px]"
+                  placeholder="Breve descrição sobre o profissional..."
+                />
+              </div>
+
+              <div className="flex gap-2">
+                <Button type="submit" className="bg-amber-600 hover:bg-amber-700" disabled={loading}>
+                  {loading ? 'A guardar...' : (editingBarbeiro ? 'Guardar Alterações' : 'Adicionar')}
+                </Button>
+                <Button 
+                  type="button" 
+                  variant="outline" 
+                  className="border-zinc-700"
+                  onClick={() => {
+                    resetForm();
+                    setShowForm(false);
+                  }}
+                >
+                  Cancelar
+                </Button>
+              </div>
+            </form>
+          )}
+
+          {barbeiros.length === 0 ? (
+            <div className="text-center py-12">
+              <Users className="h-12 w-12 text-zinc-600 mx-auto mb-4" />
+              <p className="text-zinc-400">Nenhum barbeiro registado</p>
+              <p className="text-zinc-500 text-sm mt-2">Adicione barbeiros para que possam aceder ao sistema e gerir as suas marcações</p>
+            </div>
+          ) : (
+            <div className="grid md:grid-cols-2 lg:grid-cols-3 gap-4">
+              {barbeiros.map((barbeiro) => (
+                <Card key={barbeiro._id} className={`bg-zinc-900 border-zinc-700 ${barbeiro.ativo === false ? 'opacity-60' : ''}`}>
+                  <CardHeader className="pb-2">
+                    <div className="flex justify-between items-start">
+                      <div className="flex items-center gap-3">
+                        <div className="w-12 h-12 bg-amber-600 rounded-full flex items-center justify-center text-white text-lg font-bold">
+                          {barbeiro.nome?.charAt(0).toUpperCase() || 'B'}
+                        </div>
+                        <div>
+                          <CardTitle className="text-white text-lg">{barbeiro.nome}</CardTitle>
+                          <p className="text-zinc-400 text-sm">{barbeiro.email}</p>
+                        </div>
+                      </div>
+                      <div className={`px-2 py-1 rounded text-xs ${barbeiro.ativo !== false ? 'bg-green-900/50 text-green-400' : 'bg-red-900/50 text-red-400'}`}>
+                        {barbeiro.ativo !== false ? 'Ativo' : 'Inativo'}
+                      </div>
+                    </div>
+                  </CardHeader>
+                  <CardContent className="space-y-3">
+                    {barbeiro.telemovel && (
+                      <div className="flex items-center gap-2 text-zinc-300 text-sm">
+                        <span className="text-zinc-500">📞</span>
+                        {barbeiro.telemovel}
+                      </div>
+                    )}
+
+                    {/* Local de Trabalho */}
+                    {barbeiro.local_id && (
+                      <div className="flex items-center gap-2 text-zinc-300 text-sm">
+                        <MapPin className="h-4 w-4 text-amber-500" />
+                        <span>
+                          {locais.find(l => l._id === barbeiro.local_id)?.nome || 'Local não encontrado'}
+                        </span>
+                      </div>
+                    )}
+                    {!barbeiro.local_id && locais.length > 0 && (
+                      <div className="flex items-center gap-2 text-zinc-500 text-sm">
+                        <MapPin className="h-4 w-4" />
+                        <span className="italic">Todos os locais</span>
+                      </div>
+                    )}
+                    
+                    {barbeiro.especialidades && barbeiro.especialidades.length > 0 && (
+                      <div className="flex flex-wrap gap-1">
+                        {barbeiro.especialidades.map((esp, idx) => (
+                          <span key={idx} className="bg-amber-900/30 text-amber-400 px-2 py-0.5 rounded text-xs">
+                            {esp}
+                          </span>
+                        ))}
+                      </div>
+                    )}
+                    
+                    {barbeiro.biografia && (
+                      <p className="text-zinc-400 text-sm line-clamp-2">{barbeiro.biografia}</p>
+                    )}
+
+                    <div className="flex gap-2 pt-2 border-t border-zinc-800">
+                      <Button
+                        size="sm"
+                        variant="outline"
+                        className="flex-1 border-zinc-700 hover:bg-zinc-800"
+                        onClick={() => handleEdit(barbeiro)}
+                      >
+                        Editar
+                      </Button>
+                      <Button
+                        size="sm"
+                        variant="outline"
+                        className={`border-zinc-700 ${barbeiro.ativo !== false ? 'hover:bg-yellow-900/30' : 'hover:bg-green-900/30'}`}
+                        onClick={() => handleToggleAtivo(barbeiro)}
+                      >
+                        {barbeiro.ativo !== false ? 'Desativar' : 'Ativar'}
+                      </Button>
+                      <Button
+                        variant="destructive"
+                        size="sm"
+                        onClick={() => handleDelete(barbeiro._id)}
+                      >
+                        <Trash2 className="h-4 w-4" />
+                      </Button>
+                    </div>
+                  </CardContent>
+                </Card>
+              ))}
+            </div>
+          )}
+        </CardContent>
+      </Card>
+
+      {/* Upgrade Modal */}
+      <UpgradeModal
+        isOpen={upgradeModal.isOpen}
+        onClose={() => setUpgradeModal({ ...upgradeModal, isOpen: false })}
+        onUpgrade={() => router.push('/gerir-plano')}
+        title="Limite de Barbeiros Atingido"
+        message={upgradeModal.message}
+        currentPlan={upgradeModal.currentPlan}
+        limit={upgradeModal.limit}
+        resourceType="barbeiros"
+      />
+    </div>
+  );
+}
@@ -0,0 +1,539 @@
+'use client';
+
+import { useState, useEffect } from 'react';
+import { useRouter } from 'next/navigation';
+import { Button } from '@/components/ui/button';
+import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
+import { Input } from '@/components/ui/input';
+import { Label } from '@/components/ui/label';
+import { Package, CreditCard } from 'lucide-react';
+import { CopySuccessModal } from '@/components/ui/modals';
+
+export function ConfiguracoesTab({ barbearia, subscription, fetchSettings }) {
+  const router = useRouter();
+  const [nome, setNome] = useState('');
+  const [descricao, setDescricao] = useState('');
+  const [telefone, setTelefone] = useState('');
+  const [emailContacto, setEmailContacto] = useState('');
+  const [imagemHero, setImagemHero] = useState('');
+  const [heroImageFile, setHeroImageFile] = useState(null);
+  const [heroImagePreview, setHeroImagePreview] = useState('');
+  const [uploadingHero, setUploadingHero] = useState(false);
+  const [permitirEscolhaProfissional, setPermitirEscolhaProfissional] = useState(true);
+  const [loading, setLoading] = useState(false);
+  
+  // Copy URL modal
+  const [showCopyModal, setShowCopyModal] = useState(false);
+  const [copiedUrl, setCopiedUrl] = useState('');
+  
+  // Stripe config
+  const [stripePublicKey, setStripePublicKey] = useState('');
+  const [stripeSecretKey, setStripeSecretKey] = useState('');
+  const [stripeLoading, setStripeLoading] = useState(false);
+  const [stripeSuccess, setStripeSuccess] = useState('');
+  const [stripeError, setStripeError] = useState('');
+
+  useEffect(() => {
+    if (barbearia) {
+      setNome(barbearia.nome || '');
+      setDescricao(barbearia.descricao || '');
+      setTelefone(barbearia.telefone || '');
+      setEmailContacto(barbearia.email_contacto || '');
+      setImagemHero(barbearia.imagem_hero || '');
+      setHeroImagePreview(barbearia.imagem_hero || '');
+      setPermitirEscolhaProfissional(barbearia.permitir_escolha_profissional !== false);
+      setStripePublicKey(barbearia.stripe_public_key || '');
+      // Secret key não é retornada por segurança - só mostramos se está configurada
+    }
+  }, [barbearia]);
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    setLoading(true);
+
+    try {
+      await fetch('/api/barbearia/settings', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${localStorage.getItem('token')}`
+        },
+        body: JSON.stringify({ 
+          nome, 
+          descricao, 
+          telefone, 
+          email_contacto: emailContacto, 
+          imagem_hero: imagemHero,
+          permitir_escolha_profissional: permitirEscolhaProfissional
+        })
+      });
+      alert('Configurações atualizadas com sucesso!');
+      fetchSettings();
+    } catch (error) {
+      console.error('Error:', error);
+      alert('Erro ao atualizar configurações');
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const handleHeroImageChange = (e) => {
+    const file = e.target.files[0];
+    if (file) {
+      const validTypes = ['image/jpeg', 'image/jpg', 'image/png', 'image/webp'];
+      if (!validTypes.includes(file.type)) {
+        alert('Formato inválido! Use JPG, PNG ou WebP');
+        return;
+      }
+      
+      if (file.size > 10 * 1024 * 1024) {
+        alert('Imagem muito grande! Máximo 10MB');
+        return;
+      }
+
+      setHeroImageFile(file);
+      
+      const reader = new FileReader();
+      reader.onloadend = () => {
+        setHeroImagePreview(reader.result);
+      };
+      reader.readAsDataURL(file);
+    }
+  };
+
+  const handleUploadHeroImage = async () => {
+    if (!heroImageFile) return;
+    
+    setUploadingHero(true);
+
+    try {
+      const formData = new FormData();
+      formData.append('image', heroImageFile);
+
+      const res = await fetch('/api/barbearia/upload-hero', {
+        method: 'POST',
+        headers: {
+          'Authorization': `Bearer ${localStorage.getItem('token')}`
+        },
+        body: formData
+      });
+
+      if (res.ok) {
+        alert('Imagem de capa atualizada com sucesso!');
+        setHeroImageFile(null);
+        fetchSettings();
+      } else {
+        const data = await res.json();
+        alert(data.error || 'Erro ao fazer upload');
+      }
+    } catch (error) {
+      alert('Erro de conexão');
+    } finally {
+      setUploadingHero(false);
+    }
+  };
+
+  const handleRemoveHeroImage = async () => {
+    if (!confirm('Tem certeza que deseja remover a imagem de capa?')) return;
+
+    try {
+      const res = await fetch('/api/barbearia/upload-hero', {
+        method: 'DELETE',
+        headers: {
+          'Authorization': `Bearer ${localStorage.getItem('token')}`
+        }
+      });
+
+      if (res.ok) {
+        alert('Imagem de capa removida com sucesso!');
+        setImagemHero('');
+        setHeroImagePreview('');
+        setHeroImageFile(null);
+        fetchSettings();
+      }
+    } catch (error) {
+      alert('Erro ao remover imagem');
+    }
+  };
+
+  const handleStripeSubmit = async (e) => {
+    e.preventDefault();
+    setStripeLoading(true);
+    setStripeSuccess('');
+    setStripeError('');
+
+    try {
+      const response = await fetch('/api/barbearia/stripe-config', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${localStorage.getItem('token')}`
+        },
+        body: JSON.stringify({ 
+          stripe_public_key: stripePublicKey, 
+          stripe_secret_key: stripeSecretKey 
+        })
+      });
+
+      if (response.ok) {
+        setStripeSuccess('Configuração do Stripe guardada com sucesso!');
+        setStripeSecretKey(''); // Limpar por segurança
+        fetchSettings();
+      } else {
+        const data = await response.json();
+        setStripeError(data.error || 'Erro ao guardar configuração');
+      }
+    } catch (error) {
+      setStripeError('Erro ao guardar configuração');
+    } finally {
+      setStripeLoading(false);
+    }
+  };
+
+  if (!barbearia) {
+    return <div className="text-white">A carregar...</div>;
+  }
+
+  const trialDaysLeft = subscription && subscription.trial_end 
+    ? Math.ceil((new Date(subscription.trial_end) - new Date()) / (1000 * 60 * 60 * 24))
+    : 0;
+
+  const getPlanName = (plano) => {
+    switch(plano) {
+      case 'basic': return 'Básico';
+      case 'pro': return 'Pro';
+      case 'enterprise': return 'Enterprise';
+      default: return plano || 'Não definido';
+    }
+  };
+
+  const getPlanPrice = (plano) => {
+    switch(plano) {
+      case 'basic': return 29;
+      case 'pro': return 49;
+      case 'enterprise': return 99;
+      default: return 0;
+    }
+  };
+
+  return (
+    <div className="space-y-6">
+      {/* Subscription Info */}
+      {subscription && (
+        <Card className="bg-gradient-to-r from-amber-900/20 to-zinc-800 border-amber-600">
+          <CardHeader>
+            <CardTitle className="text-white flex items-center gap-2">
+              <span>Plano Ativo: {getPlanName(subscription.plano)}</span>
+              {subscription.status === 'trialing' && (
+                <span className="text-xs bg-blue-500 text-white px-2 py-1 rounded">
+                  Período de Teste
+                </span>
+              )}
+              {subscription.status === 'active' && (
+                <span className="text-xs bg-green-500 text-white px-2 py-1 rounded">
+                  Ativo
+                </span>
+              )}
+            </CardTitle>
+            <CardDescription className="text-zinc-300">
+              {getPlanPrice(subscription.plano)}€/mês • Próxima renovação: {subscription.data_fim ? new Date(subscription.data_fim).toLocaleDateString('pt-PT') : 'N/A'}
+            </CardDescription>
+          </CardHeader>
+          <CardContent>
+            <div className="flex gap-3">
+              <Button
+                variant="outline"
+                className="border-amber-600 text-amber-600 hover:bg-amber-600 hover:text-white"
+                onClick={() => router.push('/gerir-plano')}
+              >
+                Gerir Plano
+              </Button>
+            </div>
+          </CardContent>
+        </Card>
+      )}
+
+      {/* Mostrar aviso se não tiver subscription */}
+      {!subscription && (
+        <Card className="bg-gradient-to-r from-red-900/20 to-zinc-800 border-red-600">
+          <CardHeader>
+            <CardTitle className="text-white flex items-center gap-2">
+              <span>Sem Plano Ativo</span>
+            </CardTitle>
+            <CardDescription className="text-zinc-300">
+              Subscreva um plano para desbloquear todas as funcionalidades.
+            </CardDescription>
+          </CardHeader>
+          <CardContent>
+            <div className="flex gap-3">
+              <Button
+                className="bg-amber-600 hover:bg-amber-700 text-white"
+                onClick={() => router.push('/gerir-plano')}
+              >
+                Ver Planos
+              </Button>
+            </div>
+          </CardContent>
+        </Card>
+      )}
+
+      {/* Barbearia Info */}
+      <Card className="bg-zinc-800 border-zinc-700">
+        <CardHeader>
+          <CardTitle className="text-white">Informações da Barbearia</CardTitle>
+          <CardDescription className="text-zinc-400">
+            Edita as informações públicas da tua barbearia
+          </CardDescription>
+        </CardHeader>
+        <CardContent>
+          <form onSubmit={handleSubmit} className="space-y-4">
+            <div className="space-y-2">
+              <Label className="text-zinc-300">URL Pública</Label>
+              <div className="flex items-center gap-2">
+                <Input
+                  value={`${typeof window !== 'undefined' ? window.location.origin : ''}/barbearia/${barbearia.slug}`}
+                  className="bg-zinc-900 border-zinc-700 text-zinc-400"
+                  readOnly
+                />
+                <Button
+                  type="button"
+                  onClick={() => {
+                    const url = `${window.location.origin}/barbearia/${barbearia.slug}`;
+                    navigator.clipboard.writeText(url);
+                    setCopiedUrl(url);
+                    setShowCopyModal(true);
+                  }}
+                  variant="outline"
+                  className="border-zinc-700"
+                >
+                  Copiar
+                </Button>
+              </div>
+            </div>
+
+            <div className="space-y-2">
+              <Label className="text-zinc-300">Nome da Barbearia *</Label>
+              <Input
+                value={nome}
+                onChange={(e) => setNome(e.target.value)}
+                className="bg-zinc-900 border-zinc-700 text-white"
+                required
+              />
+            </div>
+
+            <div className="space-y-2">
+              <Label className="text-zinc-300">Descrição / Slogan</Label>
+              <Input
+                value={descricao}
+                onChange={(e) => setDescricao(e.target.value)}
+                className="bg-zinc-900 border-zinc-700 text-white"
+                placeholder="Ex: A melhor barbearia de Lisboa"
+              />
+            </div>
+
+            <div className="space-y-2">
+              <Label className="text-zinc-300">Telemóvel</Label>
+              <Input
+                value={telefone}
+                onChange={(e) => setTelefone(e.target.value)}
+                className="bg-zinc-900 border-zinc-700 text-white"
+                placeholder="+351 912 345 678"
+              />
+            </div>
+
+            <div className="space-y-2">
+              <Label className="text-zinc-300">Email de Contacto</Label>
+              <Input
+                value={emailContacto}
+                onChange={(e) => setEmailContacto(e.target.value)}
+                type="email"
+                className="bg-zinc-900 border-zinc-700 text-white"
+                placeholder="contacto@barbearia.pt"
+              />
+            </div>
+
+            <div className="space-y-3 p-4 bg-zinc-900 rounded-lg border border-zinc-700">
+              <Label className="text-zinc-300 text-base font-semibold">Preferências de Marcação</Label>
+              <div className="flex items-start gap-3">
+                <input
+                  type="checkbox"
+                  id="permitirEscolha"
+                  checked={permitirEscolhaProfissional}
+                  onChange={(e) => setPermitirEscolhaProfissional(e.target.checked)}
+                  className="mt-1 w-5 h-5 rounded border-zinc-700 bg-zinc-800 text-amber-600"
+                />
+                <div className="flex-1">
+                  <Label htmlFor="permitirEscolha" className="text-zinc-300 cursor-pointer font-medium">
+                    Permitir que o cliente escolha o profissional
+                  </Label>
+                  <p className="text-zinc-500 text-xs mt-1">
+                    {permitirEscolhaProfissional 
+                      ? 'Clientes poderão escolher o profissional ao fazer marcação' 
+                      : 'O sistema atribuirá automaticamente ou a marcação será feita sem profissional específico'}
+                  </p>
+                </div>
+              </div>
+            </div>
+
+            <div className="space-y-2">
+              <Label className="text-zinc-300">Imagem de Capa da Página Pública</Label>
+              <div className="space-y-3">
+                {/* Preview da imagem de capa */}
+                {heroImagePreview && (
+                  <div className="relative rounded-lg overflow-hidden">
+                    <img 
+                      src={heroImagePreview} 
+                      alt="Hero Preview" 
+                      className="w-full h-48 object-cover border-2 border-zinc-700"
+                    />
+                    <button
+                      type="button"
+                      onClick={handleRemoveHeroImage}
+                      className="absolute top-2 right-2 bg-red-600 hover:bg-red-700 text-white rounded-full w-8 h-8 flex items-center justify-center text-lg font-bold shadow-lg"
+                    >
+                      ×
+                    </button>
+                  </div>
+                )}
+                
+                {!heroImagePreview && (
+                  <div className="w-full h-48 bg-zinc-900 rounded-lg border-2 border-dashed border-zinc-700 flex items-center justify-center">
+                    <div className="text-center">
+                      <Package className="h-12 w-12 text-zinc-600 mx-auto mb-2" />
+                      <p className="text-zinc-500 text-sm">Nenhuma imagem de capa definida</p>
+                    </div>
+                  </div>
+                )}
+                
+                {/* Upload controls */}
+                <div className="flex items-center gap-3">
+                  <label className="cursor-pointer">
+                    <div className="bg-zinc-700 hover:bg-zinc-600 text-white px-4 py-2 rounded-md text-sm flex items-center gap-2">
+                      <Package className="h-4 w-4" />
+                      {heroImagePreview ? 'Alterar Imagem' : 'Escolher Imagem'}
+                    </div>
+                    <input
+                      type="file"
+                      accept="image/jpeg,image/jpg,image/png,image/webp"
+                      onChange={handleHeroImageChange}
+                      className="hidden"
+                    />
+                  </label>
+                  
+                  {heroImageFile && (
+                    <Button
+                      type="button"
+                      onClick={handleUploadHeroImage}
+                      disabled={uploadingHero}
+                      className="bg-green-600 hover:bg-green-700"
+                    >
+                      {uploadingHero ? 'A carregar...' : 'Guardar Imagem'}
+                    </Button>
+                  )}
+                </div>
+                
+                <p className="text-zinc-500 text-xs">
+                  Recomendado: Imagem horizontal (1920x800px). Formatos: JPG, PNG ou WebP (máx. 10MB)
+                </p>
+              </div>
+            </div>
+
+            <Button type="submit" className="bg-amber-600 hover:bg-amber-700" disabled={loading}>
+              {loading ? 'A guardar...' : 'Guardar Alterações'}
+            </Button>
+          </form>
+        </CardContent>
+      </Card>
+
+      {/* Stripe Configuration */}
+      <Card className="bg-zinc-800 border-zinc-700">
+        <CardHeader>
+          <div className="flex items-center justify-between">
+            <div>
+              <CardTitle className="text-white flex items-center gap-2">
+                <CreditCard className="h-5 w-5 text-amber-500" />
+                Configuração do Stripe
+              </CardTitle>
+              <CardDescription className="text-zinc-400">
+                Configure o Stripe para aceitar pagamentos de planos de assinatura dos seus clientes
+              </CardDescription>
+            </div>
+            {barbearia.stripe_configured && (
+              <span className="bg-green-900/50 text-green-400 px-3 py-1 rounded-full text-xs font-semibold">
+                ✓ Configurado
+              </span>
+            )}
+          </div>
+        </CardHeader>
+        <CardContent>
+          {stripeSuccess && (
+            <div className="bg-green-900/20 border border-green-900 text-green-400 px-4 py-2 rounded mb-4">
+              {stripeSuccess}
+            </div>
+          )}
+          {stripeError && (
+            <div className="bg-red-900/20 border border-red-900 text-red-400 px-4 py-2 rounded mb-4">
+              {stripeError}
+            </div>
+          )}
+
+          <form onSubmit={handleStripeSubmit} className="space-y-4">
+            <div className="bg-zinc-900 p-4 rounded-lg mb-4">
+              <p className="text-zinc-300 text-sm mb-2">
+                Para configurar o Stripe, precisa de criar uma conta em{' '}
+                <a href="https://stripe.com" target="_blank" rel="noopener noreferrer" className="text-amber-500 hover:underline">
+                  stripe.com
+                </a>
+                {' '}e obter as suas chaves de API.
+              </p>
+              <p className="text-zinc-500 text-xs">
+                As chaves podem ser encontradas em Dashboard → Developers → API keys
+              </p>
+            </div>
+
+            <div className="space-y-2">
+              <Label className="text-zinc-300">Publishable Key (pk_live_... ou pk_test_...)</Label>
+              <Input
+                value={stripePublicKey}
+                onChange={(e) => setStripePublicKey(e.target.value)}
+                className="bg-zinc-900 border-zinc-700 text-white font-mono text-sm"
+                placeholder="pk_live_xxxxxxxxxxxxxxxx"
+              />
+            </div>
+
+            <div className="space-y-2">
+              <Label className="text-zinc-300">Secret Key (sk_live_... ou sk_test_...)</Label>
+              <Input
+                type="password"
+                value={stripeSecretKey}
+                onChange={(e) => setStripeSecretKey(e.target.value)}
+                className="bg-zinc-900 border-zinc-700 text-white font-mono text-sm"
+                placeholder={barbearia.stripe_configured ? '••••••••••••••••' : 'sk_live_xxxxxxxxxxxxxxxx'}
+              />
+              <p className="text-zinc-500 text-xs">
+                {barbearia.stripe_configured 
+                  ? 'Deixe vazio para manter a chave atual. Preencha apenas se quiser alterar.'
+                  : 'A Secret Key é armazenada de forma segura e nunca é exposta.'}
+              </p>
+            </div>
+
+            <Button 
+              type="submit" 
+              className="bg-amber-600 hover:bg-amber-700" 
+              disabled={stripeLoading || (!stripePublicKey && !stripeSecretKey)}
+            >
+              {stripeLoading ? 'A guardar...' : (barbearia.stripe_configured ? 'Atualizar Configuração' : 'Configurar Stripe')}
+            </Button>
+          </form>
+        </CardContent>
+      </Card>
+
+      {/* Copy URL Success Modal */}
+      <CopySuccessModal
+        isOpen={showCopyModal}
+        onClose={() => setShowCopyModal(false)}
+        url={copiedUrl}
+      />
+    </div>
+  );
+}
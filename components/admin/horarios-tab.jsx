@@ -0,0 +1,114 @@
+'use client';
+
+import { useState, useEffect } from 'react';
+import { Button } from '@/components/ui/button';
+import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
+import { Input } from '@/components/ui/input';
+
+export function HorariosTab({ horarios, fetchHorarios }) {
+  const [editedHorarios, setEditedHorarios] = useState([]);
+  const [loading, setLoading] = useState(false);
+
+  useEffect(() => {
+    setEditedHorarios(horarios);
+  }, [horarios]);
+
+  const diasSemana = [
+    { key: 'segunda', label: 'Segunda-feira' },
+    { key: 'terca', label: 'Terça-feira' },
+    { key: 'quarta', label: 'Quarta-feira' },
+    { key: 'quinta', label: 'Quinta-feira' },
+    { key: 'sexta', label: 'Sexta-feira' },
+    { key: 'sabado', label: 'Sábado' },
+    { key: 'domingo', label: 'Domingo' }
+  ];
+
+  const handleChange = (dia, field, value) => {
+    setEditedHorarios(prev => {
+      const horarioIndex = prev.findIndex(h => h.dia_semana === dia);
+      if (horarioIndex >= 0) {
+        const updated = [...prev];
+        updated[horarioIndex] = { ...updated[horarioIndex], [field]: value };
+        return updated;
+      }
+      return prev;
+    });
+  };
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    setLoading(true);
+
+    try {
+      await fetch('/api/horarios', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${localStorage.getItem('token')}`
+        },
+        body: JSON.stringify({ horarios: editedHorarios })
+      });
+      alert('Horários atualizados com sucesso!');
+      fetchHorarios();
+    } catch (error) {
+      console.error('Error:', error);
+      alert('Erro ao atualizar horários');
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  return (
+    <Card className="bg-zinc-800 border-zinc-700">
+      <CardHeader>
+        <CardTitle className="text-white">Horários de Funcionamento</CardTitle>
+        <CardDescription className="text-zinc-400">Definir horários por dia da semana</CardDescription>
+      </CardHeader>
+      <CardContent>
+        <form onSubmit={handleSubmit} className="space-y-4">
+          {diasSemana.map(({ key, label }) => {
+            const horario = editedHorarios.find(h => h.dia_semana === key) || {};
+            return (
+              <div key={key} className="flex items-center gap-4 p-4 bg-zinc-900 rounded-lg">
+                <div className="w-40">
+                  <label className="text-white font-medium">{label}</label>
+                </div>
+                <div className="flex items-center gap-4 flex-1">
+                  <div className="flex items-center gap-2">
+                    <input
+                      type="checkbox"
+                      checked={horario.ativo || false}
+                      onChange={(e) => handleChange(key, 'ativo', e.target.checked)}
+                      className="w-4 h-4"
+                    />
+                    <span className="text-zinc-400 text-sm">Aberto</span>
+                  </div>
+                  {horario.ativo && (
+                    <>
+                      <Input
+                        type="time"
+                        value={horario.hora_inicio || '09:00'}
+                        onChange={(e) => handleChange(key, 'hora_inicio', e.target.value)}
+                        className="bg-zinc-800 border-zinc-700 text-white w-32"
+                      />
+                      <span className="text-zinc-400">às</span>
+                      <Input
+                        type="time"
+                        value={horario.hora_fim || '19:00'}
+                        onChange={(e) => handleChange(key, 'hora_fim', e.target.value)}
+                        className="bg-zinc-800 border-zinc-700 text-white w-32"
+                      />
+                    </>
+                  )}
+                </div>
+              </div>
+            );
+          })}
+          <Button type="submit" className="bg-amber-600 hover:bg-amber-700" disabled={loading}>
+            {loading ? 'A guardar...' : 'Guardar Horários'}
+          </Button>
+        </form>
+      </CardContent>
+    </Card>
+  );
+}
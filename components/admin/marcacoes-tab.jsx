@@ -0,0 +1,727 @@
+'use client';
+
+import { useState, useEffect } from 'react';
+import { Button } from '@/components/ui/button';
+import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
+import { Input } from '@/components/ui/input';
+import { Label } from '@/components/ui/label';
+import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from '@/components/ui/table';
+import { Plus, Calendar, RefreshCw } from 'lucide-react';
+import { MarcacaoDetailModal } from '@/components/ui/modals';
+import { ClientePicker } from '@/components/ui/cliente-search';
+
+export function MarcacoesTab({ marcacoes, fetchMarcacoes, lastUpdate, isRefreshing, onManualRefresh }) {
+  const [filtroStatus, setFiltroStatus] = useState('todas');
+  const [filtroBarbeiro, setFiltroBarbeiro] = useState('todos');
+  const [barbeiros, setBarbeiros] = useState([]);
+  const [servicos, setServicos] = useState([]);
+  const [viewMode, setViewMode] = useState('calendario');
+  const [weekOffset, setWeekOffset] = useState(0);
+  const [selectedMarcacao, setSelectedMarcacao] = useState(null);
+  const [showDetailModal, setShowDetailModal] = useState(false);
+  const [updateLoading, setUpdateLoading] = useState(false);
+  
+  // Nova Marcação Manual
+  const [showNovaModal, setShowNovaModal] = useState(false);
+  const [novoClienteMode, setNovoClienteMode] = useState(false);
+  const [selectedClienteId, setSelectedClienteId] = useState('');
+  const [selectedBarbeiroId, setSelectedBarbeiroId] = useState('');
+  const [selectedServicoId, setSelectedServicoId] = useState('');
+  const [selectedData, setSelectedData] = useState('');
+  const [selectedHora, setSelectedHora] = useState('');
+  const [availableSlots, setAvailableSlots] = useState([]);
+  const [novoCliente, setNovoCliente] = useState({ nome: '', email: '', telemovel: '' });
+  const [marcacaoLoading, setMarcacaoLoading] = useState(false);
+  const [marcacaoError, setMarcacaoError] = useState('');
+
+  // Formatador de tempo relativo
+  const getTimeAgo = (date) => {
+    if (!date) return '';
+    const seconds = Math.floor((new Date() - date) / 1000);
+    if (seconds < 60) return `há ${seconds}s`;
+    const minutes = Math.floor(seconds / 60);
+    if (minutes < 60) return `há ${minutes}m`;
+    return `há ${Math.floor(minutes / 60)}h`;
+  };
+
+  const [timeAgo, setTimeAgo] = useState('');
+  
+  useEffect(() => {
+    const updateTimeAgo = () => setTimeAgo(getTimeAgo(lastUpdate));
+    updateTimeAgo();
+    const interval = setInterval(updateTimeAgo, 5000);
+    return () => clearInterval(interval);
+  }, [lastUpdate]);
+
+  useEffect(() => {
+    fetchBarbeiros();
+    fetchServicos();
+  }, []);
+
+  const fetchBarbeiros = async () => {
+    const response = await fetch('/api/barbeiros', {
+      headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
+    });
+    const data = await response.json();
+    setBarbeiros(data.barbeiros || []);
+  };
+
+  const fetchServicos = async () => {
+    const response = await fetch('/api/servicos', {
+      headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
+    });
+    const data = await response.json();
+    setServicos(data.servicos || []);
+  };
+
+  useEffect(() => {
+    const fetchSlots = async () => {
+      if (!selectedBarbeiroId || !selectedData || !selectedServicoId) {
+        setAvailableSlots([]);
+        return;
+      }
+      
+      try {
+        const response = await fetch(
+          `/api/marcacoes/slots?barbeiro_id=${selectedBarbeiroId}&data=${selectedData}&servico_id=${selectedServicoId}`,
+          { headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` } }
+        );
+        const data = await response.json();
+        setAvailableSlots(data.slots || []);
+      } catch (error) {
+        console.error('Erro ao carregar horários:', error);
+        setAvailableSlots([]);
+      }
+    };
+    
+    fetchSlots();
+  }, [selectedBarbeiroId, selectedData, selectedServicoId]);
+
+  const handleNovaMarcacao = async (e) => {
+    e.preventDefault();
+    setMarcacaoError('');
+    setMarcacaoLoading(true);
+
+    try {
+      let clienteId = selectedClienteId;
+
+      // Se é novo cliente, criar primeiro
+      if (novoClienteMode) {
+        const clienteResponse = await fetch('/api/clientes/manual', {
+          method: 'POST',
+          headers: {
+            'Content-Type': 'application/json',
+            'Authorization': `Bearer ${localStorage.getItem('token')}`
+          },
+          body: JSON.stringify(novoCliente)
+        });
+
+        if (!clienteResponse.ok) {
+          const data = await clienteResponse.json();
+          throw new Error(data.error || 'Erro ao criar cliente');
+        }
+
+        const clienteData = await clienteResponse.json();
+        clienteId = clienteData.cliente._id;
+      }
+
+      // Criar marcação
+      const response = await fetch('/api/marcacoes/manual', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${localStorage.getItem('token')}`
+        },
+        body: JSON.stringify({
+          cliente_id: clienteId,
+          barbeiro_id: selectedBarbeiroId,
+          servico_id: selectedServicoId,
+          data: selectedData,
+          hora: selectedHora
+        })
+      });
+
+      if (response.ok) {
+        setShowNovaModal(false);
+        resetNovaForm();
+        fetchMarcacoes();
+      } else {
+        const data = await response.json();
+        setMarcacaoError(data.error || 'Erro ao criar marcação');
+      }
+    } catch (error) {
+      setMarcacaoError(error.message);
+    } finally {
+      setMarcacaoLoading(false);
+    }
+  };
+
+  const resetNovaForm = () => {
+    setSelectedClienteId('');
+    setSelectedBarbeiroId('');
+    setSelectedServicoId('');
+    setSelectedData('');
+    setSelectedHora('');
+    setNovoClienteMode(false);
+    setNovoCliente({ nome: '', email: '', telemovel: '' });
+    setAvailableSlots([]);
+    setMarcacaoError('');
+  };
+
+  const handleUpdateStatus = async (marcacaoId, newStatus) => {
+    setUpdateLoading(true);
+    try {
+      await fetch(`/api/marcacoes/${marcacaoId}`, {
+        method: 'PUT',
+        headers: {
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${localStorage.getItem('token')}`
+        },
+        body: JSON.stringify({ status: newStatus })
+      });
+      setShowDetailModal(false);
+      setSelectedMarcacao(null);
+      fetchMarcacoes();
+    } catch (error) {
+      console.error('Error:', error);
+    } finally {
+      setUpdateLoading(false);
+    }
+  };
+
+  const openMarcacaoDetail = (marcacao) => {
+    setSelectedMarcacao(marcacao);
+    setShowDetailModal(true);
+  };
+
+  const getWeekDays = (offset = 0) => {
+    const today = new Date();
+    const currentDay = today.getDay();
+    const monday = new Date(today);
+    monday.setDate(today.getDate() - (currentDay === 0 ? 6 : currentDay - 1) + (offset * 7));
+
+    const days = [];
+    for (let i = 0; i < 7; i++) {
+      const day = new Date(monday);
+      day.setDate(monday.getDate() + i);
+      days.push(day);
+    }
+    return days;
+  };
+
+  const weekDays = getWeekDays(weekOffset);
+  const diasSemana = ['Dom', 'Seg', 'Ter', 'Qua', 'Qui', 'Sex', 'Sáb'];
+
+  const marcacoesFiltradas = marcacoes.filter(m => {
+    const matchStatus = filtroStatus === 'todas' || m.status === filtroStatus;
+    const matchBarbeiro = filtroBarbeiro === 'todos' || m.barbeiro_id === filtroBarbeiro;
+    return matchStatus && matchBarbeiro;
+  });
+
+  const getMarcacoesPorDia = (date) => {
+    const dateStr = date.toISOString().split('T')[0];
+    return marcacoesFiltradas.filter(m => m.data === dateStr);
+  };
+
+  const getStatusColor = (status) => {
+    switch(status) {
+      case 'pendente': return 'bg-yellow-900/50 border-yellow-600 text-yellow-400';
+      case 'aceita': return 'bg-green-900/50 border-green-600 text-green-400';
+      case 'concluida': return 'bg-blue-900/50 border-blue-600 text-blue-400';
+      case 'rejeitada': return 'bg-red-900/50 border-red-600 text-red-400';
+      case 'cancelada': return 'bg-gray-900/50 border-gray-600 text-gray-400';
+      default: return 'bg-zinc-900/50 border-zinc-600 text-zinc-400';
+    }
+  };
+
+  const getStatusIcon = (status) => {
+    switch(status) {
+      case 'pendente': return '⏳';
+      case 'aceita': return '✓';
+      case 'concluida': return '✓✓';
+      case 'rejeitada': return '✗';
+      case 'cancelada': return '⊘';
+      default: return '•';
+    }
+  };
+
+  // Contar marcações por status
+  const contagem = {
+    todas: marcacoes.length,
+    pendente: marcacoes.filter(m => m.status === 'pendente').length,
+    aceita: marcacoes.filter(m => m.status === 'aceita').length,
+    concluida: marcacoes.filter(m => m.status === 'concluida').length
+  };
+
+  return (
+    <div className="space-y-4">
+      {/* Indicador de Atualização Automática */}
+      <div className="flex items-center justify-between bg-zinc-800/50 border border-zinc-700 rounded-lg px-4 py-2">
+        <div className="flex items-center gap-2 text-sm text-zinc-400">
+          <div className={`w-2 h-2 rounded-full ${isRefreshing ? 'bg-amber-500 animate-pulse' : 'bg-green-500'}`}></div>
+          <span>Atualização automática ativa</span>
+          {lastUpdate && (
+            <span className="text-zinc-500">• Última atualização: {timeAgo}</span>
+          )}
+        </div>
+        <Button
+          size="sm"
+          variant="ghost"
+          onClick={onManualRefresh}
+          disabled={isRefreshing}
+          className="text-zinc-400 hover:text-white"
+        >
+          <RefreshCw className={`h-4 w-4 mr-1 ${isRefreshing ? 'animate-spin' : ''}`} />
+          {isRefreshing ? 'A atualizar...' : 'Atualizar agora'}
+        </Button>
+      </div>
+
+      {/* Filtros e Toggle View */}
+      <Card className="bg-zinc-800 border-zinc-700">
+        <CardContent className="pt-6">
+          <div className="flex flex-wrap gap-4 items-center justify-between">
+            <div className="flex gap-3 flex-wrap">
+              {/* Filtro Status */}
+              <div className="flex gap-2 flex-wrap">
+                <Button
+                  size="sm"
+                  variant={filtroStatus === 'todas' ? 'default' : 'outline'}
+                  onClick={() => setFiltroStatus('todas')}
+                  className={filtroStatus === 'todas' ? 'bg-amber-600' : 'border-zinc-700'}
+                >
+                  Todas ({contagem.todas})
+                </Button>
+                <Button
+                  size="sm"
+                  variant={filtroStatus === 'pendente' ? 'default' : 'outline'}
+                  onClick={() => setFiltroStatus('pendente')}
+                  className={filtroStatus === 'pendente' ? 'bg-yellow-600' : 'border-zinc-700'}
+                >
+                  ⏳ Pendentes ({contagem.pendente})
+                </Button>
+                <Button
+                  size="sm"
+                  variant={filtroStatus === 'aceita' ? 'default' : 'outline'}
+                  onClick={() => setFiltroStatus('aceita')}
+                  className={filtroStatus === 'aceita' ? 'bg-green-600' : 'border-zinc-700'}
+                >
+                  ✓ Aceitas ({contagem.aceita})
+                </Button>
+                <Button
+                  size="sm"
+                  variant={filtroStatus === 'concluida' ? 'default' : 'outline'}
+                  onClick={() => setFiltroStatus('concluida')}
+                  className={filtroStatus === 'concluida' ? 'bg-blue-600' : 'border-zinc-700'}
+                >
+                  ✓✓ Concluídas ({contagem.concluida})
+                </Button>
+              </div>
+
+              {/* Filtro Barbeiro */}
+              <select
+                value={filtroBarbeiro}
+                onChange={(e) => setFiltroBarbeiro(e.target.value)}
+                className="bg-zinc-900 border border-zinc-700 text-white rounded px-3 py-1.5 text-sm"
+              >
+                <option value="todos">Todos Profissionais</option>
+                {barbeiros.map(b => (
+                  <option key={b._id} value={b._id}>{b.nome}</option>
+                ))}
+              </select>
+            </div>
+
+            {/* Toggle View + Nova Marcação */}
+            <div className="flex gap-2">
+              <Button
+                size="sm"
+                onClick={() => setShowNovaModal(true)}
+                className="bg-green-600 hover:bg-green-700"
+              >
+                <Plus className="h-4 w-4 mr-1" />
+                Nova Marcação
+              </Button>
+              <Button
+                size="sm"
+                variant={viewMode === 'calendario' ? 'default' : 'outline'}
+                onClick={() => setViewMode('calendario')}
+                className={viewMode === 'calendario' ? 'bg-amber-600' : 'border-zinc-700'}
+              >
+                <Calendar className="h-4 w-4 mr-1" />
+                Calendário
+              </Button>
+              <Button
+                size="sm"
+                variant={viewMode === 'tabela' ? 'default' : 'outline'}
+                onClick={() => setViewMode('tabela')}
+                className={viewMode === 'tabela' ? 'bg-amber-600' : 'border-zinc-700'}
+              >
+                Tabela
+              </Button>
+            </div>
+          </div>
+        </CardContent>
+      </Card>
+
+      {/* Modal Nova Marcação Manual */}
+      {showNovaModal && (
+        <div className="fixed inset-0 bg-black/80 flex items-center justify-center z-50 p-4">
+          <Card className="bg-zinc-800 border-zinc-700 max-w-2xl w-full max-h-[90vh] overflow-y-auto">
+            <CardHeader>
+              <div className="flex justify-between items-center">
+                <div>
+                  <CardTitle className="text-white">Nova Marcação Manual</CardTitle>
+                  <CardDescription className="text-zinc-400">
+                    Criar marcação para cliente existente ou novo
+                  </CardDescription>
+                </div>
+                <button 
+                  onClick={() => { setShowNovaModal(false); resetNovaForm(); }}
+                  className="text-zinc-400 hover:text-white text-2xl"
+                >
+                  ×
+                </button>
+              </div>
+            </CardHeader>
+            <CardContent>
+              {marcacaoError && (
+                <div className="bg-red-900/20 border border-red-900 text-red-400 px-4 py-2 rounded mb-4">
+                  {marcacaoError}
+                </div>
+              )}
+
+              <form onSubmit={handleNovaMarcacao} className="space-y-4">
+                {/* Selecção Cliente */}
+                <div className="space-y-3">
+                  <Label className="text-zinc-300">Cliente</Label>
+                  <div className="flex gap-2 mb-2">
+                    <Button
+                      type="button"
+                      size="sm"
+                      variant={!novoClienteMode ? 'default' : 'outline'}
+                      onClick={() => setNovoClienteMode(false)}
+                      className={!novoClienteMode ? 'bg-amber-600' : 'border-zinc-700'}
+                    >
+                      Cliente Existente
+                    </Button>
+                    <Button
+                      type="button"
+                      size="sm"
+                      variant={novoClienteMode ? 'default' : 'outline'}
+                      onClick={() => setNovoClienteMode(true)}
+                      className={novoClienteMode ? 'bg-amber-600' : 'border-zinc-700'}
+                    >
+                      Novo Cliente
+                    </Button>
+                  </div>
+
+                  {!novoClienteMode ? (
+                    <ClientePicker value={selectedClienteId} onChange={setSelectedClienteId} />
+                  ) : (
+                    <div className="grid grid-cols-1 md:grid-cols-3 gap-3 p-3 bg-zinc-900 rounded-lg">
+                      <div className="space-y-1">
+                        <Label className="text-zinc-400 text-sm">Nome *</Label>
+                        <Input
+                          value={novoCliente.nome}
+                          onChange={(e) => setNovoCliente({...novoCliente, nome: e.target.value})}
+                          className="bg-zinc-800 border-zinc-700 text-white"
+                          placeholder="Nome do cliente"
+                          required={novoClienteMode}
+                        />
+                      </div>
+                      <div className="space-y-1">
+                        <Label className="text-zinc-400 text-sm">Email</Label>
+                        <Input
+                          type="email"
+                          value={novoCliente.email}
+                          onChange={(e) => setNovoCliente({...novoCliente, email: e.target.value})}
+                          className="bg-zinc-800 border-zinc-700 text-white"
+                          placeholder="email@exemplo.com"
+                        />
+                      </div>
+                      <div className="space-y-1">
+                        <Label className="text-zinc-400 text-sm">Telemóvel</Label>
+                        <Input
+                          type="tel"
+                          value={novoCliente.telemovel}
+                          onChange={(e) => setNovoCliente({...novoCliente, telemovel: e.target.value})}
+                          className="bg-zinc-800 border-zinc-700 text-white"
+                          placeholder="+351 912 345 678"
+                        />
+                      </div>
+                    </div>
+                  )}
+                </div>
+
+                {/* Selecção Barbeiro e Serviço */}
+                <div className="grid grid-cols-2 gap-4">
+                  <div className="space-y-2">
+                    <Label className="text-zinc-300">Profissional *</Label>
+                    <select
+                      value={selectedBarbeiroId}
+                      onChange={(e) => setSelectedBarbeiroId(e.target.value)}
+                      className="w-full bg-zinc-900 border border-zinc-700 text-white rounded px-3 py-2"
+                      required
+                    >
+                      <option value="">Selecione</option>
+                      {barbeiros.map(b => (
+                        <option key={b._id} value={b._id}>{b.nome}</option>
+                      ))}
+                    </select>
+                  </div>
+                  <div className="space-y-2">
+                    <Label className="text-zinc-300">Serviço *</Label>
+                    <select
+                      value={selectedServicoId}
+                      onChange={(e) => setSelectedServicoId(e.target.value)}
+                      className="w-full bg-zinc-900 border border-zinc-700 text-white rounded px-3 py-2"
+                      required
+                    >
+                      <option value="">Selecione</option>
+                      {servicos.map(s => (
+                        <option key={s._id} value={s._id}>
+                          {s.nome} - {s.preco?.toFixed(2)}€ ({s.duracao}min)
+                        </option>
+                      ))}
+                    </select>
+                  </div>
+                </div>
+
+                {/* Data e Hora */}
+                <div className="grid grid-cols-2 gap-4">
+                  <div className="space-y-2">
+                    <Label className="text-zinc-300">Data *</Label>
+                    <Input
+                      type="date"
+                      value={selectedData}
+                      onChange={(e) => setSelectedData(e.target.value)}
+                      min={new Date().toISOString().split('T')[0]}
+                      className="bg-zinc-900 border-zinc-700 text-white"
+                      required
+                    />
+                  </div>
+                  <div className="space-y-2">
+                    <Label className="text-zinc-300">Hora *</Label>
+                    <select
+                      value={selectedHora}
+                      onChange={(e) => setSelectedHora(e.target.value)}
+                      className="w-full bg-zinc-900 border border-zinc-700 text-white rounded px-3 py-2"
+                      required
+                    >
+                      <option value="">Selecione</option>
+                      {availableSlots.length === 0 && selectedBarbeiroId && selectedData && selectedServicoId ? (
+                        <option value="" disabled>Nenhum horário disponível</option>
+                      ) : (
+                        availableSlots.map(slot => (
+                          <option key={slot} value={slot}>{slot}</option>
+                        ))
+                      )}
+                    </select>
+                  </div>
+                </div>
+
+                <div className="flex gap-3 pt-4">
+                  <Button
+                    type="button"
+                    variant="outline"
+                    className="flex-1 border-zinc-700"
+                    onClick={() => { setShowNovaModal(false); resetNovaForm(); }}
+                  >
+                    Cancelar
+                  </Button>
+                  <Button
+                    type="submit"
+                    className="flex-1 bg-amber-600 hover:bg-amber-700"
+                    disabled={marcacaoLoading || !selectedHora}
+                  >
+                    {marcacaoLoading ? 'A criar...' : 'Criar Marcação'}
+                  </Button>
+                </div>
+              </form>
+            </CardContent>
+          </Card>
+        </div>
+      )}
+
+      {/* Vista Calendário */}
+      {viewMode === 'calendario' && (
+        <Card className="bg-zinc-800 border-zinc-700">
+          <CardHeader>
+            <div className="flex justify-between items-center">
+              <CardTitle className="text-white">
+                Semana: {weekDays[0].toLocaleDateString('pt-PT', { day: '2-digit', month: 'short' })} - {weekDays[6].toLocaleDateString('pt-PT', { day: '2-digit', month: 'short', year: 'numeric' })}
+              </CardTitle>
+              <div className="flex gap-2">
+                <Button
+                  size="sm"
+                  variant="outline"
+                  className="border-zinc-700"
+                  onClick={() => setWeekOffset(weekOffset - 1)}
+                >
+                  ← Anterior
+                </Button>
+                <Button
+                  size="sm"
+                  variant="outline"
+                  className="border-zinc-700"
+                  onClick={() => setWeekOffset(0)}
+                  disabled={weekOffset === 0}
+                >
+                  Hoje
+                </Button>
+                <Button
+                  size="sm"
+                  variant="outline"
+                  className="border-zinc-700"
+                  onClick={() => setWeekOffset(weekOffset + 1)}
+                >
+                  Próxima →
+                </Button>
+              </div>
+            </div>
+          </CardHeader>
+          <CardContent>
+            <div className="grid grid-cols-7 gap-2">
+              {/* Headers dos dias */}
+              {weekDays.map((day, index) => {
+                const isToday = day.toDateString() === new Date().toDateString();
+                return (
+                  <div key={index} className={`text-center p-2 rounded-t ${isToday ? 'bg-amber-600' : 'bg-zinc-700'}`}>
+                    <div className="text-white font-semibold">{diasSemana[day.getDay()]}</div>
+                    <div className={`text-sm ${isToday ? 'text-white' : 'text-zinc-400'}`}>
+                      {day.getDate()}
+                    </div>
+                  </div>
+                );
+              })}
+
+              {/* Marcações por dia */}
+              {weekDays.map((day, index) => {
+                const marcacoesDia = getMarcacoesPorDia(day);
+                const isToday = day.toDateString() === new Date().toDateString();
+
+                return (
+                  <div 
+                    key={index} 
+                    className={`min-h-[300px] border rounded-b p-2 space-y-2 ${
+                      isToday ? 'border-amber-600 bg-amber-900/10' : 'border-zinc-700 bg-zinc-900/50'
+                    }`}
+                  >
+                    {marcacoesDia.length === 0 ? (
+                      <div className="text-zinc-600 text-xs text-center mt-4">Sem marcações</div>
+                    ) : (
+                      marcacoesDia
+                        .sort((a, b) => a.hora.localeCompare(b.hora))
+                        .map(marcacao => (
+                          <div
+                            key={marcacao._id}
+                            className={`border-l-4 p-2 rounded text-xs cursor-pointer hover:opacity-80 transition-opacity ${getStatusColor(marcacao.status)}`}
+                            onClick={() => openMarcacaoDetail(marcacao)}
+                          >
+                            <div className="font-semibold">{marcacao.hora}</div>
+                            <div className="text-white">{marcacao.cliente?.nome}</div>
+                            <div className="text-xs opacity-80">{marcacao.servico?.nome}</div>
+                            <div className="text-xs opacity-80">{marcacao.barbeiro?.nome}</div>
+                            <div className="text-xs text-zinc-400 mt-1">Clique para detalhes</div>
+                          </div>
+                        ))
+                    )}
+                  </div>
+                );
+              })}
+            </div>
+          </CardContent>
+        </Card>
+      )}
+
+      {/* Modal de Detalhes da Marcação */}
+      <MarcacaoDetailModal
+        isOpen={showDetailModal}
+        onClose={() => {
+          setShowDetailModal(false);
+          setSelectedMarcacao(null);
+        }}
+        marcacao={selectedMarcacao}
+        onUpdateStatus={handleUpdateStatus}
+        loading={updateLoading}
+      />
+
+      {/* Vista Tabela (original) */}
+      {viewMode === 'tabela' && (
+        <Card className="bg-zinc-800 border-zinc-700">
+          <CardHeader>
+            <CardTitle className="text-white">Todas as Marcações</CardTitle>
+            <CardDescription className="text-zinc-400">
+              Gestão de marcações da barbearia
+            </CardDescription>
+          </CardHeader>
+          <CardContent>
+            {marcacoesFiltradas.length === 0 ? (
+              <p className="text-zinc-400 text-center py-8">Nenhuma marcação com os filtros selecionados</p>
+            ) : (
+              <div className="overflow-x-auto">
+                <Table>
+                  <TableHeader>
+                    <TableRow className="border-zinc-700">
+                      <TableHead className="text-zinc-300">Data</TableHead>
+                      <TableHead className="text-zinc-300">Hora</TableHead>
+                      <TableHead className="text-zinc-300">Cliente</TableHead>
+                      <TableHead className="text-zinc-300">Profissional</TableHead>
+                      <TableHead className="text-zinc-300">Serviço</TableHead>
+                      <TableHead className="text-zinc-300">Status</TableHead>
+                      <TableHead className="text-zinc-300">Ações</TableHead>
+                    </TableRow>
+                  </TableHeader>
+                  <TableBody>
+                    {marcacoesFiltradas.map((marcacao) => (
+                      <TableRow key={marcacao._id} className="border-zinc-700">
+                        <TableCell className="text-white">{new Date(marcacao.data).toLocaleDateString('pt-PT')}</TableCell>
+                        <TableCell className="text-white font-semibold">{marcacao.hora}</TableCell>
+                        <TableCell className="text-white">{marcacao.cliente?.nome}</TableCell>
+                        <TableCell className="text-white">{marcacao.barbeiro?.nome}</TableCell>
+                        <TableCell className="text-white">{marcacao.servico?.nome}</TableCell>
+                        <TableCell>
+                          <span className={`px-2 py-1 rounded text-xs ${getStatusColor(marcacao.status)}`}>
+                            {getStatusIcon(marcacao.status)} {marcacao.status}
+                          </span>
+                        </TableCell>
+                        <TableCell>
+                          {marcacao.status === 'pendente' && (
+                            <div className="flex gap-2">
+                              <Button
+                                size="sm"
+                                className="bg-green-600 hover:bg-green-700"
+                                onClick={() => handleUpdateStatus(marcacao._id, 'aceita')}
+                              >
+                                Aceitar
+                              </Button>
+                              <Button
+                                size="sm"
+                                variant="destructive"
+                                onClick={() => handleUpdateStatus(marcacao._id, 'rejeitada')}
+                              >
+                                Rejeitar
+                              </Button>
+                            </div>
+                          )}
+                          {marcacao.status === 'aceita' && (
+                            <Button
+                              size="sm"
+                              className="bg-blue-600 hover:bg-blue-700"
+                              onClick={() => handleUpdateStatus(marcacao._id, 'concluida')}
+                            >
+                              Concluir
+                            </Button>
+                          )}
+                        </TableCell>
+                      </TableRow>
+                    ))}
+                  </TableBody>
+                </Table>
+              </div>
+            )}
+          </CardContent>
+        </Card>
+      )}
+    </div>
+  );
+}
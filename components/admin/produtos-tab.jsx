@@ -0,0 +1,332 @@
+'use client';
+
+import { useState } from 'react';
+import { Button } from '@/components/ui/button';
+import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
+import { Input } from '@/components/ui/input';
+import { Label } from '@/components/ui/label';
+import { Plus, Trash2, Package, Edit } from 'lucide-react';
+
+export function ProdutosTab({ produtos, fetchProdutos }) {
+  const [showForm, setShowForm] = useState(false);
+  const [editingProduto, setEditingProduto] = useState(null);
+  const [nome, setNome] = useState('');
+  const [preco, setPreco] = useState('');
+  const [descricao, setDescricao] = useState('');
+  const [imagem, setImagem] = useState('');
+  const [imagemFile, setImagemFile] = useState(null);
+  const [imagemPreview, setImagemPreview] = useState('');
+  const [uploadingImage, setUploadingImage] = useState(false);
+  const [loading, setLoading] = useState(false);
+
+  const resetForm = () => {
+    setNome('');
+    setPreco('');
+    setDescricao('');
+    setImagem('');
+    setImagemFile(null);
+    setImagemPreview('');
+    setEditingProduto(null);
+  };
+
+  const handleEdit = (produto) => {
+    setEditingProduto(produto);
+    setNome(produto.nome || '');
+    setPreco(produto.preco?.toString() || '');
+    setDescricao(produto.descricao || '');
+    setImagem(produto.imagem || '');
+    setImagemPreview(produto.imagem || '');
+    setImagemFile(null);
+    setShowForm(true);
+  };
+
+  const handleImageChange = (e) => {
+    const file = e.target.files[0];
+    if (file) {
+      // Validate file type
+      const validTypes = ['image/jpeg', 'image/jpg', 'image/png', 'image/webp'];
+      if (!validTypes.includes(file.type)) {
+        alert('Formato inválido! Use JPG, PNG ou WebP');
+        return;
+      }
+      
+      // Validate file size (5MB)
+      if (file.size > 5 * 1024 * 1024) {
+        alert('Imagem muito grande! Máximo 5MB');
+        return;
+      }
+
+      setImagemFile(file);
+      
+      // Create preview
+      const reader = new FileReader();
+      reader.onloadend = () => {
+        setImagemPreview(reader.result);
+      };
+      reader.readAsDataURL(file);
+    }
+  };
+
+  const handleRemoveImage = async () => {
+    if (editingProduto && editingProduto.imagem) {
+      try {
+        await fetch(`/app/api/produtos/${editingProduto._id}/upload-image`, {
+          method: 'DELETE',
+          headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
+        });
+        setImagem('');
+        setImagemPreview('');
+        setImagemFile(null);
+        fetchProdutos();
+      } catch (error) {
+        console.error('Error removing image:', error);
+      }
+    } else {
+      setImagemFile(null);
+      setImagemPreview('');
+    }
+  };
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    setLoading(true);
+
+    try {
+      const url = editingProduto ? `/api/produtos/${editingProduto._id}` : '/api/produtos';
+      const method = editingProduto ? 'PUT' : 'POST';
+
+      const response = await fetch(url, {
+        method,
+        headers: {
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${localStorage.getItem('token')}`
+        },
+        body: JSON.stringify({ nome, preco, descricao, imagem: imagem || null })
+      });
+
+      const data = await response.json();
+      
+      // If there's a new image file, upload it
+      if (imagemFile && data.produto) {
+        setUploadingImage(true);
+        const produtoId = editingProduto ? editingProduto._id : data.produto._id;
+        
+        const formData = new FormData();
+        formData.append('image', imagemFile);
+
+        await fetch(`/api/produtos/${produtoId}/upload-image`, {
+          method: 'POST',
+          headers: {
+            'Authorization': `Bearer ${localStorage.getItem('token')}`
+          },
+          body: formData
+        });
+        
+        setUploadingImage(false);
+      }
+
+      resetForm();
+      setShowForm(false);
+      fetchProdutos();
+    } catch (error) {
+      console.error('Error:', error);
+    } finally {
+      setLoading(false);
+      setUploadingImage(false);
+    }
+  };
+
+  const handleDelete = async (id) => {
+    if (!confirm('Tem certeza que deseja remover este produto?')) return;
+
+    try {
+      await fetch(`/api/produtos/${id}`, {
+        method: 'DELETE',
+        headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
+      });
+      fetchProdutos();
+    } catch (error) {
+      console.error('Error:', error);
+    }
+  };
+
+  return (
+    <Card className="bg-zinc-800 border-zinc-700">
+      <CardHeader>
+        <div className="flex justify-between items-center">
+          <div>
+            <CardTitle className="text-white">Produtos</CardTitle>
+            <CardDescription className="text-zinc-400">Gerir produtos para venda</CardDescription>
+          </div>
+          <Button 
+            onClick={() => {
+              resetForm();
+              setShowForm(!showForm);
+            }} 
+            className="bg-amber-600 hover:bg-amber-700"
+          >
+            <Plus className="mr-2 h-4 w-4" />
+            Adicionar Produto
+          </Button>
+        </div>
+      </CardHeader>
+      <CardContent>
+        {showForm && (
+          <form onSubmit={handleSubmit} className="mb-6 space-y-4 p-4 bg-zinc-900 rounded-lg">
+            <h3 className="text-white font-semibold text-lg mb-4">
+              {editingProduto ? 'Editar Produto' : 'Novo Produto'}
+            </h3>
+            
+            <div className="grid grid-cols-2 gap-4">
+              <div className="space-y-2">
+                <Label className="text-zinc-300">Nome do Produto *</Label>
+                <Input
+                  value={nome}
+                  onChange={(e) => setNome(e.target.value)}
+                  className="bg-zinc-800 border-zinc-700 text-white"
+                  placeholder="Ex: Pomada para Cabelo"
+                  required
+                />
+              </div>
+              <div className="space-y-2">
+                <Label className="text-zinc-300">Preço (€) *</Label>
+                <Input
+                  type="number"
+                  step="0.01"
+                  value={preco}
+                  onChange={(e) => setPreco(e.target.value)}
+                  className="bg-zinc-800 border-zinc-700 text-white"
+                  placeholder="25.00"
+                  required
+                />
+              </div>
+            </div>
+            
+            <div className="space-y-2">
+              <Label className="text-zinc-300">Descrição</Label>
+              <textarea
+                value={descricao}
+                onChange={(e) => setDescricao(e.target.value)}
+                className="w-full bg-zinc-800 border border-zinc-700 text-white rounded-md px-3 py-2 min-h-[60px]"
+                placeholder="Descrição do produto..."
+              />
+            </div>
+
+            <div className="space-y-2">
+              <Label className="text-zinc-300">Imagem do Produto</Label>
+              <div className="space-y-3">
+                {/* Preview da imagem */}
+                {(imagemPreview || editingProduto?.imagem) && (
+                  <div className="relative inline-block">
+                    <img 
+                      src={imagemPreview || editingProduto?.imagem} 
+                      alt="Preview" 
+                      className="h-32 w-32 object-cover rounded-lg border-2 border-zinc-700"
+                    />
+                    <button
+                      type="button"
+                      onClick={handleRemoveImage}
+                      className="absolute -top-2 -right-2 bg-red-600 hover:bg-red-700 text-white rounded-full w-6 h-6 flex items-center justify-center text-sm font-bold"
+                    >
+                      ×
+                    </button>
+                  </div>
+                )}
+                
+                {/* Input de arquivo */}
+                <div className="flex items-center gap-3">
+                  <label className="cursor-pointer">
+                    <div className="bg-zinc-700 hover:bg-zinc-600 text-white px-4 py-2 rounded-md text-sm flex items-center gap-2">
+                      <Package className="h-4 w-4" />
+                      {imagemPreview || editingProduto?.imagem ? 'Alterar Imagem' : 'Escolher Imagem'}
+                    </div>
+                    <input
+                      type="file"
+                      accept="image/jpeg,image/jpg,image/png,image/webp"
+                      onChange={handleImageChange}
+                      className="hidden"
+                    />
+                  </label>
+                  <p className="text-zinc-500 text-xs">JPG, PNG ou WebP (máx. 5MB)</p>
+                </div>
+              </div>
+            </div>
+
+            <div className="flex gap-2">
+              <Button type="submit" className="bg-amber-600 hover:bg-amber-700" disabled={loading || uploadingImage}>
+                {uploadingImage ? 'A carregar imagem...' : loading ? 'A guardar...' : (editingProduto ? 'Guardar Alterações' : 'Adicionar')}
+              </Button>
+              <Button 
+                type="button" 
+                variant="outline" 
+                className="border-zinc-700"
+                onClick={() => {
+                  resetForm();
+                  setShowForm(false);
+                }}
+              >
+                Cancelar
+              </Button>
+            </div>
+          </form>
+        )}
+
+        {produtos.length === 0 ? (
+          <div className="text-center py-12">
+            <Package className="h-12 w-12 text-zinc-600 mx-auto mb-4" />
+            <p className="text-zinc-400">Nenhum produto registado</p>
+            <p className="text-zinc-500 text-sm mt-2">Adicione produtos para vender na sua barbearia</p>
+          </div>
+        ) : (
+          <div className="grid md:grid-cols-3 gap-4">
+            {produtos.map((produto) => (
+              <Card key={produto._id} className="bg-zinc-900 border-zinc-700 overflow-hidden">
+                <div className="h-40 overflow-hidden bg-zinc-800">
+                  {produto.imagem ? (
+                    <img 
+                      src={produto.imagem} 
+                      alt={produto.nome}
+                      className="w-full h-full object-cover"
+                    />
+                  ) : (
+                    <div className="w-full h-full flex items-center justify-center">
+                      <Package className="h-16 w-16 text-zinc-600" />
+                    </div>
+                  )}
+                </div>
+                <CardHeader className="pt-3">
+                  <CardTitle className="text-white text-lg">{produto.nome}</CardTitle>
+                  {produto.descricao && (
+                    <CardDescription className="text-zinc-400 line-clamp-2">{produto.descricao}</CardDescription>
+                  )}
+                </CardHeader>
+                <CardContent>
+                  <div className="flex justify-between items-center">
+                    <span className="text-amber-500 text-xl font-bold">{produto.preco?.toFixed(2)}€</span>
+                    <div className="flex gap-2">
+                      <Button
+                        variant="outline"
+                        size="sm"
+                        className="border-zinc-700"
+                        onClick={() => handleEdit(produto)}
+                      >
+                        <Edit className="h-4 w-4" />
+                      </Button>
+                      <Button
+                        variant="destructive"
+                        size="sm"
+                        onClick={() => handleDelete(produto._id)}
+                      >
+                        <Trash2 className="h-4 w-4" />
+                      </Button>
+                    </div>
+                  </div>
+                </CardContent>
+              </Card>
+            ))}
+          </div>
+        )}
+      </CardContent>
+    </Card>
+  );
+}
@@ -0,0 +1,203 @@
+'use client';
+
+import { useState } from 'react';
+import { Button } from '@/components/ui/button';
+import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
+import { Input } from '@/components/ui/input';
+import { Label } from '@/components/ui/label';
+import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from '@/components/ui/table';
+import { Plus, Trash2, Scissors, Edit } from 'lucide-react';
+
+export function ServicosTab({ servicos, fetchServicos }) {
+  const [showForm, setShowForm] = useState(false);
+  const [editingServico, setEditingServico] = useState(null);
+  const [nome, setNome] = useState('');
+  const [preco, setPreco] = useState('');
+  const [duracao, setDuracao] = useState('30');
+  const [loading, setLoading] = useState(false);
+
+  const resetForm = () => {
+    setNome('');
+    setPreco('');
+    setDuracao('30');
+    setEditingServico(null);
+  };
+
+  const handleEdit = (servico) => {
+    setEditingServico(servico);
+    setNome(servico.nome || '');
+    setPreco(servico.preco?.toString() || '');
+    setDuracao(servico.duracao?.toString() || '30');
+    setShowForm(true);
+  };
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    setLoading(true);
+
+    try {
+      const url = editingServico ? `/api/servicos/${editingServico._id}` : '/api/servicos';
+      const method = editingServico ? 'PUT' : 'POST';
+
+      await fetch(url, {
+        method,
+        headers: {
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${localStorage.getItem('token')}`
+        },
+        body: JSON.stringify({ nome, preco, duracao })
+      });
+
+      resetForm();
+      setShowForm(false);
+      fetchServicos();
+    } catch (error) {
+      console.error('Error:', error);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const handleDelete = async (id) => {
+    if (!confirm('Tem certeza que deseja remover este serviço?')) return;
+
+    try {
+      await fetch(`/api/servicos/${id}`, {
+        method: 'DELETE',
+        headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
+      });
+      fetchServicos();
+    } catch (error) {
+      console.error('Error:', error);
+    }
+  };
+
+  return (
+    <Card className="bg-zinc-800 border-zinc-700">
+      <CardHeader>
+        <div className="flex justify-between items-center">
+          <div>
+            <CardTitle className="text-white">Serviços</CardTitle>
+            <CardDescription className="text-zinc-400">Gerir serviços da barbearia</CardDescription>
+          </div>
+          <Button 
+            onClick={() => {
+              resetForm();
+              setShowForm(!showForm);
+            }} 
+            className="bg-amber-600 hover:bg-amber-700"
+          >
+            <Plus className="mr-2 h-4 w-4" />
+            Adicionar Serviço
+          </Button>
+        </div>
+      </CardHeader>
+      <CardContent>
+        {showForm && (
+          <form onSubmit={handleSubmit} className="mb-6 space-y-4 p-4 bg-zinc-900 rounded-lg">
+            <h3 className="text-white font-semibold text-lg mb-4">
+              {editingServico ? 'Editar Serviço' : 'Novo Serviço'}
+            </h3>
+            <div className="grid grid-cols-3 gap-4">
+              <div className="space-y-2">
+                <Label className="text-zinc-300">Nome do Serviço</Label>
+                <Input
+                  value={nome}
+                  onChange={(e) => setNome(e.target.value)}
+                  className="bg-zinc-800 border-zinc-700 text-white"
+                  placeholder="Ex: Corte de Cabelo"
+                  required
+                />
+              </div>
+              <div className="space-y-2">
+                <Label className="text-zinc-300">Preço (€)</Label>
+                <Input
+                  type="number"
+                  step="0.01"
+                  value={preco}
+                  onChange={(e) => setPreco(e.target.value)}
+                  className="bg-zinc-800 border-zinc-700 text-white"
+                  placeholder="15.00"
+                  required
+                />
+              </div>
+              <div className="space-y-2">
+                <Label className="text-zinc-300">Duração (minutos)</Label>
+                <Input
+                  type="number"
+                  value={duracao}
+                  onChange={(e) => setDuracao(e.target.value)}
+                  className="bg-zinc-800 border-zinc-700 text-white"
+                  required
+                />
+              </div>
+            </div>
+            <div className="flex gap-2">
+              <Button type="submit" className="bg-amber-600 hover:bg-amber-700" disabled={loading}>
+                {loading ? 'A guardar...' : (editingServico ? 'Guardar Alterações' : 'Adicionar')}
+              </Button>
+              <Button 
+                type="button" 
+                variant="outline" 
+                className="border-zinc-700"
+                onClick={() => {
+                  resetForm();
+                  setShowForm(false);
+                }}
+              >
+                Cancelar
+              </Button>
+            </div>
+          </form>
+        )}
+
+        {servicos.length === 0 ? (
+          <div className="text-center py-12">
+            <Scissors className="h-12 w-12 text-zinc-600 mx-auto mb-4" />
+            <p className="text-zinc-400">Nenhum serviço registado</p>
+            <p className="text-zinc-500 text-sm mt-2">Adicione serviços que oferece na sua barbearia</p>
+          </div>
+        ) : (
+          <Table>
+            <TableHeader>
+              <TableRow className="border-zinc-700">
+                <TableHead className="text-zinc-300">Nome</TableHead>
+                <TableHead className="text-zinc-300">Preço</TableHead>
+                <TableHead className="text-zinc-300">Duração</TableHead>
+                <TableHead className="text-zinc-300">Ações</TableHead>
+              </TableRow>
+            </TableHeader>
+            <TableBody>
+              {servicos.map((servico) => (
+                <TableRow key={servico._id} className="border-zinc-700">
+                  <TableCell className="text-white font-medium">{servico.nome}</TableCell>
+                  <TableCell className="text-amber-500 font-semibold">{servico.preco?.toFixed(2)}€</TableCell>
+                  <TableCell className="text-zinc-300">{servico.duracao} min</TableCell>
+                  <TableCell>
+                    <div className="flex gap-2">
+                      <Button
+                        variant="outline"
+                        size="sm"
+                        className="border-zinc-700"
+                        onClick={() => handleEdit(servico)}
+                      >
+                        <Edit className="h-4 w-4" />
+                      </Button>
+                      <Button
+                        variant="destructive"
+                        size="sm"
+                        onClick={() => handleDelete(servico._id)}
+                      >
+                        <Trash2 className="h-4 w-4" />
+                      </Button>
+                    </div>
+                  </TableCell>
+                </TableRow>
+              ))}
+            </TableBody>
+          </Table>
+        )}
+      </CardContent>
+    </Card>
+  );
+}
@@ -0,0 +1,202 @@
+'use client';
+
+import { useState, useEffect } from 'react';
+import { Button } from '@/components/ui/button';
+import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
+import { Input } from '@/components/ui/input';
+import { Label } from '@/components/ui/label';
+import { User, Save } from 'lucide-react';
+
+export function PerfilTab({ user, fetchUserData }) {
+  const [nome, setNome] = useState('');
+  const [telemovel, setTelemovel] = useState('');
+  const [biografia, setBiografia] = useState('');
+  const [especialidades, setEspecialidades] = useState('');
+  const [foto, setFoto] = useState('');
+  const [password, setPassword] = useState('');
+  const [loading, setLoading] = useState(false);
+  const [success, setSuccess] = useState('');
+  const [error, setError] = useState('');
+
+  useEffect(() => {
+    if (user) {
+      setNome(user.nome || '');
+      setTelemovel(user.telemovel || '');
+      setBiografia(user.biografia || '');
+      setEspecialidades(Array.isArray(user.especialidades) ? user.especialidades.join(', ') : '');
+      setFoto(user.foto || '');
+    }
+  }, [user]);
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    setLoading(true);
+    setSuccess('');
+    setError('');
+
+    const especialidadesArray = especialidades
+      .split(',')
+      .map(e => e.trim())
+      .filter(e => e.length > 0);
+
+    try {
+      const response = await fetch('/api/barbeiro/perfil', {
+        method: 'PUT',
+        headers: {
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${localStorage.getItem('token')}`
+        },
+        body: JSON.stringify({
+          nome,
+          telemovel,
+          biografia,
+          especialidades: especialidadesArray,
+          foto: foto || null,
+          password: password || undefined
+        })
+      });
+
+      if (response.ok) {
+        setSuccess('Perfil atualizado com sucesso!');
+        setPassword('');
+        fetchUserData();
+      } else {
+        const data = await response.json();
+        setError(data.error || 'Erro ao atualizar perfil');
+      }
+    } catch (err) {
+      setError('Erro ao atualizar perfil');
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  return (
+    <div className="max-w-2xl">
+      <Card className="bg-zinc-800 border-zinc-700">
+        <CardHeader>
+          <CardTitle className="text-white flex items-center gap-2">
+            <User className="h-6 w-6" />
+            O Meu Perfil
+          </CardTitle>
+          <CardDescription className="text-zinc-400">
+            Atualiza as tuas informações pessoais
+          </CardDescription>
+        </CardHeader>
+        <CardContent>
+          <form onSubmit={handleSubmit} className="space-y-6">
+            {success && (
+              <div className="bg-green-900/20 border border-green-900 text-green-400 px-4 py-2 rounded">
+                {success}
+              </div>
+            )}
+            {error && (
+              <div className="bg-red-900/20 border border-red-900 text-red-400 px-4 py-2 rounded">
+                {error}
+              </div>
+            )}
+
+            {/* Foto de Perfil */}
+            <div className="flex items-center gap-6">
+              <div className="shrink-0">
+                {foto ? (
+                  <img src={foto} alt="Foto de perfil" className="w-24 h-24 rounded-full object-cover border-2 border-amber-600" />
+                ) : (
+                  <div className="w-24 h-24 bg-amber-600 rounded-full flex items-center justify-center text-white text-3xl font-bold">
+                    {nome?.charAt(0).toUpperCase() || 'B'}
+                  </div>
+                )}
+              </div>
+              <div className="flex-1 space-y-2">
+                <Label className="text-zinc-300">URL da Foto de Perfil</Label>
+                <Input
+                  value={foto}
+                  onChange={(e) => setFoto(e.target.value)}
+                  className="bg-zinc-900 border-zinc-700 text-white"
+                  placeholder="https://exemplo.com/minha-foto.jpg"
+                />
+                <p className="text-zinc-500 text-xs">Cole o URL de uma foto (Unsplash, Imgur, etc.)</p>
+              </div>
+            </div>
+
+            {/* Nome */}
+            <div className="space-y-2">
+              <Label className="text-zinc-300">Nome *</Label>
+              <Input
+                value={nome}
+                onChange={(e) => setNome(e.target.value)}
+                className="bg-zinc-900 border-zinc-700 text-white"
+                required
+              />
+            </div>
+
+            {/* Email (readonly) */}
+            <div className="space-y-2">
+              <Label className="text-zinc-300">Email</Label>
+              <Input
+                value={user?.email || ''}
+                className="bg-zinc-900 border-zinc-700 text-zinc-500"
+                disabled
+              />
+              <p className="text-zinc-500 text-xs">O email não pode ser alterado</p>
+            </div>
+
+            {/* Telemóvel */}
+            <div className="space-y-2">
+              <Label className="text-zinc-300">Telemóvel</Label>
+              <Input
+                type="tel"
+                value={telemovel}
+                onChange={(e) => setTelemovel(e.target.value)}
+                className="bg-zinc-900 border-zinc-700 text-white"
+                placeholder="+351 912 345 678"
+              />
+            </div>
+
+            {/* Especialidades */}
+            <div className="space-y-2">
+              <Label className="text-zinc-300">Especialidades</Label>
+              <Input
+                value={especialidades}
+                onChange={(e) => setEspecialidades(e.target.value)}
+                className="bg-zinc-900 border-zinc-700 text-white"
+                placeholder="Ex: Corte clássico, Barba, Degradê"
+              />
+              <p className="text-zinc-500 text-xs">Separe as especialidades por vírgulas</p>
+            </div>
+
+            {/* Biografia */}
+            <div className="space-y-2">
+              <Label className="text-zinc-300">Biografia</Label>
+              <textarea
+                value={biografia}
+                onChange={(e) => setBiografia(e.target.value)}
+                className="w-full bg-zinc-900 border border-zinc-700 text-white rounded-md px-3 py-2 min-h-[100px]"
+                placeholder="Conta um pouco sobre ti e a tua experiência..."
+              />
+            </div>
+
+            {/* Nova Password */}
+            <div className="space-y-2">
+              <Label className="text-zinc-300">Nova Palavra-passe</Label>
+              <Input
+                type="password"
+                value={password}
+                onChange={(e) => setPassword(e.target.value)}
+                className="bg-zinc-900 border-zinc-700 text-white"
+                placeholder="Deixe vazio para manter a atual"
+                minLength={6}
+              />
+              <p className="text-zinc-500 text-xs">Mínimo 6 caracteres. Deixe vazio para não alterar.</p>
+            </div>
+
+            <Button type="submit" className="bg-amber-600 hover:bg-amber-700" disabled={loading}>
+              <Save className="mr-2 h-4 w-4" />
+              {loading ? 'A guardar...' : 'Guardar Alterações'}
+            </Button>
+          </form>
+        </CardContent>
+      </Card>
+    </div>
+  );
+}
@@ -0,0 +1,123 @@
+'use client';
+
+import { useState, useEffect } from 'react';
+import { Input } from '@/components/ui/input';
+
+const DEBOUNCE_MS = 200;
+const MIN_CHARS = 2;
+
+// Pesquisa no servidor (GET /api/clientes/search) com debounce; pedidos
+// antigos são cancelados para a lista nunca mostrar resultados fora de ordem
+export function useClienteSearch(termo, { stats = false, limit = 20 } = {}) {
+  const [clientes, setClientes] = useState([]);
+  const [loading, setLoading] = useState(false);
+
+  useEffect(() => {
+    const q = termo.trim();
+    if (q.length < MIN_CHARS) {
+      setClientes([]);
+      setLoading(false);
+      return;
+    }
+
+    const controller = new AbortController();
+    setLoading(true);
+    const timer = setTimeout(async () => {
+      try {
+        const params = new URLSearchParams({ q, limit: String(limit) });
+        if (stats) params.set('stats', 'true');
+        const response = await fetch(`/api/clientes/search?${params}`, {
+          headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` },
+          signal: controller.signal
+        });
+        const data = await response.json();
+        setClientes(data.clientes || []);
+        setLoading(false);
+      } catch (error) {
+        if (error.name !== 'AbortError') {
+          console.error('Erro ao pesquisar clientes:', error);
+          setLoading(false);
+        }
+      }
+    }, DEBOUNCE_MS);
+
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [termo, stats, limit]);
+
+  return { clientes, loading, active: termo.trim().length >= MIN_CHARS };
+}
+
+// Seletor de cliente para as marcações manuais (substitui o <select> com
+// todos os clientes da barbearia)
+export function ClientePicker({ value, onChange }) {
+  const [termo, setTermo] = useState('');
+  const [selected, setSelected] = useState(null);
+  const { clientes, loading, active } = useClienteSearch(termo);
+
+  useEffect(() => {
+    if (!value) setSelected(null);
+  }, [value]);
+
+  const contacto = (c) => [
+    c.email?.includes('@manual.local') ? null : c.email,
+    c.telemovel ? `(${c.telemovel})` : null
+  ].filter(Boolean).join(' ');
+
+  if (value && selected) {
+    return (
+      <div className="flex items-center justify-between w-full bg-zinc-900 border border-zinc-700 text-white rounded px-3 py-2">
+        <span>
+          {selected.nome} <span className="text-zinc-400 text-sm">{contacto(selected)}</span>
+        </span>
+        <button
+          type="button"
+          className="text-amber-500 text-sm"
+          onClick={() => { setSelected(null); onChange(''); }}
+        >
+          Alterar
+        </button>
+      </div>
+    );
+  }
+
+  return (
+    <div className="space-y-1">
+      <Input
+        value={termo}
+        onChange={(e) => setTermo(e.target.value)}
+        className="bg-zinc-900 border-zinc-700 text-white"
+        placeholder="Pesquisar por nome, email ou telemóvel..."
+        autoComplete="off"
+      />
+      {/* Campo escondido para manter a validação "required" do formulário */}
+      <input
+        tabIndex={-1}
+        className="sr-only"
+        value={value || ''}
+        onChange={() => {}}
+        required
+        aria-hidden="true"
+      />
+      {active && (
+        <div className="max-h-56 overflow-y-auto bg-zinc-900 border border-zinc-700 rounded">
+          {clientes.map(c => (
+            <button
+              type="button"
+              key={c._id}
+              className="block w-full text-left px-3 py-2 text-white hover:bg-zinc-800"
+              onClick={() => { setSelected(c); setTermo(''); onChange(c._id); }}
+            >
+              {c.nome} <span className="text-zinc-400 text-sm">{contacto(c)}</span>
+            </button>
+          ))}
+          {!loading && clientes.length === 0 && (
+            <p className="px-3 py-2 text-zinc-500 text-sm">Nenhum cliente encontrado</p>
+          )}
+        </div>
+      )}
+    </div>
+  );
+}
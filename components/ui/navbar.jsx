@@ -21,7 +21,7 @@ export function Navbar() {
     if (!token) return;
 
     try {
-      const response = await fetch('/api/auth/me', {
+      const response = await fetch('/api/auth/me?source=token', {
         headers: { 'Authorization': `Bearer ${token}` }
       });
       
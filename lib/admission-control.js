@@ -0,0 +1,344 @@
+import { NextResponse } from 'next/server';
+import { monitorEventLoopDelay } from 'perf_hooks';
+import { getAuthContext } from '@/lib/auth';
+
+// Controlo de admissão da API: cada pedido é classificado numa classe
+// (marcação pública, auth, leituras do dashboard, analytics do master) e só
+// entra se houver vaga na classe, vaga para o tenant e tokens no balde do
+// tenant. Com o event loop atrasado ou o pool Mongo com espera, as classes
+// de baixa prioridade são recusadas com 429 + Retry-After para que as
+// marcações dos clientes continuem a passar durante um pico.
+
+function envInt(name, fallback) {
+  const value = parseInt(process.env[name] || '', 10);
+  return Number.isFinite(value) ? value : fallback;
+}
+
+const ENABLED = process.env.ADMISSION_CONTROL !== 'false';
+const MAX_EVENT_LOOP_LAG_MS = envInt('ADMISSION_MAX_EVENT_LOOP_LAG_MS', 200);
+const MAX_POOL_WAIT_MS = envInt('ADMISSION_MAX_POOL_WAIT_MS', 100);
+const SAMPLE_INTERVAL_MS = 1000;
+const OVERLOAD_RETRY_AFTER_SECONDS = 2;
+// Proxies de confiança à frente da app: cada um acrescenta um endereço à
+// direita do X-Forwarded-For
+const TRUSTED_PROXY_HOPS = envInt('TRUSTED_PROXY_HOPS', 1);
+
+// maxConcurrent: pedidos em curso na classe (todo o processo)
+// perTenantConcurrent: pedidos em curso por tenant dentro da classe
+// rate/burst: balde de tokens por tenant (pedidos/s e rajada); 0 = sem balde
+// shedOnOverload: recusar quando o processo está sobrecarregado
+const CLASSES = {
+  booking: {
+    maxConcurrent: envInt('ADMISSION_BOOKING_CONCURRENCY', 200),
+    perTenantConcurrent: 0,
+    rate: 0,
+    burst: 0,
+    shedOnOverload: false
+  },
+  auth: {
+    maxConcurrent: envInt('ADMISSION_AUTH_CONCURRENCY', 50),
+    perTenantConcurrent: 0,
+    rate: envInt('ADMISSION_AUTH_RATE', 5),
+    burst: envInt('ADMISSION_AUTH_BURST', 20),
+    shedOnOverload: false
+  },
+  dashboard: {
+    maxConcurrent: envInt('ADMISSION_DASHBOARD_CONCURRENCY', 60),
+    perTenantConcurrent: envInt('ADMISSION_DASHBOARD_TENANT_CONCURRENCY', 8),
+    rate: envInt('ADMISSION_DASHBOARD_RATE', 20),
+    burst: envInt('ADMISSION_DASHBOARD_BURST', 40),
+    shedOnOverload: true
+  },
+  master: {
+    maxConcurrent: envInt('ADMISSION_MASTER_CONCURRENCY', 4),
+    perTenantConcurrent: 2,
+    rate: envInt('ADMISSION_MASTER_RATE', 2),
+    burst: envInt('ADMISSION_MASTER_BURST', 10),
+    shedOnOverload: true
+  }
+};
+
+// Baldes sem uso há mais do que isto são removidos na amostragem
+const BUCKET_IDLE_MS = 10 * 60 * 1000;
+
+const STATE_KEY = Symbol.for('cuthub.admissionControl');
+
+if (!globalThis[STATE_KEY]) {
+  globalThis[STATE_KEY] = {
+    inflight: new Map(),        // classe -> pedidos em curso
+    tenantInflight: new Map(),  // "classe|tenant" -> pedidos em curso
+    buckets: new Map(),         // "classe|tenant" -> { tokens, updatedAt }
+    counters: new Map(),        // "classe|resultado" -> total
+    eventLoopLagMs: 0,
+    poolWaitMs: 0,
+    poolWaiting: 0,
+    pendingCheckouts: new Map(), // address -> [timestamps de início]
+    sampler: null
+  };
+}
+
+const state = globalThis[STATE_KEY];
+
+// Classe de um pedido à API. Tudo o que não é público, auth ou master
+// conta como dashboard (painéis admin/barbeiro/cliente). auth/me é uma
+// leitura do painel em cada página, não um login.
+export function classifyRequest(method, path) {
+  if (path.startsWith('auth/') && path !== 'auth/me') return 'auth';
+  if (path.startsWith('master/')) return 'master';
+
+  if (method === 'GET') {
+    if (path.startsWith('barbearias/') || path === 'marcacoes/slots') return 'booking';
+    if (path === 'planos' || path === 'plans') return 'booking';
+  }
+  if (method === 'POST') {
+    if (path === 'marcacoes' || path === 'checkout/create-session') return 'booking';
+  }
+
+  return 'dashboard';
+}
+
+// O cliente controla as entradas à esquerda do X-Forwarded-For: conta só a
+// que o proxy de confiança mais exterior acrescentou (TRUSTED_PROXY_HOPS a
+// partir da direita), senão o limite por IP era contornável
+function clientIp(request) {
+  if (request.ip) return request.ip;
+  const forwarded = request.headers.get('x-forwarded-for');
+  if (forwarded && TRUSTED_PROXY_HOPS > 0) {
+    const hops = forwarded.split(',').map(entry => entry.trim()).filter(Boolean);
+    if (hops.length > 0) return hops[Math.max(0, hops.length - TRUSTED_PROXY_HOPS)];
+  }
+  return request.headers.get('x-real-ip') || 'anon';
+}
+
+// Tenant para justiça entre clientes: barbearia do token, depois o
+// utilizador, e por fim o IP (pedidos anónimos). Login e registo contam
+// sempre por IP: o limite é contra tentativas de um mesmo cliente, não
+// contra a equipa de uma barbearia.
+function resolveTenant(request, className) {
+  if (className === 'auth') return `ip:${clientIp(request)}`;
+  const decoded = getAuthContext(request)?.decoded;
+  if (decoded?.barbearia_id) return `b:${decoded.barbearia_id}`;
+  if (decoded?.userId) return `u:${decoded.userId}`;
+  return `ip:${clientIp(request)}`;
+}
+
+function count(className, outcome) {
+  const key = `${className}|${outcome}`;
+  state.counters.set(key, (state.counters.get(key) || 0) + 1);
+}
+
+// ---------------------------------------------------------------------------
+// Sinais de sobrecarga
+// ---------------------------------------------------------------------------
+
+function startSampler() {
+  if (state.sampler) return;
+
+  const histogram = monitorEventLoopDelay({ resolution: 20 });
+  histogram.enable();
+
+  state.sampler = setInterval(() => {
+    // p99 do atraso do event loop no último intervalo (ns -> ms)
+    state.eventLoopLagMs = histogram.percentile(99) / 1e6;
+    histogram.reset();
+
+    // A espera no pool decai quando deixa de haver checkouts lentos
+    state.poolWaitMs *= 0.5;
+
+    const now = Date.now();
+    for (const [key, bucket] of state.buckets) {
+      if (now - bucket.updatedAt > BUCKET_IDLE_MS) state.buckets.delete(key);
+    }
+  }, SAMPLE_INTERVAL_MS);
+  state.sampler.unref?.();
+}
+
+function recordPoolWait(waitMs) {
+  // Média móvel exponencial do tempo de espera por uma ligação
+  state.poolWaitMs = state.poolWaitMs * 0.8 + waitMs * 0.2;
+}
+
+// Liga os eventos do pool de ligações do driver à medição de espera.
+// Os checkouts de um servidor são servidos por ordem de chegada.
+export function attachPoolMonitoring(client) {
+  const pending = state.pendingCheckouts;
+
+  client.on('connectionCheckOutStarted', (event) => {
+    if (!pending.has(event.address)) pending.set(event.address, []);
+    pending.get(event.address).push(Date.now());
+    state.poolWaiting++;
+  });
+
+  const finish = (event) => {
+    const startedAt = pending.get(event.address)?.shift();
+    state.poolWaiting = Math.max(0, state.poolWaiting - 1);
+    // Drivers recentes já trazem a duração no evento
+    const waitMs = event.durationMS ?? (startedAt ? Date.now() - startedAt : 0);
+    recordPoolWait(waitMs);
+  };
+
+  client.on('connectionCheckedOut', finish);
+  client.on('connectionCheckOutFailed', finish);
+}
+
+function overloadReason() {
+  if (MAX_EVENT_LOOP_LAG_MS > 0 && state.eventLoopLagMs > MAX_EVENT_LOOP_LAG_MS) {
+    return 'event_loop_lag';
+  }
+  if (MAX_POOL_WAIT_MS > 0 && state.poolWaitMs > MAX_POOL_WAIT_MS) {
+    return 'pool_wait';
+  }
+  return null;
+}
+
+// ---------------------------------------------------------------------------
+// Limites
+// ---------------------------------------------------------------------------
+
+// Tira um token do balde; devolve 0 se admitido ou os segundos até haver token
+function takeToken(key, config) {
+  if (!config.rate) return 0;
+
+  const now = Date.now();
+  let bucket = state.buckets.get(key);
+  if (!bucket) {
+    bucket = { tokens: config.burst, updatedAt: now };
+    state.buckets.set(key, bucket);
+  }
+
+  bucket.tokens = Math.min(config.burst, bucket.tokens + ((now - bucket.updatedAt) / 1000) * config.rate);
+  bucket.updatedAt = now;
+
+  if (bucket.tokens >= 1) {
+    bucket.tokens -= 1;
+    return 0;
+  }
+  return Math.ceil((1 - bucket.tokens) / config.rate);
+}
+
+function increment(map, key) {
+  map.set(key, (map.get(key) || 0) + 1);
+}
+
+function decrement(map, key) {
+  const value = (map.get(key) || 1) - 1;
+  if (value <= 0) map.delete(key);
+  else map.set(key, value);
+}
+
+function reject(className, reason, retryAfterSeconds) {
+  count(className, `shed_${reason}`);
+  return NextResponse.json(
+    {
+      error: 'Servidor com muitos pedidos, tente novamente dentro de instantes',
+      motivo: reason
+    },
+    { status: 429, headers: { 'Retry-After': String(retryAfterSeconds) } }
+  );
+}
+
+// Decide se o pedido entra. Devolve { response } com o 429 a enviar,
+// ou { release } para chamar quando o pedido terminar.
+export function admit(request, method, path) {
+  startSampler();
+
+  const className = classifyRequest(method, path);
+  const config = CLASSES[className];
+
+  if (config.shedOnOverload) {
+    const reason = overloadReason();
+    if (reason) return { response: reject(className, reason, OVERLOAD_RETRY_AFTER_SECONDS) };
+  }
+
+  if ((state.inflight.get(className) || 0) >= config.maxConcurrent) {
+    return { response: reject(className, 'concurrency', 1) };
+  }
+
+  const tenantKey = `${className}|${resolveTenant(request, className)}`;
+
+  if (config.perTenantConcurrent && (state.tenantInflight.get(tenantKey) || 0) >= config.perTenantConcurrent) {
+    return { response: reject(className, 'tenant_concurrency', 1) };
+  }
+
+  const waitSeconds = takeToken(tenantKey, config);
+  if (waitSeconds > 0) {
+    return { response: reject(className, 'rate_limit', waitSeconds) };
+  }
+
+  increment(state.inflight, className);
+  increment(state.tenantInflight, tenantKey);
+  count(className, 'admitted');
+
+  let released = false;
+  return {
+    release() {
+      if (released) return;
+      released = true;
+      decrement(state.inflight, className);
+      decrement(state.tenantInflight, tenantKey);
+    }
+  };
+}
+
+// Envolve um handler com o controlo de admissão. Na rota catch-all o path
+// vem dos params; as rotas próprias (ex: auth/login) indicam-no em `routePath`.
+export function withAdmissionControl(method, handler, routePath) {
+  if (!ENABLED) return handler;
+
+  return async function admittedHandler(request, context) {
+    const path = routePath || (context?.params?.path ? context.params.path.join('/') : '');
+    const { response, release } = admit(request, method, path);
+    if (response) return response;
+
+    try {
+      return await handler(request, context);
+    } finally {
+      release();
+    }
+  };
+}
+
+export function renderAdmissionPrometheus() {
+  const lines = [];
+
+  lines.push('# HELP api_admission_requests_total Decisões do controlo de admissão por classe.');
+  lines.push('# TYPE api_admission_requests_total counter');
+  for (const [key, total] of state.counters) {
+    const [className, outcome] = key.split('|');
+    lines.push(`api_admission_requests_total{class="${className}",outcome="${outcome}"} ${total}`);
+  }
+
+  lines.push('# HELP api_admission_inflight Pedidos em curso por classe.');
+  lines.push('# TYPE api_admission_inflight gauge');
+  for (const className of Object.keys(CLASSES)) {
+    lines.push(`api_admission_inflight{class="${className}"} ${state.inflight.get(className) || 0}`);
+  }
+
+  lines.push('# HELP nodejs_event_loop_lag_p99_seconds Atraso p99 do event loop no último segundo.');
+  lines.push('# TYPE nodejs_event_loop_lag_p99_seconds gauge');
+  lines.push(`nodejs_event_loop_lag_p99_seconds ${state.eventLoopLagMs / 1000}`);
+
+  lines.push('# HELP mongo_pool_wait_seconds Média móvel da espera por uma ligação do pool.');
+  lines.push('# TYPE mongo_pool_wait_seconds gauge');
+  lines.push(`mongo_pool_wait_seconds ${state.poolWaitMs / 1000}`);
+
+  lines.push('# HELP mongo_pool_waiting Checkouts do pool à espera de ligação.');
+  lines.push('# TYPE mongo_pool_waiting gauge');
+  lines.push(`mongo_pool_waiting ${state.poolWaiting}`);
+
+  return lines.join('\n') + '\n';
+}
+
+export function getAdmissionStats() {
+  const counters = {};
+  for (const [key, total] of state.counters) counters[key] = total;
+
+  return {
+    sobrecarga: overloadReason(),
+    event_loop_lag_ms: state.eventLoopLagMs,
+    pool_wait_ms: state.poolWaitMs,
+    pool_waiting: state.poolWaiting,
+    inflight: Object.fromEntries(state.inflight),
+    counters
+  };
+}
@@ -0,0 +1,126 @@
+import jwt from 'jsonwebtoken';
+
+// Autenticação por pedido: o header Authorization é lido e verificado uma só
+// vez por pedido, e os tokens já verificados ficam numa LRU (até ao exp) para
+// evitar repetir o jwt.verify em cada chamada do dashboard.
+
+const JWT_SECRET = process.env.JWT_SECRET;
+const TOKEN_CACHE_SIZE = parseInt(process.env.AUTH_TOKEN_CACHE_SIZE || '1000', 10);
+
+// Claims incluídas nos tokens de sessão. Com `nome` no token, o
+// GET auth/me?source=token responde sem carregar o utilizador completo;
+// `sessao_versao` é comparada com a do documento para detetar claims
+// desatualizadas (sobe a cada alteração do perfil).
+const SESSION_CLAIMS = ['userId', 'email', 'tipo', 'barbearia_id', 'nome', 'sessao_versao'];
+
+// Projeção mínima para validar as claims de um token com userFromClaims
+export const SESSION_VERSION_PROJECTION = { sessao_versao: 1 };
+
+const STATE_KEY = Symbol.for('cuthub.authTokenCache');
+
+if (!globalThis[STATE_KEY]) {
+  globalThis[STATE_KEY] = { entries: new Map(), hits: 0, misses: 0 };
+}
+
+const tokenCache = globalThis[STATE_KEY];
+const requestContexts = new WeakMap();
+
+function getCached(token) {
+  const entry = tokenCache.entries.get(token);
+  if (!entry) return null;
+
+  if (entry.expiresAt <= Date.now()) {
+    tokenCache.entries.delete(token);
+    return null;
+  }
+
+  // LRU: reinserir para passar a ser o mais recente
+  tokenCache.entries.delete(token);
+  tokenCache.entries.set(token, entry);
+  return entry.decoded;
+}
+
+function setCached(token, decoded) {
+  if (!decoded.exp) return;
+
+  tokenCache.entries.set(token, { decoded, expiresAt: decoded.exp * 1000 });
+  if (tokenCache.entries.size > TOKEN_CACHE_SIZE) {
+    const oldest = tokenCache.entries.keys().next().value;
+    tokenCache.entries.delete(oldest);
+  }
+}
+
+export function verifyToken(token) {
+  if (!token) return null;
+
+  const cached = getCached(token);
+  if (cached) {
+    tokenCache.hits++;
+    return cached;
+  }
+
+  tokenCache.misses++;
+  try {
+    const decoded = jwt.verify(token, JWT_SECRET);
+    // Tokens de uso único (ex: confirmação de email) não são de sessão
+    if (!decoded.type) {
+      setCached(token, decoded);
+    }
+    return decoded;
+  } catch (error) {
+    return null;
+  }
+}
+
+// Contexto de autenticação do pedido: null sem header Bearer,
+// { token, decoded: null } se o token for inválido.
+export function getAuthContext(request) {
+  if (requestContexts.has(request)) {
+    return requestContexts.get(request);
+  }
+
+  const authHeader = request.headers.get('authorization');
+  let context = null;
+
+  if (authHeader && authHeader.startsWith('Bearer ')) {
+    const token = authHeader.substring(7);
+    context = { token, decoded: verifyToken(token) };
+  }
+
+  requestContexts.set(request, context);
+  return context;
+}
+
+// Token de sessão (7 dias) com as claims usadas pelas rotas
+export function signSessionToken(user) {
+  const claims = {};
+  for (const key of SESSION_CLAIMS) {
+    if (user[key] !== undefined) claims[key] = user[key];
+  }
+  return jwt.sign(claims, JWT_SECRET, { expiresIn: '7d' });
+}
+
+// Utilizador reconstruído a partir das claims, ou null se o token for
+// antigo e não trouxer tudo o que é preciso, ou se `current` (o utilizador
+// lido com SESSION_VERSION_PROJECTION) não existir ou tiver outra
+// sessao_versao. Nesses casos, ir à base de dados.
+export function userFromClaims(decoded, current) {
+  if (!decoded || decoded.nome === undefined || !current) return null;
+  if ((decoded.sessao_versao || 0) !== (current.sessao_versao || 0)) return null;
+
+  return {
+    _id: decoded.userId,
+    email: decoded.email,
+    nome: decoded.nome,
+    tipo: decoded.tipo,
+    barbearia_id: decoded.barbearia_id || null
+  };
+}
+
+export function getTokenCacheStats() {
+  return {
+    size: tokenCache.entries.size,
+    hits: tokenCache.hits,
+    misses: tokenCache.misses
+  };
+}
@@ -0,0 +1,318 @@
+import { randomBytes } from 'crypto';
+import { ObjectId } from 'mongodb';
+import { getLoader, PROJECTIONS } from '@/lib/loaders';
+import { getTenantDb } from '@/lib/tenant-db';
+
+// Feeds iCalendar (.ics) por barbeiro e por local, para subscrever a agenda
+// no calendário do telemóvel. As apps de calendário consultam o URL com
+// muita frequência, por isso cada consulta custa só a leitura do documento
+// do feed (pelo token): o ETag e o Last-Modified vêm da `versao` do feed,
+// incrementada em cada escrita de uma marcação desse barbeiro/local. O
+// calendário só é gerado (janela limitada de datas) quando a versão muda e
+// fica em cache no processo.
+//
+// O token no URL é a única credencial: regenerá-lo revoga o URL anterior.
+
+export const FEEDS_COLLECTION = 'calendar_feeds';
+
+export const FEED_TYPES = ['barbeiro', 'local'];
+
+const PAST_DAYS = parseInt(process.env.CALENDAR_FEED_PAST_DAYS || '30', 10);
+const FUTURE_DAYS = parseInt(process.env.CALENDAR_FEED_FUTURE_DAYS || '90', 10);
+const MAX_EVENTS = parseInt(process.env.CALENDAR_FEED_MAX_EVENTS || '2000', 10);
+const CACHE_SIZE = parseInt(process.env.CALENDAR_FEED_CACHE_SIZE || '500', 10);
+const TIME_ZONE = process.env.CALENDAR_FEED_TZ || 'Europe/Lisbon';
+const BASE_URL = process.env.NEXT_PUBLIC_BASE_URL || 'http://localhost:3000';
+const DEFAULT_DURATION_MINUTES = 30;
+
+// Estados que aparecem na agenda
+const FEED_STATUSES = ['pendente', 'aceita', 'concluida'];
+
+const TOKEN_PATTERN = /^[a-f0-9]{32}$/;
+
+export const CALENDAR_CACHE_CONTROL = 'private, max-age=300';
+
+const STATE_KEY = Symbol.for('cuthub.calendarFeeds');
+
+if (!globalThis[STATE_KEY]) {
+  globalThis[STATE_KEY] = {
+    cache: new Map(),      // token -> { chave, body } (ordem de inserção = LRU)
+    indexesReady: null
+  };
+}
+
+const state = globalThis[STATE_KEY];
+
+function ensureIndexes(db) {
+  if (!state.indexesReady) {
+    state.indexesReady = db.collection(FEEDS_COLLECTION)
+      .createIndex({ tipo: 1, ref_id: 1 }, { unique: true })
+      .catch((error) => {
+        state.indexesReady = null;
+        throw error;
+      });
+  }
+  return state.indexesReady;
+}
+
+export function isValidFeedToken(token) {
+  return TOKEN_PATTERN.test(token || '');
+}
+
+export function calendarFeedUrl(feed) {
+  return `${BASE_URL}/api/calendario/${feed._id}.ics`;
+}
+
+// Feed de um barbeiro ou local (criado na primeira vez)
+export async function getOrCreateCalendarFeed(db, { tipo, refId, barbeariaId }) {
+  await ensureIndexes(db);
+  const feeds = db.collection(FEEDS_COLLECTION);
+  const existing = await feeds.findOne({ tipo, ref_id: refId });
+  if (existing) return existing;
+
+  const now = new Date();
+  const feed = {
+    _id: randomBytes(16).toString('hex'),
+    tipo,
+    ref_id: refId,
+    barbearia_id: barbeariaId || null,
+    versao: 0,
+    criado_em: now,
+    atualizado_em: now
+  };
+  try {
+    await feeds.insertOne(feed);
+    return feed;
+  } catch (error) {
+    // Dois pedidos a criar o mesmo feed ao mesmo tempo
+    if (error.code !== 11000) throw error;
+    return feeds.findOne({ tipo, ref_id: refId });
+  }
+}
+
+// Novo token; o URL anterior deixa de funcionar
+export async function rotateCalendarFeed(db, { tipo, refId, barbeariaId }) {
+  const old = await db.collection(FEEDS_COLLECTION).findOneAndDelete({ tipo, ref_id: refId });
+  if (old) state.cache.delete(old._id);
+  return getOrCreateCalendarFeed(db, { tipo, refId, barbeariaId });
+}
+
+// O barbeiro ou local foi eliminado: o URL do feed deixa de funcionar
+export async function deleteCalendarFeed(db, { tipo, refId }) {
+  const old = await db.collection(FEEDS_COLLECTION).findOneAndDelete({ tipo, ref_id: refId });
+  if (old) state.cache.delete(old._id);
+}
+
+// Chamado depois de cada escrita numa marcação. Nunca lança.
+export async function touchCalendarFeeds(db, marcacao) {
+  const alvos = [];
+  if (marcacao?.barbeiro_id) alvos.push({ tipo: 'barbeiro', ref_id: String(marcacao.barbeiro_id) });
+  if (marcacao?.local_id) alvos.push({ tipo: 'local', ref_id: String(marcacao.local_id) });
+  if (alvos.length === 0) return;
+
+  try {
+    await db.collection(FEEDS_COLLECTION).updateMany(
+      { $or: alvos },
+      { $inc: { versao: 1 }, $set: { atualizado_em: new Date() } }
+    );
+  } catch (error) {
+    console.error('Erro ao atualizar feeds de calendário:', error.message);
+  }
+}
+
+// A partir do id de uma marcação (ex: depois de um PUT)
+export async function touchCalendarFeedsForMarcacao(db, marcacaoId) {
+  try {
+    const marcacao = await db.collection('marcacoes').findOne(
+      { _id: new ObjectId(marcacaoId) },
+      { projection: { barbeiro_id: 1, local_id: 1 } }
+    );
+    await touchCalendarFeeds(db, marcacao);
+  } catch (error) {
+    console.error('Erro ao atualizar feeds de calendário:', error.message);
+  }
+}
+
+function isoDate(date) {
+  return date.toISOString().split('T')[0];
+}
+
+// Janela [de, ate]; muda uma vez por dia, o que também muda o ETag
+function feedWindow(now = new Date()) {
+  const de = new Date(now);
+  de.setUTCDate(de.getUTCDate() - PAST_DAYS);
+  const ate = new Date(now);
+  ate.setUTCDate(ate.getUTCDate() + FUTURE_DAYS);
+  return { de: isoDate(de), ate: isoDate(ate) };
+}
+
+// ==================== FORMATO ICALENDAR (RFC 5545) ====================
+
+function escapeText(value) {
+  return String(value ?? '')
+    .replace(/\\/g, '\\\\')
+    .replace(/;/g, '\\;')
+    .replace(/,/g, '\\,')
+    .replace(/\r?\n/g, '\\n');
+}
+
+// Linhas com mais de 75 octetos continuam na seguinte, começada por espaço
+function foldLine(line) {
+  if (Buffer.byteLength(line) <= 75) return line;
+  const parts = [];
+  let current = '';
+  let bytes = 0;
+  for (const char of line) {
+    const size = Buffer.byteLength(char);
+    if (bytes + size > (parts.length === 0 ? 75 : 74)) {
+      parts.push(current);
+      current = '';
+      bytes = 0;
+    }
+    current += char;
+    bytes += size;
+  }
+  parts.push(current);
+  return parts.join('\r\n ');
+}
+
+const zoneFormat = new Intl.DateTimeFormat('en-US', {
+  timeZone: TIME_ZONE,
+  hourCycle: 'h23',
+  year: 'numeric', month: 'numeric', day: 'numeric',
+  hour: 'numeric', minute: 'numeric', second: 'numeric'
+});
+
+// Diferença (ms) entre a hora de TIME_ZONE e UTC no instante `ms`
+function zoneOffset(ms) {
+  const parts = Object.fromEntries(zoneFormat.formatToParts(new Date(ms)).map(p => [p.type, p.value]));
+  const asUtc = Date.UTC(parts.year, parts.month - 1, parts.day, parts.hour, parts.minute, parts.second);
+  return asUtc - Math.floor(ms / 1000) * 1000;
+}
+
+// data "YYYY-MM-DD" + hora "HH:MM" (+ minutos) em hora de TIME_ZONE, como
+// instante UTC. As horas são escritas em UTC ("Z") para o feed não precisar
+// de um VTIMEZONE com as regras de hora de verão.
+function zonedInstant(data, hora, plusMinutes = 0) {
+  const [y, m, d] = data.split('-').map(Number);
+  const [hh, mm] = (hora || '00:00').split(':').map(Number);
+  const wall = Date.UTC(y, m - 1, d, hh, mm + plusMinutes);
+  const guess = wall - zoneOffset(wall);
+  // Perto da mudança de hora o offset no instante estimado pode ser outro
+  return new Date(wall - zoneOffset(guess));
+}
+
+function utcStamp(date) {
+  return new Date(date).toISOString().replace(/[-:]/g, '').replace(/\.\d{3}/, '');
+}
+
+function eventLines(marcacao, { servico, cliente, local, barbeiro }) {
+  const duracao = parseInt(servico?.duracao, 10) || DEFAULT_DURATION_MINUTES;
+  const summary = [servico?.nome || 'Marcação', cliente?.nome].filter(Boolean).join(' - ');
+  const description = [
+    barbeiro?.nome ? `Profissional: ${barbeiro.nome}` : null,
+    marcacao.status === 'pendente' ? 'Por confirmar' : null,
+    marcacao.observacoes || null
+  ].filter(Boolean).join('\n');
+
+  return [
+    'BEGIN:VEVENT',
+    `UID:${marcacao._id}@cuthub`,
+    `DTSTAMP:${utcStamp(marcacao.atualizado_em || marcacao.criado_em || new Date())}`,
+    `DTSTART:${utcStamp(zonedInstant(marcacao.data, marcacao.hora))}`,
+    `DTEND:${utcStamp(zonedInstant(marcacao.data, marcacao.hora, duracao))}`,
+    `SUMMARY:${escapeText(summary)}`,
+    ...(description ? [`DESCRIPTION:${escapeText(description)}`] : []),
+    ...(local?.morada || local?.nome ? [`LOCATION:${escapeText(local.morada || local.nome)}`] : []),
+    `STATUS:${marcacao.status === 'pendente' ? 'TENTATIVE' : 'CONFIRMED'}`,
+    'END:VEVENT'
+  ];
+}
+
+async function buildCalendar(db, feed, { de, ate }) {
+  const database = feed.barbearia_id ? await getTenantDb(db, feed.barbearia_id) : db;
+  const loader = getLoader(database);
+
+  const filter = feed.tipo === 'barbeiro'
+    ? { barbeiro_id: feed.ref_id }
+    : { barbearia_id: feed.barbearia_id, local_id: feed.ref_id };
+
+  const [marcacoes, titular] = await Promise.all([
+    database.collection('marcacoes')
+      .find(
+        { ...filter, data: { $gte: de, $lte: ate }, status: { $in: FEED_STATUSES } },
+        { projection: { data: 1, hora: 1, status: 1, observacoes: 1, servico_id: 1, cliente_id: 1, barbeiro_id: 1, local_id: 1, criado_em: 1, atualizado_em: 1 } }
+      )
+      .sort({ data: 1, hora: 1 })
+      .limit(MAX_EVENTS)
+      .toArray(),
+    feed.tipo === 'barbeiro'
+      ? loader.load('utilizadores', feed.ref_id, { projection: PROJECTIONS.utilizadorResumo })
+      : loader.load('locais', feed.ref_id, { projection: PROJECTIONS.localResumo })
+  ]);
+
+  // Serviços, clientes, locais e profissionais numa query por coleção
+  const details = await Promise.all(marcacoes.map(async m => {
+    const [servico, cliente, local, barbeiro] = await Promise.all([
+      m.servico_id ? loader.load('servicos', m.servico_id, { projection: PROJECTIONS.servicoResumo }) : null,
+      m.cliente_id ? loader.load('utilizadores', m.cliente_id, { projection: PROJECTIONS.utilizadorResumo }) : null,
+      m.local_id ? loader.load('locais', m.local_id, { projection: PROJECTIONS.localResumo }) : null,
+      feed.tipo === 'local' && m.barbeiro_id ? loader.load('utilizadores', m.barbeiro_id, { projection: PROJECTIONS.utilizadorResumo }) : null
+    ]);
+    return { servico, cliente, local, barbeiro };
+  }));
+
+  const lines = [
+    'BEGIN:VCALENDAR',
+    'VERSION:2.0',
+    'PRODID:-//CutHub//Agenda//PT',
+    'CALSCALE:GREGORIAN',
+    'METHOD:PUBLISH',
+    `X-WR-CALNAME:${escapeText(`CutHub - ${titular?.nome || 'Agenda'}`)}`,
+    `X-WR-TIMEZONE:${TIME_ZONE}`,
+    'REFRESH-INTERVAL;VALUE=DURATION:PT15M',
+    'X-PUBLISHED-TTL:PT15M',
+    ...marcacoes.flatMap((m, i) => eventLines(m, details[i])),
+    'END:VCALENDAR'
+  ];
+  return lines.map(foldLine).join('\r\n') + '\r\n';
+}
+
+// Documento do feed e validadores HTTP, sem gerar o calendário. Devolve null
+// se o token não existir.
+export async function getCalendarFeed(db, token) {
+  if (!isValidFeedToken(token)) return null;
+  const feed = await db.collection(FEEDS_COLLECTION).findOne({ _id: token });
+  if (!feed) return null;
+
+  const window = feedWindow();
+  // A janela avança à meia-noite (UTC): o conteúdo pode mudar sem escritas
+  const windowStart = new Date(`${isoDate(new Date())}T00:00:00Z`);
+  const lastModified = new Date(Math.max(new Date(feed.atualizado_em).getTime(), windowStart.getTime()));
+  lastModified.setMilliseconds(0);
+
+  return {
+    feed,
+    window,
+    chave: `${feed.versao}|${window.de}`,
+    lastModified
+  };
+}
+
+// Corpo .ics da versão atual (da cache do processo quando possível)
+export async function renderCalendarFeed(db, { feed, window, chave }) {
+  const cached = state.cache.get(feed._id);
+  if (cached && cached.chave === chave) {
+    state.cache.delete(feed._id);
+    state.cache.set(feed._id, cached);
+    return cached.body;
+  }
+
+  const body = await buildCalendar(db, feed, window);
+  state.cache.delete(feed._id);
+  state.cache.set(feed._id, { chave, body });
+  if (state.cache.size > CACHE_SIZE) {
+    state.cache.delete(state.cache.keys().next().value);
+  }
+  return body;
+}
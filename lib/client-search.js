@@ -0,0 +1,287 @@
+import { ObjectId } from 'mongodb';
+import { getTenantDb, tenantDatabases } from '@/lib/tenant-db';
+
+// Pesquisa de clientes por prefixo (typeahead do CRM e das marcações
+// manuais). Cada par barbearia × cliente tem um documento em
+// `clientes_pesquisa` com chaves normalizadas (sem acentos, minúsculas):
+// cada palavra do nome, o email e o telemóvel só com dígitos (com e sem
+// indicativo). Uma pesquisa é um intervalo no índice
+// { barbearia_id, chaves } com regex ancorada, e nunca lê a lista completa.
+// Os resultados são ordenados na query pelo nome normalizado (`nome_ordem`)
+// antes do limite, para que o limite corte os últimos por ordem alfabética.
+//
+// Um cliente pode aparecer em várias barbearias (regista-se numa e marca
+// noutra), por isso o índice é por par e não um campo em `utilizadores`.
+// Os documentos vivem na base do tenant (lib/tenant-db.js).
+
+export const CLIENT_SEARCH_COLLECTION = 'clientes_pesquisa';
+
+const DEFAULT_LIMIT = 20;
+const MAX_LIMIT = 50;
+const MAX_TOKENS = 4;
+const MIN_PHONE_DIGITS = 3;
+
+const STATE_KEY = Symbol.for('cuthub.clientSearch');
+
+if (!globalThis[STATE_KEY]) {
+  globalThis[STATE_KEY] = { indexesReady: null };
+}
+
+const state = globalThis[STATE_KEY];
+
+function ensureIndexes(db) {
+  if (!state.indexesReady) {
+    const collection = db.collection(CLIENT_SEARCH_COLLECTION);
+    state.indexesReady = Promise.all([
+      collection.createIndex({ barbearia_id: 1, chaves: 1 }),
+      collection.createIndex({ barbearia_id: 1, nome_ordem: 1 }),
+      collection.createIndex({ cliente_id: 1 })
+    ]).catch((error) => {
+      state.indexesReady = null;
+      throw error;
+    });
+  }
+  return state.indexesReady;
+}
+
+// "  João  Gonçalves " -> "joao goncalves"
+export function normalizeSearchText(value) {
+  return String(value || '')
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .replace(/\s+/g, ' ')
+    .trim();
+}
+
+function phoneKeys(telemovel) {
+  const digits = String(telemovel || '').replace(/\D/g, '');
+  if (!digits) return [];
+  // 00351 912... -> também 351912... e 912...
+  const international = digits.replace(/^00/, '');
+  return [...new Set([digits, international, international.replace(/^351(?=\d{9}$)/, '')])];
+}
+
+export function searchKeys({ nome, email, telemovel }) {
+  const keys = new Set(normalizeSearchText(nome).split(' ').filter(Boolean));
+  // Emails fictícios dos clientes manuais não são pesquisáveis
+  if (email && !email.endsWith('@manual.local')) {
+    keys.add(normalizeSearchText(email));
+  }
+  phoneKeys(telemovel).forEach(k => keys.add(k));
+  return [...keys];
+}
+
+function searchDocument(barbeariaId, cliente) {
+  return {
+    barbearia_id: barbeariaId,
+    cliente_id: cliente._id.toString(),
+    nome: cliente.nome || '',
+    nome_ordem: normalizeSearchText(cliente.nome),
+    email: cliente.email || '',
+    telemovel: cliente.telemovel || '',
+    criado_manualmente: Boolean(cliente.criado_manualmente),
+    chaves: searchKeys(cliente),
+    atualizado_em: new Date()
+  };
+}
+
+function upsertOperation(barbeariaId, cliente) {
+  const doc = searchDocument(barbeariaId, cliente);
+  return {
+    updateOne: {
+      filter: { _id: `${barbeariaId}|${doc.cliente_id}` },
+      update: { $set: doc },
+      upsert: true
+    }
+  };
+}
+
+// Indexa (ou atualiza) um cliente numa barbearia. Nunca lança: a pesquisa
+// fica desatualizada até ao próximo backfill, a escrita principal não falha.
+export async function indexClienteForBarbearia(db, barbeariaId, cliente) {
+  if (!barbeariaId || !cliente?._id) return;
+  try {
+    const tenantDb = await getTenantDb(db, barbeariaId);
+    await ensureIndexes(tenantDb);
+    const { updateOne } = upsertOperation(barbeariaId, cliente);
+    await tenantDb.collection(CLIENT_SEARCH_COLLECTION).updateOne(updateOne.filter, updateOne.update, { upsert: true });
+  } catch (error) {
+    console.error('Erro ao indexar cliente para pesquisa:', error.message);
+  }
+}
+
+export async function indexClienteIdForBarbearia(db, barbeariaId, clienteId) {
+  try {
+    const cliente = await db.collection('utilizadores').findOne(
+      { _id: new ObjectId(clienteId), tipo: 'cliente' },
+      { projection: { nome: 1, email: 1, telemovel: 1, criado_manualmente: 1 } }
+    );
+    if (cliente) await indexClienteForBarbearia(db, barbeariaId, cliente);
+  } catch (error) {
+    console.error('Erro ao indexar cliente para pesquisa:', error.message);
+  }
+}
+
+// Perfil alterado: atualiza as entradas do cliente em todas as barbearias
+export async function reindexCliente(db, cliente) {
+  try {
+    const { barbearia_id, cliente_id, atualizado_em, ...fields } = searchDocument(null, cliente);
+    for (const database of await tenantDatabases(db)) {
+      await database.collection(CLIENT_SEARCH_COLLECTION).updateMany(
+        { cliente_id },
+        { $set: { ...fields, atualizado_em } }
+      );
+    }
+  } catch (error) {
+    console.error('Erro ao reindexar cliente:', error.message);
+  }
+}
+
+function escapeRegex(text) {
+  return text.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+}
+
+// Termos da pesquisa: um número de telefone conta como um só termo
+function queryTokens(q) {
+  const normalized = normalizeSearchText(q);
+  const digits = normalized.replace(/[\s+()-]/g, '');
+  if (/^\d+$/.test(digits) && digits.length >= MIN_PHONE_DIGITS) {
+    return [digits.replace(/^00/, '')];
+  }
+  return normalized.split(' ').filter(Boolean).slice(0, MAX_TOKENS);
+}
+
+export function parseSearchLimit(value) {
+  const limit = parseInt(value, 10);
+  if (!Number.isFinite(limit) || limit <= 0) return DEFAULT_LIMIT;
+  return Math.min(limit, MAX_LIMIT);
+}
+
+// Clientes da barbearia cujas chaves começam por todos os termos de `q`
+export async function searchClientes(db, barbeariaId, q, { limit = DEFAULT_LIMIT } = {}) {
+  const tokens = queryTokens(q);
+  if (tokens.length === 0) return [];
+
+  db = await getTenantDb(db, barbeariaId);
+  await ensureIndexes(db);
+  const regexes = tokens.map(t => new RegExp(`^${escapeRegex(t)}`));
+
+  const docs = await db.collection(CLIENT_SEARCH_COLLECTION)
+    .find(
+      {
+        barbearia_id: barbeariaId,
+        chaves: regexes.length === 1 ? regexes[0] : { $all: regexes }
+      },
+      { projection: { chaves: 0, nome_ordem: 0, atualizado_em: 0, barbearia_id: 0 } }
+    )
+    .sort({ nome_ordem: 1, _id: 1 })
+    .limit(limit)
+    .toArray();
+
+  return docs.map(({ _id, cliente_id, ...cliente }) => ({ _id: cliente_id, ...cliente }));
+}
+
+// Estatísticas (como em GET clientes) só para os clientes encontrados
+export async function attachClienteStats(db, barbeariaId, clientes) {
+  if (clientes.length === 0) return clientes;
+
+  db = await getTenantDb(db, barbeariaId);
+  const [stats, servicos] = await Promise.all([
+    db.collection('marcacoes').aggregate([
+      { $match: { barbearia_id: barbeariaId, cliente_id: { $in: clientes.map(c => c._id) } } },
+      {
+        $group: {
+          _id: '$cliente_id',
+          total_marcacoes: { $sum: 1 },
+          concluidas: { $push: { $cond: [{ $eq: ['$status', 'concluida'] }, '$servico_id', '$$REMOVE'] } },
+          ultima_visita: { $max: '$data' }
+        }
+      }
+    ]).toArray(),
+    db.collection('servicos')
+      .find({ barbearia_id: barbeariaId }, { projection: { preco: 1 } })
+      .toArray()
+  ]);
+
+  const precos = new Map(servicos.map(s => [s._id.toString(), s.preco || 0]));
+  const porCliente = new Map(stats.map(s => [s._id, s]));
+
+  return clientes.map(cliente => {
+    const s = porCliente.get(cliente._id);
+    return {
+      ...cliente,
+      total_marcacoes: s?.total_marcacoes || 0,
+      marcacoes_concluidas: s?.concluidas.length || 0,
+      total_gasto: (s?.concluidas || []).reduce((sum, id) => sum + (precos.get(id) || 0), 0),
+      ultima_visita: s?.ultima_visita || null
+    };
+  });
+}
+
+// Backfill: clientes registados na barbearia e clientes com marcações nela
+export async function backfillClientSearch(db, { barbeariaId, batchSize = 1000 } = {}) {
+  await ensureIndexes(db);
+  const projection = { nome: 1, email: 1, telemovel: 1, criado_manualmente: 1, barbearia_id: 1 };
+  const result = { registados: 0, com_marcacoes: 0 };
+
+  // Cada documento vai para a base do seu tenant
+  let operations = [];
+  const flush = async () => {
+    const porBarbearia = new Map();
+    operations.forEach(op => {
+      const id = op.updateOne.update.$set.barbearia_id;
+      if (!porBarbearia.has(id)) porBarbearia.set(id, []);
+      porBarbearia.get(id).push(op);
+    });
+    operations = [];
+    for (const [id, ops] of porBarbearia) {
+      const tenantDb = await getTenantDb(db, id);
+      await tenantDb.collection(CLIENT_SEARCH_COLLECTION).bulkWrite(ops, { ordered: false });
+    }
+  };
+
+  const registados = db.collection('utilizadores').find(
+    { tipo: 'cliente', barbearia_id: barbeariaId || { $nin: [null, ''] } },
+    { projection }
+  );
+  for await (const cliente of registados) {
+    operations.push(upsertOperation(cliente.barbearia_id, cliente));
+    result.registados++;
+    if (operations.length >= batchSize) await flush();
+  }
+  await flush();
+
+  let pendentes = [];
+  const flushPares = async () => {
+    const ids = pendentes.map(p => p.cliente_id).filter(id => ObjectId.isValid(id)).map(id => new ObjectId(id));
+    const clientes = await db.collection('utilizadores')
+      .find({ _id: { $in: ids }, tipo: 'cliente' }, { projection })
+      .toArray();
+    const porId = new Map(clientes.map(c => [c._id.toString(), c]));
+    pendentes.forEach(({ barbearia_id, cliente_id }) => {
+      const cliente = porId.get(cliente_id);
+      if (cliente && barbearia_id) {
+        operations.push(upsertOperation(barbearia_id, cliente));
+        result.com_marcacoes++;
+      }
+    });
+    pendentes = [];
+    await flush();
+  };
+
+  const databases = barbeariaId ? [await getTenantDb(db, barbeariaId)] : await tenantDatabases(db);
+  for (const database of databases) {
+    const pares = database.collection('marcacoes').aggregate([
+      ...(barbeariaId ? [{ $match: { barbearia_id: barbeariaId } }] : []),
+      { $group: { _id: { barbearia_id: '$barbearia_id', cliente_id: '$cliente_id' } } }
+    ], { allowDiskUse: true });
+    for await (const { _id } of pares) {
+      pendentes.push(_id);
+      if (pendentes.length >= batchSize) await flushPares();
+    }
+    await flushPares();
+  }
+
+  return result;
+}
@@ -0,0 +1,98 @@
+// Formas compactas dos documentos devolvidos pelas listagens. Os documentos
+// do Mongo trazem campos internos (flags dos lembretes, timestamps de
+// escrita, tipo/estado da conta) que o dashboard não usa e que, multiplicados
+// por centenas de marcações em cada polling, pesam no JSON e no encode.
+// Os DTOs são listas de campos permitidos: um campo novo só chega ao cliente
+// quando é acrescentado aqui.
+//
+// `fields=` (sparse fieldsets) reduz ainda mais: `?fields=_id,data,hora,
+// status,cliente.nome` devolve só esses caminhos de cada item.
+
+const CLIENTE_FIELDS = [
+  '_id', 'nome', 'email', 'telemovel', 'foto', 'tipo', 'morada', 'data_nascimento',
+  'preferencias', 'observacoes', 'barbearia_id', 'criado_manualmente', 'criado_em'
+];
+
+const CLIENTE_STATS_FIELDS = ['total_marcacoes', 'marcacoes_concluidas', 'total_gasto', 'ultima_visita'];
+
+const BARBEIRO_FIELDS = [
+  '_id', 'nome', 'email', 'telemovel', 'foto', 'biografia', 'especialidades',
+  'barbearia_id', 'local_id', 'local', 'ativo', 'criado_em'
+];
+
+const MARCACAO_FIELDS = [
+  '_id', 'cliente_id', 'barbeiro_id', 'servico_id', 'barbearia_id', 'local_id',
+  'data', 'hora', 'status', 'observacoes', 'criado_manualmente', 'criado_em', 'arquivada_em'
+];
+
+// Campos embebidos numa marcação
+const MARCACAO_CLIENTE_FIELDS = ['_id', 'nome', 'email', 'telemovel', 'foto', 'observacoes', 'criado_em'];
+const MARCACAO_BARBEIRO_FIELDS = ['_id', 'nome', 'foto'];
+
+const MAX_FIELDS = 50;
+
+function pick(doc, fields) {
+  if (!doc) return doc ?? null;
+  const out = {};
+  for (const field of fields) {
+    if (doc[field] !== undefined) out[field] = doc[field];
+  }
+  return out;
+}
+
+export function toClienteDTO(cliente) {
+  return pick(cliente, [...CLIENTE_FIELDS, ...CLIENTE_STATS_FIELDS]);
+}
+
+export function toBarbeiroDTO(barbeiro) {
+  return pick(barbeiro, BARBEIRO_FIELDS);
+}
+
+export function toMarcacaoDTO(marcacao) {
+  const dto = pick(marcacao, MARCACAO_FIELDS);
+  if ('cliente' in marcacao) dto.cliente = pick(marcacao.cliente, MARCACAO_CLIENTE_FIELDS);
+  if ('barbeiro' in marcacao) dto.barbeiro = pick(marcacao.barbeiro, MARCACAO_BARBEIRO_FIELDS);
+  // servico e local já vêm dos loaders com projeções de resumo
+  if ('servico' in marcacao) dto.servico = marcacao.servico;
+  if ('local' in marcacao) dto.local = marcacao.local;
+  return dto;
+}
+
+// "_id,data,cliente.nome" -> ['_id', 'data', 'cliente.nome'] (null sem parâmetro)
+export function parseFields(value) {
+  if (!value) return null;
+  const fields = [...new Set(
+    value.split(',')
+      .map(f => f.trim())
+      .filter(f => /^[A-Za-z_][\w]*(\.[A-Za-z_][\w]*)*$/.test(f))
+  )].slice(0, MAX_FIELDS);
+  return fields.length > 0 ? fields : null;
+}
+
+function pickPath(source, target, path) {
+  const [head, ...rest] = path;
+  if (source === null || typeof source !== 'object' || source[head] === undefined) return;
+  if (rest.length === 0) {
+    target[head] = source[head];
+    return;
+  }
+  const value = source[head];
+  if (value === null || typeof value !== 'object') {
+    target[head] = value;
+    return;
+  }
+  if (!target[head] || typeof target[head] !== 'object') target[head] = {};
+  pickPath(value, target[head], rest);
+}
+
+// Aplica o sparse fieldset a cada item; o _id vai sempre, para o cliente
+// conseguir identificar as linhas
+export function applyFields(items, fields) {
+  if (!fields) return items;
+  const paths = (fields.includes('_id') ? fields : ['_id', ...fields]).map(f => f.split('.'));
+  return items.map(item => {
+    const out = {};
+    paths.forEach(path => pickPath(item, out, path));
+    return out;
+  });
+}
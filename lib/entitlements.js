@@ -0,0 +1,342 @@
+import { ObjectId } from 'mongodb';
+import { publishInvalidation, registerInvalidationHandler } from '@/lib/invalidation-bus';
+import { getTenantDb } from '@/lib/tenant-db';
+
+// Entitlements por tenant: limites do plano, uso atual e estado da
+// subscrição num só documento da collection `entitlements`.
+//
+// - `barbearia:<id>`  limites/uso de barbeiros e locais de uma barbearia
+// - `owner:<userId>`  limite/uso de barbearias de um owner
+//
+// Os gates de criação reservam uma unidade com um único findOneAndUpdate
+// condicional (uso < limite), o que fecha a corrida count-then-insert. A
+// reserva fica pendente até a inserção chegar à base (confirmUsage) ou ser
+// devolvida (releaseUsage); enquanto houver reservas pendentes, ou se o
+// documento mudou durante a contagem (`versao`), a recontagem não
+// substitui o uso, para não apagar uma reserva cuja inserção ainda não
+// foi contada.
+// As leituras passam por uma cache em memória com TTL curto; qualquer
+// escrita neste processo atualiza ou invalida a entrada e publica a chave
+// no barramento de invalidação para os outros nós (lib/invalidation-bus).
+
+const CACHE_TTL_MS = parseInt(process.env.ENTITLEMENTS_CACHE_TTL_MS || '30000', 10);
+// Documentos mais antigos do que isto são recontados na próxima leitura
+// (corrige desvios de escritas que não passem por este módulo)
+const MAX_AGE_MS = parseInt(process.env.ENTITLEMENTS_MAX_AGE_MS || String(60 * 60 * 1000), 10);
+
+// Reservas pendentes há mais do que isto são de pedidos que morreram entre
+// a reserva e a inserção: a recontagem volta a ser a fonte de verdade
+const PENDING_TIMEOUT_MS = 5 * 60 * 1000;
+
+const ACTIVE_STATUSES = ['active', 'trialing'];
+
+// Recurso -> campo do plano (limite_barbearias é usado também para locais)
+const PLAN_LIMIT_FIELDS = {
+  barbeiros: 'limite_barbeiros',
+  locais: 'limite_barbearias',
+  barbearias: 'limite_barbearias'
+};
+
+const STATE_KEY = Symbol.for('cuthub.entitlementsCache');
+
+if (!globalThis[STATE_KEY]) {
+  globalThis[STATE_KEY] = { entries: new Map(), hits: 0, misses: 0 };
+}
+
+const cache = globalThis[STATE_KEY];
+
+export function barbeariaKey(barbeariaId) {
+  return `barbearia:${barbeariaId}`;
+}
+
+export function ownerKey(userId) {
+  return `owner:${userId}`;
+}
+
+function cacheGet(key) {
+  const entry = cache.entries.get(key);
+  if (!entry || entry.expiresAt <= Date.now()) {
+    cache.entries.delete(key);
+    return null;
+  }
+  return entry.doc;
+}
+
+function cacheSet(doc) {
+  cache.entries.set(doc._id, { doc, expiresAt: Date.now() + CACHE_TTL_MS });
+}
+
+// Remove entradas da cache deste processo (ex: invalidação vinda de outro nó)
+export function invalidateEntitlements(keys) {
+  for (const key of [].concat(keys)) {
+    cache.entries.delete(key);
+  }
+}
+
+registerInvalidationHandler('entitlements', {
+  invalidate: (key) => invalidateEntitlements(key),
+  flush: () => cache.entries.clear()
+});
+
+// Os outros nós descartam a entrada; este já tem o documento novo em cache
+function broadcastChange(key, { skipLocal = true } = {}) {
+  publishInvalidation(`entitlements:${key}`, { skipLocal });
+}
+
+function planLimit(plano, resource) {
+  if (!plano) return null;
+  const value = plano[PLAN_LIMIT_FIELDS[resource]];
+  // -1 (ou ausente) significa ilimitado
+  return value === undefined || value === null || value === -1 ? null : value;
+}
+
+async function findPlano(db, subscription) {
+  if (!subscription) return null;
+  // Subscrições criadas pelo checkout Stripe guardam plan_id em vez de plano
+  const planoId = subscription.plano || subscription.plan_id;
+  if (!planoId) return null;
+  return db.collection('planos').findOne({ id: planoId });
+}
+
+async function buildBarbeariaEntitlements(db, barbeariaId) {
+  let subscription = await db.collection('subscriptions').findOne({
+    barbearia_id: barbeariaId,
+    status: { $in: ACTIVE_STATUSES }
+  });
+
+  // Fallback: subscrição do owner (checkout Stripe só guarda user_id)
+  if (!subscription && ObjectId.isValid(barbeariaId)) {
+    const barbearia = await db.collection('barbearias').findOne(
+      { _id: new ObjectId(barbeariaId) },
+      { projection: { owner_id: 1 } }
+    );
+    if (barbearia?.owner_id) {
+      subscription = await db.collection('subscriptions').findOne({
+        user_id: barbearia.owner_id,
+        status: { $in: ACTIVE_STATUSES }
+      });
+    }
+  }
+
+  const tenantDb = await getTenantDb(db, barbeariaId);
+  const [plano, barbeiros, locais] = await Promise.all([
+    findPlano(db, subscription),
+    db.collection('utilizadores').countDocuments({
+      barbearia_id: barbeariaId,
+      tipo: 'barbeiro',
+      ativo: { $ne: false }
+    }),
+    tenantDb.collection('locais').countDocuments({
+      barbearia_id: barbeariaId,
+      ativo: { $ne: false }
+    })
+  ]);
+
+  return {
+    scope: 'barbearia',
+    status: subscription?.status || 'none',
+    plano: plano ? { id: plano.id, nome: plano.nome } : null,
+    limits: {
+      barbeiros: planLimit(plano, 'barbeiros'),
+      locais: planLimit(plano, 'locais')
+    },
+    usage: { barbeiros, locais }
+  };
+}
+
+async function buildOwnerEntitlements(db, userId) {
+  const subscription = await db.collection('subscriptions').findOne({
+    user_id: userId,
+    status: { $in: ACTIVE_STATUSES }
+  });
+
+  const [plano, barbearias] = await Promise.all([
+    findPlano(db, subscription),
+    db.collection('barbearias').countDocuments({ owner_id: userId })
+  ]);
+
+  return {
+    scope: 'owner',
+    status: subscription?.status || 'none',
+    plano: plano ? { id: plano.id, nome: plano.nome } : null,
+    limits: { barbearias: planLimit(plano, 'barbearias') },
+    usage: { barbearias }
+  };
+}
+
+// Recalcula o documento a partir das collections de origem e guarda-o.
+// O uso recontado só substitui o guardado se nenhuma reserva estiver
+// pendente nem tiver mudado o documento desde o início da contagem; caso
+// contrário atualiza só o plano, os limites e o estado.
+export async function refreshEntitlements(db, key) {
+  const collection = db.collection('entitlements');
+  const [scope, id] = key.split(':');
+  const before = await collection.findOne({ _id: key }, { projection: { versao: 1 } });
+  const data = scope === 'owner'
+    ? await buildOwnerEntitlements(db, id)
+    : await buildBarbeariaEntitlements(db, id);
+  const { usage, ...planData } = data;
+  const now = new Date();
+
+  let doc = null;
+  if (before) {
+    doc = await collection.findOneAndUpdate(
+      {
+        _id: key,
+        versao: before.versao ?? null,
+        $or: [
+          { pendentes: { $in: [0, null] } },
+          { reservado_em: { $lt: new Date(now.getTime() - PENDING_TIMEOUT_MS) } }
+        ]
+      },
+      { $set: { ...data, pendentes: 0, atualizado_em: now }, $inc: { versao: 1 } },
+      { returnDocument: 'after' }
+    );
+  } else {
+    doc = await collection.findOneAndUpdate(
+      { _id: key },
+      { $setOnInsert: { ...data, pendentes: 0, versao: 0, atualizado_em: now } },
+      { upsert: true, returnDocument: 'after' }
+    ).catch((error) => {
+      // Criado ao mesmo tempo por uma reserva noutro pedido
+      if (error.code !== 11000) throw error;
+      return null;
+    });
+  }
+
+  if (!doc) {
+    doc = await collection.findOneAndUpdate(
+      { _id: key },
+      { $set: planData },
+      { returnDocument: 'after' }
+    );
+  }
+
+  cacheSet(doc);
+  broadcastChange(key);
+  return doc;
+}
+
+export async function getEntitlements(db, key) {
+  const cached = cacheGet(key);
+  if (cached) {
+    cache.hits++;
+    return cached;
+  }
+
+  cache.misses++;
+  const doc = await db.collection('entitlements').findOne({ _id: key });
+  if (!doc || Date.now() - new Date(doc.atualizado_em).getTime() > MAX_AGE_MS) {
+    return refreshEntitlements(db, key);
+  }
+
+  cacheSet(doc);
+  return doc;
+}
+
+// Reserva uma unidade de `resource` se o limite o permitir.
+// Devolve { allowed, entitlements }; com allowed=false nada foi alterado.
+export async function reserveUsage(db, key, resource) {
+  const collection = db.collection('entitlements');
+  const filter = {
+    _id: key,
+    $or: [
+      { [`limits.${resource}`]: null },
+      { $expr: { $lt: [`$usage.${resource}`, `$limits.${resource}`] } }
+    ]
+  };
+  const update = {
+    $inc: { [`usage.${resource}`]: 1, pendentes: 1, versao: 1 },
+    $set: { reservado_em: new Date() }
+  };
+
+  let doc = await collection.findOneAndUpdate(filter, update, { returnDocument: 'after' });
+
+  if (!doc) {
+    // Documento inexistente (ou antigo): recalcular e tentar uma vez mais
+    const current = await refreshEntitlements(db, key);
+    doc = await collection.findOneAndUpdate(filter, update, { returnDocument: 'after' });
+    if (!doc) {
+      return { allowed: false, entitlements: current };
+    }
+  }
+
+  cacheSet(doc);
+  broadcastChange(key);
+  return { allowed: true, entitlements: doc };
+}
+
+// A inserção da unidade reservada chegou à base: a recontagem já a vê.
+// Nunca lança (uma reserva não confirmada expira em PENDING_TIMEOUT_MS).
+export async function confirmUsage(db, key) {
+  try {
+    await db.collection('entitlements').updateOne(
+      { _id: key, pendentes: { $gt: 0 } },
+      { $inc: { pendentes: -1, versao: 1 } }
+    );
+  } catch (error) {
+    console.error(`Erro ao confirmar reserva de entitlements ${key}:`, error.message);
+  }
+}
+
+// Devolve uma unidade reservada (ex: a inserção falhou depois da reserva)
+export async function releaseUsage(db, key, resource) {
+  const doc = await db.collection('entitlements').findOneAndUpdate(
+    { _id: key, [`usage.${resource}`]: { $gt: 0 } },
+    [
+      {
+        $set: {
+          [`usage.${resource}`]: { $subtract: [`$usage.${resource}`, 1] },
+          pendentes: { $max: [0, { $subtract: [{ $ifNull: ['$pendentes', 0] }, 1] }] },
+          versao: { $add: [{ $ifNull: ['$versao', 0] }, 1] }
+        }
+      }
+    ],
+    { returnDocument: 'after' }
+  );
+  if (doc) {
+    cacheSet(doc);
+    broadcastChange(key);
+  } else {
+    broadcastChange(key, { skipLocal: false });
+  }
+}
+
+// Recalcula os entitlements afetados por uma mudança de subscrição.
+// Nunca lança: a subscrição já foi gravada e os documentos expiram sozinhos.
+export async function refreshEntitlementsForSubscription(db, subscription) {
+  if (!subscription) return;
+
+  const keys = [];
+  if (subscription.user_id) {
+    keys.push(ownerKey(subscription.user_id));
+    try {
+      const barbearias = await db.collection('barbearias')
+        .find({ owner_id: subscription.user_id }, { projection: { _id: 1 } })
+        .toArray();
+      barbearias.forEach(b => keys.push(barbeariaKey(b._id.toString())));
+    } catch (error) {
+      console.error(`Erro ao listar barbearias do owner ${subscription.user_id}:`, error.message);
+    }
+  }
+  if (subscription.barbearia_id) {
+    keys.push(barbeariaKey(subscription.barbearia_id));
+  }
+
+  await Promise.all(
+    [...new Set(keys)].map(key =>
+      refreshEntitlements(db, key).catch(error => {
+        console.error(`Erro ao recalcular entitlements ${key}:`, error.message);
+        broadcastChange(key, { skipLocal: false });
+      })
+    )
+  );
+}
+
+export function getEntitlementsCacheStats() {
+  return {
+    size: cache.entries.size,
+    hits: cache.hits,
+    misses: cache.misses
+  };
+}
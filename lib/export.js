@@ -0,0 +1,397 @@
+import { ObjectId } from 'mongodb';
+import { ARCHIVE_COLLECTION, rangeNeedsArchive } from '@/lib/marcacoes-archive';
+
+// Exportação de dados de um tenant em CSV ou NDJSON, em streaming: as linhas
+// saem de um cursor Mongo em blocos de CHUNK_SIZE e vão direto para a
+// resposta (com backpressure), sem nunca carregar a exportação toda em
+// memória. Os nomes (cliente, barbeiro, serviço, local) são resolvidos por
+// bloco com um $in e guardados numa LRU de tamanho fixo.
+
+const CHUNK_SIZE = 500;
+const LOOKUP_CACHE_SIZE = parseInt(process.env.EXPORT_LOOKUP_CACHE_SIZE || '5000', 10);
+
+export const EXPORT_FORMATS = {
+  csv: 'text/csv; charset=utf-8',
+  ndjson: 'application/x-ndjson; charset=utf-8'
+};
+
+// ---------------------------------------------------------------------------
+// Lookups com LRU limitada
+// ---------------------------------------------------------------------------
+
+function toObjectId(id) {
+  try {
+    return new ObjectId(id);
+  } catch {
+    return null;
+  }
+}
+
+function createLookup(db, collection, projection) {
+  const entries = new Map();
+
+  function remember(id, value) {
+    entries.delete(id);
+    entries.set(id, value);
+    if (entries.size > LOOKUP_CACHE_SIZE) {
+      entries.delete(entries.keys().next().value);
+    }
+  }
+
+  return {
+    // Carrega de uma vez os ids do bloco que ainda não estão em cache
+    async prefetch(ids) {
+      const missing = [...new Set(ids.filter(id => id && !entries.has(id)))];
+      if (missing.length === 0) return;
+
+      const objectIds = missing.map(toObjectId).filter(Boolean);
+      const docs = await db.collection(collection)
+        .find({ _id: { $in: objectIds } }, { projection })
+        .toArray();
+
+      const found = new Map(docs.map(doc => [doc._id.toString(), doc]));
+      // Ids inexistentes também ficam em cache (null) para não repetir a query
+      missing.forEach(id => remember(id, found.get(id) || null));
+    },
+    get(id) {
+      if (!id) return null;
+      const value = entries.get(id);
+      if (value === undefined) return null;
+      // LRU: reinserir para passar a ser o mais recente
+      entries.delete(id);
+      entries.set(id, value);
+      return value;
+    }
+  };
+}
+
+// ---------------------------------------------------------------------------
+// Formatação
+// ---------------------------------------------------------------------------
+
+function csvCell(value) {
+  if (value === null || value === undefined) return '';
+  let text = value instanceof Date ? value.toISOString() : String(value);
+  // Evitar fórmulas quando o ficheiro é aberto numa folha de cálculo
+  if (/^[=+\-@\t\r]/.test(text)) text = `'${text}`;
+  return /[",\n\r;]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+}
+
+function formatRows(rows, columns, format) {
+  if (format === 'ndjson') {
+    return rows.map(row => JSON.stringify(row)).join('\n') + '\n';
+  }
+  return rows.map(row => columns.map(column => csvCell(row[column])).join(',')).join('\r\n') + '\r\n';
+}
+
+// ---------------------------------------------------------------------------
+// Fontes (um cursor por exportação; opcionalmente junta o arquivo frio)
+// ---------------------------------------------------------------------------
+
+function dateRange(de, ate) {
+  if (!de && !ate) return null;
+  const range = {};
+  if (de) range.$gte = de;
+  if (ate) range.$lte = ate;
+  return range;
+}
+
+// Pipeline sobre marcacoes com o arquivo acrescentado por $unionWith
+function marcacoesPipeline(match, includeArchive, stages) {
+  const pipeline = [{ $match: match }];
+  if (includeArchive) {
+    pipeline.push({ $unionWith: { coll: ARCHIVE_COLLECTION, pipeline: [{ $match: match }] } });
+  }
+  return pipeline.concat(stages);
+}
+
+function includeArchiveFor({ de, arquivo }) {
+  return arquivo || rangeNeedsArchive(de);
+}
+
+const RESOURCES = {
+  marcacoes: {
+    columns: ['id', 'data', 'hora', 'status', 'cliente', 'cliente_email', 'cliente_telefone',
+      'barbeiro', 'servico', 'preco', 'local', 'criado_em'],
+
+    open(db, barbeariaId, filters) {
+      const match = { barbearia_id: barbeariaId };
+      const range = dateRange(filters.de, filters.ate);
+      if (range) match.data = range;
+      if (filters.status) match.status = filters.status;
+
+      return db.collection('marcacoes').aggregate(
+        marcacoesPipeline(match, includeArchiveFor(filters), [{ $sort: { data: 1, hora: 1 } }]),
+        { allowDiskUse: true }
+      );
+    },
+
+    lookups(db) {
+      return {
+        utilizadores: createLookup(db, 'utilizadores', { nome: 1, email: 1, telefone: 1 }),
+        servicos: createLookup(db, 'servicos', { nome: 1, preco: 1 }),
+        locais: createLookup(db, 'locais', { nome: 1 })
+      };
+    },
+
+    async toRows(docs, lookups) {
+      await Promise.all([
+        lookups.utilizadores.prefetch(docs.flatMap(m => [m.cliente_id, m.barbeiro_id])),
+        lookups.servicos.prefetch(docs.map(m => m.servico_id)),
+        lookups.locais.prefetch(docs.map(m => m.local_id))
+      ]);
+
+      return docs.map(m => {
+        const cliente = lookups.utilizadores.get(m.cliente_id);
+        const barbeiro = lookups.utilizadores.get(m.barbeiro_id);
+        const servico = lookups.servicos.get(m.servico_id);
+        const local = lookups.locais.get(m.local_id);
+        return {
+          id: m._id.toString(),
+          data: m.data,
+          hora: m.hora,
+          status: m.status,
+          cliente: cliente?.nome || m.cliente_nome || null,
+          cliente_email: cliente?.email || null,
+          cliente_telefone: cliente?.telefone || m.cliente_telefone || null,
+          barbeiro: barbeiro?.nome || null,
+          servico: servico?.nome || null,
+          preco: servico?.preco ?? null,
+          local: local?.nome || null,
+          criado_em: m.criado_em || null
+        };
+      });
+    }
+  },
+
+  // Uma linha por cliente com marcações, com totais; depois os clientes
+  // registados na barbearia que nunca marcaram
+  clientes: {
+    columns: ['id', 'nome', 'email', 'telefone', 'total_marcacoes', 'marcacoes_concluidas',
+      'total_gasto', 'ultima_visita'],
+
+    open(db, barbeariaId, filters) {
+      const match = { barbearia_id: barbeariaId };
+      const range = dateRange(filters.de, filters.ate);
+      if (range) match.data = range;
+
+      const comMarcacoes = db.collection('marcacoes').aggregate(
+        marcacoesPipeline(match, includeArchiveFor(filters), [
+          {
+            $group: {
+              _id: { cliente: '$cliente_id', servico: '$servico_id' },
+              total: { $sum: 1 },
+              concluidas: { $sum: { $cond: [{ $eq: ['$status', 'concluida'] }, 1, 0] } },
+              ultima: { $max: '$data' }
+            }
+          },
+          {
+            $group: {
+              _id: '$_id.cliente',
+              total_marcacoes: { $sum: '$total' },
+              marcacoes_concluidas: { $sum: '$concluidas' },
+              ultima_visita: { $max: '$ultima' },
+              // Limitado pelo número de serviços, não pelo histórico
+              por_servico: { $push: { servico_id: '$_id.servico', concluidas: '$concluidas' } }
+            }
+          },
+          { $sort: { _id: 1 } }
+        ]),
+        { allowDiskUse: true }
+      );
+
+      // Com filtro de datas só interessam os clientes com marcações no intervalo
+      if (range) return comMarcacoes;
+
+      const semMarcacoes = db.collection('utilizadores')
+        .find({ barbearia_id: barbeariaId, tipo: 'cliente' }, { projection: { password: 0 } })
+        .sort({ _id: 1 });
+
+      return chainCursors(comMarcacoes, semMarcacoes, async (docs) => {
+        // Saltar os que já saíram na primeira parte
+        const ids = docs.map(doc => doc._id.toString());
+        const jaExportados = new Set(
+          await db.collection('marcacoes').distinct('cliente_id', { barbearia_id: barbeariaId, cliente_id: { $in: ids } })
+        );
+        if (includeArchiveFor(filters)) {
+          const arquivados = await db.collection(ARCHIVE_COLLECTION)
+            .distinct('cliente_id', { barbearia_id: barbeariaId, cliente_id: { $in: ids } });
+          arquivados.forEach(id => jaExportados.add(id));
+        }
+        return docs
+          .filter(doc => !jaExportados.has(doc._id.toString()))
+          .map(doc => ({ ...doc, _id: doc._id.toString(), semMarcacoes: true }));
+      });
+    },
+
+    lookups(db) {
+      return {
+        utilizadores: createLookup(db, 'utilizadores', { nome: 1, email: 1, telefone: 1 }),
+        servicos: createLookup(db, 'servicos', { preco: 1 })
+      };
+    },
+
+    async toRows(docs, lookups) {
+      const agregados = docs.filter(doc => !doc.semMarcacoes);
+      await Promise.all([
+        lookups.utilizadores.prefetch(agregados.map(doc => doc._id)),
+        lookups.servicos.prefetch(agregados.flatMap(doc => doc.por_servico.map(s => s.servico_id)))
+      ]);
+
+      return docs.map(doc => {
+        if (doc.semMarcacoes) {
+          return {
+            id: doc._id, nome: doc.nome, email: doc.email, telefone: doc.telefone || null,
+            total_marcacoes: 0, marcacoes_concluidas: 0, total_gasto: 0, ultima_visita: null
+          };
+        }
+
+        const cliente = lookups.utilizadores.get(doc._id);
+        const totalGasto = doc.por_servico.reduce(
+          (sum, s) => sum + s.concluidas * (lookups.servicos.get(s.servico_id)?.preco || 0),
+          0
+        );
+        return {
+          id: doc._id,
+          nome: cliente?.nome || null,
+          email: cliente?.email || null,
+          telefone: cliente?.telefone || null,
+          total_marcacoes: doc.total_marcacoes,
+          marcacoes_concluidas: doc.marcacoes_concluidas,
+          total_gasto: totalGasto,
+          ultima_visita: doc.ultima_visita
+        };
+      });
+    }
+  },
+
+  // Receita das marcações concluídas por dia (ou mês com agrupar=mes)
+  receita: {
+    columns: ['periodo', 'marcacoes_concluidas', 'receita'],
+
+    open(db, barbeariaId, filters) {
+      const match = { barbearia_id: barbeariaId, status: 'concluida' };
+      const range = dateRange(filters.de, filters.ate);
+      if (range) match.data = range;
+
+      const periodo = filters.agrupar === 'mes' ? { $substrBytes: ['$data', 0, 7] } : '$data';
+
+      return db.collection('marcacoes').aggregate(
+        marcacoesPipeline(match, includeArchiveFor(filters), [
+          { $group: { _id: { periodo, servico: '$servico_id' }, concluidas: { $sum: 1 } } },
+          {
+            $group: {
+              _id: '$_id.periodo',
+              marcacoes_concluidas: { $sum: '$concluidas' },
+              por_servico: { $push: { servico_id: '$_id.servico', concluidas: '$concluidas' } }
+            }
+          },
+          { $sort: { _id: 1 } }
+        ]),
+        { allowDiskUse: true }
+      );
+    },
+
+    lookups(db) {
+      return { servicos: createLookup(db, 'servicos', { preco: 1 }) };
+    },
+
+    async toRows(docs, lookups) {
+      await lookups.servicos.prefetch(docs.flatMap(doc => doc.por_servico.map(s => s.servico_id)));
+      return docs.map(doc => ({
+        periodo: doc._id,
+        marcacoes_concluidas: doc.marcacoes_concluidas,
+        receita: doc.por_servico.reduce(
+          (sum, s) => sum + s.concluidas * (lookups.servicos.get(s.servico_id)?.preco || 0),
+          0
+        )
+      }));
+    }
+  }
+};
+
+export function isExportResource(resource) {
+  return Object.prototype.hasOwnProperty.call(RESOURCES, resource);
+}
+
+// Dois cursores em sequência, o segundo com um filtro assíncrono por bloco
+function chainCursors(first, second, filterSecond) {
+  let current = first;
+  return {
+    async readChunk(size) {
+      if (current === first) {
+        const docs = await readFromCursor(first, size);
+        if (docs.length > 0) return docs;
+        current = second;
+      }
+      // Blocos inteiramente filtrados não terminam a exportação
+      for (;;) {
+        const docs = await readFromCursor(second, size);
+        if (docs.length === 0) return docs;
+        const kept = await filterSecond(docs);
+        if (kept.length > 0) return kept;
+      }
+    },
+    async close() {
+      await Promise.all([first.close(), second.close()]);
+    }
+  };
+}
+
+async function readFromCursor(cursor, size) {
+  if (cursor.readChunk) return cursor.readChunk(size);
+
+  const docs = [];
+  while (docs.length < size && await cursor.hasNext()) {
+    docs.push(await cursor.next());
+  }
+  return docs;
+}
+
+// ReadableStream com a exportação. pull() só lê o bloco seguinte quando o
+// cliente consumiu o anterior, por isso a memória não cresce com o tamanho.
+// onDone é chamado uma vez quando a exportação termina ou é cancelada.
+export function createExportStream(db, { resource, barbeariaId, format, filters, onDone }) {
+  const definition = RESOURCES[resource];
+  const encoder = new TextEncoder();
+  const cursor = definition.open(db, barbeariaId, filters);
+  const lookups = definition.lookups(db);
+  let finished = false;
+
+  async function finish() {
+    if (finished) return;
+    finished = true;
+    await cursor.close().catch(() => {});
+    onDone?.();
+  }
+
+  return new ReadableStream({
+    start(controller) {
+      if (format === 'csv') {
+        // BOM para o Excel abrir UTF-8 corretamente
+        controller.enqueue(encoder.encode('\uFEFF' + definition.columns.join(',') + '\r\n'));
+      }
+    },
+
+    async pull(controller) {
+      try {
+        const docs = await readFromCursor(cursor, CHUNK_SIZE);
+        if (docs.length === 0) {
+          await finish();
+          controller.close();
+          return;
+        }
+        const rows = await definition.toRows(docs, lookups);
+        controller.enqueue(encoder.encode(formatRows(rows, definition.columns, format)));
+      } catch (error) {
+        console.error(`Erro na exportação de ${resource}:`, error.message);
+        await finish();
+        controller.error(error);
+      }
+    },
+
+    async cancel() {
+      await finish();
+    }
+  });
+}
@@ -0,0 +1,55 @@
+import { createHash } from 'crypto';
+import { NextResponse } from 'next/server';
+import { encodeJsonBody } from '@/lib/json-response';
+
+// Respostas JSON com ETag fraco e 304 Not Modified para endpoints de leitura.
+// O browser (ou CDN) guarda a resposta e revalida com If-None-Match; quando
+// nada mudou a resposta é um 304 sem corpo.
+
+export const CACHE_POLICIES = {
+  // Catálogo estático (planos do SaaS)
+  static: 'public, max-age=3600, stale-while-revalidate=86400',
+  // Páginas públicas do tenant: CDN/browser absorvem tráfego repetido
+  publicTenant: 'public, max-age=60, stale-while-revalidate=300',
+  // Dados do dashboard: guardar, mas revalidar sempre (304 quando não mudou)
+  privateRevalidate: 'private, no-cache'
+};
+
+export function computeETag(value) {
+  const hash = createHash('sha1').update(value).digest('base64url').substring(0, 27);
+  return `W/"${hash}"`;
+}
+
+export function matchesIfNoneMatch(request, etag) {
+  const header = request.headers.get('if-none-match');
+  if (!header) return false;
+  if (header.trim() === '*') return true;
+
+  // Comparação fraca: ignorar o prefixo W/
+  const opaque = etag.replace(/^W\//, '');
+  return header.split(',').some(candidate => candidate.trim().replace(/^W\//, '') === opaque);
+}
+
+// Devolve data como JSON com ETag e Cache-Control, ou 304 se o cliente já tem
+// esta versão. `version` (ex: atualizado_em mais recente) evita o hash do corpo.
+// O ETag é calculado sobre o JSON, por isso é o mesmo com ou sem compressão.
+export async function cachedJson(request, data, { cacheControl = CACHE_POLICIES.privateRevalidate, version } = {}) {
+  const body = JSON.stringify(data);
+  const etag = computeETag(version !== undefined ? String(version) : body);
+
+  const headers = {
+    ETag: etag,
+    'Cache-Control': cacheControl
+  };
+  headers.Vary = cacheControl.startsWith('private') ? 'Authorization, Accept-Encoding' : 'Accept-Encoding';
+
+  if (matchesIfNoneMatch(request, etag)) {
+    return new NextResponse(null, { status: 304, headers });
+  }
+
+  const encoded = await encodeJsonBody(request, body);
+  return new NextResponse(encoded.body, {
+    status: 200,
+    headers: { ...encoded.headers, ...headers }
+  });
+}
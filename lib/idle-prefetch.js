@@ -0,0 +1,44 @@
+// Pré-carregamento dos chunks das tabs quando o browser está ocioso.
+// Os loaders são os mesmos passados ao next/dynamic: chamar import() de novo
+// põe o chunk na cache do webpack, e a tab abre sem esperar pela rede.
+
+const IDLE_TIMEOUT_MS = 2000;
+
+function onIdle(callback) {
+  if (typeof window.requestIdleCallback === 'function') {
+    const id = window.requestIdleCallback(callback, { timeout: IDLE_TIMEOUT_MS });
+    return () => window.cancelIdleCallback(id);
+  }
+  // Safari não tem requestIdleCallback
+  const id = setTimeout(() => callback({ timeRemaining: () => 0, didTimeout: true }), IDLE_TIMEOUT_MS);
+  return () => clearTimeout(id);
+}
+
+// Carrega um loader por cada período ocioso, para não competir com a
+// interação do utilizador. Devolve uma função que cancela o que falta.
+export function prefetchOnIdle(loaders) {
+  if (typeof window === 'undefined') return () => {};
+
+  // Poupança de dados ou rede lenta: carregar só quando a tab for aberta
+  const connection = navigator.connection;
+  if (connection && (connection.saveData || /(^|-)2g$/.test(connection.effectiveType || ''))) {
+    return () => {};
+  }
+
+  const pending = [...loaders];
+  let cancel = () => {};
+
+  const next = () => {
+    const loader = pending.shift();
+    if (!loader) return;
+    cancel = onIdle(() => {
+      loader().catch(() => {}).finally(next);
+    });
+  };
+
+  next();
+  return () => {
+    pending.length = 0;
+    cancel();
+  };
+}
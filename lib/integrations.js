@@ -0,0 +1,52 @@
+// SDKs de pagamentos e mensagens carregados só quando são usados. O stripe e
+// o twilio são pesados de importar (centenas de módulos) e a maioria dos
+// pedidos à API nunca lhes toca: com import() dinâmico o webpack põe-nos em
+// chunks à parte e um cold start que só serve leituras não os carrega.
+//
+// Os clientes ficam em cache por credencial (as barbearias têm chaves
+// próprias) durante a vida do processo.
+
+const STATE_KEY = Symbol.for('cuthub.integrations');
+
+if (!globalThis[STATE_KEY]) {
+  globalThis[STATE_KEY] = { modules: new Map(), clients: new Map() };
+}
+
+const state = globalThis[STATE_KEY];
+
+function loadModule(name, loader) {
+  if (!state.modules.has(name)) {
+    const promise = loader().then(mod => mod.default || mod).catch((error) => {
+      state.modules.delete(name);
+      throw error;
+    });
+    state.modules.set(name, promise);
+  }
+  return state.modules.get(name);
+}
+
+async function cachedClient(key, create) {
+  if (!state.clients.has(key)) {
+    const promise = create().catch((error) => {
+      state.clients.delete(key);
+      throw error;
+    });
+    state.clients.set(key, promise);
+  }
+  return state.clients.get(key);
+}
+
+// Cliente Stripe para uma chave secreta (por omissão a da plataforma)
+export function getStripeClient(secretKey = process.env.STRIPE_SECRET_KEY, { apiVersion } = {}) {
+  return cachedClient(`stripe|${secretKey}|${apiVersion || ''}`, async () => {
+    const Stripe = await loadModule('stripe', () => import('stripe'));
+    return new Stripe(secretKey, apiVersion ? { apiVersion } : undefined);
+  });
+}
+
+export function getTwilioClient(accountSid, authToken) {
+  return cachedClient(`twilio|${accountSid}|${authToken}`, async () => {
+    const twilio = await loadModule('twilio', () => import('twilio'));
+    return twilio(accountSid, authToken);
+  });
+}
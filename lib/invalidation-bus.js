@@ -0,0 +1,254 @@
+import { ObjectId } from 'mongodb';
+import { hostname } from 'os';
+import { randomBytes } from 'crypto';
+import { runOutsideRequest } from '@/lib/metrics';
+
+// Barramento de invalidação de caches entre instâncias (`next start` atrás de
+// um load balancer). As escritas publicam chaves numa capped collection e
+// cada nó segue-a com um cursor tailable, apagando as mesmas chaves das suas
+// caches em memória. Não precisa de replica set nem de infraestrutura extra.
+//
+// Chaves: "<namespace>:<id>", ex. "entitlements:barbearia:<id>" ou
+// "public-barbearia:<slug>". Cada módulo com cache regista o seu namespace
+// com registerInvalidationHandler.
+//
+// Invalidações são idempotentes: ao retomar o cursor o nó relê uma pequena
+// janela para trás (tolera desvio de relógio entre nós) e, se a posição se
+// perdeu (a capped collection deu a volta), limpa as caches por inteiro.
+
+export const INVALIDATION_COLLECTION = 'cache_invalidations';
+
+const ENABLED = process.env.INVALIDATION_BUS !== 'false';
+const CAPPED_SIZE_BYTES = 4 * 1024 * 1024;
+const MAX_AWAIT_MS = parseInt(process.env.INVALIDATION_BUS_MAX_AWAIT_MS || '1000', 10);
+const RETRY_MS = 1000;
+const RESUME_OVERLAP_SECONDS = 5;
+const LAG_BUCKETS_SECONDS = [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+
+const STATE_KEY = Symbol.for('cuthub.invalidationBus');
+
+if (!globalThis[STATE_KEY]) {
+  globalThis[STATE_KEY] = {
+    nodeId: `${hostname()}:${process.pid}:${randomBytes(3).toString('hex')}`,
+    handlers: new Map(),   // namespace -> { invalidate(id), flush() }
+    db: null,
+    listening: false,
+    up: false,
+    lastSeenAt: null,      // Date do último documento lido
+    published: 0,
+    applied: 0,
+    flushes: 0,
+    errors: 0,
+    lagBuckets: LAG_BUCKETS_SECONDS.map(() => 0),
+    lagSum: 0,
+    lagCount: 0,
+    lagMax: 0
+  };
+}
+
+const bus = globalThis[STATE_KEY];
+
+let collectionReady = null;
+
+export function registerInvalidationHandler(namespace, handler) {
+  bus.handlers.set(namespace, handler);
+}
+
+function applyKey(key) {
+  const separator = key.indexOf(':');
+  const namespace = separator === -1 ? key : key.substring(0, separator);
+  const id = separator === -1 ? null : key.substring(separator + 1);
+  const handler = bus.handlers.get(namespace);
+  if (!handler) return;
+
+  try {
+    handler.invalidate(id);
+  } catch (error) {
+    console.error(`Erro ao aplicar invalidação ${key}:`, error.message);
+  }
+}
+
+function flushAll() {
+  bus.flushes++;
+  for (const [namespace, handler] of bus.handlers) {
+    try {
+      handler.flush();
+    } catch (error) {
+      console.error(`Erro ao limpar cache ${namespace}:`, error.message);
+    }
+  }
+}
+
+async function ensureCollection(db) {
+  if (!collectionReady) {
+    collectionReady = db
+      .createCollection(INVALIDATION_COLLECTION, { capped: true, size: CAPPED_SIZE_BYTES })
+      .catch((error) => {
+        // 48 = NamespaceExists
+        if (error.code !== 48) {
+          collectionReady = null;
+          throw error;
+        }
+      });
+  }
+  await collectionReady;
+}
+
+// Invalida as chaves neste nó e publica-as para os restantes. Com
+// skipLocal, a cache deste nó já tem o valor novo e só os outros invalidam.
+// Nunca lança: a escrita de origem já foi feita e as caches têm TTL.
+export async function publishInvalidation(keys, { skipLocal = false } = {}) {
+  const list = [...new Set([].concat(keys).filter(Boolean))];
+  if (list.length === 0) return;
+
+  if (!skipLocal) list.forEach(applyKey);
+
+  if (!ENABLED || !bus.db) return;
+  try {
+    await runOutsideRequest(async () => {
+      await ensureCollection(bus.db);
+      await bus.db.collection(INVALIDATION_COLLECTION).insertOne({
+        keys: list,
+        origem: bus.nodeId,
+        criado_em: new Date()
+      });
+    });
+    bus.published++;
+  } catch (error) {
+    bus.errors++;
+    console.error('Erro ao publicar invalidação:', error.message);
+  }
+}
+
+function recordLag(createdAt) {
+  const lagSeconds = Math.max(0, (Date.now() - new Date(createdAt).getTime()) / 1000);
+  LAG_BUCKETS_SECONDS.forEach((le, i) => {
+    if (lagSeconds <= le) bus.lagBuckets[i]++;
+  });
+  bus.lagSum += lagSeconds;
+  bus.lagCount++;
+  bus.lagMax = Math.max(bus.lagMax, lagSeconds);
+}
+
+function handleMessage(doc) {
+  bus.lastSeenAt = doc.criado_em || doc._id.getTimestamp();
+  // As mensagens deste nó já foram aplicadas ao publicar
+  if (doc.origem === bus.nodeId || !Array.isArray(doc.keys) || doc.keys.length === 0) return;
+
+  doc.keys.forEach(applyKey);
+  bus.applied++;
+  recordLag(doc.criado_em || doc._id.getTimestamp());
+}
+
+async function tailOnce(db) {
+  const collection = db.collection(INVALIDATION_COLLECTION);
+
+  let filter = {};
+  if (bus.lastSeenAt) {
+    const resumeFrom = new Date(bus.lastSeenAt.getTime() - RESUME_OVERLAP_SECONDS * 1000);
+
+    // Se a mensagem mais antiga ainda na collection é posterior ao ponto de
+    // retoma, perderam-se invalidações: limpar tudo
+    const oldest = await collection.findOne({}, { sort: { $natural: 1 } });
+    if (oldest && oldest._id.getTimestamp() > resumeFrom) {
+      flushAll();
+    }
+    filter = { _id: { $gt: ObjectId.createFromTime(Math.floor(resumeFrom.getTime() / 1000)) } };
+  } else {
+    // Arranque: só interessa o que for publicado a partir de agora
+    filter = { _id: { $gt: ObjectId.createFromTime(Math.floor(Date.now() / 1000)) } };
+    bus.lastSeenAt = new Date();
+  }
+
+  // Um cursor tailable sem resultados iniciais morre logo; este marcador
+  // (sem chaves) garante que o cursor abre e fica à espera no fim
+  await collection.insertOne({ keys: [], origem: bus.nodeId, criado_em: new Date() });
+
+  const cursor = collection.find(filter, {
+    tailable: true,
+    awaitData: true,
+    maxAwaitTimeMS: MAX_AWAIT_MS
+  });
+
+  try {
+    bus.up = true;
+    for await (const doc of cursor) {
+      handleMessage(doc);
+    }
+  } finally {
+    await cursor.close().catch(() => {});
+  }
+}
+
+async function listen(db) {
+  for (;;) {
+    try {
+      await ensureCollection(db);
+      // Só termina se o cursor morrer (ex: a capped collection deu a volta)
+      await tailOnce(db);
+    } catch (error) {
+      bus.up = false;
+      bus.errors++;
+      console.error('Erro no listener de invalidações:', error.message);
+    }
+    await new Promise(resolve => setTimeout(resolve, RETRY_MS).unref?.());
+  }
+}
+
+// Chamado por connectToDatabase: um listener por processo
+export function startInvalidationListener(db) {
+  if (!ENABLED || bus.listening) return;
+  bus.db = db;
+  bus.listening = true;
+  runOutsideRequest(() => {
+    listen(db);
+  });
+}
+
+export function renderInvalidationPrometheus() {
+  const lines = [];
+
+  lines.push('# HELP cache_invalidation_lag_seconds Atraso entre a publicação e a aplicação de uma invalidação noutro nó.');
+  lines.push('# TYPE cache_invalidation_lag_seconds histogram');
+  LAG_BUCKETS_SECONDS.forEach((le, i) => {
+    lines.push(`cache_invalidation_lag_seconds_bucket{le="${le}"} ${bus.lagBuckets[i]}`);
+  });
+  lines.push(`cache_invalidation_lag_seconds_bucket{le="+Inf"} ${bus.lagCount}`);
+  lines.push(`cache_invalidation_lag_seconds_sum ${bus.lagSum}`);
+  lines.push(`cache_invalidation_lag_seconds_count ${bus.lagCount}`);
+
+  lines.push('# HELP cache_invalidation_lag_max_seconds Maior atraso observado.');
+  lines.push('# TYPE cache_invalidation_lag_max_seconds gauge');
+  lines.push(`cache_invalidation_lag_max_seconds ${bus.lagMax}`);
+
+  lines.push('# HELP cache_invalidations_published_total Mensagens de invalidação publicadas por este nó.');
+  lines.push('# TYPE cache_invalidations_published_total counter');
+  lines.push(`cache_invalidations_published_total ${bus.published}`);
+
+  lines.push('# HELP cache_invalidations_applied_total Mensagens de outros nós aplicadas.');
+  lines.push('# TYPE cache_invalidations_applied_total counter');
+  lines.push(`cache_invalidations_applied_total ${bus.applied}`);
+
+  lines.push('# HELP cache_invalidation_flushes_total Limpezas completas por perda de posição no barramento.');
+  lines.push('# TYPE cache_invalidation_flushes_total counter');
+  lines.push(`cache_invalidation_flushes_total ${bus.flushes}`);
+
+  lines.push('# HELP cache_invalidation_listener_up 1 se o cursor do barramento está ativo.');
+  lines.push('# TYPE cache_invalidation_listener_up gauge');
+  lines.push(`cache_invalidation_listener_up ${bus.up ? 1 : 0}`);
+
+  return lines.join('\n') + '\n';
+}
+
+export function getInvalidationStats() {
+  return {
+    no: bus.nodeId,
+    ativo: bus.up,
+    publicadas: bus.published,
+    aplicadas: bus.applied,
+    limpezas: bus.flushes,
+    erros: bus.errors,
+    atraso_medio_ms: bus.lagCount ? (bus.lagSum / bus.lagCount) * 1000 : 0,
+    atraso_max_ms: bus.lagMax * 1000
+  };
+}
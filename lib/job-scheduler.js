@@ -0,0 +1,393 @@
+import { hostname } from 'os';
+import { randomBytes } from 'crypto';
+import { runOutsideRequest } from '@/lib/metrics';
+
+// Agendador de jobs dentro da app, partilhado por todos os nós. Substitui a
+// dependência de um chamador externo nos crons (que podia disparar duas
+// execuções sobrepostas) por leases no Mongo:
+//
+// - `scheduled_jobs`: um documento por job com a próxima execução. Em cada
+//   tick, o nó que consegue avançar `proxima_execucao` (update condicional)
+//   abre uma nova onda e cria as partições dela.
+// - `job_leases`: um documento por onda × partição. Qualquer nó reclama uma
+//   partição pendente (ou com lease expirado) com findOneAndUpdate, renova o
+//   lease enquanto trabalha e marca-a concluída no fim. Vários nós dividem
+//   assim uma onda grande; se um nó morrer, a partição volta a ficar
+//   disponível quando o lease expira.
+//
+// Os jobs registam-se com registerJob (ver lib/jobs) e indicam as partições
+// de cada onda (por tenant ou faixa de hash) e o trabalho de uma partição.
+// Em deploys serverless sem processo permanente, /api/cron/jobs corre um
+// tick (JOB_SCHEDULER=false desliga o ciclo em background).
+
+export const JOBS_COLLECTION = 'scheduled_jobs';
+export const LEASES_COLLECTION = 'job_leases';
+
+const ENABLED = process.env.JOB_SCHEDULER !== 'false';
+const TICK_MS = parseInt(process.env.JOB_SCHEDULER_TICK_MS || '5000', 10);
+const LEASE_MS = parseInt(process.env.JOB_LEASE_MS || '60000', 10);
+const CONCURRENCY = parseInt(process.env.JOB_SCHEDULER_CONCURRENCY || '2', 10);
+const MAX_ATTEMPTS = parseInt(process.env.JOB_MAX_ATTEMPTS || '3', 10);
+// Partições concluídas ficam este tempo para consulta e depois expiram
+const RETENTION_SECONDS = 7 * 24 * 60 * 60;
+const DURATION_BUCKETS_SECONDS = [0.1, 0.5, 1, 5, 15, 30, 60, 300, 900];
+const LAG_BUCKETS_SECONDS = [1, 5, 15, 30, 60, 300, 900, 3600];
+
+const STATE_KEY = Symbol.for('cuthub.jobScheduler');
+
+if (!globalThis[STATE_KEY]) {
+  globalThis[STATE_KEY] = {
+    nodeId: `${hostname()}:${process.pid}:${randomBytes(3).toString('hex')}`,
+    jobs: new Map(),       // nome -> { intervalMs, partitions(db), run(db, particao, ctx) }
+    stats: new Map(),      // nome -> métricas das partições corridas neste nó
+    db: null,
+    started: false,
+    ticking: null,         // Promise do tick em curso (os ticks não se sobrepõem)
+    indexesReady: null,
+    ticks: 0,
+    tickErrors: 0
+  };
+}
+
+const scheduler = globalThis[STATE_KEY];
+
+function emptyStats() {
+  return {
+    ondas: 0,
+    particoes: 0,
+    erros: 0,
+    leasesPerdidos: 0,
+    durationBuckets: DURATION_BUCKETS_SECONDS.map(() => 0),
+    durationSum: 0,
+    durationCount: 0,
+    lagBuckets: LAG_BUCKETS_SECONDS.map(() => 0),
+    lagSum: 0,
+    lagCount: 0,
+    lagMax: 0,
+    ultimaExecucao: null,
+    ultimoErro: null
+  };
+}
+
+function statsFor(name) {
+  if (!scheduler.stats.has(name)) scheduler.stats.set(name, emptyStats());
+  return scheduler.stats.get(name);
+}
+
+function observe(buckets, limits, value) {
+  limits.forEach((le, i) => {
+    if (value <= le) buckets[i]++;
+  });
+}
+
+// Regista um job. `partitions(db)` devolve as chaves das partições de uma
+// onda (strings); `run(db, particao, ctx)` faz o trabalho de uma delas e
+// deve verificar `ctx.signal.aborted` entre lotes (lease perdido).
+export function registerJob(name, { intervalMs, partitions = async () => ['*'], run }) {
+  if (!intervalMs || typeof run !== 'function') {
+    throw new Error(`Job ${name} sem intervalMs ou run`);
+  }
+  scheduler.jobs.set(name, { name, intervalMs, partitions, run });
+  statsFor(name);
+}
+
+function ensureIndexes(db) {
+  if (!scheduler.indexesReady) {
+    const leases = db.collection(LEASES_COLLECTION);
+    scheduler.indexesReady = Promise.all([
+      leases.createIndex({ estado: 1, agendada_para: 1 }),
+      leases.createIndex({ job: 1, onda: 1 }),
+      leases.createIndex({ expira_em: 1 }, { expireAfterSeconds: 0 })
+    ]).catch((error) => {
+      scheduler.indexesReady = null;
+      throw error;
+    });
+  }
+  return scheduler.indexesReady;
+}
+
+// Cria os documentos dos jobs que ainda não existem (primeira onda já devida)
+async function ensureJobDocuments(db, now) {
+  const jobs = db.collection(JOBS_COLLECTION);
+  await Promise.all([...scheduler.jobs.values()].map(job =>
+    jobs.updateOne(
+      { _id: job.name },
+      { $setOnInsert: { proxima_execucao: now, onda: 0 } },
+      { upsert: true }
+    ).catch((error) => {
+      // Dois nós a criar o mesmo job ao mesmo tempo
+      if (error.code !== 11000) throw error;
+    })
+  ));
+}
+
+// Abre as ondas devidas: só um nó consegue avançar proxima_execucao
+async function openDueWaves(db, now) {
+  const jobs = db.collection(JOBS_COLLECTION);
+  const leases = db.collection(LEASES_COLLECTION);
+
+  for (const job of scheduler.jobs.values()) {
+    const previous = await jobs.findOneAndUpdate(
+      { _id: job.name, proxima_execucao: { $lte: now } },
+      {
+        $set: { proxima_execucao: new Date(now.getTime() + job.intervalMs), aberta_em: now, aberta_por: scheduler.nodeId },
+        $inc: { onda: 1 }
+      },
+      { returnDocument: 'before' }
+    );
+    if (!previous) continue;
+
+    const onda = (previous.onda || 0) + 1;
+    const agendadaPara = previous.proxima_execucao;
+    try {
+      const keys = [...new Set(await job.partitions(db))];
+      if (keys.length > 0) {
+        await leases.insertMany(keys.map(particao => ({
+          _id: `${job.name}|${onda}|${particao}`,
+          job: job.name,
+          onda,
+          particao,
+          estado: 'pendente',
+          agendada_para: agendadaPara,
+          tentativas: 0,
+          criado_em: now,
+          expira_em: new Date(now.getTime() + RETENTION_SECONDS * 1000)
+        })), { ordered: false });
+      }
+      await jobs.updateOne({ _id: job.name }, { $set: { particoes: keys.length } });
+      statsFor(job.name).ondas++;
+    } catch (error) {
+      // Sem partições a onda perde-se: voltar a agendar para o próximo tick
+      await jobs.updateOne({ _id: job.name, onda }, { $set: { proxima_execucao: now } }).catch(() => {});
+      statsFor(job.name).erros++;
+      statsFor(job.name).ultimoErro = error.message;
+      console.error(`Erro ao abrir onda do job ${job.name}:`, error.message);
+    }
+  }
+}
+
+// Partições com lease expirado e sem tentativas restantes ficam em erro
+async function expireExhausted(db, now) {
+  await db.collection(LEASES_COLLECTION).updateMany(
+    { estado: 'em_curso', lease_ate: { $lt: now }, tentativas: { $gte: MAX_ATTEMPTS } },
+    { $set: { estado: 'erro', erro: 'Lease expirado sem tentativas restantes' }, $unset: { lease_ate: '' } }
+  );
+}
+
+async function claimPartition(db) {
+  const now = new Date();
+  return db.collection(LEASES_COLLECTION).findOneAndUpdate(
+    {
+      job: { $in: [...scheduler.jobs.keys()] },
+      tentativas: { $lt: MAX_ATTEMPTS },
+      $or: [
+        { estado: 'pendente' },
+        { estado: 'em_curso', lease_ate: { $lt: now } }
+      ]
+    },
+    {
+      $set: { estado: 'em_curso', dono: scheduler.nodeId, lease_ate: new Date(now.getTime() + LEASE_MS), iniciada_em: now },
+      $inc: { tentativas: 1 }
+    },
+    { sort: { agendada_para: 1 }, returnDocument: 'after' }
+  );
+}
+
+async function runPartition(db, lease) {
+  const job = scheduler.jobs.get(lease.job);
+  const stats = statsFor(lease.job);
+  const leases = db.collection(LEASES_COLLECTION);
+  const controller = new AbortController();
+  const startedAt = Date.now();
+
+  const lagSeconds = Math.max(0, (startedAt - new Date(lease.agendada_para).getTime()) / 1000);
+  observe(stats.lagBuckets, LAG_BUCKETS_SECONDS, lagSeconds);
+  stats.lagSum += lagSeconds;
+  stats.lagCount++;
+  stats.lagMax = Math.max(stats.lagMax, lagSeconds);
+
+  // Renovar o lease; se outro nó o tiver reclamado, abortar
+  const heartbeat = setInterval(() => {
+    leases.updateOne(
+      { _id: lease._id, dono: scheduler.nodeId, estado: 'em_curso' },
+      { $set: { lease_ate: new Date(Date.now() + LEASE_MS) } }
+    ).then((result) => {
+      if (result.matchedCount === 0) controller.abort();
+    }).catch(() => {});
+  }, Math.max(1000, Math.floor(LEASE_MS / 3)));
+  heartbeat.unref?.();
+
+  const finish = (fields) => leases.updateOne(
+    { _id: lease._id, dono: scheduler.nodeId },
+    { $set: { ...fields, duracao_ms: Date.now() - startedAt }, $unset: { lease_ate: '' } }
+  );
+
+  try {
+    const resultado = await job.run(db, lease.particao, {
+      onda: lease.onda,
+      agendadaPara: lease.agendada_para,
+      signal: controller.signal
+    });
+    if (controller.signal.aborted) {
+      stats.leasesPerdidos++;
+      return;
+    }
+    await finish({ estado: 'concluida', concluida_em: new Date(), resultado: resultado ?? null });
+    stats.particoes++;
+  } catch (error) {
+    stats.erros++;
+    stats.ultimoErro = error.message;
+    console.error(`Erro no job ${lease.job} (${lease.particao}):`, error.message);
+    // Volta a pendente enquanto houver tentativas
+    await finish({
+      estado: lease.tentativas >= MAX_ATTEMPTS ? 'erro' : 'pendente',
+      erro: error.message
+    }).catch(() => {});
+  } finally {
+    clearInterval(heartbeat);
+    const seconds = (Date.now() - startedAt) / 1000;
+    observe(stats.durationBuckets, DURATION_BUCKETS_SECONDS, seconds);
+    stats.durationSum += seconds;
+    stats.durationCount++;
+    stats.ultimaExecucao = new Date().toISOString();
+  }
+}
+
+// Um tick: abre as ondas devidas e trabalha partições até não haver mais
+// (CONCURRENCY de cada vez). Devolve quantas partições este nó correu.
+export function runSchedulerTick(db) {
+  if (scheduler.ticking) return scheduler.ticking;
+
+  scheduler.ticking = runOutsideRequest(async () => {
+    // Os jobs importam módulos que dependem de lib/mongodb: carregar aqui
+    // evita o ciclo no arranque
+    await import('@/lib/jobs');
+    const now = new Date();
+    await ensureIndexes(db);
+    await ensureJobDocuments(db, now);
+    await expireExhausted(db, now);
+    await openDueWaves(db, now);
+
+    let corridas = 0;
+    const worker = async () => {
+      for (;;) {
+        const lease = await claimPartition(db);
+        if (!lease) return;
+        await runPartition(db, lease);
+        corridas++;
+      }
+    };
+    await Promise.all(Array.from({ length: Math.max(1, CONCURRENCY) }, worker));
+    scheduler.ticks++;
+    return corridas;
+  }).catch((error) => {
+    scheduler.tickErrors++;
+    console.error('Erro no tick do agendador de jobs:', error.message);
+    return 0;
+  }).finally(() => {
+    scheduler.ticking = null;
+  });
+
+  return scheduler.ticking;
+}
+
+// Chamado por connectToDatabase: um ciclo por processo
+export function startJobScheduler(db) {
+  if (!ENABLED || scheduler.started) return;
+  scheduler.db = db;
+  scheduler.started = true;
+  runOutsideRequest(() => {
+    const timer = setInterval(() => runSchedulerTick(db), TICK_MS);
+    timer.unref?.();
+    runSchedulerTick(db);
+  });
+}
+
+// Estado de cada job na base (próxima execução e partições da última onda)
+export async function getJobStatus(db) {
+  const docs = await db.collection(JOBS_COLLECTION).find({}).toArray();
+  return Promise.all(docs.map(async (doc) => {
+    const estados = await db.collection(LEASES_COLLECTION).aggregate([
+      { $match: { job: doc._id, onda: doc.onda } },
+      { $group: { _id: '$estado', total: { $sum: 1 } } }
+    ]).toArray();
+    return {
+      job: doc._id,
+      onda: doc.onda,
+      proxima_execucao: doc.proxima_execucao,
+      aberta_em: doc.aberta_em || null,
+      particoes: Object.fromEntries(estados.map(e => [e._id, e.total]))
+    };
+  }));
+}
+
+export function renderJobPrometheus() {
+  const lines = [];
+  const histogram = (metric, help, limits, field) => {
+    lines.push(`# HELP ${metric} ${help}`);
+    lines.push(`# TYPE ${metric} histogram`);
+    for (const [job, stats] of scheduler.stats) {
+      limits.forEach((le, i) => {
+        lines.push(`${metric}_bucket{job="${job}",le="${le}"} ${stats[`${field}Buckets`][i]}`);
+      });
+      lines.push(`${metric}_bucket{job="${job}",le="+Inf"} ${stats[`${field}Count`]}`);
+      lines.push(`${metric}_sum{job="${job}"} ${stats[`${field}Sum`]}`);
+      lines.push(`${metric}_count{job="${job}"} ${stats[`${field}Count`]}`);
+    }
+  };
+  const counter = (metric, help, field) => {
+    lines.push(`# HELP ${metric} ${help}`);
+    lines.push(`# TYPE ${metric} counter`);
+    for (const [job, stats] of scheduler.stats) {
+      lines.push(`${metric}{job="${job}"} ${stats[field]}`);
+    }
+  };
+
+  histogram('job_partition_duration_seconds', 'Duração de cada partição corrida por este nó.', DURATION_BUCKETS_SECONDS, 'duration');
+  histogram('job_partition_lag_seconds', 'Atraso entre a hora agendada da onda e o início da partição.', LAG_BUCKETS_SECONDS, 'lag');
+
+  lines.push('# HELP job_partition_lag_max_seconds Maior atraso observado.');
+  lines.push('# TYPE job_partition_lag_max_seconds gauge');
+  for (const [job, stats] of scheduler.stats) {
+    lines.push(`job_partition_lag_max_seconds{job="${job}"} ${stats.lagMax}`);
+  }
+
+  counter('job_waves_opened_total', 'Ondas abertas por este nó.', 'ondas');
+  counter('job_partitions_completed_total', 'Partições concluídas por este nó.', 'particoes');
+  counter('job_errors_total', 'Partições (ou aberturas de onda) que falharam neste nó.', 'erros');
+  counter('job_leases_lost_total', 'Partições abandonadas porque o lease passou para outro nó.', 'leasesPerdidos');
+
+  lines.push('# HELP job_scheduler_ticks_total Ticks do agendador neste nó.');
+  lines.push('# TYPE job_scheduler_ticks_total counter');
+  lines.push(`job_scheduler_ticks_total ${scheduler.ticks}`);
+
+  lines.push('# HELP job_scheduler_tick_errors_total Ticks interrompidos por erro.');
+  lines.push('# TYPE job_scheduler_tick_errors_total counter');
+  lines.push(`job_scheduler_tick_errors_total ${scheduler.tickErrors}`);
+
+  return lines.join('\n') + '\n';
+}
+
+export function getJobStats() {
+  const jobs = {};
+  for (const [job, stats] of scheduler.stats) {
+    jobs[job] = {
+      ondas: stats.ondas,
+      particoes: stats.particoes,
+      erros: stats.erros,
+      leases_perdidos: stats.leasesPerdidos,
+      duracao_media_ms: stats.durationCount ? (stats.durationSum / stats.durationCount) * 1000 : 0,
+      atraso_medio_ms: stats.lagCount ? (stats.lagSum / stats.lagCount) * 1000 : 0,
+      atraso_max_ms: stats.lagMax * 1000,
+      ultima_execucao: stats.ultimaExecucao,
+      ultimo_erro: stats.ultimoErro
+    };
+  }
+  return {
+    no: scheduler.nodeId,
+    ativo: scheduler.started,
+    ticks: scheduler.ticks,
+    erros_tick: scheduler.tickErrors,
+    jobs
+  };
+}
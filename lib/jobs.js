@@ -0,0 +1,106 @@
+import { createHash } from 'crypto';
+import { registerJob } from '@/lib/job-scheduler';
+import { sendReminderWave } from '@/lib/reminders';
+import { archiveMarcacoes } from '@/lib/marcacoes-archive';
+import { rebuildRollups } from '@/lib/rollups';
+import { tenantDatabases, getTenantDb, TenantDb } from '@/lib/tenant-db';
+import { recoverStaleMigrations } from '@/lib/tenant-migration';
+
+// Jobs periódicos corridos pelo agendador (lib/job-scheduler). Chaves de
+// partição:
+// - "partilhada:<i>/<n>": faixa de hash i de n na base partilhada
+// - "<barbearia_id>:<i>/<n>": faixa de hash de um tenant em base dedicada
+// - "partilhada" / "<barbearia_id>": uma base inteira
+
+const MINUTE = 60 * 1000;
+const HOUR = 60 * MINUTE;
+
+const REMINDERS_INTERVAL_MS = parseInt(process.env.JOB_REMINDERS_INTERVAL_MS || String(5 * MINUTE), 10);
+const REMINDERS_PARTITIONS = parseInt(process.env.JOB_REMINDERS_PARTITIONS || '8', 10);
+const ARCHIVE_INTERVAL_MS = parseInt(process.env.JOB_ARCHIVE_INTERVAL_MS || String(24 * HOUR), 10);
+const ROLLUPS_INTERVAL_MS = parseInt(process.env.JOB_ROLLUPS_INTERVAL_MS || String(HOUR), 10);
+const ROLLUPS_PARTITIONS = parseInt(process.env.JOB_ROLLUPS_PARTITIONS || '8', 10);
+const MIGRATION_RECOVERY_INTERVAL_MS = parseInt(process.env.JOB_MIGRATION_RECOVERY_INTERVAL_MS || String(MINUTE), 10);
+
+const SHARED = 'partilhada';
+
+function databaseKey(database) {
+  return database instanceof TenantDb ? database.barbeariaId : SHARED;
+}
+
+async function databaseForKey(db, key) {
+  return key === SHARED ? db : getTenantDb(db, key);
+}
+
+// Uma partição por faixa de hash em cada base
+async function hashRangePartitions(db, partes) {
+  const keys = [];
+  for (const database of await tenantDatabases(db)) {
+    for (let i = 0; i < partes; i++) keys.push(`${databaseKey(database)}:${i}/${partes}`);
+  }
+  return keys;
+}
+
+function parseHashRange(particao) {
+  const match = /^(.+):(\d+)\/(\d+)$/.exec(particao);
+  return { base: match[1], parte: parseInt(match[2], 10), partes: parseInt(match[3], 10) };
+}
+
+function hashBucket(id, partes) {
+  return createHash('md5').update(String(id)).digest().readUInt32BE(0) % partes;
+}
+
+// Lembretes de 24h e 60min: a onda é dividida por tenant e por faixa de
+// hash das marcações, para que vários nós partilhem uma onda grande
+registerJob('lembretes', {
+  intervalMs: REMINDERS_INTERVAL_MS,
+  partitions: db => hashRangePartitions(db, REMINDERS_PARTITIONS),
+  async run(db, particao) {
+    const { base, parte, partes } = parseHashRange(particao);
+    const database = await databaseForKey(db, base);
+    const { reminders24h, reminders60min, errors } = await sendReminderWave(database, { parte, partes });
+    if (errors.length > 0 && reminders24h + reminders60min === 0) {
+      throw new Error(`${errors.length} lembretes falharam`);
+    }
+    return { reminders24h, reminders60min, erros: errors.length };
+  }
+});
+
+// Arquivo frio: uma partição por base de dados
+registerJob('arquivo-marcacoes', {
+  intervalMs: ARCHIVE_INTERVAL_MS,
+  partitions: async db => (await tenantDatabases(db)).map(databaseKey),
+  async run(db, particao) {
+    const { arquivadas, lotes } = await archiveMarcacoes(await databaseForKey(db, particao));
+    return { arquivadas, lotes };
+  }
+});
+
+// Rollups de ontem e hoje, com as barbearias divididas por hash do id
+registerJob('rollups', {
+  intervalMs: ROLLUPS_INTERVAL_MS,
+  partitions: async () => Array.from({ length: ROLLUPS_PARTITIONS }, (_, i) => `${SHARED}:${i}/${ROLLUPS_PARTITIONS}`),
+  async run(db, particao, { signal }) {
+    const { parte, partes } = parseHashRange(particao);
+    const hoje = new Date().toISOString().split('T')[0];
+    const ontem = new Date(Date.now() - 24 * HOUR).toISOString().split('T')[0];
+
+    const barbearias = await db.collection('barbearias').find({}, { projection: { _id: 1 } }).toArray();
+    const result = { barbearias: 0, buckets: 0 };
+    for (const { _id } of barbearias) {
+      if (signal.aborted) break;
+      const id = _id.toString();
+      if (hashBucket(id, partes) !== parte) continue;
+      const { buckets } = await rebuildRollups(db, id, ontem, hoje);
+      result.barbearias++;
+      result.buckets += buckets;
+    }
+    return result;
+  }
+});
+
+// Migrações de tenant abandonadas antes da troca (lib/tenant-migration)
+registerJob('recuperar-migracoes', {
+  intervalMs: MIGRATION_RECOVERY_INTERVAL_MS,
+  run: db => recoverStaleMigrations(db)
+});
@@ -0,0 +1,81 @@
+import { promisify } from 'util';
+import zlib from 'zlib';
+import { NextResponse } from 'next/server';
+
+// Respostas JSON comprimidas (brotli ou gzip, conforme o Accept-Encoding)
+// para as listagens grandes do dashboard. Abaixo do limiar o corpo segue sem
+// compressão: para respostas pequenas o custo de CPU não compensa. O servidor
+// do Next não volta a comprimir respostas que já trazem Content-Encoding.
+
+const brotliCompress = promisify(zlib.brotliCompress);
+const gzip = promisify(zlib.gzip);
+
+const DEFAULT_MIN_BYTES = 1024;
+
+function minBytes() {
+  const value = parseInt(process.env.JSON_COMPRESS_MIN_BYTES, 10);
+  return Number.isFinite(value) && value >= 0 ? value : DEFAULT_MIN_BYTES;
+}
+
+// Codificações aceites pelo cliente, por ordem de preferência do servidor
+// (br comprime melhor o JSON repetitivo das listagens). q=0 exclui.
+export function negotiateEncoding(request) {
+  const header = request.headers.get('accept-encoding');
+  if (!header) return null;
+
+  const accepted = new Map();
+  header.split(',').forEach(part => {
+    const [name, ...params] = part.trim().toLowerCase().split(';');
+    const q = params.map(p => p.trim()).find(p => p.startsWith('q='));
+    accepted.set(name, q ? parseFloat(q.slice(2)) : 1);
+  });
+
+  const allows = (encoding) => {
+    const q = accepted.has(encoding) ? accepted.get(encoding) : accepted.get('*');
+    return q !== undefined && q > 0;
+  };
+
+  if (allows('br')) return 'br';
+  if (allows('gzip')) return 'gzip';
+  return null;
+}
+
+async function compress(encoding, buffer) {
+  if (encoding === 'br') {
+    // Qualidade 4: perto do gzip em CPU e ainda assim mais pequeno
+    return brotliCompress(buffer, {
+      params: {
+        [zlib.constants.BROTLI_PARAM_QUALITY]: 4,
+        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: buffer.length
+      }
+    });
+  }
+  return gzip(buffer, { level: 6 });
+}
+
+// Corpo e cabeçalhos de uma resposta JSON já serializada. Vary é sempre
+// enviado, para uma cache não servir a versão comprimida a quem não a aceita.
+export async function encodeJsonBody(request, body) {
+  const headers = { 'Content-Type': 'application/json', Vary: 'Accept-Encoding' };
+  const buffer = Buffer.from(body);
+  const encoding = buffer.length >= minBytes() ? negotiateEncoding(request) : null;
+  if (!encoding) {
+    return { body, headers };
+  }
+
+  const compressed = await compress(encoding, buffer);
+  return {
+    body: compressed,
+    headers: { ...headers, 'Content-Encoding': encoding, 'Content-Length': String(compressed.length) }
+  };
+}
+
+// Equivalente a NextResponse.json(data, { status, headers }) com compressão
+export async function jsonResponse(request, data, { status = 200, headers = {} } = {}) {
+  const encoded = await encodeJsonBody(request, JSON.stringify(data));
+  const vary = [headers.Vary, encoded.headers.Vary].filter(Boolean).join(', ');
+  return new NextResponse(encoded.body, {
+    status,
+    headers: { ...headers, ...encoded.headers, Vary: vary }
+  });
+}
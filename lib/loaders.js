@@ -0,0 +1,193 @@
+import { ObjectId } from 'mongodb';
+import { getRequestContext } from '@/lib/metrics';
+
+// Loaders por pedido (estilo DataLoader) para leituras por _id de
+// utilizadores, servicos, barbearias e locais. Todos os load() feitos no
+// mesmo tick para a mesma coleção e projeção juntam-se num único find com
+// $in, ids repetidos são pedidos uma só vez, e o resultado fica em cache até
+// ao fim do pedido. Assim um Promise.all(items.map(async x => findOne(...)))
+// passa de N queries para uma por coleção, sem reescrever cada rota.
+//
+// O loader vive no contexto do pedido (lib/metrics.js); fora de um pedido
+// instrumentado (crons) cada getLoader() devolve um loader novo, que deve ser
+// reutilizado durante a execução.
+
+export const LOADER_COLLECTIONS = ['utilizadores', 'servicos', 'barbearias', 'locais'];
+
+// Projeções por caso de uso. A password nunca sai de um loader.
+export const PROJECTIONS = {
+  utilizador: { password: 0 },
+  utilizadorResumo: { nome: 1, foto: 1 },
+  utilizadorContacto: { nome: 1, email: 1, telemovel: 1 },
+  clienteMarcacao: { nome: 1, email: 1, telemovel: 1, foto: 1, observacoes: 1, criado_em: 1 },
+  barbeiroSemHorario: { password: 0, horario_trabalho: 0 },
+  servicoResumo: { nome: 1, preco: 1, duracao: 1 },
+  localResumo: { nome: 1, morada: 1 },
+  barbeariaResumo: { nome: 1, slug: 1 }
+};
+
+const MAX_BATCH_SIZE = 1000;
+
+const STATE_KEY = Symbol.for('cuthub.loaders');
+
+if (!globalThis[STATE_KEY]) {
+  globalThis[STATE_KEY] = { stats: new Map() };
+}
+
+const state = globalThis[STATE_KEY];
+
+function statsFor(collection) {
+  let stats = state.stats.get(collection);
+  if (!stats) {
+    stats = { loads: 0, cacheHits: 0, batches: 0, keys: 0 };
+    state.stats.set(collection, stats);
+  }
+  return stats;
+}
+
+// Garante que a password não é devolvida, seja a projeção de inclusão ou de exclusão
+function safeProjection(projection) {
+  const fields = { ...(projection || PROJECTIONS.utilizador) };
+  const inclusion = Object.entries(fields).some(([field, value]) => field !== '_id' && value);
+  if (inclusion) {
+    delete fields.password;
+  } else {
+    fields.password = 0;
+  }
+  return fields;
+}
+
+// Como o DataLoader: espera que as promises já resolvidas corram antes de
+// despachar, para apanhar os load() feitos por continuações do mesmo tick
+const resolved = Promise.resolve();
+function enqueueDispatch(fn) {
+  resolved.then(() => process.nextTick(fn));
+}
+
+class EntityLoader {
+  constructor(db) {
+    this.db = db;
+    this.cache = new Map();   // `${collection}|${projKey}|${id}` -> Promise<doc|null>
+    this.queues = new Map();  // `${collection}|${projKey}` -> { collection, projection, pending: Map<id, callbacks[]> }
+  }
+
+  load(collection, id, { projection } = {}) {
+    if (!LOADER_COLLECTIONS.includes(collection)) {
+      throw new Error(`Coleção sem loader: ${collection}`);
+    }
+    const stats = statsFor(collection);
+    stats.loads++;
+
+    const key = id ? id.toString() : '';
+    if (!ObjectId.isValid(key)) return Promise.resolve(null);
+
+    const fields = safeProjection(projection);
+    const projKey = JSON.stringify(fields);
+    const cacheKey = `${collection}|${projKey}|${key}`;
+
+    const cached = this.cache.get(cacheKey);
+    if (cached) {
+      stats.cacheHits++;
+      return cached;
+    }
+
+    const promise = new Promise((resolve, reject) => {
+      const queueKey = `${collection}|${projKey}`;
+      let queue = this.queues.get(queueKey);
+      if (!queue) {
+        queue = { collection, projection: fields, pending: new Map() };
+        this.queues.set(queueKey, queue);
+        enqueueDispatch(() => this.dispatch(queueKey));
+      }
+      if (!queue.pending.has(key)) queue.pending.set(key, []);
+      queue.pending.get(key).push({ resolve, reject });
+    });
+
+    this.cache.set(cacheKey, promise);
+    return promise;
+  }
+
+  loadMany(collection, ids, options) {
+    return Promise.all(ids.map(id => this.load(collection, id, options)));
+  }
+
+  // Esquecer um documento depois de o alterar no mesmo pedido
+  clear(collection, id) {
+    const suffix = `|${id}`;
+    for (const cacheKey of this.cache.keys()) {
+      if (cacheKey.startsWith(`${collection}|`) && cacheKey.endsWith(suffix)) {
+        this.cache.delete(cacheKey);
+      }
+    }
+  }
+
+  async dispatch(queueKey) {
+    const queue = this.queues.get(queueKey);
+    this.queues.delete(queueKey);
+
+    const ids = [...queue.pending.keys()];
+    const stats = statsFor(queue.collection);
+
+    for (let i = 0; i < ids.length; i += MAX_BATCH_SIZE) {
+      const chunk = ids.slice(i, i + MAX_BATCH_SIZE);
+      stats.batches++;
+      stats.keys += chunk.length;
+
+      try {
+        const docs = await this.db.collection(queue.collection)
+          .find({ _id: { $in: chunk.map(id => new ObjectId(id)) } }, { projection: queue.projection })
+          .toArray();
+        const byId = new Map(docs.map(doc => [doc._id.toString(), doc]));
+        chunk.forEach(id => {
+          queue.pending.get(id).forEach(({ resolve }) => resolve(byId.get(id) || null));
+        });
+      } catch (error) {
+        chunk.forEach(id => {
+          queue.pending.get(id).forEach(({ reject }) => reject(error));
+        });
+      }
+    }
+  }
+}
+
+// Loader do pedido atual (criado no primeiro uso)
+export function getLoader(db) {
+  const ctx = getRequestContext();
+  if (!ctx) return new EntityLoader(db);
+
+  if (!ctx.loaders) ctx.loaders = new Map();
+  const dbName = db.databaseName;
+  if (!ctx.loaders.has(dbName)) ctx.loaders.set(dbName, new EntityLoader(db));
+  return ctx.loaders.get(dbName);
+}
+
+export function getLoaderStats() {
+  const colecoes = {};
+  for (const [collection, stats] of state.stats) {
+    colecoes[collection] = {
+      ...stats,
+      // load() por query efetivamente enviada ao Mongo
+      coalescencia: stats.batches > 0 ? Math.round(((stats.loads - stats.cacheHits) / stats.batches) * 100) / 100 : null
+    };
+  }
+  return colecoes;
+}
+
+const PROMETHEUS_SERIES = [
+  ['loads', 'entity_loader_loads_total', 'Chamadas a load() por id nos loaders de pedido.'],
+  ['cacheHits', 'entity_loader_cache_hits_total', 'load() servidos pela cache do pedido (ids repetidos).'],
+  ['batches', 'entity_loader_batches_total', 'Queries $in efetivamente enviadas ao Mongo.'],
+  ['keys', 'entity_loader_keys_total', 'Ids distintos pedidos nessas queries.']
+];
+
+export function renderLoaderPrometheus() {
+  const lines = [];
+  for (const [field, metric, help] of PROMETHEUS_SERIES) {
+    lines.push(`# HELP ${metric} ${help}`);
+    lines.push(`# TYPE ${metric} counter`);
+    for (const [collection, stats] of state.stats) {
+      lines.push(`${metric}{collection="${collection}"} ${stats[field]}`);
+    }
+  }
+  return lines.join('\n') + '\n';
+}
@@ -0,0 +1,135 @@
+import { TenantDb, blockedTenantIds } from '@/lib/tenant-db';
+
+// Arquivo frio de marcações. Marcações terminadas (concluída, cancelada,
+// rejeitada) com data anterior ao horizonte passam de `marcacoes` para
+// `marcacoes_arquivo` em lotes, para que a collection quente e os seus
+// índices (listagens, CRM, slots por barbeiro_id+data) caibam em RAM.
+//
+// As leituras só consultam o arquivo quando o pedido o pede: intervalo de
+// datas que começa antes do horizonte, ou totais de toda a vida no CRM.
+
+export const ARCHIVE_COLLECTION = 'marcacoes_arquivo';
+
+// Estados finais: nunca mais mudam, por isso podem sair da collection quente
+export const ARCHIVABLE_STATUSES = ['concluida', 'cancelada', 'rejeitada'];
+
+const ARCHIVE_AFTER_DAYS = parseInt(process.env.MARCACOES_ARCHIVE_AFTER_DAYS || '180', 10);
+const BATCH_SIZE = parseInt(process.env.MARCACOES_ARCHIVE_BATCH_SIZE || '1000', 10);
+
+// Uma promessa por base de dados física: tenants dedicados têm a sua base
+const indexesReady = new Map();
+
+function ensureIndexes(db) {
+  const database = db instanceof TenantDb ? db.tenantDatabase : db;
+  const key = database.databaseName;
+  if (!indexesReady.has(key)) {
+    const archive = database.collection(ARCHIVE_COLLECTION);
+    indexesReady.set(key, Promise.all([
+      archive.createIndex({ barbearia_id: 1, data: -1 }),
+      archive.createIndex({ barbearia_id: 1, cliente_id: 1 }),
+      archive.createIndex({ barbeiro_id: 1, data: -1 }),
+      archive.createIndex({ cliente_id: 1, data: -1 }),
+      // Varrimento do job de arquivo na collection quente
+      database.collection('marcacoes').createIndex({ status: 1, data: 1 })
+    ]).catch((error) => {
+      indexesReady.delete(key);
+      throw error;
+    }));
+  }
+  return indexesReady.get(key);
+}
+
+// Data (YYYY-MM-DD, como o campo `data`) antes da qual as marcações
+// terminadas estão no arquivo
+export function archiveCutoffDate(horizonDays = ARCHIVE_AFTER_DAYS) {
+  const cutoff = new Date();
+  cutoff.setDate(cutoff.getDate() - horizonDays);
+  return cutoff.toISOString().split('T')[0];
+}
+
+// Um intervalo de datas que começa antes do horizonte precisa do arquivo
+export function rangeNeedsArchive(de) {
+  return Boolean(de) && de < archiveCutoffDate();
+}
+
+// Move um lote de cada vez: primeiro upsert no arquivo (idempotente se o job
+// for interrompido), depois remove da collection quente.
+export async function archiveMarcacoes(db, { horizonDays = ARCHIVE_AFTER_DAYS, batchSize = BATCH_SIZE, dryRun = false } = {}) {
+  await ensureIndexes(db);
+
+  const hot = db.collection('marcacoes');
+  const archive = db.collection(ARCHIVE_COLLECTION);
+  const cutoff = archiveCutoffDate(horizonDays);
+  const filter = { status: { $in: ARCHIVABLE_STATUSES }, data: { $lt: cutoff } };
+  // Na base partilhada o lote mistura tenants: os que estão em corte ficam
+  // para a próxima execução (um TenantDb em corte já recusa as escritas)
+  const partilhada = !(db instanceof TenantDb);
+
+  if (dryRun) {
+    return { cutoff, candidatas: await hot.countDocuments(filter), arquivadas: 0, lotes: 0 };
+  }
+
+  let arquivadas = 0;
+  let lotes = 0;
+
+  for (;;) {
+    const batchFilter = partilhada
+      ? { ...filter, barbearia_id: { $nin: await blockedTenantIds(db) } }
+      : filter;
+    const batch = await hot.find(batchFilter).limit(batchSize).toArray();
+    if (batch.length === 0) break;
+
+    const arquivadaEm = new Date();
+    await archive.bulkWrite(
+      batch.map(doc => ({
+        replaceOne: {
+          filter: { _id: doc._id },
+          replacement: { ...doc, arquivada_em: arquivadaEm },
+          upsert: true
+        }
+      })),
+      { ordered: false }
+    );
+
+    // Só remove o que continua terminado (um PUT pode ter mudado o estado
+    // entre a leitura e aqui; nesse caso a cópia arquivada é descartada)
+    const ids = batch.map(doc => doc._id);
+    await hot.deleteMany({ _id: { $in: ids }, status: { $in: ARCHIVABLE_STATUSES } });
+    const stillHot = await hot.find({ _id: { $in: ids } }, { projection: { _id: 1 } }).toArray();
+    if (stillHot.length > 0) {
+      await archive.deleteMany({ _id: { $in: stillHot.map(doc => doc._id) } });
+    }
+
+    arquivadas += batch.length - stillHot.length;
+    lotes++;
+    if (batch.length < batchSize) break;
+  }
+
+  return { cutoff, arquivadas, lotes };
+}
+
+// find() sobre a collection quente e, se includeArchive, também sobre o
+// arquivo. Os resultados são juntos e ordenados por data/hora descendente.
+export async function findMarcacoes(db, query, { includeArchive = false } = {}) {
+  const sort = { data: -1, hora: -1 };
+  const [hot, cold] = await Promise.all([
+    db.collection('marcacoes').find(query).sort(sort).toArray(),
+    includeArchive
+      ? db.collection(ARCHIVE_COLLECTION).find(query).sort(sort).toArray()
+      : []
+  ]);
+
+  if (cold.length === 0) return hot;
+
+  return hot.concat(cold).sort((a, b) =>
+    (b.data || '').localeCompare(a.data || '') || (b.hora || '').localeCompare(a.hora || '')
+  );
+}
+
+export async function countMarcacoes(db, query = {}, { includeArchive = false } = {}) {
+  const [hot, cold] = await Promise.all([
+    db.collection('marcacoes').countDocuments(query),
+    includeArchive ? db.collection(ARCHIVE_COLLECTION).countDocuments(query) : 0
+  ]);
+  return hot + cold;
+}
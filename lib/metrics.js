@@ -0,0 +1,264 @@
+import { AsyncLocalStorage } from 'node:async_hooks';
+
+// Instrumentação das rotas da API: duração por rota, comandos Mongo por pedido
+// (via command monitoring do driver) e aviso de padrões N+1.
+
+const DURATION_BUCKETS_SECONDS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+const QUERY_WARN_THRESHOLD = parseInt(process.env.METRICS_QUERY_WARN_THRESHOLD || '50', 10);
+const SERVER_TIMING_ENABLED = process.env.METRICS_SERVER_TIMING === 'true';
+
+const OBJECT_ID_SEGMENT = /^[a-f0-9]{24}$/i;
+
+// O estado vive em globalThis para ser partilhado entre os bundles das rotas
+// e sobreviver aos recarregamentos do servidor de desenvolvimento.
+const STATE_KEY = Symbol.for('cuthub.metrics');
+
+if (!globalThis[STATE_KEY]) {
+  globalThis[STATE_KEY] = {
+    requestStore: new AsyncLocalStorage(),
+    routes: new Map(),
+    commands: new Map(),
+    inflightCommands: new Map(),
+    startedAt: Date.now()
+  };
+}
+
+const state = globalThis[STATE_KEY];
+
+// Contexto do pedido atual (rota, contagem de comandos Mongo, ...) ou undefined
+// quando o código corre fora de um pedido instrumentado.
+export function getRequestContext() {
+  return state.requestStore.getStore();
+}
+
+// Executa fn fora de qualquer pedido, para que trabalho interno (ex: explain
+// do slow-query log) não seja contado nas métricas do pedido que o originou.
+export function runOutsideRequest(fn) {
+  return state.requestStore.exit(fn);
+}
+
+// Converte o caminho do catch-all numa etiqueta de baixa cardinalidade:
+// ids passam a ":id" e o slug público a ":slug".
+export function normalizeRoute(pathSegments) {
+  const segments = Array.isArray(pathSegments)
+    ? pathSegments
+    : String(pathSegments || '').split('/').filter(Boolean);
+
+  if (segments[0] === 'barbearias' && segments.length > 1) {
+    return ['barbearias', ':slug', ...segments.slice(2)].join('/');
+  }
+
+  return segments
+    .map(segment => (OBJECT_ID_SEGMENT.test(segment) ? ':id' : segment))
+    .join('/') || '/';
+}
+
+function getRouteStats(route) {
+  let stats = state.routes.get(route);
+  if (!stats) {
+    stats = {
+      buckets: new Array(DURATION_BUCKETS_SECONDS.length).fill(0),
+      count: 0,
+      durationSum: 0,
+      statuses: new Map(),
+      mongoCommands: 0,
+      mongoDurationMs: 0,
+      mongoCommandsMax: 0,
+      nPlusOneWarnings: 0
+    };
+    state.routes.set(route, stats);
+  }
+  return stats;
+}
+
+function recordRequest(ctx, durationSeconds, status) {
+  const stats = getRouteStats(ctx.route);
+
+  stats.count++;
+  stats.durationSum += durationSeconds;
+  DURATION_BUCKETS_SECONDS.forEach((le, i) => {
+    if (durationSeconds <= le) stats.buckets[i]++;
+  });
+
+  const statusKey = String(status || 0);
+  stats.statuses.set(statusKey, (stats.statuses.get(statusKey) || 0) + 1);
+
+  stats.mongoCommands += ctx.mongoCommands;
+  stats.mongoDurationMs += ctx.mongoDurationMs;
+  stats.mongoCommandsMax = Math.max(stats.mongoCommandsMax, ctx.mongoCommands);
+
+  if (ctx.mongoCommands > QUERY_WARN_THRESHOLD) {
+    stats.nPlusOneWarnings++;
+    console.warn(
+      `[METRICS] ${ctx.route} emitiu ${ctx.mongoCommands} comandos Mongo num só pedido ` +
+      `(limite ${QUERY_WARN_THRESHOLD}) - possível padrão N+1`
+    );
+  }
+}
+
+function recordCommand(ctx, commandName, durationMs) {
+  let stats = state.commands.get(commandName);
+  if (!stats) {
+    stats = { count: 0, durationMs: 0 };
+    state.commands.set(commandName, stats);
+  }
+  stats.count++;
+  stats.durationMs += durationMs;
+
+  if (ctx) {
+    ctx.mongoCommands++;
+    ctx.mongoDurationMs += durationMs;
+  }
+}
+
+// Liga os eventos de command monitoring do driver ao contexto do pedido.
+// O cliente tem de ser criado com { monitorCommands: true }.
+export function attachCommandMonitoring(client) {
+  const commandKey = (event) => `${event.connectionId}:${event.requestId}`;
+
+  // commandStarted é emitido de forma síncrona na cadeia assíncrona do pedido,
+  // por isso o AsyncLocalStorage ainda aponta para o contexto certo
+  client.on('commandStarted', (event) => {
+    state.inflightCommands.set(commandKey(event), getRequestContext() || null);
+  });
+
+  const finish = (event) => {
+    const key = commandKey(event);
+    const ctx = state.inflightCommands.get(key);
+    state.inflightCommands.delete(key);
+    recordCommand(ctx, event.commandName, event.duration || 0);
+  };
+
+  client.on('commandSucceeded', finish);
+  client.on('commandFailed', finish);
+}
+
+function setServerTiming(response, ctx, totalMs) {
+  if (!SERVER_TIMING_ENABLED || !response?.headers) return;
+  try {
+    response.headers.set(
+      'Server-Timing',
+      `db;desc="mongo x${ctx.mongoCommands}";dur=${ctx.mongoDurationMs.toFixed(1)}, total;dur=${totalMs.toFixed(1)}`
+    );
+  } catch {
+    // Respostas com headers imutáveis (ex: redirects) ficam sem Server-Timing
+  }
+}
+
+// Envolve um handler de rota (GET/POST/...) para medir duração e comandos Mongo.
+// Sem routeName, a etiqueta é derivada de params.path (rota catch-all).
+export function instrumentRoute(method, handler, routeName) {
+  return async function instrumentedHandler(request, context) {
+    const ctx = {
+      route: `${method} ${routeName || normalizeRoute(context?.params?.path)}`,
+      mongoCommands: 0,
+      mongoDurationMs: 0
+    };
+    const startedAt = performance.now();
+
+    let response;
+    try {
+      response = await state.requestStore.run(ctx, () => handler(request, context));
+      return response;
+    } finally {
+      const totalMs = performance.now() - startedAt;
+      recordRequest(ctx, totalMs / 1000, response ? response.status : 500);
+      setServerTiming(response, ctx, totalMs);
+    }
+  };
+}
+
+function escapeLabel(value) {
+  return String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+}
+
+// Exposição em formato texto do Prometheus
+export function renderPrometheus() {
+  const lines = [];
+
+  lines.push('# HELP http_request_duration_seconds Duração dos pedidos à API por rota.');
+  lines.push('# TYPE http_request_duration_seconds histogram');
+  for (const [route, stats] of state.routes) {
+    const label = `route="${escapeLabel(route)}"`;
+    DURATION_BUCKETS_SECONDS.forEach((le, i) => {
+      lines.push(`http_request_duration_seconds_bucket{${label},le="${le}"} ${stats.buckets[i]}`);
+    });
+    lines.push(`http_request_duration_seconds_bucket{${label},le="+Inf"} ${stats.count}`);
+    lines.push(`http_request_duration_seconds_sum{${label}} ${stats.durationSum}`);
+    lines.push(`http_request_duration_seconds_count{${label}} ${stats.count}`);
+  }
+
+  lines.push('# HELP http_requests_total Pedidos à API por rota e status.');
+  lines.push('# TYPE http_requests_total counter');
+  for (const [route, stats] of state.routes) {
+    for (const [status, count] of stats.statuses) {
+      lines.push(`http_requests_total{route="${escapeLabel(route)}",status="${status}"} ${count}`);
+    }
+  }
+
+  lines.push('# HELP api_mongo_commands_total Comandos Mongo emitidos pelos pedidos de cada rota.');
+  lines.push('# TYPE api_mongo_commands_total counter');
+  for (const [route, stats] of state.routes) {
+    lines.push(`api_mongo_commands_total{route="${escapeLabel(route)}"} ${stats.mongoCommands}`);
+  }
+
+  lines.push('# HELP api_mongo_duration_seconds_total Tempo total em comandos Mongo por rota.');
+  lines.push('# TYPE api_mongo_duration_seconds_total counter');
+  for (const [route, stats] of state.routes) {
+    lines.push(`api_mongo_duration_seconds_total{route="${escapeLabel(route)}"} ${stats.mongoDurationMs / 1000}`);
+  }
+
+  lines.push('# HELP api_mongo_commands_max Máximo de comandos Mongo num único pedido da rota.');
+  lines.push('# TYPE api_mongo_commands_max gauge');
+  for (const [route, stats] of state.routes) {
+    lines.push(`api_mongo_commands_max{route="${escapeLabel(route)}"} ${stats.mongoCommandsMax}`);
+  }
+
+  lines.push(`# HELP api_n_plus_one_warnings_total Pedidos acima de ${QUERY_WARN_THRESHOLD} comandos Mongo.`);
+  lines.push('# TYPE api_n_plus_one_warnings_total counter');
+  for (const [route, stats] of state.routes) {
+    lines.push(`api_n_plus_one_warnings_total{route="${escapeLabel(route)}"} ${stats.nPlusOneWarnings}`);
+  }
+
+  lines.push('# HELP mongo_commands_total Comandos Mongo por tipo de comando.');
+  lines.push('# TYPE mongo_commands_total counter');
+  for (const [command, stats] of state.commands) {
+    lines.push(`mongo_commands_total{command="${escapeLabel(command)}"} ${stats.count}`);
+  }
+
+  lines.push('# HELP mongo_command_duration_seconds_total Tempo total por tipo de comando Mongo.');
+  lines.push('# TYPE mongo_command_duration_seconds_total counter');
+  for (const [command, stats] of state.commands) {
+    lines.push(`mongo_command_duration_seconds_total{command="${escapeLabel(command)}"} ${stats.durationMs / 1000}`);
+  }
+
+  lines.push('# HELP process_metrics_start_time_seconds Início da recolha de métricas.');
+  lines.push('# TYPE process_metrics_start_time_seconds gauge');
+  lines.push(`process_metrics_start_time_seconds ${Math.floor(state.startedAt / 1000)}`);
+
+  return lines.join('\n') + '\n';
+}
+
+// Perfil por rota em JSON, ordenado pelo tempo total gasto
+export function getRouteProfile() {
+  const routes = [];
+  for (const [route, stats] of state.routes) {
+    routes.push({
+      route,
+      pedidos: stats.count,
+      duracao_media_ms: stats.count ? (stats.durationSum * 1000) / stats.count : 0,
+      duracao_total_ms: stats.durationSum * 1000,
+      comandos_mongo_por_pedido: stats.count ? stats.mongoCommands / stats.count : 0,
+      comandos_mongo_max: stats.mongoCommandsMax,
+      tempo_mongo_medio_ms: stats.count ? stats.mongoDurationMs / stats.count : 0,
+      avisos_n_plus_one: stats.nPlusOneWarnings
+    });
+  }
+  routes.sort((a, b) => b.duracao_total_ms - a.duracao_total_ms);
+
+  return {
+    desde: new Date(state.startedAt).toISOString(),
+    limite_comandos_por_pedido: QUERY_WARN_THRESHOLD,
+    routes
+  };
+}
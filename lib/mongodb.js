@@ -1,7 +1,16 @@
 import { MongoClient } from 'mongodb';
+import { attachCommandMonitoring } from '@/lib/metrics';
+import { attachSlowQueryLog } from '@/lib/slow-query-log';
+import { attachPoolMonitoring } from '@/lib/admission-control';
+import { startInvalidationListener } from '@/lib/invalidation-bus';
+import { startJobScheduler } from '@/lib/job-scheduler';
 
 const MONGO_URL = process.env.MONGO_URL;
 
+// Base partilhada: a mesma para as rotas, os crons, o agendador de jobs e o
+// barramento de invalidações
+export const DB_NAME = process.env.DB_NAME || 'barbearia_saas';
+
 if (!MONGO_URL) {
   throw new Error('MONGO_URL não definido nas variáveis de ambiente');
 }
@@ -13,7 +22,18 @@ export async function connectToDatabase() {
     return cachedClient;
   }
 
-  const client = await MongoClient.connect(MONGO_URL);
+  // monitorCommands alimenta as métricas por pedido (lib/metrics)
+  // e o slow-query log (lib/slow-query-log); os eventos do pool medem a
+  // espera por ligações usada no controlo de admissão
+  const client = new MongoClient(MONGO_URL, { monitorCommands: true });
+  attachCommandMonitoring(client);
+  attachSlowQueryLog(client);
+  attachPoolMonitoring(client);
+  await client.connect();
   cachedClient = client;
+  // Invalidações de cache publicadas pelos outros nós
+  startInvalidationListener(client.db(DB_NAME));
+  // Jobs periódicos (lembretes, arquivo, rollups) com leases partilhados
+  startJobScheduler(client.db(DB_NAME));
   return client;
 }
@@ -0,0 +1,207 @@
+import { Worker } from 'worker_threads';
+import os from 'os';
+
+// Hashing de passwords fora do event loop: o bcryptjs (JS puro) corre num pool
+// de worker threads com fila limitada. O custo é calibrado no arranque contra
+// PASSWORD_HASH_TARGET_MS e os hashes abaixo do custo mínimo do cluster
+// (PASSWORD_HASH_MIN_COST) são refeitos no login.
+
+const MIN_COST = 10; // custo usado até agora - nunca calibrar abaixo
+const MAX_COST = 14;
+const TARGET_MS = parseInt(process.env.PASSWORD_HASH_TARGET_MS || '250', 10);
+const POOL_SIZE = parseInt(
+  process.env.PASSWORD_HASH_WORKERS || String(Math.max(1, Math.min(4, os.availableParallelism() - 1))),
+  10
+);
+const QUEUE_MAX = parseInt(process.env.PASSWORD_HASH_QUEUE_MAX || '200', 10);
+const FIXED_COST = process.env.PASSWORD_HASH_COST ? parseInt(process.env.PASSWORD_HASH_COST, 10) : null;
+// Igual em todos os nós: a calibração varia de máquina para máquina e não
+// pode decidir sozinha se um hash está desatualizado
+const REHASH_MIN_COST = parseInt(process.env.PASSWORD_HASH_MIN_COST || String(FIXED_COST || MIN_COST), 10);
+
+// Código do worker (eval) para não depender de um ficheiro separado no bundle
+const WORKER_SOURCE = `
+const { parentPort } = require('worker_threads');
+const bcrypt = require('bcryptjs');
+
+parentPort.on('message', ({ id, op, password, hash, cost }) => {
+  try {
+    let result;
+    const startedAt = Date.now();
+    if (op === 'hash') {
+      result = bcrypt.hashSync(password, cost);
+    } else if (op === 'compare') {
+      result = bcrypt.compareSync(password, hash);
+    } else if (op === 'calibrate') {
+      bcrypt.hashSync(password, cost);
+      result = Date.now() - startedAt;
+    }
+    parentPort.postMessage({ id, result });
+  } catch (error) {
+    parentPort.postMessage({ id, error: error.message });
+  }
+});
+`;
+
+export class PasswordHasherBusyError extends Error {
+  constructor() {
+    super('Servidor ocupado, tente novamente dentro de momentos');
+    this.name = 'PasswordHasherBusyError';
+    this.status = 503;
+  }
+}
+
+// Estado em globalThis: um só pool por processo, partilhado entre rotas
+const STATE_KEY = Symbol.for('cuthub.passwordHasher');
+
+function getPool() {
+  if (!globalThis[STATE_KEY]) {
+    globalThis[STATE_KEY] = {
+      workers: [],
+      idle: [],
+      queue: [],
+      pending: new Map(),
+      nextId: 1,
+      cost: null,
+      calibration: null
+    };
+  }
+  return globalThis[STATE_KEY];
+}
+
+function spawnWorker(pool) {
+  const worker = new Worker(WORKER_SOURCE, { eval: true });
+  worker.unref();
+
+  worker.on('message', ({ id, result, error }) => {
+    const task = pool.pending.get(id);
+    pool.pending.delete(id);
+    if (task) {
+      if (error) task.reject(new Error(error));
+      else task.resolve(result);
+    }
+    release(pool, worker);
+  });
+
+  worker.on('error', (error) => {
+    console.error('[PASSWORD HASHER] Worker error:', error);
+    // Rejeitar a tarefa em curso deste worker e substituí-lo
+    for (const [id, task] of pool.pending) {
+      if (task.worker === worker) {
+        pool.pending.delete(id);
+        task.reject(error);
+      }
+    }
+    pool.workers = pool.workers.filter(w => w !== worker);
+    pool.idle = pool.idle.filter(w => w !== worker);
+    const replacement = spawnWorker(pool);
+    release(pool, replacement);
+  });
+
+  pool.workers.push(worker);
+  return worker;
+}
+
+function release(pool, worker) {
+  const next = pool.queue.shift();
+  if (next) {
+    dispatch(pool, worker, next);
+  } else {
+    pool.idle.push(worker);
+  }
+}
+
+function dispatch(pool, worker, task) {
+  task.worker = worker;
+  pool.pending.set(task.id, task);
+  worker.postMessage({ id: task.id, ...task.message });
+}
+
+function runTask(message) {
+  const pool = getPool();
+  while (pool.workers.length < POOL_SIZE) {
+    pool.idle.push(spawnWorker(pool));
+  }
+
+  return new Promise((resolve, reject) => {
+    const task = { id: pool.nextId++, message, resolve, reject };
+    const worker = pool.idle.pop();
+
+    if (worker) {
+      dispatch(pool, worker, task);
+    } else if (pool.queue.length >= QUEUE_MAX) {
+      reject(new PasswordHasherBusyError());
+    } else {
+      pool.queue.push(task);
+    }
+  });
+}
+
+// Custo bcrypt para novos hashes. Na primeira chamada mede o custo mínimo num
+// worker e sobe o custo (cada +1 duplica o tempo) até se aproximar do alvo.
+export async function getHashCost() {
+  const pool = getPool();
+  if (pool.cost) return pool.cost;
+
+  if (FIXED_COST) {
+    pool.cost = FIXED_COST;
+    return pool.cost;
+  }
+
+  if (!pool.calibration) {
+    pool.calibration = runTask({ op: 'calibrate', password: 'calibration-password', cost: MIN_COST })
+      .then((elapsedMs) => {
+        const extra = Math.floor(Math.log2(TARGET_MS / Math.max(elapsedMs, 1)));
+        pool.cost = Math.max(REHASH_MIN_COST, Math.min(MAX_COST, MIN_COST + extra));
+        console.log(`[PASSWORD HASHER] Custo ${MIN_COST} demora ${elapsedMs}ms; custo calibrado: ${pool.cost} (alvo ${TARGET_MS}ms)`);
+        return pool.cost;
+      })
+      .catch((error) => {
+        console.error('[PASSWORD HASHER] Calibração falhou, a usar custo mínimo:', error.message);
+        pool.cost = Math.max(MIN_COST, REHASH_MIN_COST);
+        return pool.cost;
+      });
+  }
+
+  return pool.calibration;
+}
+
+export async function hashPassword(password) {
+  const cost = await getHashCost();
+  return runTask({ op: 'hash', password, cost });
+}
+
+export async function verifyPassword(password, hash) {
+  if (!password || !hash) return false;
+  return runTask({ op: 'compare', password, hash });
+}
+
+// Custo embutido num hash bcrypt ($2a$10$...)
+export function getHashCostFromHash(hash) {
+  const match = /^\$2[abxy]?\$(\d{2})\$/.exec(hash || '');
+  return match ? parseInt(match[1], 10) : null;
+}
+
+// true se o hash foi gerado abaixo do custo mínimo do cluster. Nunca
+// compara com o custo calibrado deste nó, para que nós com custos
+// diferentes não refaçam o mesmo hash alternadamente nem o baixem.
+export async function needsRehash(hash) {
+  const cost = getHashCostFromHash(hash);
+  return cost === null || cost < REHASH_MIN_COST;
+}
+
+// Após um login válido, refaz o hash abaixo do mínimo sem atrasar a resposta
+export function rehashInBackground(db, userId, password, hash) {
+  needsRehash(hash)
+    .then(async (stale) => {
+      if (!stale) return;
+      const newHash = await hashPassword(password);
+      await db.collection('utilizadores').updateOne(
+        { _id: userId, password: hash },
+        { $set: { password: newHash } }
+      );
+    })
+    .catch((error) => {
+      console.error('[PASSWORD HASHER] Erro ao refazer hash (non-blocking):', error.message);
+    });
+}
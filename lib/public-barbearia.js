@@ -0,0 +1,120 @@
+import { ObjectId } from 'mongodb';
+import { unstable_cache, revalidateTag } from 'next/cache';
+import { connectToDatabase, DB_NAME } from '@/lib/mongodb';
+import { publishInvalidation, registerInvalidationHandler } from '@/lib/invalidation-bus';
+import { getTenantDb } from '@/lib/tenant-db';
+
+// Catálogo público de uma barbearia (página /barbearia/[slug] e
+// GET /api/barbearias/:slug). A página é gerada no servidor e guardada (ISR)
+// por slug; as rotas que alteram serviços, produtos, planos, locais,
+// barbeiros ou definições invalidam-na com revalidatePublicBarbearia, que
+// passa pelo barramento de invalidação para chegar à cache de todos os nós.
+
+// Regeneração de segurança, caso alguma escrita não passe pela invalidação
+export const PUBLIC_PAGE_REVALIDATE_SECONDS = 300;
+
+// Tag comum a todas as páginas públicas (limpeza completa)
+const ALL_PUBLIC_BARBEARIAS_TAG = 'public-barbearia';
+
+export function publicBarbeariaTag(slug) {
+  return `barbearia:${slug}`;
+}
+
+// Fora de um pedido (ex: invalidação vinda de outro nó, aplicada pelo
+// listener) revalidateTag não tem contexto; usar a cache incremental global
+function revalidateTagAnywhere(tag) {
+  try {
+    revalidateTag(tag);
+  } catch (error) {
+    const incrementalCache = globalThis.__incrementalCache;
+    if (!incrementalCache?.revalidateTag) throw error;
+    incrementalCache.revalidateTag(tag).catch((cacheError) => {
+      console.error('Erro ao invalidar página pública:', cacheError.message);
+    });
+  }
+}
+
+registerInvalidationHandler('public-barbearia', {
+  invalidate: (slug) => revalidateTagAnywhere(publicBarbeariaTag(slug)),
+  flush: () => revalidateTagAnywhere(ALL_PUBLIC_BARBEARIAS_TAG)
+});
+
+export async function loadPublicBarbearia(db, slug) {
+  // Dados públicos: nunca incluir credenciais da barbearia
+  const barbearia = await db.collection('barbearias').findOne(
+    { slug },
+    { projection: { stripe_secret_key: 0, twilio_account_sid: 0, twilio_auth_token: 0 } }
+  );
+
+  if (!barbearia) return null;
+
+  const barbeariaId = barbearia._id.toString();
+  const tenantDb = await getTenantDb(db, barbeariaId);
+
+  const [servicos, produtos, planos, locais, barbeiros] = await Promise.all([
+    tenantDb.collection('servicos').find({ barbearia_id: barbeariaId }).toArray(),
+    tenantDb.collection('produtos').find({ barbearia_id: barbeariaId }).toArray(),
+    // Planos de cliente (para assinaturas dos clientes)
+    tenantDb.collection('planos_cliente').find({ barbearia_id: barbeariaId, ativo: { $ne: false } }).toArray(),
+    tenantDb.collection('locais').find({ barbearia_id: barbeariaId, ativo: { $ne: false } }).toArray(),
+    // Apenas barbeiros ativos
+    db.collection('utilizadores')
+      .find({ barbearia_id: barbeariaId, tipo: 'barbeiro', ativo: { $ne: false } })
+      .project({ password: 0, horario_trabalho: 0 })
+      .toArray()
+  ]);
+
+  // Adicionar informações do local a cada barbeiro
+  const barbeirosComLocal = barbeiros.map(barbeiro => {
+    if (barbeiro.local_id) {
+      const local = locais.find(l => l._id.toString() === barbeiro.local_id);
+      return { ...barbeiro, local: local ? { _id: local._id, nome: local.nome } : null };
+    }
+    return { ...barbeiro, local: null };
+  });
+
+  return {
+    barbearia,
+    servicos,
+    produtos,
+    planos,
+    locais,
+    barbeiros: barbeirosComLocal
+  };
+}
+
+// Versão em cache para a página do servidor. O resultado é serializado em
+// JSON (ObjectId e Date passam a string), como na resposta da API.
+export function getPublicBarbearia(slug) {
+  return unstable_cache(
+    async () => {
+      const client = await connectToDatabase();
+      const db = client.db(DB_NAME);
+      return loadPublicBarbearia(db, slug);
+    },
+    ['public-barbearia', slug],
+    { tags: [publicBarbeariaTag(slug), ALL_PUBLIC_BARBEARIAS_TAG], revalidate: PUBLIC_PAGE_REVALIDATE_SECONDS }
+  )();
+}
+
+export function revalidatePublicBarbeariaSlug(slug) {
+  if (!slug) return;
+  // O handler registado acima invalida este nó; os restantes recebem a
+  // chave pelo barramento. Erros de revalidateTag ficam no applyKey.
+  publishInvalidation(`public-barbearia:${slug}`);
+}
+
+// Invalida a página pública de uma barbearia depois de uma escrita.
+// Nunca lança: a escrita já foi feita e a página regenera sozinha.
+export async function revalidatePublicBarbearia(db, barbeariaId) {
+  if (!barbeariaId) return;
+  try {
+    const barbearia = await db.collection('barbearias').findOne(
+      { _id: new ObjectId(barbeariaId) },
+      { projection: { slug: 1 } }
+    );
+    revalidatePublicBarbeariaSlug(barbearia?.slug);
+  } catch (error) {
+    console.error('Erro ao invalidar página pública:', error.message);
+  }
+}
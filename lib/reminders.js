@@ -0,0 +1,149 @@
+import { getLoader, PROJECTIONS } from '@/lib/loaders';
+import { TenantDb, isTenantWriteBlocked } from '@/lib/tenant-db';
+
+// Lembretes de marcações por email (24h antes e 60min antes). Cada marcação
+// é reclamada com um update condicional na flag `lembrete_*_enviado` antes
+// do envio, por isso duas execuções sobrepostas (dois nós, o job agendado e
+// o cron manual) nunca enviam o mesmo lembrete duas vezes. Se o envio
+// falhar a flag volta atrás e a próxima onda tenta de novo.
+
+const ACTIVE_STATUSES = ['aceita', 'pendente'];
+
+function pad(n) {
+  return String(n).padStart(2, '0');
+}
+
+const WAVES = [
+  {
+    tipo: '24h',
+    contador: 'reminders24h',
+    flag: 'lembrete_24h_enviado',
+    query(now) {
+      const tomorrow = new Date(now);
+      tomorrow.setDate(tomorrow.getDate() + 1);
+      return { data: tomorrow.toISOString().split('T')[0] };
+    },
+    send(EmailService, cliente, marcacao, [, servico, barbearia, , profissional]) {
+      return EmailService.sendBookingReminder24h(cliente.email, {
+        clienteName: cliente.nome,
+        data: marcacao.data,
+        hora: marcacao.hora,
+        servicoName: servico?.nome || 'Serviço',
+        profissionalName: profissional?.nome || null,
+        barbeariaName: barbearia?.nome || 'CutHub'
+      });
+    }
+  },
+  {
+    tipo: '60min',
+    contador: 'reminders60min',
+    flag: 'lembrete_60min_enviado',
+    query(now) {
+      const in60min = new Date(now.getTime() + 60 * 60 * 1000);
+      return {
+        data: in60min.toISOString().split('T')[0],
+        hora: {
+          $gte: `${pad(in60min.getHours())}:${pad(in60min.getMinutes())}`,
+          $lte: `${pad(in60min.getHours())}:59`
+        }
+      };
+    },
+    send(EmailService, cliente, marcacao, [, servico, barbearia, local, profissional]) {
+      return EmailService.sendBookingReminder60min(cliente.email, {
+        clienteName: cliente.nome,
+        data: marcacao.data,
+        hora: marcacao.hora,
+        servicoName: servico?.nome || 'Serviço',
+        profissionalName: profissional?.nome || null,
+        barbeariaName: barbearia?.nome || 'CutHub',
+        localMorada: local?.morada || null
+      });
+    }
+  }
+];
+
+// Cliente, serviço, barbearia, local e profissional de uma marcação
+function loadMarcacaoDetails(loader, marcacao) {
+  return Promise.all([
+    loader.load('utilizadores', marcacao.cliente_id, { projection: PROJECTIONS.utilizadorContacto }),
+    loader.load('servicos', marcacao.servico_id, { projection: PROJECTIONS.servicoResumo }),
+    loader.load('barbearias', marcacao.barbearia_id, { projection: PROJECTIONS.barbeariaResumo }),
+    marcacao.local_id ? loader.load('locais', marcacao.local_id, { projection: PROJECTIONS.localResumo }) : null,
+    marcacao.barbeiro_id ? loader.load('utilizadores', marcacao.barbeiro_id, { projection: PROJECTIONS.utilizadorResumo }) : null
+  ]);
+}
+
+// Faixa [parte] de [partes] das marcações, pelo segundo de criação no
+// ObjectId. É um predicado residual: o índice continua a ser o de `data`.
+export function hashRangeFilter(parte, partes) {
+  if (!partes || partes <= 1) return {};
+  return {
+    $expr: {
+      $eq: [{ $mod: [{ $floor: { $divide: [{ $toLong: { $toDate: '$_id' } }, 1000] } }, partes] }, parte]
+    }
+  };
+}
+
+// Envia os lembretes devidos numa base (partilhada ou TenantDb).
+// `parte`/`partes` restringem a uma faixa de hash, para que vários nós
+// dividam uma onda grande.
+export async function sendReminderWave(database, { now = new Date(), parte = 0, partes = 1 } = {}) {
+  const { EmailService } = await import('@/lib/email-service');
+  const marcacoes = database.collection('marcacoes');
+  // Os dados de todas as marcações de cada lote são pré-carregados numa
+  // query por coleção; o ciclo de envio lê-os da cache do loader (um erro
+  // na pré-carga aparece em cada marcação afetada, dentro do ciclo)
+  const loader = getLoader(database);
+  const result = { reminders24h: 0, reminders60min: 0, errors: [] };
+
+  for (const wave of WAVES) {
+    const pendentes = await marcacoes
+      .find({
+        ...wave.query(now),
+        status: { $in: ACTIVE_STATUSES },
+        [wave.flag]: { $ne: true },
+        ...hashRangeFilter(parte, partes)
+      })
+      .toArray();
+
+    await Promise.all(pendentes.map(m => loadMarcacaoDetails(loader, m))).catch(() => {});
+
+    for (const marcacao of pendentes) {
+      let reclamada = false;
+      try {
+        const details = await loadMarcacaoDetails(loader, marcacao);
+        const cliente = details[0];
+        if (!cliente?.email) continue;
+
+        // Na base partilhada a flag é escrita sem TenantDb: tenants em corte
+        // ficam para a próxima onda, senão a flag perde-se na troca
+        if (!(database instanceof TenantDb) && await isTenantWriteBlocked(database, marcacao.barbearia_id)) continue;
+
+        // Reclamar a marcação: só um envio ganha
+        const claim = await marcacoes.updateOne(
+          { _id: marcacao._id, [wave.flag]: { $ne: true } },
+          { $set: { [wave.flag]: true, [`${wave.flag}_em`]: new Date() } }
+        );
+        if (claim.modifiedCount === 0) continue;
+        reclamada = true;
+
+        const sent = await wave.send(EmailService, cliente, marcacao, details);
+        if (sent?.success === false) {
+          throw new Error(typeof sent.error === 'string' ? sent.error : sent.error?.message || 'Falha no envio');
+        }
+        result[wave.contador]++;
+      } catch (error) {
+        console.error(`[CRON] Error sending ${wave.tipo} reminder:`, error);
+        result.errors.push({ type: wave.tipo, marcacao_id: marcacao._id.toString(), error: error.message });
+        if (reclamada) {
+          await marcacoes.updateOne(
+            { _id: marcacao._id },
+            { $unset: { [wave.flag]: '', [`${wave.flag}_em`]: '' } }
+          ).catch(() => {});
+        }
+      }
+    }
+  }
+
+  return result;
+}
@@ -0,0 +1,342 @@
+import { ObjectId } from 'mongodb';
+import { findMarcacoes, rangeNeedsArchive } from '@/lib/marcacoes-archive';
+import { resolveWorkingHours, availableMinutes, WORKING_HOURS_PROJECTION } from '@/lib/schedule';
+import { mapScheduleExceptions, migrateBarberExceptions } from '@/lib/schedule-exceptions';
+import { runOutsideRequest } from '@/lib/metrics';
+import { getTenantDb } from '@/lib/tenant-db';
+
+// Rollups diários para os relatórios avançados. Cada documento de
+// `rollups_diarios` é um bucket barbearia × dia × local × barbeiro × serviço
+// com contagens por estado, receita (concluídas × servicos.preco) e minutos
+// marcados. Os minutos disponíveis de cada barbeiro ficam num bucket com
+// servico_id null.
+//
+// Os buckets de um dia são sempre recalculados por inteiro a partir das
+// marcações desse dia (idempotente): as escritas agendam o recálculo do dia
+// afetado (com coalescência), as mudanças de horário o dos dias seguintes
+// (minutos disponíveis) e o backfill percorre intervalos de datas.
+// Os relatórios só somam buckets.
+
+export const ROLLUPS_COLLECTION = 'rollups_diarios';
+
+export const ROLLUP_STATUSES = ['pendente', 'aceita', 'concluida', 'cancelada', 'rejeitada'];
+
+// Estados que não ocupam tempo do barbeiro
+const NAO_OCUPA = new Set(['cancelada', 'rejeitada']);
+
+const REFRESH_DELAY_MS = 2000;
+const MAX_BACKFILL_DAYS = 3 * 366;
+// Dias à frente recalculados quando muda um horário semanal
+const SCHEDULE_HORIZON_DAYS = parseInt(process.env.ROLLUPS_SCHEDULE_HORIZON_DAYS || '90', 10);
+
+const STATE_KEY = Symbol.for('cuthub.rollups');
+
+if (!globalThis[STATE_KEY]) {
+  globalThis[STATE_KEY] = { pending: new Map(), timer: null, indexesReady: null };
+}
+
+const state = globalThis[STATE_KEY];
+
+function ensureIndexes(db) {
+  if (!state.indexesReady) {
+    state.indexesReady = db.collection(ROLLUPS_COLLECTION)
+      .createIndex({ barbearia_id: 1, data: 1 })
+      .catch((error) => {
+        state.indexesReady = null;
+        throw error;
+      });
+  }
+  return state.indexesReady;
+}
+
+function bucketId(barbeariaId, data, localId, barbeiroId, servicoId) {
+  return [barbeariaId, data, localId || '-', barbeiroId || '-', servicoId || '-'].join('|');
+}
+
+function emptyBucket(barbeariaId, data, localId, barbeiroId, servicoId) {
+  return {
+    _id: bucketId(barbeariaId, data, localId, barbeiroId, servicoId),
+    barbearia_id: barbeariaId,
+    data,
+    local_id: localId || null,
+    barbeiro_id: barbeiroId || null,
+    servico_id: servicoId || null,
+    contagens: Object.fromEntries(ROLLUP_STATUSES.map(s => [s, 0])),
+    total: 0,
+    receita: 0,
+    minutos_marcados: 0,
+    minutos_disponiveis: 0
+  };
+}
+
+export function* eachDate(de, ate) {
+  const current = new Date(`${de}T00:00:00Z`);
+  const end = new Date(`${ate}T00:00:00Z`);
+  while (current <= end) {
+    yield current.toISOString().split('T')[0];
+    current.setUTCDate(current.getUTCDate() + 1);
+  }
+}
+
+function addDays(data, days) {
+  const date = new Date(`${data}T00:00:00Z`);
+  date.setUTCDate(date.getUTCDate() + days);
+  return date.toISOString().split('T')[0];
+}
+
+// Dados da barbearia usados em todos os dias de um recálculo
+async function loadContext(db, barbeariaId) {
+  const [servicos, barbeiros, horariosFuncionamento] = await Promise.all([
+    db.collection('servicos')
+      .find({ barbearia_id: barbeariaId }, { projection: { preco: 1, duracao: 1 } })
+      .toArray(),
+    db.collection('utilizadores')
+      .find(
+        { barbearia_id: barbeariaId, tipo: 'barbeiro', ativo: { $ne: false } },
+        { projection: { ...WORKING_HOURS_PROJECTION, local_id: 1 } }
+      )
+      .toArray(),
+    db.collection('horarios_funcionamento').find({ barbearia_id: barbeariaId }).toArray()
+  ]);
+
+  // Exceções ainda no array antigo entram na coleção antes de serem lidas em lote
+  for (const barbeiro of barbeiros) {
+    if (!Array.isArray(barbeiro.horario_trabalho?.excepcoes)) continue;
+    await migrateBarberExceptions(db, barbeiro);
+    delete barbeiro.horario_trabalho.excepcoes;
+  }
+
+  return {
+    servicos: new Map(servicos.map(s => [s._id.toString(), s])),
+    barbeiros,
+    horariosFuncionamento
+  };
+}
+
+async function buildBuckets(db, barbeariaId, data, marcacoes, context, excecoes) {
+  const buckets = new Map();
+  const bucketFor = (localId, barbeiroId, servicoId) => {
+    const id = bucketId(barbeariaId, data, localId, barbeiroId, servicoId);
+    if (!buckets.has(id)) {
+      buckets.set(id, emptyBucket(barbeariaId, data, localId, barbeiroId, servicoId));
+    }
+    return buckets.get(id);
+  };
+
+  for (const m of marcacoes) {
+    const servico = context.servicos.get(m.servico_id);
+    const bucket = bucketFor(m.local_id, m.barbeiro_id, m.servico_id);
+    if (bucket.contagens[m.status] !== undefined) bucket.contagens[m.status]++;
+    bucket.total++;
+    if (m.status === 'concluida') bucket.receita += servico?.preco || 0;
+    if (!NAO_OCUPA.has(m.status)) bucket.minutos_marcados += servico?.duracao || 0;
+  }
+
+  // Minutos disponíveis por barbeiro (bucket sem serviço)
+  for (const barbeiro of context.barbeiros) {
+    const barbeiroId = barbeiro._id.toString();
+    const horas = await resolveWorkingHours(db, barbeiro, data, {
+      horariosFuncionamento: context.horariosFuncionamento,
+      excecao: excecoes.get(`${barbeiroId}|${data}`) || null
+    });
+    const minutos = availableMinutes(horas);
+    if (minutos > 0) {
+      bucketFor(barbeiro.local_id, barbeiroId, null).minutos_disponiveis = minutos;
+    }
+  }
+
+  return [...buckets.values()];
+}
+
+// Recalcula os buckets de [de, ate] de uma barbearia, um mês de cada vez
+export async function rebuildRollups(db, barbeariaId, de, ate) {
+  db = await getTenantDb(db, barbeariaId);
+  await ensureIndexes(db);
+  const context = await loadContext(db, barbeariaId);
+  const collection = db.collection(ROLLUPS_COLLECTION);
+  let dias = 0;
+  let buckets = 0;
+
+  for (let inicio = de; inicio <= ate; inicio = addDays(inicio, 31)) {
+    const fim = addDays(inicio, 30) < ate ? addDays(inicio, 30) : ate;
+
+    const [marcacoes, excecoes] = await Promise.all([
+      findMarcacoes(
+        db,
+        { barbearia_id: barbeariaId, data: { $gte: inicio, $lte: fim } },
+        { includeArchive: rangeNeedsArchive(inicio) }
+      ),
+      mapScheduleExceptions(db, context.barbeiros.map(b => b._id.toString()), inicio, fim)
+    ]);
+
+    const porDia = new Map();
+    marcacoes.forEach(m => {
+      if (!porDia.has(m.data)) porDia.set(m.data, []);
+      porDia.get(m.data).push(m);
+    });
+
+    const operations = [];
+    for (const data of eachDate(inicio, fim)) {
+      const docs = await buildBuckets(db, barbeariaId, data, porDia.get(data) || [], context, excecoes);
+      const atualizadoEm = new Date();
+      docs.forEach(doc => operations.push({
+        replaceOne: { filter: { _id: doc._id }, replacement: { ...doc, atualizado_em: atualizadoEm }, upsert: true }
+      }));
+      // Buckets que deixaram de existir (ex: marcação mudou de barbeiro)
+      operations.push({
+        deleteMany: {
+          filter: { barbearia_id: barbeariaId, data, _id: { $nin: docs.map(doc => doc._id) } }
+        }
+      });
+      dias++;
+      buckets += docs.length;
+    }
+
+    if (operations.length > 0) {
+      await collection.bulkWrite(operations, { ordered: false });
+    }
+  }
+
+  return { dias, buckets };
+}
+
+// Backfill de todas as barbearias (ou de uma) num intervalo
+export async function backfillRollups(db, { de, ate, barbeariaId } = {}) {
+  const dias = [...eachDate(de, ate)].length;
+  if (dias > MAX_BACKFILL_DAYS) {
+    throw new Error(`Intervalo demasiado grande (máximo ${MAX_BACKFILL_DAYS} dias)`);
+  }
+
+  const barbearias = barbeariaId
+    ? [barbeariaId]
+    : (await db.collection('barbearias').find({}, { projection: { _id: 1 } }).toArray()).map(b => b._id.toString());
+
+  const result = { barbearias: 0, dias: 0, buckets: 0 };
+  for (const id of barbearias) {
+    const { dias: d, buckets } = await rebuildRollups(db, id, de, ate);
+    result.barbearias++;
+    result.dias += d;
+    result.buckets += buckets;
+  }
+  return result;
+}
+
+// Agenda o recálculo do dia de uma marcação. Várias escritas no mesmo dia
+// dentro de REFRESH_DELAY_MS dão um só recálculo. Nunca lança.
+export function scheduleRollupRefresh(db, barbeariaId, data) {
+  scheduleRollupRangeRefresh(db, barbeariaId, data, data);
+}
+
+// Agenda o recálculo de [de, ate], com a mesma coalescência. Nunca lança.
+export function scheduleRollupRangeRefresh(db, barbeariaId, de, ate) {
+  if (!barbeariaId || !de || !ate) return;
+  state.pending.set(`${barbeariaId}|${de}|${ate}`, { db, barbeariaId, de, ate });
+
+  if (state.timer) return;
+  state.timer = setTimeout(() => {
+    state.timer = null;
+    const jobs = [...state.pending.values()];
+    state.pending.clear();
+
+    runOutsideRequest(async () => {
+      for (const job of jobs) {
+        try {
+          await rebuildRollups(job.db, job.barbeariaId, job.de, job.ate);
+        } catch (error) {
+          console.error(`Erro ao atualizar rollup ${job.barbeariaId} ${job.de}..${job.ate}:`, error.message);
+        }
+      }
+    });
+  }, REFRESH_DELAY_MS);
+  state.timer.unref?.();
+}
+
+// Um horário semanal mudou: os minutos disponíveis de hoje até
+// SCHEDULE_HORIZON_DAYS (ou até `ate`, se for mais tarde) ficam por recalcular
+export function scheduleRollupScheduleRefresh(db, barbeariaId, { ate = null } = {}) {
+  const hoje = new Date().toISOString().split('T')[0];
+  const limite = addDays(hoje, MAX_BACKFILL_DAYS);
+  let fim = addDays(hoje, SCHEDULE_HORIZON_DAYS);
+  if (ate && ate > fim) fim = ate < limite ? ate : limite;
+  scheduleRollupRangeRefresh(db, barbeariaId, hoje, fim);
+}
+
+// Agenda o recálculo a partir do id de uma marcação (ex: depois de um PUT)
+export async function scheduleRollupRefreshForMarcacao(db, marcacaoId) {
+  try {
+    const marcacao = await db.collection('marcacoes').findOne(
+      { _id: new ObjectId(marcacaoId) },
+      { projection: { barbearia_id: 1, data: 1 } }
+    );
+    if (marcacao) scheduleRollupRefresh(db, marcacao.barbearia_id, marcacao.data);
+  } catch (error) {
+    console.error('Erro ao agendar rollup:', error.message);
+  }
+}
+
+// Planos que incluem "Relatórios avançados" (ver GET plans)
+const REPORT_PLANS = new Set(['pro', 'enterprise']);
+
+export function planIncludesReports(plano) {
+  return Boolean(plano && REPORT_PLANS.has(plano.id));
+}
+
+const PERIODOS = {
+  dia: '$data',
+  mes: { $substrBytes: ['$data', 0, 7] },
+  total: null
+};
+
+const DIMENSOES = {
+  barbeiro: { campo: '$barbeiro_id', collection: 'utilizadores' },
+  servico: { campo: '$servico_id', collection: 'servicos' },
+  local: { campo: '$local_id', collection: 'locais' }
+};
+
+export function isValidReportGrouping(agrupar, por) {
+  return Object.prototype.hasOwnProperty.call(PERIODOS, agrupar) &&
+    (!por || Object.prototype.hasOwnProperty.call(DIMENSOES, por));
+}
+
+// Relatório de [de, ate]: soma dos buckets, agrupada por período e
+// opcionalmente por barbeiro, serviço ou local
+export async function queryReport(db, barbeariaId, { de, ate, agrupar = 'dia', por = null }) {
+  const dimensao = por ? DIMENSOES[por] : null;
+
+  db = await getTenantDb(db, barbeariaId);
+  const rows = await db.collection(ROLLUPS_COLLECTION).aggregate([
+    { $match: { barbearia_id: barbeariaId, data: { $gte: de, $lte: ate } } },
+    {
+      $group: {
+        _id: { periodo: PERIODOS[agrupar], chave: dimensao ? dimensao.campo : null },
+        ...Object.fromEntries(ROLLUP_STATUSES.map(s => [s, { $sum: `$contagens.${s}` }])),
+        total: { $sum: '$total' },
+        receita: { $sum: '$receita' },
+        minutos_marcados: { $sum: '$minutos_marcados' },
+        minutos_disponiveis: { $sum: '$minutos_disponiveis' }
+      }
+    },
+    { $sort: { '_id.periodo': 1, '_id.chave': 1 } }
+  ]).toArray();
+
+  // Nomes das dimensões (poucos: barbeiros, serviços ou locais da barbearia)
+  let nomes = new Map();
+  if (dimensao) {
+    const ids = [...new Set(rows.map(r => r._id.chave).filter(Boolean))]
+      .filter(id => ObjectId.isValid(id))
+      .map(id => new ObjectId(id));
+    const docs = await db.collection(dimensao.collection)
+      .find({ _id: { $in: ids } }, { projection: { nome: 1 } })
+      .toArray();
+    nomes = new Map(docs.map(d => [d._id.toString(), d.nome]));
+  }
+
+  return rows.map(({ _id, ...totais }) => ({
+    periodo: _id.periodo ?? `${de}..${ate}`,
+    ...(dimensao ? { [`${por}_id`]: _id.chave, nome: nomes.get(_id.chave) || null } : {}),
+    ...totais,
+    ocupacao: totais.minutos_disponiveis > 0
+      ? Math.round((totais.minutos_marcados / totais.minutos_disponiveis) * 1000) / 1000
+      : null
+  }));
+}
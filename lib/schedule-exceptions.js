@@ -0,0 +1,199 @@
+import { ObjectId } from 'mongodb';
+import { getTenantDb } from '@/lib/tenant-db';
+
+// Exceções ao horário dos barbeiros (folgas, dias parciais, feriados) numa
+// coleção datada em vez do array horario_trabalho.excepcoes do utilizador,
+// que crescia sem limite e era lido por inteiro em cada pedido de slots.
+// Há no máximo uma exceção por barbeiro e dia (_id `barbeiro_id|data`), e
+// as leituras são pontuais (um dia) ou por intervalo (vistas de calendário).
+// As funções que só recebem o barbeiro usam o `db` que lhes é passado: para
+// tenants em base dedicada deve ser o TenantDb da barbearia.
+//
+// Enquanto o array antigo existir num barbeiro, a primeira leitura ou
+// escrita das suas exceções copia-o para a coleção (sem substituir o que já
+// lá está) e remove-o, por isso não é preciso esperar pelo cron de
+// migração e as duas fontes nunca divergem.
+
+export const EXCEPTIONS_COLLECTION = 'horario_excecoes';
+
+export const EXCEPTION_TYPES = ['folga', 'parcial', 'feriado', 'extra'];
+
+// Tipos em que o barbeiro não trabalha o dia inteiro
+export const DAY_OFF_TYPES = new Set(['folga', 'feriado']);
+
+const PROJECTION = { _id: 0, data: 1, tipo: 1, inicio: 1, fim: 1, motivo: 1, barbeiro_id: 1, criado_em: 1 };
+
+const STATE_KEY = Symbol.for('cuthub.scheduleExceptions');
+
+if (!globalThis[STATE_KEY]) {
+  globalThis[STATE_KEY] = { indexesReady: null };
+}
+
+const state = globalThis[STATE_KEY];
+
+function ensureIndexes(db) {
+  if (!state.indexesReady) {
+    const collection = db.collection(EXCEPTIONS_COLLECTION);
+    state.indexesReady = Promise.all([
+      collection.createIndex({ barbeiro_id: 1, data: 1 }, { unique: true }),
+      collection.createIndex({ barbearia_id: 1, data: 1 })
+    ]).catch((error) => {
+      state.indexesReady = null;
+      throw error;
+    });
+  }
+  return state.indexesReady;
+}
+
+function exceptionDocument(barbeiroId, barbeariaId, excecao) {
+  return {
+    _id: `${barbeiroId}|${excecao.data}`,
+    barbeiro_id: barbeiroId,
+    barbearia_id: barbeariaId || null,
+    data: excecao.data,
+    tipo: excecao.tipo,
+    inicio: excecao.inicio || null,
+    fim: excecao.fim || null,
+    motivo: excecao.motivo || '',
+    criado_em: excecao.criado_em ? new Date(excecao.criado_em) : new Date()
+  };
+}
+
+// Exceção de um barbeiro num dia (ou null)
+export async function findScheduleException(db, barbeiroId, data) {
+  return db.collection(EXCEPTIONS_COLLECTION).findOne(
+    { barbeiro_id: barbeiroId, data },
+    { projection: PROJECTION }
+  );
+}
+
+// Exceções de um barbeiro e/ou de uma barbearia em [de, ate]
+export async function listScheduleExceptions(db, { barbeiroId, barbeariaId, de, ate }) {
+  const query = {};
+  if (barbeiroId) query.barbeiro_id = barbeiroId;
+  if (barbeariaId) query.barbearia_id = barbeariaId;
+  if (de || ate) {
+    query.data = {};
+    if (de) query.data.$gte = de;
+    if (ate) query.data.$lte = ate;
+  }
+  return db.collection(EXCEPTIONS_COLLECTION)
+    .find(query, { projection: PROJECTION })
+    .sort({ data: 1 })
+    .toArray();
+}
+
+// Exceções de vários barbeiros num intervalo, indexadas por `barbeiro_id|data`
+export async function mapScheduleExceptions(db, barbeiroIds, de, ate) {
+  if (barbeiroIds.length === 0) return new Map();
+  const docs = await db.collection(EXCEPTIONS_COLLECTION)
+    .find({ barbeiro_id: { $in: barbeiroIds }, data: { $gte: de, $lte: ate } }, { projection: PROJECTION })
+    .toArray();
+  return new Map(docs.map(d => [`${d.barbeiro_id}|${d.data}`, d]));
+}
+
+export function isValidException(excecao) {
+  return Boolean(
+    excecao &&
+    /^\d{4}-\d{2}-\d{2}$/.test(excecao.data || '') &&
+    EXCEPTION_TYPES.includes(excecao.tipo)
+  );
+}
+
+// Cria ou substitui a exceção desse dia
+export async function upsertScheduleException(db, barbeiroId, barbeariaId, excecao) {
+  if (barbeariaId) db = await getTenantDb(db, barbeariaId);
+  await ensureIndexes(db);
+  const doc = exceptionDocument(barbeiroId, barbeariaId, excecao);
+  await db.collection(EXCEPTIONS_COLLECTION).replaceOne({ _id: doc._id }, doc, { upsert: true });
+  const { _id, barbearia_id, ...excecaoGuardada } = doc;
+  return excecaoGuardada;
+}
+
+export async function removeScheduleException(db, barbeiroId, data) {
+  const result = await db.collection(EXCEPTIONS_COLLECTION).deleteOne({ barbeiro_id: barbeiroId, data });
+  return result.deletedCount > 0;
+}
+
+// O formulário de horários envia a lista completa das exceções que mostra
+// (de `desde` em diante): substitui essas e mantém o histórico anterior
+export async function replaceScheduleExceptions(db, barbeiroId, barbeariaId, excepcoes, { desde }) {
+  if (barbeariaId) db = await getTenantDb(db, barbeariaId);
+  await ensureIndexes(db);
+  const docs = excepcoes
+    .filter(isValidException)
+    .filter(e => e.data >= desde)
+    .map(e => exceptionDocument(barbeiroId, barbeariaId, e));
+
+  const operations = [
+    {
+      deleteMany: {
+        filter: { barbeiro_id: barbeiroId, data: { $gte: desde }, _id: { $nin: docs.map(d => d._id) } }
+      }
+    },
+    ...docs.map(doc => ({ replaceOne: { filter: { _id: doc._id }, replacement: doc, upsert: true } }))
+  ];
+  await db.collection(EXCEPTIONS_COLLECTION).bulkWrite(operations, { ordered: true });
+  return docs.length;
+}
+
+// Copia o array embebido de um barbeiro para a coleção e remove-o. O que
+// já está na coleção foi escrito depois do array e ganha. Devolve o número
+// de exceções válidas do array (0 se o barbeiro já não o tiver).
+export async function migrateBarberExceptions(db, barbeiro) {
+  const excepcoes = barbeiro?.horario_trabalho?.excepcoes;
+  if (!Array.isArray(excepcoes)) return 0;
+
+  const barbeiroId = barbeiro._id.toString();
+  // Se houver duas exceções no mesmo dia, fica a última (como o $pull por data)
+  const porDia = new Map(excepcoes.filter(isValidException).map(e => [e.data, e]));
+  const operations = [...porDia.values()].map(e => {
+    const { _id, ...doc } = exceptionDocument(barbeiroId, barbeiro.barbearia_id, e);
+    return { updateOne: { filter: { _id }, update: { $setOnInsert: doc }, upsert: true } };
+  });
+  if (operations.length > 0) {
+    const tenantDb = barbeiro.barbearia_id ? await getTenantDb(db, barbeiro.barbearia_id) : db;
+    await ensureIndexes(tenantDb);
+    await tenantDb.collection(EXCEPTIONS_COLLECTION).bulkWrite(operations, { ordered: false });
+  }
+  // Só remove o array que foi copiado
+  await db.collection('utilizadores').updateOne(
+    { _id: barbeiro._id, 'horario_trabalho.excepcoes': excepcoes },
+    { $unset: { 'horario_trabalho.excepcoes': '' } }
+  );
+  return porDia.size;
+}
+
+// Antes de escrever as exceções de um barbeiro: migra o array se ainda existir
+export async function migrateBarberExceptionsById(db, barbeiroId) {
+  const barbeiro = await db.collection('utilizadores').findOne(
+    { _id: new ObjectId(barbeiroId), 'horario_trabalho.excepcoes': { $exists: true } },
+    { projection: { barbearia_id: 1, 'horario_trabalho.excepcoes': 1 } }
+  );
+  return migrateBarberExceptions(db, barbeiro);
+}
+
+// Migração: move horario_trabalho.excepcoes de cada barbeiro para a coleção
+// e remove o array do utilizador. Idempotente; pode correr com a app ativa.
+export async function migrateEmbeddedExceptions(db, { batchSize = 200, dryRun = false } = {}) {
+  await ensureIndexes(db);
+  const result = { barbeiros: 0, excecoes: 0, invalidas: 0 };
+
+  const cursor = db.collection('utilizadores').find(
+    { 'horario_trabalho.excepcoes': { $exists: true } },
+    { projection: { barbearia_id: 1, 'horario_trabalho.excepcoes': 1 } }
+  ).batchSize(batchSize);
+
+  for await (const barbeiro of cursor) {
+    const excepcoes = barbeiro.horario_trabalho?.excepcoes || [];
+    const validas = excepcoes.filter(isValidException);
+    result.barbeiros++;
+    result.excecoes += validas.length;
+    result.invalidas += excepcoes.length - validas.length;
+    if (dryRun) continue;
+
+    await migrateBarberExceptions(db, barbeiro);
+  }
+
+  return result;
+}
@@ -0,0 +1,112 @@
+import { findScheduleException, migrateBarberExceptions, DAY_OFF_TYPES } from '@/lib/schedule-exceptions';
+import { getTenantDb } from '@/lib/tenant-db';
+
+// Horário de trabalho efetivo de um barbeiro num dia: horário semanal
+// individual com exceções (folga/feriado/parcial, ver
+// lib/schedule-exceptions.js) e almoço, ou, sem horário individual, o
+// horário de funcionamento da barbearia. Usado pelo cálculo de slots e pelos
+// minutos disponíveis dos relatórios.
+
+export const DIAS_SEMANA = ['domingo', 'segunda', 'terca', 'quarta', 'quinta', 'sexta', 'sabado'];
+
+// Campos do utilizador de que resolveWorkingHours precisa
+export const WORKING_HOURS_PROJECTION = {
+  barbearia_id: 1,
+  'horario_trabalho.horario_semanal': 1,
+  'horario_trabalho.hora_almoco_inicio': 1,
+  'horario_trabalho.hora_almoco_fim': 1,
+  // Array antigo: só existe até à primeira leitura (migrateBarberExceptions)
+  'horario_trabalho.excepcoes': 1
+};
+
+export function toMinutes(hora) {
+  const [h, m] = hora.split(':').map(Number);
+  return h * 60 + m;
+}
+
+// Carrega o horário de funcionamento da barbearia (fallback) só quando é
+// preciso; `horariosFuncionamento` evita a query quando já foi lido.
+async function findHorarioFuncionamento(db, barbeiro, diaSemana, horariosFuncionamento) {
+  if (horariosFuncionamento) {
+    return horariosFuncionamento.find(h => h.dia_semana === diaSemana && h.ativo) || null;
+  }
+  return db.collection('horarios_funcionamento').findOne({
+    barbearia_id: barbeiro.barbearia_id,
+    dia_semana: diaSemana,
+    ativo: true
+  });
+}
+
+// Devolve { inicio, fim, almocoInicio, almocoFim } em minutos desde a
+// meia-noite, ou { fechado: true, message } se o barbeiro não trabalha.
+// `excecao` (null = sem exceção) evita a query quando já foi lida em lote.
+export async function resolveWorkingHours(db, barbeiro, data, { horariosFuncionamento, excecao } = {}) {
+  if (barbeiro.barbearia_id) db = await getTenantDb(db, barbeiro.barbearia_id);
+  const diaSemanaNum = new Date(data).getDay(); // 0 = Domingo, 6 = Sábado
+  const diaSemana = DIAS_SEMANA[diaSemanaNum];
+
+  const horarioBarbeiro = barbeiro.horario_trabalho;
+
+  if (horarioBarbeiro && horarioBarbeiro.horario_semanal) {
+    const horarioDia = horarioBarbeiro.horario_semanal[diaSemanaNum];
+
+    if (!horarioDia || !horarioDia.ativo) {
+      return { fechado: true, message: 'Barbeiro não trabalha neste dia' };
+    }
+
+    let horaInicio = horarioDia.inicio || '09:00';
+    let horaFim = horarioDia.fim || '19:00';
+
+    // Exceção para esta data específica. Com o array antigo ainda presente,
+    // a exceção lida em lote pode estar em falta: migra e lê de novo.
+    const embebidas = Array.isArray(horarioBarbeiro.excepcoes);
+    if (embebidas) {
+      await migrateBarberExceptions(db, barbeiro);
+      delete horarioBarbeiro.excepcoes;
+    }
+    const excecaoDia = excecao !== undefined && !embebidas
+      ? excecao
+      : await findScheduleException(db, barbeiro._id.toString(), data);
+    if (excecaoDia) {
+      if (DAY_OFF_TYPES.has(excecaoDia.tipo)) {
+        return { fechado: true, message: 'Barbeiro de folga neste dia' };
+      } else if (excecaoDia.tipo === 'parcial') {
+        // Horário diferente para este dia
+        horaInicio = excecaoDia.inicio || horaInicio;
+        horaFim = excecaoDia.fim || horaFim;
+      }
+    }
+
+    const almoco = horarioBarbeiro.hora_almoco_inicio && horarioBarbeiro.hora_almoco_fim;
+    return {
+      inicio: toMinutes(horaInicio),
+      fim: toMinutes(horaFim),
+      almocoInicio: almoco ? toMinutes(horarioBarbeiro.hora_almoco_inicio) : null,
+      almocoFim: almoco ? toMinutes(horarioBarbeiro.hora_almoco_fim) : null
+    };
+  }
+
+  // Usar horário de funcionamento da barbearia como fallback
+  const horarioFuncionamento = await findHorarioFuncionamento(db, barbeiro, diaSemana, horariosFuncionamento);
+  if (!horarioFuncionamento || !horarioFuncionamento.hora_inicio) {
+    return { fechado: true };
+  }
+
+  return {
+    inicio: toMinutes(horarioFuncionamento.hora_inicio),
+    fim: toMinutes(horarioFuncionamento.hora_fim),
+    almocoInicio: null,
+    almocoFim: null
+  };
+}
+
+// Minutos de trabalho no dia, sem a sobreposição com o almoço
+export function availableMinutes(hours) {
+  if (!hours || hours.fechado) return 0;
+  let total = Math.max(0, hours.fim - hours.inicio);
+  if (hours.almocoInicio !== null && hours.almocoFim !== null) {
+    const overlap = Math.min(hours.fim, hours.almocoFim) - Math.max(hours.inicio, hours.almocoInicio);
+    total -= Math.max(0, overlap);
+  }
+  return total;
+}
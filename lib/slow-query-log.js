@@ -0,0 +1,199 @@
+import { appendFile } from 'fs/promises';
+import { getRequestContext, runOutsideRequest } from '@/lib/metrics';
+
+// Slow-query log: qualquer comando Mongo acima de SLOW_QUERY_MS é registado com a
+// rota, a forma normalizada do filtro, a duração, documentos devolvidos e, por
+// amostragem, o plano do explain(). Destino: ficheiro JSONL (SLOW_QUERY_LOG_FILE)
+// ou a capped collection `slow_queries`. Relatório: slow_query_report.py
+
+const SLOW_QUERY_MS = parseInt(process.env.SLOW_QUERY_MS || '100', 10);
+const EXPLAIN_SAMPLE_RATE = parseFloat(process.env.SLOW_QUERY_EXPLAIN_RATE || '0.1');
+const EXPLAIN_COOLDOWN_MS = 5 * 60 * 1000;
+const LOG_FILE = process.env.SLOW_QUERY_LOG_FILE || null;
+
+export const SLOW_QUERY_COLLECTION = 'slow_queries';
+const CAPPED_SIZE_BYTES = 16 * 1024 * 1024;
+
+// Comandos de leitura/escrita cujo filtro sabemos extrair
+const FILTER_EXTRACTORS = {
+  find: (cmd) => cmd.filter,
+  count: (cmd) => cmd.query,
+  distinct: (cmd) => cmd.query,
+  aggregate: (cmd) => cmd.pipeline,
+  findAndModify: (cmd) => cmd.query,
+  update: (cmd) => cmd.updates?.[0]?.q,
+  delete: (cmd) => cmd.deletes?.[0]?.q
+};
+
+const EXPLAINABLE = new Set(['find', 'count', 'distinct', 'aggregate']);
+
+// Campos de sessão/transporte que não podem ir para dentro de um explain
+const TRANSPORT_FIELDS = new Set([
+  'lsid', '$db', '$clusterTime', 'txnNumber', 'autocommit', 'startTransaction',
+  '$readPreference', 'readConcern', 'writeConcern', 'apiVersion', 'apiStrict', 'apiDeprecationErrors'
+]);
+
+const inflight = new Map();
+const lastExplainByShape = new Map();
+let cappedCollectionReady = null;
+
+// Substitui valores concretos por "?" mantendo chaves e operadores,
+// para que queries iguais com parâmetros diferentes tenham a mesma forma.
+export function normalizeShape(value) {
+  if (Array.isArray(value)) {
+    if (value.length === 0) return [];
+    const shapes = value.map(normalizeShape);
+    const unique = [...new Set(shapes.map(s => JSON.stringify(s)))];
+    return unique.length === 1 ? [shapes[0]] : shapes;
+  }
+  if (value && typeof value === 'object' && value.constructor === Object) {
+    const shape = {};
+    for (const key of Object.keys(value).sort()) {
+      shape[key] = normalizeShape(value[key]);
+    }
+    return shape;
+  }
+  return '?';
+}
+
+function collectStages(plan, stages = []) {
+  if (!plan || typeof plan !== 'object') return stages;
+  if (plan.stage) stages.push(plan.stage);
+  if (plan.inputStage) collectStages(plan.inputStage, stages);
+  if (Array.isArray(plan.inputStages)) plan.inputStages.forEach(s => collectStages(s, stages));
+  if (plan.queryPlan) collectStages(plan.queryPlan, stages);
+  return stages;
+}
+
+// Extrai o essencial do explain (find ou aggregate com/sem pushdown)
+function summarizeExplain(explain) {
+  const cursorStage = explain?.stages?.[0]?.$cursor;
+  const queryPlanner = explain?.queryPlanner || cursorStage?.queryPlanner;
+  const executionStats = explain?.executionStats || cursorStage?.executionStats;
+
+  return {
+    plan_stages: collectStages(queryPlanner?.winningPlan),
+    docs_examined: executionStats?.totalDocsExamined ?? null,
+    keys_examined: executionStats?.totalKeysExamined ?? null,
+    winning_plan: queryPlanner?.winningPlan || null
+  };
+}
+
+function stripTransportFields(command) {
+  const stripped = {};
+  for (const [key, value] of Object.entries(command)) {
+    if (!TRANSPORT_FIELDS.has(key)) stripped[key] = value;
+  }
+  return stripped;
+}
+
+function shouldExplain(commandName, shapeKey) {
+  if (!EXPLAINABLE.has(commandName) || Math.random() >= EXPLAIN_SAMPLE_RATE) return false;
+  const last = lastExplainByShape.get(shapeKey);
+  if (last && Date.now() - last < EXPLAIN_COOLDOWN_MS) return false;
+  lastExplainByShape.set(shapeKey, Date.now());
+  return true;
+}
+
+async function writeEntry(client, entry) {
+  if (LOG_FILE) {
+    await appendFile(LOG_FILE, JSON.stringify(entry) + '\n');
+    return;
+  }
+
+  const db = client.db(entry.db);
+  if (!cappedCollectionReady) {
+    cappedCollectionReady = db
+      .createCollection(SLOW_QUERY_COLLECTION, { capped: true, size: CAPPED_SIZE_BYTES })
+      .catch((error) => {
+        // 48 = NamespaceExists
+        if (error.code !== 48) throw error;
+      });
+  }
+  await cappedCollectionReady;
+  await db.collection(SLOW_QUERY_COLLECTION).insertOne(entry);
+}
+
+async function recordSlowQuery(client, started, event) {
+  const reply = event.reply || {};
+  const entry = {
+    ts: new Date(),
+    route: started.route,
+    db: started.db,
+    collection: started.collection,
+    command: started.commandName,
+    shape: started.shapeKey,
+    duration_ms: event.duration,
+    docs_returned: reply.cursor?.firstBatch?.length ?? reply.n ?? null,
+    docs_examined: null,
+    keys_examined: null,
+    plan_stages: null,
+    explain: null
+  };
+
+  if (shouldExplain(started.commandName, `${started.collection}:${started.shapeKey}`)) {
+    try {
+      const explain = await client.db(started.db).command({
+        explain: started.command,
+        verbosity: 'executionStats'
+      });
+      const summary = summarizeExplain(explain);
+      entry.docs_examined = summary.docs_examined;
+      entry.keys_examined = summary.keys_examined;
+      entry.plan_stages = summary.plan_stages;
+      entry.explain = summary.winning_plan;
+    } catch (error) {
+      console.error('[SLOW QUERY] Erro no explain:', error.message);
+    }
+  }
+
+  console.warn(
+    `[SLOW QUERY] ${entry.route || '-'} ${entry.collection}.${entry.command} ` +
+    `${entry.duration_ms}ms shape=${entry.shape}` +
+    (entry.plan_stages ? ` plan=${entry.plan_stages.join('>')}` : '')
+  );
+
+  await writeEntry(client, entry);
+}
+
+// Regista os listeners no cliente (criado com { monitorCommands: true })
+export function attachSlowQueryLog(client) {
+  const commandKey = (event) => `${event.connectionId}:${event.requestId}`;
+
+  client.on('commandStarted', (event) => {
+    const extractFilter = FILTER_EXTRACTORS[event.commandName];
+    if (!extractFilter) return;
+
+    const collection = event.command[event.commandName];
+    if (collection === SLOW_QUERY_COLLECTION) return;
+
+    inflight.set(commandKey(event), {
+      route: getRequestContext()?.route || null,
+      db: event.databaseName,
+      collection,
+      commandName: event.commandName,
+      shapeKey: JSON.stringify(normalizeShape(extractFilter(event.command) || {})),
+      command: EXPLAINABLE.has(event.commandName) ? stripTransportFields(event.command) : null
+    });
+  });
+
+  client.on('commandSucceeded', (event) => {
+    const key = commandKey(event);
+    const started = inflight.get(key);
+    if (!started) return;
+    inflight.delete(key);
+
+    if (event.duration < SLOW_QUERY_MS) return;
+
+    // Fora do contexto do pedido e sem bloquear a resposta
+    setImmediate(() => {
+      runOutsideRequest(() => recordSlowQuery(client, started, event)).catch((error) => {
+        console.error('[SLOW QUERY] Erro ao registar:', error.message);
+      });
+    });
+  });
+
+  client.on('commandFailed', (event) => {
+    inflight.delete(commandKey(event));
+  });
+}
@@ -0,0 +1,339 @@
+import { refreshEntitlementsForSubscription } from '@/lib/entitlements';
+import { getStripeClient } from '@/lib/integrations';
+import { runOutsideRequest } from '@/lib/metrics';
+
+// Fila de eventos do webhook Stripe. O endpoint só verifica a assinatura,
+// grava o evento em `stripe_events` (o _id é o event.id, por isso um reenvio
+// do Stripe é descartado pelo índice único) e responde 200. O worker
+// processa os eventos por ordem de criação dentro de cada customer, com
+// lock por evento e novas tentativas com backoff.
+//
+// Estados: pending -> processing -> done | dead (tentativas esgotadas)
+
+export const STRIPE_EVENTS_COLLECTION = 'stripe_events';
+
+const MAX_ATTEMPTS = parseInt(process.env.STRIPE_EVENTS_MAX_ATTEMPTS || '8', 10);
+const LOCK_MS = 60 * 1000;
+const BATCH_SIZE = 50;
+const BACKOFF_BASE_MS = 5 * 1000;
+const BACKOFF_MAX_MS = 60 * 60 * 1000;
+
+const STATE_KEY = Symbol.for('cuthub.stripeEventsWorker');
+
+if (!globalThis[STATE_KEY]) {
+  globalThis[STATE_KEY] = { draining: null, rerun: false, indexesReady: null };
+}
+
+const worker = globalThis[STATE_KEY];
+
+function getStripe() {
+  return getStripeClient(process.env.STRIPE_SECRET_KEY, { apiVersion: '2023-10-16' });
+}
+
+function ensureIndexes(db) {
+  if (!worker.indexesReady) {
+    const collection = db.collection(STRIPE_EVENTS_COLLECTION);
+    worker.indexesReady = Promise.all([
+      collection.createIndex({ status: 1, next_attempt_at: 1, created: 1 }),
+      collection.createIndex({ customer: 1, created: 1 })
+    ]).catch((error) => {
+      worker.indexesReady = null;
+      throw error;
+    });
+  }
+  return worker.indexesReady;
+}
+
+// Chave de ordenação: eventos do mesmo customer são processados em série
+function eventCustomer(event) {
+  const object = event.data?.object || {};
+  return object.customer || object.client_reference_id || object.metadata?.user_id || null;
+}
+
+// Grava o evento. Devolve { duplicate: true } se já tinha sido recebido.
+export async function recordStripeEvent(db, event) {
+  await ensureIndexes(db);
+  try {
+    await db.collection(STRIPE_EVENTS_COLLECTION).insertOne({
+      _id: event.id,
+      type: event.type,
+      customer: eventCustomer(event),
+      created: event.created,
+      livemode: Boolean(event.livemode),
+      payload: event,
+      status: 'pending',
+      attempts: 0,
+      next_attempt_at: new Date(),
+      locked_until: null,
+      last_error: null,
+      recebido_em: new Date(),
+      processado_em: null
+    });
+    return { duplicate: false };
+  } catch (error) {
+    // 11000 = chave duplicada: reenvio de um evento já gravado
+    if (error.code === 11000) return { duplicate: true };
+    throw error;
+  }
+}
+
+// ---------------------------------------------------------------------------
+// Handlers por tipo de evento (idempotentes: só $set/upsert). Cada
+// subscrição guarda em `stripe_event_created` o `created` do último evento
+// aplicado, para que um evento atrasado não reponha estado antigo.
+// ---------------------------------------------------------------------------
+
+const HANDLERS = {
+  async 'checkout.session.completed'(db, event) {
+    const session = event.data.object;
+
+    const userId = session.metadata?.user_id || session.client_reference_id;
+    const planId = session.metadata?.plan_id;
+
+    if (!userId) {
+      console.error('[STRIPE WEBHOOK] userId ausente');
+      return;
+    }
+
+    const subscription = await (await getStripe()).subscriptions.retrieve(session.subscription);
+
+    // Guardar subscrição
+    await db.collection('subscriptions').updateOne(
+      { user_id: userId },
+      {
+        $set: {
+          user_id: userId,
+          plan_id: planId,
+          stripe_subscription_id: subscription.id,
+          stripe_customer_id: subscription.customer,
+          status: subscription.status,
+          current_period_start: new Date(subscription.current_period_start * 1000),
+          current_period_end: new Date(subscription.current_period_end * 1000),
+          updated_at: new Date()
+        },
+        $max: { stripe_event_created: event.created },
+        $setOnInsert: { created_at: new Date() }
+      },
+      { upsert: true }
+    );
+
+    await refreshEntitlementsForSubscription(db, { user_id: userId });
+  },
+
+  async 'customer.subscription.updated'(db, event) {
+    // O payload pode estar desatualizado (eventos no mesmo segundo ou
+    // entregues fora de ordem): lê o estado atual ao Stripe e só aplica se
+    // nenhum evento mais recente já tiver sido aplicado a esta subscrição.
+    const subscription = await (await getStripe()).subscriptions.retrieve(event.data.object.id);
+
+    const stored = await db.collection('subscriptions').findOneAndUpdate(
+      {
+        stripe_subscription_id: subscription.id,
+        status: { $ne: 'cancelled' },
+        $or: [{ stripe_event_created: null }, { stripe_event_created: { $lte: event.created } }]
+      },
+      {
+        $set: {
+          status: subscription.status,
+          current_period_start: new Date(subscription.current_period_start * 1000),
+          current_period_end: new Date(subscription.current_period_end * 1000),
+          stripe_event_created: event.created,
+          updated_at: new Date()
+        }
+      },
+      { returnDocument: 'after' }
+    );
+    if (!stored) {
+      console.log(`[STRIPE WEBHOOK] ${event.id} ignorado: subscrição ${subscription.id} já tem estado mais recente`);
+      return;
+    }
+    await refreshEntitlementsForSubscription(db, stored);
+  },
+
+  async 'customer.subscription.deleted'(db, event) {
+    const subscription = event.data.object;
+
+    const stored = await db.collection('subscriptions').findOneAndUpdate(
+      { stripe_subscription_id: subscription.id },
+      // Cancelamento é final: aplica sempre, sem recuar a marca de evento
+      { $set: { status: 'cancelled', updated_at: new Date() }, $max: { stripe_event_created: event.created } },
+      { returnDocument: 'after' }
+    );
+    await refreshEntitlementsForSubscription(db, stored);
+  }
+};
+
+export async function handleStripeEvent(db, event) {
+  const handler = HANDLERS[event.type];
+  if (!handler) {
+    console.log('[STRIPE WEBHOOK] Evento ignorado:', event.type);
+    return;
+  }
+  await handler(db, event);
+}
+
+// ---------------------------------------------------------------------------
+// Worker
+// ---------------------------------------------------------------------------
+
+function backoffMs(attempts) {
+  return Math.min(BACKOFF_MAX_MS, BACKOFF_BASE_MS * 2 ** Math.max(0, attempts - 1));
+}
+
+// Há um evento anterior do mesmo customer ainda por processar?
+async function hasEarlierPending(db, candidate) {
+  if (!candidate.customer) return false;
+  const earlier = await db.collection(STRIPE_EVENTS_COLLECTION).findOne(
+    {
+      customer: candidate.customer,
+      status: { $in: ['pending', 'processing'] },
+      $or: [
+        { created: { $lt: candidate.created } },
+        { created: candidate.created, _id: { $lt: candidate._id } }
+      ]
+    },
+    { projection: { _id: 1 } }
+  );
+  return Boolean(earlier);
+}
+
+// Reclama o evento para este worker (pending com tentativa devida, ou
+// processing com lock expirado de um worker que morreu)
+async function claim(db, candidate) {
+  const now = new Date();
+  return db.collection(STRIPE_EVENTS_COLLECTION).findOneAndUpdate(
+    {
+      _id: candidate._id,
+      $or: [
+        { status: 'pending', next_attempt_at: { $lte: now } },
+        { status: 'processing', locked_until: { $lte: now } }
+      ]
+    },
+    {
+      $set: { status: 'processing', locked_until: new Date(now.getTime() + LOCK_MS) },
+      $inc: { attempts: 1 }
+    },
+    { returnDocument: 'after' }
+  );
+}
+
+async function processClaimed(db, doc) {
+  const collection = db.collection(STRIPE_EVENTS_COLLECTION);
+  try {
+    await handleStripeEvent(db, doc.payload);
+    await collection.updateOne(
+      { _id: doc._id },
+      { $set: { status: 'done', locked_until: null, last_error: null, processado_em: new Date() } }
+    );
+    return 'done';
+  } catch (error) {
+    const dead = doc.attempts >= MAX_ATTEMPTS;
+    console.error(`[STRIPE WEBHOOK] Erro ao processar ${doc._id} (tentativa ${doc.attempts}):`, error.message);
+    await collection.updateOne(
+      { _id: doc._id },
+      {
+        $set: {
+          status: dead ? 'dead' : 'pending',
+          locked_until: null,
+          last_error: error.message,
+          next_attempt_at: new Date(Date.now() + backoffMs(doc.attempts))
+        }
+      }
+    );
+    return dead ? 'dead' : 'retry';
+  }
+}
+
+// Processa todos os eventos devidos. Devolve contagens por resultado.
+// Percorre a fila por (created, _id) e continua depois dos candidatos
+// bloqueados por um evento anterior em backoff, para que eventos de outros
+// customers não fiquem à espera; termina quando a query não devolve nada.
+export async function processStripeEvents(db, { limit = Infinity } = {}) {
+  await ensureIndexes(db);
+  const collection = db.collection(STRIPE_EVENTS_COLLECTION);
+  const result = { done: 0, retry: 0, dead: 0, blocked: 0 };
+  const blockedCustomers = new Set();
+  let processed = 0;
+  let after = null;
+
+  for (;;) {
+    const now = new Date();
+    const filter = {
+      $or: [
+        { status: 'pending', next_attempt_at: { $lte: now } },
+        { status: 'processing', locked_until: { $lte: now } }
+      ]
+    };
+    const candidates = await collection
+      .find(
+        after
+          ? {
+              $and: [
+                filter,
+                { $or: [{ created: { $gt: after.created } }, { created: after.created, _id: { $gt: after._id } }] }
+              ]
+            }
+          : filter,
+        { projection: { payload: 0 } }
+      )
+      .sort({ created: 1, _id: 1 })
+      .limit(BATCH_SIZE)
+      .toArray();
+
+    if (candidates.length === 0) return result;
+    after = candidates[candidates.length - 1];
+
+    for (const candidate of candidates) {
+      if (processed >= limit) return result;
+
+      // Os eventos seguintes de um customer bloqueado também estão bloqueados
+      if (blockedCustomers.has(candidate.customer) || await hasEarlierPending(db, candidate)) {
+        blockedCustomers.add(candidate.customer);
+        result.blocked++;
+        continue;
+      }
+
+      const doc = await claim(db, candidate);
+      if (!doc) continue; // outro worker ficou com ele
+
+      const outcome = await processClaimed(db, doc);
+      result[outcome]++;
+      processed++;
+      // Em backoff: os eventos seguintes deste customer esperam por ele
+      if (outcome === 'retry' && doc.customer) blockedCustomers.add(doc.customer);
+    }
+  }
+}
+
+// Dispara o worker em segundo plano (depois de responder ao Stripe).
+// Um só dreno por processo; pedidos durante o dreno pedem nova passagem.
+export function kickStripeEventsWorker(db) {
+  if (worker.draining) {
+    worker.rerun = true;
+    return worker.draining;
+  }
+
+  worker.draining = runOutsideRequest(async () => {
+    try {
+      do {
+        worker.rerun = false;
+        await processStripeEvents(db);
+      } while (worker.rerun);
+    } catch (error) {
+      console.error('[STRIPE WEBHOOK] Erro no worker:', error.message);
+    } finally {
+      worker.draining = null;
+    }
+  });
+  return worker.draining;
+}
+
+// Volta a pôr eventos na fila (replay de eventos já processados ou dead)
+export async function requeueStripeEvents(db, ids) {
+  const filter = ids === 'dead' ? { status: 'dead' } : { _id: { $in: [].concat(ids) }, status: { $in: ['done', 'dead'] } };
+  const { modifiedCount } = await db.collection(STRIPE_EVENTS_COLLECTION).updateMany(
+    filter,
+    { $set: { status: 'pending', attempts: 0, next_attempt_at: new Date(), last_error: null } }
+  );
+  return modifiedCount;
+}
@@ -0,0 +1,415 @@
+import { connectToDatabase } from '@/lib/mongodb';
+import { publishInvalidation, registerInvalidationHandler } from '@/lib/invalidation-bus';
+
+// Acesso aos dados por tenant. As coleções de TENANT_COLLECTIONS pertencem
+// sempre a uma barbearia (campo string `barbearia_id`); getTenantDb() devolve
+// um objeto com a mesma interface do Db do driver em que:
+//
+//   - cada query, update, delete e aggregate nessas coleções leva o filtro
+//     barbearia_id, e cada insert leva o campo. Com a shard key
+//     { barbearia_id: 1, _id: 1 } (ensureTenantSharding) todas as operações
+//     vão a um só shard em vez de scatter-gather;
+//   - a base de dados é a da colocação do tenant: a partilhada (DB_NAME) ou
+//     uma dedicada para tenants muito grandes (lib/tenant-migration.js);
+//   - as restantes coleções (utilizadores, barbearias, subscriptions...) são
+//     globais e vão sempre para a base partilhada.
+//
+// As funções que já recebem `db` (findMarcacoes, getLoader, ...) ficam
+// automaticamente restritas ao tenant quando recebem um TenantDb.
+//
+// A colocação vive em `tenant_placements` (sem documento = partilhada) com
+// cache curta por processo, invalidada pelo barramento entre nós.
+
+export const TENANT_COLLECTIONS = [
+  'marcacoes',
+  'marcacoes_arquivo',
+  'servicos',
+  'produtos',
+  'planos_cliente',
+  'horarios_funcionamento',
+  'locais',
+  'horario_excecoes',
+  'clientes_pesquisa',
+  'rollups_diarios'
+];
+
+export const PLACEMENTS_COLLECTION = 'tenant_placements';
+
+// Shard key das coleções de tenant: o prefixo barbearia_id encaminha as
+// queries; _id evita chunks indivisíveis num tenant muito grande
+export const TENANT_SHARD_KEY = { barbearia_id: 1, _id: 1 };
+
+export const PLACEMENT_CACHE_TTL_MS = parseInt(process.env.TENANT_PLACEMENT_CACHE_TTL_MS || '5000', 10);
+
+const TENANT_SET = new Set(TENANT_COLLECTIONS);
+
+export class TenantMigratingError extends Error {
+  constructor() {
+    super('Dados da barbearia em migração, tente novamente dentro de momentos');
+    this.name = 'TenantMigratingError';
+    this.status = 503;
+  }
+}
+
+const STATE_KEY = Symbol.for('cuthub.tenantPlacements');
+
+if (!globalThis[STATE_KEY]) {
+  globalThis[STATE_KEY] = { placements: new Map(), dedicated: null };
+}
+
+const state = globalThis[STATE_KEY];
+
+registerInvalidationHandler('tenant-placement', {
+  invalidate: (barbeariaId) => {
+    state.placements.delete(barbeariaId);
+    state.dedicated = null;
+  },
+  flush: () => {
+    state.placements.clear();
+    state.dedicated = null;
+  }
+});
+
+export function isTenantCollection(name) {
+  return TENANT_SET.has(name);
+}
+
+function sharedDb(db) {
+  return db instanceof TenantDb ? db.sharedDb : db;
+}
+
+// ==================== COLOCAÇÃO ====================
+
+export async function getTenantPlacement(db, barbeariaId) {
+  const cached = state.placements.get(barbeariaId);
+  if (cached && cached.expiresAt > Date.now()) return cached.placement;
+
+  const doc = await sharedDb(db).collection(PLACEMENTS_COLLECTION).findOne({ _id: barbeariaId });
+  const placement = {
+    database: doc?.database || null,
+    estado: doc?.estado || 'estavel'
+  };
+  state.placements.set(barbeariaId, { placement, expiresAt: Date.now() + PLACEMENT_CACHE_TTL_MS });
+  return placement;
+}
+
+export async function setTenantPlacement(db, barbeariaId, fields) {
+  await sharedDb(db).collection(PLACEMENTS_COLLECTION).updateOne(
+    { _id: barbeariaId },
+    { $set: { ...fields, atualizado_em: new Date() } },
+    { upsert: true }
+  );
+  await publishInvalidation(`tenant-placement:${barbeariaId}`);
+}
+
+// Escritas que não passam por um TenantDb (jobs que varrem a base
+// partilhada inteira) têm de saltar os tenants em corte: o que escreverem
+// depois do último dreno da migração perde-se na troca.
+export async function isTenantWriteBlocked(db, barbeariaId) {
+  if (!barbeariaId) return false;
+  const placement = await getTenantPlacement(sharedDb(db), String(barbeariaId));
+  return placement.estado === 'corte';
+}
+
+// Tenants em corte neste momento (para excluir de uma query em lote)
+export async function blockedTenantIds(db) {
+  const docs = await sharedDb(db).collection(PLACEMENTS_COLLECTION)
+    .find({ estado: 'corte' }, { projection: { _id: 1 } })
+    .toArray();
+  return docs.map(doc => doc._id);
+}
+
+// ==================== ACESSO POR TENANT ====================
+
+function scopeFilter(filter, barbeariaId) {
+  const base = filter || {};
+  if (base.barbearia_id === undefined) return { ...base, barbearia_id: barbeariaId };
+  if (base.barbearia_id === barbeariaId) return base;
+  // Filtro com outro valor ou operador: nunca alarga para lá do tenant
+  return { $and: [base, { barbearia_id: barbeariaId }] };
+}
+
+function scopeDocument(doc, barbeariaId) {
+  if (doc.barbearia_id !== undefined && doc.barbearia_id !== barbeariaId) {
+    throw new Error(`Documento de outra barbearia (${doc.barbearia_id}) no acesso de ${barbeariaId}`);
+  }
+  return doc.barbearia_id === undefined ? Object.assign(doc, { barbearia_id: barbeariaId }) : doc;
+}
+
+function scopeBulkOperation(operation, barbeariaId) {
+  const [type, spec] = Object.entries(operation)[0];
+  if (type === 'insertOne') {
+    return { insertOne: { ...spec, document: scopeDocument(spec.document, barbeariaId) } };
+  }
+  if (type === 'replaceOne') {
+    return {
+      replaceOne: {
+        ...spec,
+        filter: scopeFilter(spec.filter, barbeariaId),
+        replacement: scopeDocument(spec.replacement, barbeariaId)
+      }
+    };
+  }
+  return { [type]: { ...spec, filter: scopeFilter(spec.filter, barbeariaId) } };
+}
+
+// Sub-pipelines ($lookup, $unionWith, $graphLookup, $facet) que leem coleções
+// de tenant recebem o mesmo filtro que o pipeline principal; escrever numa
+// coleção de tenant com $out/$merge não é permitido.
+function scopePipeline(pipeline, barbeariaId) {
+  const match = { $match: { barbearia_id: barbeariaId } };
+  return pipeline.map((stage) => {
+    const [name, spec] = Object.entries(stage)[0];
+
+    if (name === '$unionWith') {
+      const { coll, pipeline: sub = [], ...rest } = typeof spec === 'string' ? { coll: spec } : spec;
+      if (!isTenantCollection(coll)) return stage;
+      return { $unionWith: { ...rest, coll, pipeline: [match, ...scopePipeline(sub, barbeariaId)] } };
+    }
+    if (name === '$lookup') {
+      if (!isTenantCollection(spec.from)) return stage;
+      return { $lookup: { ...spec, pipeline: [match, ...scopePipeline(spec.pipeline || [], barbeariaId)] } };
+    }
+    if (name === '$graphLookup') {
+      if (!isTenantCollection(spec.from)) return stage;
+      return {
+        $graphLookup: {
+          ...spec,
+          restrictSearchWithMatch: scopeFilter(spec.restrictSearchWithMatch, barbeariaId)
+        }
+      };
+    }
+    if (name === '$facet') {
+      return {
+        $facet: Object.fromEntries(
+          Object.entries(spec).map(([key, sub]) => [key, scopePipeline(sub, barbeariaId)])
+        )
+      };
+    }
+    if (name === '$out' || name === '$merge') {
+      const target = typeof spec === 'string' ? spec : (spec.coll || spec.into?.coll || spec.into);
+      if (isTenantCollection(target)) {
+        throw new Error(`${name} para a coleção de tenant ${target} não é suportado num TenantDb`);
+      }
+    }
+    return stage;
+  });
+}
+
+// Subconjunto do Collection do driver usado pela app, sempre com barbearia_id
+class TenantCollection {
+  constructor(collection, tenantDb) {
+    this.collection = collection;
+    this.tenantDb = tenantDb;
+    this.barbeariaId = tenantDb.barbeariaId;
+    this.collectionName = collection.collectionName;
+  }
+
+  async assertWritable() {
+    if (await this.tenantDb.isMigrating()) throw new TenantMigratingError();
+  }
+
+  find(filter, options) {
+    return this.collection.find(scopeFilter(filter, this.barbeariaId), options);
+  }
+
+  findOne(filter, options) {
+    return this.collection.findOne(scopeFilter(filter, this.barbeariaId), options);
+  }
+
+  countDocuments(filter, options) {
+    return this.collection.countDocuments(scopeFilter(filter, this.barbeariaId), options);
+  }
+
+  distinct(key, filter, options) {
+    return this.collection.distinct(key, scopeFilter(filter, this.barbeariaId), options);
+  }
+
+  aggregate(pipeline = [], options) {
+    return this.collection.aggregate(
+      [{ $match: { barbearia_id: this.barbeariaId } }, ...scopePipeline(pipeline, this.barbeariaId)],
+      options
+    );
+  }
+
+  async insertOne(doc, options) {
+    await this.assertWritable();
+    return this.collection.insertOne(scopeDocument(doc, this.barbeariaId), options);
+  }
+
+  async insertMany(docs, options) {
+    await this.assertWritable();
+    return this.collection.insertMany(docs.map(doc => scopeDocument(doc, this.barbeariaId)), options);
+  }
+
+  async updateOne(filter, update, options) {
+    await this.assertWritable();
+    return this.collection.updateOne(scopeFilter(filter, this.barbeariaId), update, options);
+  }
+
+  async updateMany(filter, update, options) {
+    await this.assertWritable();
+    return this.collection.updateMany(scopeFilter(filter, this.barbeariaId), update, options);
+  }
+
+  async replaceOne(filter, replacement, options) {
+    await this.assertWritable();
+    return this.collection.replaceOne(
+      scopeFilter(filter, this.barbeariaId),
+      scopeDocument(replacement, this.barbeariaId),
+      options
+    );
+  }
+
+  async findOneAndUpdate(filter, update, options) {
+    await this.assertWritable();
+    return this.collection.findOneAndUpdate(scopeFilter(filter, this.barbeariaId), update, options);
+  }
+
+  async findOneAndDelete(filter, options) {
+    await this.assertWritable();
+    return this.collection.findOneAndDelete(scopeFilter(filter, this.barbeariaId), options);
+  }
+
+  async deleteOne(filter, options) {
+    await this.assertWritable();
+    return this.collection.deleteOne(scopeFilter(filter, this.barbeariaId), options);
+  }
+
+  async deleteMany(filter, options) {
+    await this.assertWritable();
+    return this.collection.deleteMany(scopeFilter(filter, this.barbeariaId), options);
+  }
+
+  async bulkWrite(operations, options) {
+    await this.assertWritable();
+    return this.collection.bulkWrite(operations.map(op => scopeBulkOperation(op, this.barbeariaId)), options);
+  }
+
+  createIndex(spec, options) {
+    return this.collection.createIndex(spec, options);
+  }
+}
+
+export class TenantDb {
+  constructor(sharedDatabase, tenantDatabase, barbeariaId) {
+    this.sharedDb = sharedDatabase;
+    this.tenantDatabase = tenantDatabase;
+    this.barbeariaId = barbeariaId;
+    // Chave própria para caches por base de dados (ex: loaders do pedido)
+    this.databaseName = `${tenantDatabase.databaseName}|${barbeariaId}`;
+  }
+
+  collection(name) {
+    if (!isTenantCollection(name)) return this.sharedDb.collection(name);
+    return new TenantCollection(this.tenantDatabase.collection(name), this);
+  }
+
+  async isMigrating() {
+    const placement = await getTenantPlacement(this.sharedDb, this.barbeariaId);
+    return placement.estado === 'corte';
+  }
+}
+
+// Acesso restrito a uma barbearia, na base de dados onde ela está
+export async function getTenantDb(db, barbeariaId) {
+  if (!barbeariaId) {
+    throw new Error('barbearia_id em falta no acesso por tenant');
+  }
+  const id = String(barbeariaId);
+  if (db instanceof TenantDb && db.barbeariaId === id) return db;
+
+  const shared = sharedDb(db);
+  const placement = await getTenantPlacement(shared, id);
+  const tenantDatabase = placement.database
+    ? (await connectToDatabase()).db(placement.database)
+    : shared;
+  return new TenantDb(shared, tenantDatabase, id);
+}
+
+// ==================== LEITURAS ENTRE TENANTS ====================
+
+async function dedicatedPlacements(db) {
+  if (!state.dedicated || state.dedicated.expiresAt <= Date.now()) {
+    const docs = await sharedDb(db).collection(PLACEMENTS_COLLECTION)
+      .find({ database: { $ne: null } }, { projection: { database: 1 } })
+      .toArray();
+    state.dedicated = { docs, expiresAt: Date.now() + PLACEMENT_CACHE_TTL_MS };
+  }
+  return state.dedicated.docs;
+}
+
+// Bases a consultar para leituras que atravessam tenants (marcações de um
+// cliente em várias barbearias, painel master, crons): a partilhada mais um
+// TenantDb por tenant dedicado. Os tenants dedicados são poucos.
+export async function tenantDatabases(db) {
+  const shared = sharedDb(db);
+  const dedicated = await dedicatedPlacements(shared);
+  if (dedicated.length === 0) return [shared];
+
+  const client = await connectToDatabase();
+  return [
+    shared,
+    ...dedicated.map(doc => new TenantDb(shared, client.db(doc.database), doc._id))
+  ];
+}
+
+// Documento de uma coleção de tenant quando ainda não se sabe a barbearia
+// (ex: serviço escolhido por um cliente sem barbearia no token)
+export async function findAcrossTenants(db, name, filter, options) {
+  for (const database of await tenantDatabases(db)) {
+    const doc = await database.collection(name).findOne(filter, options);
+    if (doc) return doc;
+  }
+  return null;
+}
+
+// ==================== SHARDING ====================
+
+// Ativa o sharding das coleções de tenant com TENANT_SHARD_KEY (só num
+// cluster: ligação a um mongos). Coleções com índices únicos que não começam
+// pela shard key não podem ser shardadas e são reportadas com o erro.
+export async function ensureTenantSharding(db, { dryRun = false } = {}) {
+  const shared = sharedDb(db);
+  const admin = shared.admin();
+  const hello = await admin.command({ hello: 1 });
+  if (hello.msg !== 'isdbgrid') {
+    return { sharded: false, motivo: 'A ligação não é a um mongos: sharding indisponível', colecoes: {} };
+  }
+
+  const colecoes = {};
+  if (!dryRun) {
+    await admin.command({ enableSharding: shared.databaseName }).catch((error) => {
+      // AlreadyInitialized em versões antigas
+      if (error.code !== 23) throw error;
+    });
+  }
+
+  for (const name of TENANT_COLLECTIONS) {
+    const collection = shared.collection(name);
+    const indexes = await collection.indexes().catch(() => []);
+    const conflito = indexes.find(index =>
+      index.unique && index.name !== '_id_' && Object.keys(index.key)[0] !== 'barbearia_id'
+    );
+    if (conflito) {
+      colecoes[name] = { ok: false, erro: `Índice único ${conflito.name} não começa por barbearia_id` };
+      continue;
+    }
+    if (dryRun) {
+      colecoes[name] = { ok: true, dryRun: true };
+      continue;
+    }
+    try {
+      await collection.createIndex(TENANT_SHARD_KEY);
+      await admin.command({ shardCollection: `${shared.databaseName}.${name}`, key: TENANT_SHARD_KEY });
+      colecoes[name] = { ok: true };
+    } catch (error) {
+      // AlreadySharded
+      colecoes[name] = error.codeName === 'AlreadyInitialized' || /already sharded/i.test(error.message)
+        ? { ok: true, jaExistia: true }
+        : { ok: false, erro: error.message };
+    }
+  }
+
+  return { sharded: true, colecoes };
+}
@@ -0,0 +1,417 @@
+import { hostname } from 'os';
+import { randomBytes } from 'crypto';
+import { connectToDatabase, DB_NAME } from '@/lib/mongodb';
+import { publishInvalidation } from '@/lib/invalidation-bus';
+import {
+  TENANT_COLLECTIONS,
+  PLACEMENTS_COLLECTION,
+  PLACEMENT_CACHE_TTL_MS,
+  getTenantPlacement
+} from '@/lib/tenant-db';
+
+// Move os dados de uma barbearia entre a base partilhada e uma base dedicada
+// (ou entre duas dedicadas) com a aplicação a correr:
+//
+//   1. a_copiar: guarda o operationTime da origem, copia cada coleção de
+//      tenant em lotes (upsert por _id, idempotente) e depois aplica as
+//      alterações feitas entretanto, lidas de um change stream aberto nesse
+//      operationTime (requer replica set ou cluster);
+//   2. corte: as escritas do tenant passam a falhar com 503 (TenantDb) e,
+//      depois de todos os nós verem o estado, aplica-se o resto do stream;
+//   3. estavel: a colocação aponta para o destino e os nós passam a ler e
+//      escrever lá.
+//
+// Depois do passo 3 os documentos do tenant são apagados da origem (a menos
+// que limparOrigem seja false): as leituras entre tenants (tenantDatabases)
+// consultam a base partilhada sem filtro e veriam cópias antigas. A limpeza
+// só começa CLEANUP_DELAY_MS depois da troca, quando nenhum nó pode ainda ter
+// em cache a colocação anterior; se o processo morrer antes, o job
+// "recuperar-migracoes" faz a limpeza. Uma falha antes do passo 3 deixa a
+// colocação como estava e apaga as cópias parciais do destino; depois do
+// passo 3 a colocação nunca volta atrás (uma falha na limpeza fica em
+// migracao.limpeza_erro e repete-se com retryTenantCleanup).
+//
+// O processo que corre a migração é o dono dela (migracao.dono) e renova
+// migracao.lease_ate enquanto trabalha. Se morrer, outra migração pode
+// retomar depois do lease expirar, e o job "recuperar-migracoes" (lib/jobs)
+// devolve a colocação a `estavel` para que as escritas deixem de dar 503.
+
+const BATCH_SIZE = 1000;
+const CUTOVER_GRACE_MS = PLACEMENT_CACHE_TTL_MS + 1000;
+const LEASE_MS = parseInt(process.env.TENANT_MIGRATION_LEASE_MS || '60000', 10);
+const MIGRATING_STATES = ['a_copiar', 'corte'];
+const CLEANUP_DELAY_MS = Math.max(
+  parseInt(process.env.TENANT_MIGRATION_CLEANUP_DELAY_MS || '30000', 10),
+  CUTOVER_GRACE_MS
+);
+
+export class MigrationOwnershipError extends Error {
+  constructor() {
+    super('A migração passou para outro processo (lease expirado)');
+    this.name = 'MigrationOwnershipError';
+  }
+}
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+export function dedicatedDatabaseName(barbeariaId) {
+  const prefix = process.env.TENANT_DEDICATED_DB_PREFIX || `${DB_NAME}_t_`;
+  return `${prefix}${barbeariaId}`;
+}
+
+async function copyIndexes(source, target) {
+  for (const name of TENANT_COLLECTIONS) {
+    const indexes = await source.collection(name).indexes().catch(() => []);
+    for (const { key, name: indexName, v, ns, ...options } of indexes) {
+      if (indexName === '_id_') continue;
+      await target.collection(name).createIndex(key, { ...options, name: indexName });
+    }
+  }
+}
+
+async function copyCollection(source, target, name, barbeariaId, onProgress) {
+  const cursor = source.collection(name).find({ barbearia_id: barbeariaId }).batchSize(BATCH_SIZE);
+  let operations = [];
+  let copiados = 0;
+
+  const flush = async () => {
+    if (operations.length === 0) return;
+    await target.collection(name).bulkWrite(operations, { ordered: false });
+    copiados += operations.length;
+    operations = [];
+    await onProgress(copiados);
+  };
+
+  for await (const doc of cursor) {
+    operations.push({ replaceOne: { filter: { _id: doc._id }, replacement: doc, upsert: true } });
+    if (operations.length >= BATCH_SIZE) await flush();
+  }
+  await flush();
+  return copiados;
+}
+
+// Aplica ao destino as alterações do stream até ficar em dia (tryNext null).
+// Deletes não trazem o documento: aplicam-se por _id, que no destino só
+// pode ser deste tenant.
+async function drainChanges(stream, target) {
+  let aplicadas = 0;
+  for (;;) {
+    const change = await stream.tryNext();
+    if (!change) return aplicadas;
+
+    const collection = target.collection(change.ns.coll);
+    const _id = change.documentKey._id;
+    if (change.operationType === 'delete') {
+      await collection.deleteOne({ _id });
+    } else if (change.fullDocument) {
+      await collection.replaceOne({ _id }, change.fullDocument, { upsert: true });
+    }
+    aplicadas++;
+  }
+}
+
+function changeStreamPipeline(barbeariaId) {
+  return [
+    {
+      $match: {
+        'ns.coll': { $in: TENANT_COLLECTIONS },
+        $or: [
+          { operationType: { $in: ['insert', 'update', 'replace'] }, 'fullDocument.barbearia_id': barbeariaId },
+          { operationType: 'delete' }
+        ]
+      }
+    }
+  ];
+}
+
+// Apaga os documentos do tenant numa base que não é a da sua colocação
+// (origem depois da troca, destino de uma migração falhada)
+async function deleteTenantDocuments(database, barbeariaId) {
+  const apagados = {};
+  for (const name of TENANT_COLLECTIONS) {
+    const result = await database.collection(name).deleteMany({ barbearia_id: barbeariaId });
+    apagados[name] = result.deletedCount;
+  }
+  return apagados;
+}
+
+// Atualiza a colocação só se esta execução ainda for a dona da migração
+async function updateOwnedPlacement(db, barbeariaId, dono, fields, filter = {}) {
+  const result = await db.collection(PLACEMENTS_COLLECTION).updateOne(
+    { _id: barbeariaId, 'migracao.dono': dono, ...filter },
+    { $set: { ...fields, atualizado_em: new Date() } }
+  );
+  if (result.matchedCount === 0) throw new MigrationOwnershipError();
+  await publishInvalidation(`tenant-placement:${barbeariaId}`);
+}
+
+async function runCleanup(db, source, barbeariaId) {
+  try {
+    const apagados = await deleteTenantDocuments(source, barbeariaId);
+    await db.collection(PLACEMENTS_COLLECTION).updateOne(
+      { _id: barbeariaId },
+      { $set: { 'migracao.limpeza_concluida_em': new Date() }, $unset: { 'migracao.limpeza_erro': '' } }
+    );
+    return { apagadosOrigem: apagados };
+  } catch (error) {
+    console.error(`Erro ao limpar a origem da barbearia ${barbeariaId}:`, error.message);
+    await db.collection(PLACEMENTS_COLLECTION).updateOne(
+      { _id: barbeariaId },
+      { $set: { 'migracao.limpeza_erro': error.message } }
+    ).catch(() => {});
+    return { limpezaErro: error.message };
+  }
+}
+
+// Cópias parciais de uma migração que não chegou à troca. Nunca apaga da
+// base onde o tenant está colocado. Nunca lança.
+async function rollbackTarget(db, barbeariaId, destinoNome) {
+  const placements = db.collection(PLACEMENTS_COLLECTION);
+  try {
+    const doc = await placements.findOne({ _id: barbeariaId }, { projection: { database: 1 } });
+    if ((doc?.database || db.databaseName) === destinoNome) return {};
+    const client = await connectToDatabase();
+    return { copiasApagadas: await deleteTenantDocuments(client.db(destinoNome), barbeariaId) };
+  } catch (error) {
+    console.error(`Erro ao apagar as cópias parciais da barbearia ${barbeariaId} em ${destinoNome}:`, error.message);
+    await placements.updateOne(
+      { _id: barbeariaId },
+      { $set: { 'migracao.rollback_erro': error.message } }
+    ).catch(() => {});
+    return { rollbackErro: error.message };
+  }
+}
+
+// destino: nome da base dedicada, ou null para voltar à partilhada
+export async function moveTenant(db, barbeariaId, { destino, limparOrigem = true } = {}) {
+  const client = await connectToDatabase();
+  const placements = db.collection(PLACEMENTS_COLLECTION);
+  const atual = await getTenantPlacement(db, barbeariaId);
+  const origemNome = atual.database || db.databaseName;
+  const destinoNome = destino || db.databaseName;
+
+  if (origemNome === destinoNome) {
+    return { movido: false, motivo: 'A barbearia já está nessa base de dados', database: atual.database };
+  }
+
+  const source = client.db(origemNome);
+  const target = client.db(destinoNome);
+
+  // A origem de uma migração anterior ainda por limpar não pode ser destino:
+  // a limpeza apagaria o que esta migração copia
+  const limpezaPendente = {
+    $or: [
+      { 'migracao.origem': { $ne: destinoNome } },
+      { 'migracao.limpar_origem': { $ne: true } },
+      { 'migracao.limpeza_concluida_em': { $exists: true } }
+    ]
+  };
+  const anterior = (await placements.findOne({ _id: barbeariaId }, { projection: { migracao: 1 } }))?.migracao;
+  if (anterior?.origem === destinoNome && anterior.limpar_origem === true && !anterior.limpeza_concluida_em) {
+    return { movido: false, motivo: 'A limpeza da migração anterior ainda não terminou nesta base de dados' };
+  }
+
+  const { operationTime } = await source.command({ hello: 1 });
+  if (!operationTime) {
+    throw new Error('A migração online requer um replica set ou cluster (change streams)');
+  }
+
+  // Só uma migração de cada vez por tenant: o upsert colide no _id quando
+  // o documento existe noutro estado de migração com o lease ainda válido.
+  // Uma migração abandonada é retomada do início (a cópia é idempotente) e a
+  // colocação mantém a base anterior, ainda intacta.
+  const progresso = {};
+  const dono = `${hostname()}:${process.pid}:${randomBytes(3).toString('hex')}`;
+  const now = new Date();
+  try {
+    await placements.updateOne(
+      {
+        _id: barbeariaId,
+        $and: [
+          {
+            $or: [
+              { estado: { $nin: MIGRATING_STATES } },
+              { 'migracao.lease_ate': { $not: { $gte: now } } }
+            ]
+          },
+          limpezaPendente
+        ]
+      },
+      {
+        $set: {
+          database: atual.database,
+          estado: 'a_copiar',
+          migracao: {
+            origem: origemNome,
+            destino: destinoNome,
+            iniciada_em: now,
+            dono,
+            lease_ate: new Date(now.getTime() + LEASE_MS),
+            limpar_origem: limparOrigem,
+            progresso
+          },
+          atualizado_em: now
+        }
+      },
+      { upsert: true }
+    );
+  } catch (error) {
+    if (error.code === 11000) return { movido: false, motivo: 'Migração já em curso' };
+    throw error;
+  }
+  await publishInvalidation(`tenant-placement:${barbeariaId}`);
+
+  // Renovar o lease enquanto a cópia corre
+  let perdida = false;
+  const heartbeat = setInterval(() => {
+    placements.updateOne(
+      { _id: barbeariaId, 'migracao.dono': dono },
+      { $set: { 'migracao.lease_ate': new Date(Date.now() + LEASE_MS) } }
+    ).then((result) => {
+      if (result.matchedCount === 0) perdida = true;
+    }).catch(() => {});
+  }, Math.max(1000, Math.floor(LEASE_MS / 3)));
+  heartbeat.unref?.();
+  const assertOwner = () => {
+    if (perdida) throw new MigrationOwnershipError();
+  };
+
+  let stream = null;
+  let result;
+  try {
+    // Restos de uma tentativa anterior ou de uma migração com manter_origem
+    // (documentos apagados entretanto) não podem sobreviver à cópia
+    await deleteTenantDocuments(target, barbeariaId);
+    await copyIndexes(source, target);
+    for (const name of TENANT_COLLECTIONS) {
+      progresso[name] = await copyCollection(source, target, name, barbeariaId, async (copiados) => {
+        assertOwner();
+        await placements.updateOne({ _id: barbeariaId, 'migracao.dono': dono }, { $set: { [`migracao.progresso.${name}`]: copiados } });
+      });
+    }
+
+    stream = source.watch(changeStreamPipeline(barbeariaId), {
+      fullDocument: 'updateLookup',
+      startAtOperationTime: operationTime
+    });
+    let alteracoes = await drainChanges(stream, target);
+
+    // Corte: bloquear escritas e esperar que todos os nós vejam o estado
+    assertOwner();
+    await updateOwnedPlacement(db, barbeariaId, dono, { estado: 'corte' });
+    await sleep(CUTOVER_GRACE_MS);
+    alteracoes += await drainChanges(stream, target);
+
+    // Troca: a partir daqui a colocação nunca volta atrás
+    assertOwner();
+    await updateOwnedPlacement(db, barbeariaId, dono, {
+      database: destino || null,
+      estado: 'estavel',
+      'migracao.concluida_em': new Date(),
+      'migracao.alteracoes': alteracoes
+    });
+
+    result = { movido: true, origem: origemNome, destino: destinoNome, copiados: progresso, alteracoes };
+  } catch (error) {
+    // Outro processo retomou a migração: a colocação e o destino já não são
+    // nossos. Caso contrário (e só se a troca não chegou a ser gravada)
+    // desbloqueia as escritas na origem, apaga as cópias parciais ainda com
+    // o lease, para que nenhuma migração nova copie para o destino entretanto,
+    // e só depois liberta a colocação.
+    if (!(error instanceof MigrationOwnershipError)) {
+      const nossa = await updateOwnedPlacement(db, barbeariaId, dono, {
+        database: atual.database,
+        estado: 'a_copiar'
+      }, { estado: { $in: MIGRATING_STATES } }).then(() => true, () => false);
+      if (nossa) {
+        await rollbackTarget(db, barbeariaId, destinoNome);
+        await updateOwnedPlacement(db, barbeariaId, dono, {
+          estado: 'estavel',
+          'migracao.erro': error.message
+        }).catch(() => {});
+      }
+    }
+    throw error;
+  } finally {
+    clearInterval(heartbeat);
+    if (stream) await stream.close().catch(() => {});
+  }
+
+  if (limparOrigem) {
+    // Nós com a colocação anterior em cache ainda podem ler da origem
+    await sleep(CLEANUP_DELAY_MS);
+    Object.assign(result, await runCleanup(db, source, barbeariaId));
+  }
+  return result;
+}
+
+// Repete a limpeza da origem de uma migração concluída (migracao.limpeza_erro)
+export async function retryTenantCleanup(db, barbeariaId) {
+  const doc = await db.collection(PLACEMENTS_COLLECTION).findOne({ _id: barbeariaId });
+  const origem = doc?.migracao?.origem;
+  const atual = doc?.database || db.databaseName;
+  if (!doc?.migracao?.concluida_em || doc.estado !== 'estavel' || !origem || origem === atual) {
+    return { limpo: false, motivo: 'Sem migração concluída com origem por limpar' };
+  }
+  if (Date.now() - new Date(doc.migracao.concluida_em).getTime() < CLEANUP_DELAY_MS) {
+    return { limpo: false, motivo: 'Troca demasiado recente: a origem ainda pode estar a ser lida' };
+  }
+  const client = await connectToDatabase();
+  return { limpo: true, origem, ...(await runCleanup(db, client.db(origem), barbeariaId)) };
+}
+
+// Migrações cujo dono deixou de renovar o lease (processo reiniciado ou
+// morto) antes da troca: a base anterior continua completa, por isso a
+// colocação volta a `estavel` nela e as escritas deixam de falhar com 503.
+// O job fica com o lease enquanto apaga as cópias parciais do destino, para
+// que nenhuma migração nova copie para lá ao mesmo tempo. Também faz a
+// limpeza da origem das migrações concluídas cujo processo morreu antes.
+export async function recoverStaleMigrations(db) {
+  const placements = db.collection(PLACEMENTS_COLLECTION);
+  const stale = await placements.find({
+    estado: { $in: MIGRATING_STATES },
+    'migracao.lease_ate': { $not: { $gte: new Date() } }
+  }, { projection: { estado: 1, 'migracao.dono': 1, 'migracao.destino': 1 } }).toArray();
+
+  const dono = `recuperar:${hostname()}:${process.pid}:${randomBytes(3).toString('hex')}`;
+  let recuperadas = 0;
+  for (const doc of stale) {
+    const claimed = await placements.updateOne(
+      { _id: doc._id, estado: doc.estado, 'migracao.dono': doc.migracao?.dono },
+      { $set: { estado: 'a_copiar', 'migracao.dono': dono, 'migracao.lease_ate': new Date(Date.now() + LEASE_MS) } }
+    );
+    if (claimed.modifiedCount === 0) continue;
+    // Escritas na origem desbloqueadas já, antes de apagar as cópias
+    if (doc.estado === 'corte') await publishInvalidation(`tenant-placement:${doc._id}`);
+
+    if (doc.migracao?.destino) await rollbackTarget(db, doc._id, doc.migracao.destino);
+    const result = await placements.updateOne(
+      { _id: doc._id, 'migracao.dono': dono },
+      { $set: { estado: 'estavel', 'migracao.erro': 'Migração abandonada (lease expirado)', atualizado_em: new Date() } }
+    );
+    if (result.modifiedCount > 0) {
+      recuperadas++;
+      await publishInvalidation(`tenant-placement:${doc._id}`);
+    }
+  }
+
+  // Limpezas da origem que o processo da migração não chegou a fazer
+  const pendentes = await placements.find({
+    estado: 'estavel',
+    'migracao.limpar_origem': true,
+    'migracao.concluida_em': { $lte: new Date(Date.now() - CLEANUP_DELAY_MS - LEASE_MS) },
+    'migracao.limpeza_concluida_em': { $exists: false },
+    'migracao.limpeza_erro': { $exists: false }
+  }, { projection: { _id: 1 } }).toArray();
+
+  let limpezas = 0;
+  for (const { _id } of pendentes) {
+    const result = await retryTenantCleanup(db, _id);
+    if (result.limpo && !result.limpezaErro) limpezas++;
+  }
+  return { recuperadas, limpezas };
+}
+
+export async function getTenantMigrationStatus(db, barbeariaId) {
+  return db.collection(PLACEMENTS_COLLECTION).findOne({ _id: barbeariaId });
+}
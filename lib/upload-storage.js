@@ -0,0 +1,421 @@
+import { createHash, createHmac, randomUUID } from 'crypto';
+import { createReadStream, createWriteStream } from 'fs';
+import { mkdir, rename, stat, unlink } from 'fs/promises';
+import os from 'os';
+import path from 'path';
+import { Readable, Transform } from 'stream';
+import { pipeline } from 'stream/promises';
+
+// Armazenamento de uploads (imagens de capa e de produtos) endereçado pelo
+// conteúdo: a chave é o SHA-256 do ficheiro, por isso a mesma imagem enviada
+// várias vezes (ou por várias barbearias) é guardada uma só vez e o URL nunca
+// muda de conteúdo, o que permite servir com Cache-Control immutable.
+//
+// Backends:
+//   local - diretório no disco (UPLOAD_LOCAL_DIR), para desenvolvimento e
+//           instalações com uma só instância
+//   s3    - qualquer serviço compatível com S3 (AWS, MinIO, R2...), pedidos
+//           assinados com SigV4, sem SDK
+//
+// O upload é escrito em streaming para um ficheiro temporário enquanto se
+// calcula o hash; o envio para o S3 também é feito a partir do disco, por isso
+// a memória usada não cresce com o tamanho do ficheiro.
+//
+// Cada chave tem um documento em `uploads` com o número de referências (um
+// produto ou barbearia que usa a imagem). Ao trocar ou remover uma imagem a
+// referência é libertada; os objetos sem referências há mais de
+// ORPHAN_GRACE_MS são apagados pelo cron uploads-gc. O GC marca a chave
+// (`apagando`) antes de apagar o objeto e só remove o documento depois; um
+// upload da mesma chave durante esse intervalo espera que a marca saia e
+// volta a enviar o objeto.
+
+export const UPLOADS_COLLECTION = 'uploads';
+
+export const IMAGE_TYPES = {
+  'image/jpeg': 'jpg',
+  'image/jpg': 'jpg',
+  'image/png': 'png',
+  'image/webp': 'webp'
+};
+
+const CONTENT_TYPES = { jpg: 'image/jpeg', png: 'image/png', webp: 'image/webp' };
+
+export const IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable';
+
+const KEY_PATTERN = /^[0-9a-f]{2}\/[0-9a-f]{64}\.(jpg|png|webp)$/;
+const URL_KEY_PATTERN = /([0-9a-f]{2}\/[0-9a-f]{64}\.(?:jpg|png|webp))$/;
+
+const ORPHAN_GRACE_MS = 60 * 60 * 1000;
+// Uma marca `apagando` mais antiga do que isto é de um GC que morreu a meio
+const DELETE_STALE_MS = 5 * 60 * 1000;
+const DELETE_WAIT_MS = 10 * 1000;
+const DELETE_POLL_MS = 100;
+const EMPTY_SHA256 = createHash('sha256').update('').digest('hex');
+
+export class UploadTooLargeError extends Error {
+  constructor(maxSize) {
+    super(`Ficheiro maior do que ${Math.round(maxSize / 1024 / 1024)}MB`);
+    this.name = 'UploadTooLargeError';
+    this.status = 400;
+  }
+}
+
+export function isValidUploadKey(key) {
+  return KEY_PATTERN.test(key);
+}
+
+export function contentTypeForKey(key) {
+  return CONTENT_TYPES[key.split('.').pop()] || 'application/octet-stream';
+}
+
+// ==================== BACKENDS ====================
+
+class LocalBackend {
+  constructor(dir) {
+    this.name = 'local';
+    this.dir = dir;
+    this.tmpDir = path.join(dir, '.tmp');
+  }
+
+  pathFor(key) {
+    return path.join(this.dir, ...key.split('/'));
+  }
+
+  async exists(key) {
+    try {
+      await stat(this.pathFor(key));
+      return true;
+    } catch {
+      return false;
+    }
+  }
+
+  // O temporário está no mesmo disco: rename é atómico
+  async putFile(key, tmpPath) {
+    const target = this.pathFor(key);
+    await mkdir(path.dirname(target), { recursive: true });
+    await rename(tmpPath, target);
+  }
+
+  async read(key) {
+    const file = this.pathFor(key);
+    try {
+      const { size } = await stat(file);
+      return { body: Readable.toWeb(createReadStream(file)), size };
+    } catch {
+      return null;
+    }
+  }
+
+  async remove(key) {
+    await unlink(this.pathFor(key)).catch(() => {});
+  }
+}
+
+function sha256Hex(value) {
+  return createHash('sha256').update(value).digest('hex');
+}
+
+function hmac(key, value) {
+  return createHmac('sha256', key).update(value).digest();
+}
+
+class S3Backend {
+  constructor({ bucket, region, endpoint, accessKeyId, secretAccessKey, forcePathStyle }) {
+    this.name = 's3';
+    this.bucket = bucket;
+    this.region = region;
+    this.accessKeyId = accessKeyId;
+    this.secretAccessKey = secretAccessKey;
+    this.baseUrl = endpoint
+      ? (forcePathStyle ? `${endpoint.replace(/\/$/, '')}/${bucket}` : endpoint.replace('://', `://${bucket}.`))
+      : `https://${bucket}.s3.${region}.amazonaws.com`;
+    this.tmpDir = path.join(os.tmpdir(), 'cuthub-uploads');
+  }
+
+  // Assinatura AWS SigV4 (as chaves só têm [0-9a-f/.], não precisam de encoding)
+  signedRequest(method, key, { payloadHash = EMPTY_SHA256, headers = {}, body } = {}) {
+    const url = new URL(`${this.baseUrl}/${key}`);
+    const amzDate = new Date().toISOString().replace(/[:-]|\.\d{3}/g, '');
+    const dateStamp = amzDate.slice(0, 8);
+
+    const signed = {
+      ...Object.fromEntries(Object.entries(headers).map(([k, v]) => [k.toLowerCase(), String(v)])),
+      host: url.host,
+      'x-amz-content-sha256': payloadHash,
+      'x-amz-date': amzDate
+    };
+    const names = Object.keys(signed).sort();
+    const canonicalHeaders = names.map(name => `${name}:${signed[name].trim()}\n`).join('');
+    const signedHeaders = names.join(';');
+
+    const canonicalRequest = [method, url.pathname, '', canonicalHeaders, signedHeaders, payloadHash].join('\n');
+    const scope = `${dateStamp}/${this.region}/s3/aws4_request`;
+    const stringToSign = ['AWS4-HMAC-SHA256', amzDate, scope, sha256Hex(canonicalRequest)].join('\n');
+    const signingKey = hmac(hmac(hmac(hmac(`AWS4${this.secretAccessKey}`, dateStamp), this.region), 's3'), 'aws4_request');
+    const signature = createHmac('sha256', signingKey).update(stringToSign).digest('hex');
+
+    const { host, ...requestHeaders } = signed;
+    requestHeaders.authorization =
+      `AWS4-HMAC-SHA256 Credential=${this.accessKeyId}/${scope}, SignedHeaders=${signedHeaders}, Signature=${signature}`;
+
+    return fetch(url, {
+      method,
+      headers: requestHeaders,
+      ...(body ? { body, duplex: 'half' } : {})
+    });
+  }
+
+  async exists(key) {
+    const response = await this.signedRequest('HEAD', key);
+    if (response.status === 404) return false;
+    if (!response.ok) throw new Error(`S3 HEAD ${key}: ${response.status}`);
+    return true;
+  }
+
+  // O hash do conteúdo é o próprio x-amz-content-sha256: o S3 recusa o
+  // objeto se os bytes recebidos não corresponderem
+  async putFile(key, tmpPath, { size, hash }) {
+    const response = await this.signedRequest('PUT', key, {
+      payloadHash: hash,
+      headers: {
+        'content-length': size,
+        'content-type': contentTypeForKey(key),
+        'cache-control': IMMUTABLE_CACHE_CONTROL
+      },
+      body: Readable.toWeb(createReadStream(tmpPath))
+    });
+    if (!response.ok) {
+      throw new Error(`S3 PUT ${key}: ${response.status} ${await response.text()}`);
+    }
+  }
+
+  async read(key) {
+    const response = await this.signedRequest('GET', key);
+    if (response.status === 404) return null;
+    if (!response.ok) throw new Error(`S3 GET ${key}: ${response.status}`);
+    return { body: response.body, size: parseInt(response.headers.get('content-length'), 10) || undefined };
+  }
+
+  async remove(key) {
+    const response = await this.signedRequest('DELETE', key);
+    if (!response.ok && response.status !== 404) {
+      throw new Error(`S3 DELETE ${key}: ${response.status}`);
+    }
+  }
+}
+
+const STATE_KEY = Symbol.for('cuthub.uploadStorage');
+
+if (!globalThis[STATE_KEY]) {
+  globalThis[STATE_KEY] = { backend: null, indexesReady: null };
+}
+
+const state = globalThis[STATE_KEY];
+
+export function getUploadBackend() {
+  if (!state.backend) {
+    if ((process.env.UPLOAD_STORAGE || 'local') === 's3') {
+      if (!process.env.S3_BUCKET || !process.env.S3_ACCESS_KEY_ID || !process.env.S3_SECRET_ACCESS_KEY) {
+        throw new Error('UPLOAD_STORAGE=s3 requer S3_BUCKET, S3_ACCESS_KEY_ID e S3_SECRET_ACCESS_KEY');
+      }
+      state.backend = new S3Backend({
+        bucket: process.env.S3_BUCKET,
+        region: process.env.S3_REGION || 'us-east-1',
+        endpoint: process.env.S3_ENDPOINT,
+        accessKeyId: process.env.S3_ACCESS_KEY_ID,
+        secretAccessKey: process.env.S3_SECRET_ACCESS_KEY,
+        forcePathStyle: process.env.S3_FORCE_PATH_STYLE !== 'false'
+      });
+    } else {
+      state.backend = new LocalBackend(
+        process.env.UPLOAD_LOCAL_DIR || path.join(process.cwd(), 'storage', 'uploads')
+      );
+    }
+  }
+  return state.backend;
+}
+
+function ensureIndexes(db) {
+  if (!state.indexesReady) {
+    state.indexesReady = db.collection(UPLOADS_COLLECTION)
+      .createIndex({ orfao_desde: 1 }, { partialFilterExpression: { orfao_desde: { $exists: true } } })
+      .catch((error) => {
+        state.indexesReady = null;
+        throw error;
+      });
+  }
+  return state.indexesReady;
+}
+
+// ==================== URLS ====================
+
+// Com UPLOAD_PUBLIC_BASE_URL (CDN ou bucket público) o browser vai direto ao
+// armazenamento; sem ele, os ficheiros são servidos por GET /api/uploads/<chave>
+export function publicUploadUrl(key) {
+  const base = process.env.UPLOAD_PUBLIC_BASE_URL;
+  return base ? `${base.replace(/\/$/, '')}/${key}` : `/api/uploads/${key}`;
+}
+
+export function uploadKeyFromUrl(url) {
+  const match = typeof url === 'string' ? url.match(URL_KEY_PATTERN) : null;
+  return match ? match[1] : null;
+}
+
+// ==================== UPLOAD / LIBERTAR ====================
+
+async function writeTemp(file, tmpDir, maxSize) {
+  await mkdir(tmpDir, { recursive: true });
+  const tmpPath = path.join(tmpDir, randomUUID());
+  const hash = createHash('sha256');
+  let size = 0;
+
+  const meter = new Transform({
+    transform(chunk, encoding, callback) {
+      size += chunk.length;
+      if (size > maxSize) {
+        callback(new UploadTooLargeError(maxSize));
+        return;
+      }
+      hash.update(chunk);
+      callback(null, chunk);
+    }
+  });
+
+  try {
+    await pipeline(Readable.fromWeb(file.stream()), meter, createWriteStream(tmpPath));
+  } catch (error) {
+    await unlink(tmpPath).catch(() => {});
+    throw error;
+  }
+  return { tmpPath, size, hash: hash.digest('hex') };
+}
+
+function deleteInProgress(doc) {
+  return Boolean(doc?.apagando) && Date.now() - new Date(doc.apagando).getTime() < DELETE_STALE_MS;
+}
+
+// Espera que o GC acabe de apagar o objeto da chave (ver collectOrphanUploads)
+async function waitForDelete(collection, key, doc) {
+  const deadline = Date.now() + DELETE_WAIT_MS;
+  while (deleteInProgress(doc)) {
+    if (Date.now() > deadline) {
+      console.warn(`[UPLOADS] GC de ${key} ainda em curso, a reenviar o objeto na mesma`);
+      return;
+    }
+    await new Promise(resolve => setTimeout(resolve, DELETE_POLL_MS));
+    doc = await collection.findOne({ _id: key }, { projection: { apagando: 1 } });
+  }
+}
+
+// Guarda um File (de request.formData()) e devolve { key, url, size, deduplicado }.
+// O tipo já foi validado pela rota; a extensão vem dele e não do nome do ficheiro.
+export async function storeUpload(db, file, { maxSize }) {
+  const extension = IMAGE_TYPES[file.type];
+  if (!extension) {
+    throw Object.assign(new Error('Formato inválido'), { status: 400 });
+  }
+
+  const backend = getUploadBackend();
+  await ensureIndexes(db);
+  const { tmpPath, size, hash } = await writeTemp(file, backend.tmpDir, maxSize);
+  const key = `${hash.slice(0, 2)}/${hash}.${extension}`;
+
+  try {
+    // A referência é registada antes de confirmar o objeto: o GC nunca
+    // começa a apagar uma chave com referências
+    const collection = db.collection(UPLOADS_COLLECTION);
+    const before = await collection.findOneAndUpdate(
+      { _id: key },
+      {
+        $inc: { refs: 1 },
+        $unset: { orfao_desde: '' },
+        $setOnInsert: { hash, size, content_type: contentTypeForKey(key), backend: backend.name, criado_em: new Date() }
+      },
+      { upsert: true, returnDocument: 'before', projection: { apagando: 1 } }
+    );
+
+    // Documento novo ou chave a meio de um GC: o objeto pode já não existir
+    // (ou estar prestes a ser apagado), por isso é sempre enviado
+    let deduplicado = false;
+    if (before?.apagando) {
+      await waitForDelete(collection, key, before);
+    } else if (before) {
+      deduplicado = await backend.exists(key);
+    }
+    if (!deduplicado) {
+      await backend.putFile(key, tmpPath, { size, hash });
+    }
+    return { key, url: publicUploadUrl(key), size, deduplicado };
+  } finally {
+    await unlink(tmpPath).catch(() => {});
+  }
+}
+
+// Liberta a imagem anterior de um documento. URLs antigos (/uploads/...,
+// guardados em public/ antes deste módulo) são apagados diretamente.
+export async function releaseUpload(db, url) {
+  if (!url) return;
+
+  const key = uploadKeyFromUrl(url);
+  if (!key) {
+    const legacy = path.posix.normalize(url);
+    if (legacy.startsWith('/uploads/')) {
+      await unlink(path.join(process.cwd(), 'public', legacy)).catch(() => {});
+    }
+    return;
+  }
+
+  const collection = db.collection(UPLOADS_COLLECTION);
+  await collection.updateOne({ _id: key }, { $inc: { refs: -1 } });
+  await collection.updateOne(
+    { _id: key, refs: { $lte: 0 }, orfao_desde: { $exists: false } },
+    { $set: { orfao_desde: new Date() } }
+  );
+}
+
+// Apaga do armazenamento os objetos sem referências há mais de graceMs
+export async function collectOrphanUploads(db, { graceMs = ORPHAN_GRACE_MS, limit = 500, dryRun = false } = {}) {
+  const backend = getUploadBackend();
+  const collection = db.collection(UPLOADS_COLLECTION);
+  const cutoff = new Date(Date.now() - graceMs);
+  const filter = {
+    refs: { $lte: 0 },
+    orfao_desde: { $lte: cutoff },
+    $or: [{ apagando: { $exists: false } }, { apagando: { $lt: new Date(Date.now() - DELETE_STALE_MS) } }]
+  };
+
+  const candidatos = await collection.find(filter, { projection: { _id: 1 } }).limit(limit).toArray();
+  const result = { candidatos: candidatos.length, apagados: 0 };
+  if (dryRun) return result;
+
+  for (const { _id: key } of candidatos) {
+    // Só apaga se continuar órfão (um upload entretanto pode ter reutilizado a chave)
+    const marca = new Date();
+    const claimed = await collection.updateOne({ _id: key, ...filter }, { $set: { apagando: marca } });
+    if (claimed.modifiedCount === 0) continue;
+
+    const unmark = () => collection.updateOne({ _id: key, apagando: marca }, { $unset: { apagando: '' } });
+    try {
+      await backend.remove(key);
+    } catch (error) {
+      await unmark();
+      throw error;
+    }
+
+    // Um upload que chegou entretanto está à espera da marca para reenviar
+    const removed = await collection.findOneAndDelete({ _id: key, apagando: marca, refs: { $lte: 0 } });
+    if (removed) {
+      result.apagados++;
+    } else {
+      await unmark();
+    }
+  }
+  return result;
+}
+
+// Para GET /api/uploads/<chave>
+export async function readUpload(key) {
+  if (!isValidUploadKey(key)) return null;
+  return getUploadBackend().read(key);
+}
@@ -6,6 +6,11 @@ const nextConfig = {
   experimental: {
     // Remove if not using Server Components
     serverComponentsExternalPackages: ['mongodb'],
+    // O bcryptjs só é carregado pelos workers de lib/password-hasher (require em runtime),
+    // por isso tem de ser incluído explicitamente no output standalone
+    outputFileTracingIncludes: {
+      '/api/**/*': ['./node_modules/bcryptjs/**/*'],
+    },
   },
   webpack(config, { dev }) {
     if (dev) {
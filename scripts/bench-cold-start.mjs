@@ -0,0 +1,202 @@
+// Benchmark de cold start: tempo desde o spawn de `next start` até à primeira
+// resposta da API, em processos novos (o que um arranque serverless paga).
+// Depois da primeira rota mede o primeiro pedido a cada uma das seguintes,
+// que inclui carregar o módulo dessa rota.
+//
+// Mede também o custo de importar cada SDK num processo Node limpo, para
+// perceber o que cada import estático acrescenta ao arranque.
+//
+// Uso: node scripts/bench-cold-start.mjs [--runs 5] [--route /api/plans ...] [--record]
+// Corre depois de `next build`. Com --record o resultado é acrescentado a
+// scripts/bench-results/cold-start.jsonl e comparado com a medição anterior.
+
+import { spawn, execFileSync } from 'child_process';
+import { existsSync, readFileSync, appendFileSync, mkdirSync } from 'fs';
+import net from 'net';
+import path from 'path';
+
+const ROOT = process.cwd();
+const HISTORY_FILE = path.join(ROOT, 'scripts', 'bench-results', 'cold-start.jsonl');
+const NEXT_BIN = path.join(ROOT, 'node_modules', 'next', 'dist', 'bin', 'next');
+
+const SDK_MODULES = ['stripe', 'twilio', 'resend', 'jsonwebtoken', 'bcryptjs', 'mongodb'];
+
+const POLL_INTERVAL_MS = 10;
+const START_TIMEOUT_MS = 60 * 1000;
+
+function parseArgs(argv) {
+  const args = { runs: 5, routes: [], record: false };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === '--runs') args.runs = parseInt(argv[++i], 10);
+    else if (argv[i] === '--route') args.routes.push(argv[++i]);
+    else if (argv[i] === '--record') args.record = true;
+  }
+  if (args.routes.length === 0) args.routes = ['/api/plans'];
+  return args;
+}
+
+function percentile(values, pct) {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.min(sorted.length - 1, Math.ceil((pct / 100) * sorted.length) - 1)];
+}
+
+function summarize(values) {
+  return {
+    min: Math.round(Math.min(...values)),
+    p50: Math.round(percentile(values, 50)),
+    max: Math.round(Math.max(...values))
+  };
+}
+
+function freePort() {
+  return new Promise((resolve, reject) => {
+    const server = net.createServer();
+    server.unref();
+    server.on('error', reject);
+    server.listen(0, () => {
+      const { port } = server.address();
+      server.close(() => resolve(port));
+    });
+  });
+}
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+// Repete o pedido até o servidor aceitar a ligação; devolve o status
+async function firstResponse(url, deadline) {
+  while (performance.now() < deadline) {
+    try {
+      const response = await fetch(url);
+      await response.arrayBuffer();
+      return response.status;
+    } catch {
+      await sleep(POLL_INTERVAL_MS);
+    }
+  }
+  throw new Error(`Sem resposta de ${url} em ${START_TIMEOUT_MS}ms`);
+}
+
+async function coldStartRun(routes) {
+  const port = await freePort();
+  const startedAt = performance.now();
+  const child = spawn(process.execPath, [NEXT_BIN, 'start', '-p', String(port)], {
+    cwd: ROOT,
+    env: { ...process.env, NODE_ENV: 'production' },
+    stdio: 'ignore'
+  });
+  const exited = new Promise(resolve => child.once('exit', resolve));
+
+  try {
+    const timings = {};
+    const deadline = startedAt + START_TIMEOUT_MS;
+    const [first, ...rest] = routes;
+
+    const status = await firstResponse(`http://127.0.0.1:${port}${first}`, deadline);
+    timings[first] = { ms: performance.now() - startedAt, status };
+
+    for (const route of rest) {
+      const t0 = performance.now();
+      const response = await fetch(`http://127.0.0.1:${port}${route}`);
+      await response.arrayBuffer();
+      timings[route] = { ms: performance.now() - t0, status: response.status };
+    }
+    return timings;
+  } finally {
+    child.kill('SIGTERM');
+    await exited;
+  }
+}
+
+// Tempo de import() de um módulo num processo novo (sem cache de módulos)
+function importTime(name) {
+  const source = `const t0 = performance.now(); await import(${JSON.stringify(name)}); ` +
+    'console.log(performance.now() - t0);';
+  try {
+    const output = execFileSync(process.execPath, ['--input-type=module', '-e', source], {
+      cwd: ROOT,
+      encoding: 'utf8',
+      stdio: ['ignore', 'pipe', 'ignore']
+    });
+    return Math.round(parseFloat(output));
+  } catch {
+    return null;
+  }
+}
+
+function gitCommit() {
+  try {
+    return execFileSync('git', ['rev-parse', '--short', 'HEAD'], { cwd: ROOT, encoding: 'utf8' }).trim();
+  } catch {
+    return null;
+  }
+}
+
+function previousResult() {
+  if (!existsSync(HISTORY_FILE)) return null;
+  const lines = readFileSync(HISTORY_FILE, 'utf8').trim().split('\n').filter(Boolean);
+  return lines.length > 0 ? JSON.parse(lines[lines.length - 1]) : null;
+}
+
+function delta(current, previous) {
+  if (previous === undefined || previous === null) return '';
+  const diff = current - previous;
+  return ` (${diff >= 0 ? '+' : ''}${diff}ms)`;
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2));
+
+  if (!existsSync(path.join(ROOT, '.next', 'BUILD_ID'))) {
+    console.error('Build não encontrado: corra `next build` antes do benchmark.');
+    process.exit(1);
+  }
+
+  const samples = Object.fromEntries(args.routes.map(route => [route, []]));
+  const statuses = {};
+  for (let run = 1; run <= args.runs; run++) {
+    const timings = await coldStartRun(args.routes);
+    for (const [route, { ms, status }] of Object.entries(timings)) {
+      samples[route].push(ms);
+      statuses[route] = status;
+    }
+    process.stdout.write(`run ${run}/${args.runs}: ${Math.round(timings[args.routes[0]].ms)}ms\n`);
+  }
+
+  const result = {
+    date: new Date().toISOString(),
+    commit: gitCommit(),
+    node: process.version,
+    runs: args.runs,
+    routes: Object.fromEntries(
+      args.routes.map(route => [route, { ...summarize(samples[route]), status: statuses[route] }])
+    ),
+    modules: Object.fromEntries(SDK_MODULES.map(name => [name, importTime(name)]))
+  };
+
+  const previous = previousResult();
+  console.log(`\nCold start (${args.runs} processos, commit ${result.commit || '?'})`);
+  args.routes.forEach((route, i) => {
+    const { min, p50, max, status } = result.routes[route];
+    const label = i === 0 ? 'spawn -> 1ª resposta' : '1º pedido';
+    console.log(
+      `${route.padEnd(28)} ${label.padEnd(22)} p50 ${String(p50).padStart(6)}ms` +
+      `${delta(p50, previous?.routes?.[route]?.p50)}  min ${min}ms  max ${max}ms  [${status}]`
+    );
+  });
+
+  console.log('\nimport() num processo limpo');
+  for (const [name, ms] of Object.entries(result.modules)) {
+    console.log(`${name.padEnd(28)} ${ms === null ? 'não instalado' : `${String(ms).padStart(6)}ms`}`);
+  }
+
+  if (args.record) {
+    mkdirSync(path.dirname(HISTORY_FILE), { recursive: true });
+    appendFileSync(HISTORY_FILE, JSON.stringify(result) + '\n');
+    console.log(`\nResultado guardado em ${path.relative(ROOT, HISTORY_FILE)}`);
+  }
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
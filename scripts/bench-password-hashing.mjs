@@ -0,0 +1,60 @@
+// Benchmark: lag do event loop durante 100 logins concorrentes.
+// Compara bcryptjs no event loop (comportamento antigo) com o pool de workers.
+//
+// Uso: node scripts/bench-password-hashing.mjs [concorrência]
+
+import bcrypt from 'bcryptjs';
+import { hashPassword, verifyPassword, getHashCost } from '../lib/password-hasher.js';
+
+const CONCURRENCY = parseInt(process.argv[2] || '100', 10);
+const PASSWORD = 'palavra-passe-de-teste';
+
+const SAMPLE_INTERVAL_MS = 5;
+
+function percentile(values, pct) {
+  if (values.length === 0) return 0;
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.min(sorted.length - 1, Math.ceil((pct / 100) * sorted.length) - 1)];
+}
+
+// Mede o lag do event loop com um timer de 5ms: qualquer atraso face ao
+// intervalo esperado é tempo em que nenhum outro pedido podia ser servido.
+async function measure(label, fn) {
+  const lags = [];
+  let last = performance.now();
+  const sampler = setInterval(() => {
+    const now = performance.now();
+    lags.push(Math.max(0, now - last - SAMPLE_INTERVAL_MS));
+    last = now;
+  }, SAMPLE_INTERVAL_MS);
+
+  const startedAt = performance.now();
+  await Promise.all(Array.from({ length: CONCURRENCY }, fn));
+  const totalMs = performance.now() - startedAt;
+
+  // Deixar o sampler registar o último bloqueio
+  await new Promise(resolve => setTimeout(resolve, SAMPLE_INTERVAL_MS * 2));
+  clearInterval(sampler);
+
+  const fmt = (ms) => ms.toFixed(1).padStart(7);
+  console.log(
+    `${label.padEnd(24)} total ${totalMs.toFixed(0).padStart(6)}ms | ` +
+    `lag p50 ${fmt(percentile(lags, 50))}ms  p99 ${fmt(percentile(lags, 99))}ms  max ${fmt(Math.max(0, ...lags))}ms`
+  );
+}
+
+async function main() {
+  const cost = await getHashCost();
+  const inlineHash = bcrypt.hashSync(PASSWORD, cost);
+  const pooledHash = await hashPassword(PASSWORD);
+
+  console.log(`${CONCURRENCY} logins concorrentes, custo bcrypt ${cost}\n`);
+
+  await measure('bcryptjs no event loop', () => bcrypt.compare(PASSWORD, inlineHash));
+  await measure('pool de worker threads', () => verifyPassword(PASSWORD, pooledHash));
+}
+
+main().then(() => process.exit(0)).catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
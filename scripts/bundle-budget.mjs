@@ -0,0 +1,134 @@
+// Relatório de tamanho de JavaScript por rota, comparado com o orçamento
+// definido em bundle-budget.json. Corre depois de `next build`.
+//
+// Conta o JS de primeiro carregamento (o que o browser tem de descarregar,
+// fazer parse e executar antes da página ficar usável) e, à parte, os chunks
+// carregados com next/dynamic (tabs dos painéis).
+//
+// Uso: node scripts/bundle-budget.mjs [--json]
+// Sai com código 1 se alguma rota passar o orçamento.
+
+import { readFileSync, existsSync } from 'fs';
+import { gzipSync } from 'zlib';
+import path from 'path';
+
+const ROOT = process.cwd();
+const NEXT_DIR = path.join(ROOT, '.next');
+const BUDGET_FILE = path.join(ROOT, 'bundle-budget.json');
+const JSON_OUTPUT = process.argv.includes('--json');
+
+function readJson(file) {
+  return JSON.parse(readFileSync(file, 'utf8'));
+}
+
+const sizeCache = new Map();
+
+// Tamanho em bytes (raw e gzip) de um ficheiro de .next/
+function fileSize(relative) {
+  if (sizeCache.has(relative)) return sizeCache.get(relative);
+
+  const content = readFileSync(path.join(NEXT_DIR, relative));
+  const size = { raw: content.length, gzip: gzipSync(content, { level: 9 }).length };
+  sizeCache.set(relative, size);
+  return size;
+}
+
+function sumSizes(files) {
+  return files.reduce(
+    (total, file) => {
+      const size = fileSize(file);
+      return { raw: total.raw + size.raw, gzip: total.gzip + size.gzip };
+    },
+    { raw: 0, gzip: 0 }
+  );
+}
+
+function kb(bytes) {
+  return (bytes / 1024).toFixed(1);
+}
+
+// "/admin/page" -> "/admin"; "/barbearia/[slug]/page" -> "/barbearia/[slug]"
+function routeFromEntry(entry) {
+  const route = entry.replace(/\/page$/, '');
+  return route === '' ? '/' : route;
+}
+
+// Chunks lazy por página, a partir do react-loadable-manifest
+// (chaves no formato "app/admin/page.js -> @/components/admin/clientes-tab")
+function lazyChunksByRoute() {
+  const file = path.join(NEXT_DIR, 'react-loadable-manifest.json');
+  const byRoute = new Map();
+  if (!existsSync(file)) return byRoute;
+
+  for (const [key, value] of Object.entries(readJson(file))) {
+    const match = key.match(/^app(.*)\/page\.js -> (.+)$/);
+    if (!match) continue;
+
+    const route = match[1] || '/';
+    const files = (value.files || []).filter(f => f.endsWith('.js'));
+    if (!byRoute.has(route)) byRoute.set(route, []);
+    byRoute.get(route).push({ module: match[2], ...sumSizes(files) });
+  }
+  return byRoute;
+}
+
+function main() {
+  const manifestFile = path.join(NEXT_DIR, 'app-build-manifest.json');
+  if (!existsSync(manifestFile)) {
+    console.error('Não existe .next/app-build-manifest.json. Corra primeiro: yarn build');
+    process.exit(2);
+  }
+
+  const manifest = readJson(manifestFile);
+  const budget = existsSync(BUDGET_FILE) ? readJson(BUDGET_FILE) : { default: null, routes: {} };
+  const lazy = lazyChunksByRoute();
+
+  const report = [];
+  for (const [entry, files] of Object.entries(manifest.pages)) {
+    if (!entry.endsWith('/page')) continue;
+
+    const route = routeFromEntry(entry);
+    const firstLoad = sumSizes(files.filter(f => f.endsWith('.js')));
+    const limitKb = budget.routes?.[route] ?? budget.default ?? null;
+
+    report.push({
+      route,
+      firstLoadRaw: firstLoad.raw,
+      firstLoadGzip: firstLoad.gzip,
+      budgetGzipKb: limitKb,
+      overBudget: limitKb !== null && firstLoad.gzip > limitKb * 1024,
+      lazyChunks: lazy.get(route) || []
+    });
+  }
+
+  report.sort((a, b) => b.firstLoadGzip - a.firstLoadGzip);
+  const failures = report.filter(r => r.overBudget);
+
+  if (JSON_OUTPUT) {
+    console.log(JSON.stringify({ routes: report, failures: failures.map(r => r.route) }, null, 2));
+  } else {
+    console.log('Rota'.padEnd(28) + 'JS inicial (raw)'.padStart(18) + 'gzip'.padStart(12) + 'orçamento'.padStart(12));
+    for (const r of report) {
+      const limit = r.budgetGzipKb === null ? '-' : `${r.budgetGzipKb} KB`;
+      const flag = r.overBudget ? '  EXCEDIDO' : '';
+      console.log(
+        r.route.padEnd(28) +
+        `${kb(r.firstLoadRaw)} KB`.padStart(18) +
+        `${kb(r.firstLoadGzip)} KB`.padStart(12) +
+        limit.padStart(12) +
+        flag
+      );
+      for (const chunk of r.lazyChunks) {
+        console.log(`  lazy ${chunk.module}`.padEnd(46) + `${kb(chunk.gzip)} KB`.padStart(12));
+      }
+    }
+
+    if (failures.length > 0) {
+      console.log(`\n${failures.length} rota(s) acima do orçamento: ${failures.map(r => r.route).join(', ')}`);
+    }
+  }
+
+  process.exit(failures.length > 0 ? 1 : 0);
+}
+
+main();
@@ -0,0 +1,160 @@
+// Replay local de eventos Stripe gravados: assina cada fixture com
+// STRIPE_WEBHOOK_SECRET e envia-a ao webhook, como o Stripe faria. Com
+// --repeat simula uma tempestade de reenvios (o mesmo event.id várias vezes,
+// em paralelo) para confirmar a deduplicação e a latência do ack.
+//
+// Uso:
+//   node scripts/stripe-replay.mjs <ficheiro.json|pasta>... [--url http://localhost:3000]
+//        [--repeat N] [--concurrency N] [--fresh-ids]
+//   node scripts/stripe-replay.mjs --export <pasta> [--type checkout.session.completed] [--limit 50]
+//
+// --fresh-ids  acrescenta um sufixo aos ids para os eventos serem processados de novo
+// --export     grava em <pasta> os eventos recebidos (collection stripe_events)
+//
+// Fixtures: scripts/fixtures/stripe/*.json (um evento por ficheiro)
+
+import { readFileSync, readdirSync, statSync, writeFileSync, mkdirSync } from 'fs';
+import path from 'path';
+import Stripe from 'stripe';
+import { MongoClient } from 'mongodb';
+
+function parseArgs(argv) {
+  const options = { url: 'http://localhost:3000', repeat: 1, concurrency: 10, freshIds: false, inputs: [] };
+  for (let i = 0; i < argv.length; i++) {
+    const arg = argv[i];
+    if (arg === '--url') options.url = argv[++i];
+    else if (arg === '--repeat') options.repeat = parseInt(argv[++i], 10);
+    else if (arg === '--concurrency') options.concurrency = parseInt(argv[++i], 10);
+    else if (arg === '--fresh-ids') options.freshIds = true;
+    else if (arg === '--export') options.exportDir = argv[++i];
+    else if (arg === '--type') options.type = argv[++i];
+    else if (arg === '--limit') options.limit = parseInt(argv[++i], 10);
+    else options.inputs.push(arg);
+  }
+  return options;
+}
+
+function loadFixtures(inputs) {
+  const files = [];
+  for (const input of inputs) {
+    if (statSync(input).isDirectory()) {
+      readdirSync(input)
+        .filter(f => f.endsWith('.json'))
+        .forEach(f => files.push(path.join(input, f)));
+    } else {
+      files.push(input);
+    }
+  }
+
+  // Ordem original de criação, como o Stripe os enviou
+  return files
+    .map(file => JSON.parse(readFileSync(file, 'utf8')))
+    .sort((a, b) => (a.created || 0) - (b.created || 0));
+}
+
+function percentile(values, pct) {
+  if (values.length === 0) return 0;
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.min(sorted.length - 1, Math.ceil((pct / 100) * sorted.length) - 1)];
+}
+
+async function runPool(tasks, concurrency) {
+  let next = 0;
+  const runners = Array.from({ length: Math.min(concurrency, tasks.length) }, async () => {
+    while (next < tasks.length) {
+      const task = tasks[next++];
+      await task();
+    }
+  });
+  await Promise.all(runners);
+}
+
+async function replay(options) {
+  const secret = process.env.STRIPE_WEBHOOK_SECRET;
+  if (!secret) {
+    console.error('Defina STRIPE_WEBHOOK_SECRET (o mesmo do servidor)');
+    process.exit(2);
+  }
+
+  const stripe = new Stripe(process.env.STRIPE_SECRET_KEY || 'sk_test_replay');
+  const suffix = options.freshIds ? `_replay_${Date.now()}` : '';
+  const events = loadFixtures(options.inputs).map(event => ({ ...event, id: `${event.id}${suffix}` }));
+
+  if (events.length === 0) {
+    console.error('Nenhuma fixture encontrada');
+    process.exit(2);
+  }
+
+  const endpoint = `${options.url.replace(/\/$/, '')}/api/stripe/webhook`;
+  const latencies = [];
+  const counts = { recebidos: 0, duplicados: 0, erros: 0 };
+
+  const send = async (event) => {
+    const payload = JSON.stringify(event);
+    const header = stripe.webhooks.generateTestHeaderString({ payload, secret });
+    const startedAt = performance.now();
+    try {
+      const response = await fetch(endpoint, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'stripe-signature': header },
+        body: payload
+      });
+      latencies.push(performance.now() - startedAt);
+      if (!response.ok) {
+        counts.erros++;
+        console.error(`${event.id}: HTTP ${response.status} ${await response.text()}`);
+        return;
+      }
+      const body = await response.json();
+      if (body.duplicate) counts.duplicados++;
+      else counts.recebidos++;
+    } catch (error) {
+      counts.erros++;
+      console.error(`${event.id}: ${error.message}`);
+    }
+  };
+
+  // Cada evento é enviado `repeat` vezes em paralelo; os eventos seguem por ordem
+  for (const event of events) {
+    const tasks = Array.from({ length: options.repeat }, () => () => send(event));
+    await runPool(tasks, options.concurrency);
+  }
+
+  console.log(`Eventos: ${events.length} x ${options.repeat} envio(s) para ${endpoint}`);
+  console.log(`Gravados: ${counts.recebidos}  duplicados: ${counts.duplicados}  erros: ${counts.erros}`);
+  console.log(
+    `Latência do ack: p50 ${percentile(latencies, 50).toFixed(1)} ms  ` +
+    `p95 ${percentile(latencies, 95).toFixed(1)} ms  máx ${Math.max(0, ...latencies).toFixed(1)} ms`
+  );
+  console.log('Estado do processamento: collection stripe_events (status, attempts, last_error)');
+
+  process.exit(counts.erros > 0 ? 1 : 0);
+}
+
+async function exportEvents(options) {
+  const client = await MongoClient.connect(process.env.MONGO_URL);
+  const db = client.db(process.env.DB_NAME || 'barbearia_saas');
+
+  const filter = options.type ? { type: options.type } : {};
+  const docs = await db.collection('stripe_events')
+    .find(filter, { projection: { payload: 1 } })
+    .sort({ created: -1 })
+    .limit(options.limit || 50)
+    .toArray();
+
+  mkdirSync(options.exportDir, { recursive: true });
+  for (const doc of docs) {
+    writeFileSync(path.join(options.exportDir, `${doc._id}.json`), JSON.stringify(doc.payload, null, 2) + '\n');
+  }
+
+  console.log(`${docs.length} evento(s) exportado(s) para ${options.exportDir}`);
+  await client.close();
+}
+
+const options = parseArgs(process.argv.slice(2));
+
+if (options.exportDir) {
+  await exportEvents(options);
+} else {
+  await replay(options);
+}
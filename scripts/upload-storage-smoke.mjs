@@ -0,0 +1,47 @@
+// Verificação do backend de uploads configurado (UPLOAD_STORAGE): grava um
+// objeto, confirma que existe, lê-o de volta, compara os bytes e apaga-o.
+// Não usa o MongoDB, só o armazenamento.
+//
+// Contra um MinIO local:
+//   docker run -p 9000:9000 -e MINIO_ROOT_USER=minio -e MINIO_ROOT_PASSWORD=minio123 \
+//     minio/minio server /data
+//   (criar o bucket "uploads" na consola ou com `mc mb`)
+//   UPLOAD_STORAGE=s3 S3_ENDPOINT=http://127.0.0.1:9000 S3_BUCKET=uploads \
+//     S3_ACCESS_KEY_ID=minio S3_SECRET_ACCESS_KEY=minio123 node scripts/upload-storage-smoke.mjs
+
+import { createHash, randomBytes } from 'crypto';
+import { writeFile, mkdir, unlink } from 'fs/promises';
+import path from 'path';
+import { getUploadBackend } from '../lib/upload-storage.js';
+
+async function main() {
+  const backend = getUploadBackend();
+  const content = randomBytes(256 * 1024);
+  const hash = createHash('sha256').update(content).digest('hex');
+  const key = `${hash.slice(0, 2)}/${hash}.png`;
+
+  await mkdir(backend.tmpDir, { recursive: true });
+  const tmpPath = path.join(backend.tmpDir, `smoke-${hash}`);
+  await writeFile(tmpPath, content);
+
+  console.log(`backend ${backend.name}, chave ${key}`);
+
+  if (await backend.exists(key)) throw new Error('O objeto já existia antes do teste');
+  await backend.putFile(key, tmpPath, { size: content.length, hash });
+  await unlink(tmpPath).catch(() => {});
+  if (!(await backend.exists(key))) throw new Error('O objeto não existe depois do put');
+
+  const upload = await backend.read(key);
+  const received = Buffer.from(await new Response(upload.body).arrayBuffer());
+  if (!received.equals(content)) throw new Error('Conteúdo lido diferente do gravado');
+
+  await backend.remove(key);
+  if (await backend.exists(key)) throw new Error('O objeto continua a existir depois do remove');
+
+  console.log('ok: put, exists, read e remove');
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Slow-query report for the Barbershop SaaS API.
+
+Ranks MongoDB query shapes by total time spent, from the entries written by
+lib/slow-query-log.js (JSONL file or the `slow_queries` capped collection).
+
+Usage:
+    python slow_query_report.py slow-queries.jsonl
+    python slow_query_report.py --mongo-url mongodb://localhost:27017 --db barbearia_saas
+"""
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+
+
+def load_jsonl(paths):
+    """Read slow-query entries from one or more JSONL files"""
+    entries = []
+    for path in paths:
+        with open(path, encoding="utf-8") as fh:
+            for line_no, line in enumerate(fh, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    print(f"⚠️  {path}:{line_no}: invalid JSON, skipped", file=sys.stderr)
+    return entries
+
+
+def load_mongo(mongo_url, db_name, since_hours):
+    """Read slow-query entries from the capped collection (needs pymongo)"""
+    try:
+        from pymongo import MongoClient
+    except ImportError:
+        sys.exit("pymongo is required to read from MongoDB (pip install pymongo)")
+
+    from datetime import datetime, timedelta, timezone
+
+    query = {}
+    if since_hours:
+        query["ts"] = {"$gte": datetime.now(timezone.utc) - timedelta(hours=since_hours)}
+
+    client = MongoClient(mongo_url)
+    try:
+        return list(client[db_name]["slow_queries"].find(query, {"_id": 0}))
+    finally:
+        client.close()
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def aggregate(entries):
+    """Group entries by (collection, command, shape)"""
+    groups = defaultdict(lambda: {
+        "durations": [],
+        "routes": defaultdict(int),
+        "docs_examined": [],
+        "docs_returned": [],
+        # Each distinct plan (stages in plan order) and how often it won
+        "plans": defaultdict(int),
+    })
+
+    for entry in entries:
+        key = (entry.get("collection"), entry.get("command"), entry.get("shape"))
+        group = groups[key]
+        group["durations"].append(float(entry.get("duration_ms") or 0))
+        group["routes"][entry.get("route") or "-"] += 1
+        if entry.get("docs_examined") is not None:
+            group["docs_examined"].append(entry["docs_examined"])
+        if entry.get("docs_returned") is not None:
+            group["docs_returned"].append(entry["docs_returned"])
+        if entry.get("plan_stages"):
+            group["plans"][tuple(entry["plan_stages"])] += 1
+
+    rows = []
+    for (collection, command, shape), group in groups.items():
+        durations = group["durations"]
+        examined = group["docs_examined"]
+        returned = group["docs_returned"]
+        rows.append({
+            "collection": collection,
+            "command": command,
+            "shape": shape,
+            "count": len(durations),
+            "total_ms": sum(durations),
+            "avg_ms": sum(durations) / len(durations),
+            "p95_ms": percentile(durations, 95),
+            "max_ms": max(durations),
+            "avg_docs_examined": sum(examined) / len(examined) if examined else None,
+            "avg_docs_returned": sum(returned) / len(returned) if returned else None,
+            "collscan": any("COLLSCAN" in plan for plan in group["plans"]),
+            "plans": [
+                {"stages": list(plan), "count": count}
+                for plan, count in sorted(group["plans"].items(), key=lambda kv: -kv[1])
+            ],
+            "top_routes": sorted(group["routes"].items(), key=lambda kv: -kv[1])[:3],
+        })
+
+    rows.sort(key=lambda r: r["total_ms"], reverse=True)
+    return rows
+
+
+def print_report(rows, limit):
+    """Print the ranking as a readable table"""
+    if not rows:
+        print("No slow queries recorded.")
+        return
+
+    grand_total = sum(r["total_ms"] for r in rows) or 1
+    print(f"{'#':>3} {'total ms':>10} {'%':>5} {'count':>6} {'avg':>8} {'p95':>8} {'max':>8}  collection.command")
+    print("-" * 80)
+
+    for i, row in enumerate(rows[:limit], 1):
+        flag = "  🔴 COLLSCAN" if row["collscan"] else ""
+        print(
+            f"{i:>3} {row['total_ms']:>10.0f} {100 * row['total_ms'] / grand_total:>5.1f} "
+            f"{row['count']:>6} {row['avg_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['max_ms']:>8.1f}  "
+            f"{row['collection']}.{row['command']}{flag}"
+        )
+        print(f"      shape: {row['shape']}")
+        if row["avg_docs_examined"] is not None or row["avg_docs_returned"] is not None:
+            examined = row["avg_docs_examined"]
+            returned = row["avg_docs_returned"]
+            examined_txt = f"{examined:.0f}" if examined is not None else "?"
+            returned_txt = f"{returned:.0f}" if returned is not None else "?"
+            print(f"      docs examined/returned (avg): {examined_txt} / {returned_txt}")
+        for plan in row["plans"]:
+            times = f" ({plan['count']}x)" if len(row["plans"]) > 1 else ""
+            print(f"      plan{times}: {' > '.join(plan['stages'])}")
+        routes = ", ".join(f"{route} ({count})" for route, count in row["top_routes"])
+        print(f"      routes: {routes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank slow MongoDB query shapes by total time")
+    parser.add_argument("files", nargs="*", help="JSONL files written with SLOW_QUERY_LOG_FILE")
+    parser.add_argument("--mongo-url", help="Read from the slow_queries capped collection instead")
+    parser.add_argument("--db", default="barbearia_saas", help="Database name (default: barbearia_saas)")
+    parser.add_argument("--since-hours", type=float, help="Only entries from the last N hours (MongoDB source)")
+    parser.add_argument("--limit", type=int, default=20, help="Number of shapes to show (default: 20)")
+    parser.add_argument("--json", action="store_true", help="Print the ranking as JSON")
+    args = parser.parse_args()
+
+    if args.mongo_url:
+        entries = load_mongo(args.mongo_url, args.db, args.since_hours)
+    elif args.files:
+        entries = load_jsonl(args.files)
+    else:
+        parser.error("pass one or more JSONL files or --mongo-url")
+
+    rows = aggregate(entries)
+
+    if args.json:
+        print(json.dumps(rows[:args.limit], indent=2, default=str))
+    else:
+        print_report(rows, args.limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Unit tests for analytics.grid on small synthetic frames."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from analytics.grid import (  # noqa: E402
+    SLOTS_PER_DAY,
+    SLOTS_PER_WEEK,
+    booking_start_slots,
+    capacity_grid,
+    day_occurrences,
+    expand_intervals,
+)
+
+# 2026-01-04 is a Sunday (weekday 0 in the API numbering)
+SUNDAY = "2026-01-04"
+MONDAY = "2026-01-05"
+SATURDAY = "2026-01-10"
+
+OPENING_COLUMNS = ["barbearia_id", "dia_semana", "hora_inicio", "hora_fim", "ativo"]
+
+
+def test_booking_start_slots_uses_js_weekdays_and_15_minute_slots():
+    bookings = pd.DataFrame({
+        "data": [SUNDAY, MONDAY, SATURDAY],
+        "hora": ["00:00", "09:30", "23:59"],
+    })
+    start, valid = booking_start_slots(bookings)
+    assert valid.tolist() == [True, True, True]
+    assert start.tolist() == [0, SLOTS_PER_DAY + 38, 6 * SLOTS_PER_DAY + 95]
+
+
+def test_booking_start_slots_flags_bad_dates_and_times():
+    bookings = pd.DataFrame({
+        "data": [MONDAY, "30/01/2026", MONDAY, None],
+        "hora": ["10:00", "10:00", None, "10:00"],
+    })
+    start, valid = booking_start_slots(bookings)
+    assert valid.tolist() == [True, False, False, False]
+    assert start[0] == SLOTS_PER_DAY + 40
+
+
+def test_expand_intervals_covers_every_slot_and_wraps_the_week():
+    owner, slots = expand_intervals(np.array([0, SLOTS_PER_WEEK - 1]), np.array([2, 3]))
+    assert owner.tolist() == [0, 0, 1, 1, 1]
+    assert slots.tolist() == [0, 1, SLOTS_PER_WEEK - 1, 0, 1]
+
+
+def test_expand_intervals_counts_empty_intervals_as_one_slot():
+    owner, slots = expand_intervals(np.array([10, 20]), np.array([0, 1]))
+    assert owner.tolist() == [0, 1]
+    assert slots.tolist() == [10, 20]
+
+
+def test_day_occurrences_counts_weekdays_in_range():
+    assert day_occurrences(SUNDAY, SATURDAY).tolist() == [1] * 7
+    assert day_occurrences(SUNDAY, "2026-01-11").tolist() == [2, 1, 1, 1, 1, 1, 1]
+
+
+def _weekday_slots(row, weekday):
+    return row[weekday * SLOTS_PER_DAY:(weekday + 1) * SLOTS_PER_DAY]
+
+
+def test_capacity_grid_weekly_schedule_minus_lunch():
+    barbers = pd.DataFrame({
+        "barbeiro_id": ["x"],
+        "barbearia_id": ["b1"],
+        "horario_trabalho": [{
+            "horario_semanal": {"1": {"ativo": True, "inicio": "09:00", "fim": "12:00"}, "2": {"ativo": False}},
+            "hora_almoco_inicio": "10:00",
+            "hora_almoco_fim": "10:30",
+        }],
+    })
+    template, exceptions = capacity_grid(barbers, pd.DataFrame(columns=OPENING_COLUMNS), "2026-01-01", "2026-01-31")
+
+    monday = _weekday_slots(template[0], 1)
+    assert np.flatnonzero(monday).tolist() == [36, 37, 38, 39, 42, 43, 44, 45, 46, 47]
+    assert template[0].sum() == 10
+    assert exceptions.tolist() == [0]
+
+
+def test_capacity_grid_falls_back_to_active_opening_hours():
+    barbers = pd.DataFrame({
+        "barbeiro_id": ["x"],
+        "barbearia_id": ["b1"],
+        "horario_trabalho": [None],
+    })
+    opening = pd.DataFrame([
+        ["b1", "terca", "09:00", "10:00", True],
+        ["b1", "quarta", "09:00", "10:00", False],
+        ["b2", "terca", "08:00", "20:00", True],
+    ], columns=OPENING_COLUMNS)
+    template, _ = capacity_grid(barbers, opening, "2026-01-01", "2026-01-31")
+
+    assert np.flatnonzero(_weekday_slots(template[0], 2)).tolist() == [36, 37, 38, 39]
+    assert template[0].sum() == 4
+
+
+def test_capacity_grid_exception_slots():
+    barbers = pd.DataFrame({
+        "barbeiro_id": ["x"],
+        "barbearia_id": ["b1"],
+        "horario_trabalho": [{
+            "horario_semanal": {"1": {"ativo": True, "inicio": "09:00", "fim": "12:00"}},
+            "hora_almoco_inicio": "10:00",
+            "hora_almoco_fim": "10:30",
+            "excepcoes": [
+                {"data": MONDAY, "tipo": "folga"},
+                {"data": "2026-01-12", "tipo": "parcial", "inicio": "09:00", "fim": "10:00"},
+                # Not a working day: ignored
+                {"data": "2026-01-06", "tipo": "folga"},
+                # Outside the range: ignored
+                {"data": "2026-02-02", "tipo": "feriado"},
+            ],
+        }],
+    })
+    _, exceptions = capacity_grid(barbers, pd.DataFrame(columns=OPENING_COLUMNS), "2026-01-01", "2026-01-31")
+
+    # folga removes the 10 usual slots, parcial keeps 4 of them
+    assert exceptions.tolist() == [-10 + (4 - 10)]
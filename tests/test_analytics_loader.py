@@ -0,0 +1,55 @@
+"""Unit tests for the tenant placement handling in analytics.loader."""
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from analytics.loader import _find_all, _tenant_sources  # noqa: E402
+
+
+class FakeCursor(list):
+    def batch_size(self, _size):
+        return self
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def find(self, query, _projection=None):
+        self.queries.append(query)
+        return FakeCursor(self.docs)
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection([])
+        return self[name]
+
+
+def _setup():
+    shared = FakeDatabase(tenant_placements=FakeCollection([{"_id": "big", "database": "cuthub_big"}]))
+    client = {"cuthub_big": FakeDatabase(marcacoes=FakeCollection([{"data": "2026-01-05"}]))}
+    return client, shared
+
+
+def test_tenant_sources_excludes_dedicated_tenants_from_the_shared_database():
+    client, shared = _setup()
+    sources = _tenant_sources(client, shared, None)
+    assert sources[0] == (shared, {"barbearia_id": {"$nin": ["big"]}})
+    assert sources[1] == (client["cuthub_big"], {"barbearia_id": "big"})
+
+
+def test_tenant_sources_only_includes_requested_dedicated_tenants():
+    client, shared = _setup()
+    sources = _tenant_sources(client, shared, ["small"])
+    assert sources == [(shared, {"barbearia_id": {"$nin": ["big"], "$in": ["small"]}})]
+
+
+def test_find_all_reads_each_source_with_its_filter():
+    client, shared = _setup()
+    docs = list(_find_all(_tenant_sources(client, shared, None), "marcacoes", {"data": {"$gte": "2026-01-01"}}, {}))
+    assert docs == [{"data": "2026-01-05"}]
+    assert client["cuthub_big"]["marcacoes"].queries == [{"data": {"$gte": "2026-01-01"}, "barbearia_id": "big"}]
+    assert shared["marcacoes"].queries == [{"data": {"$gte": "2026-01-01"}, "barbearia_id": {"$nin": ["big"]}}]
@@ -0,0 +1,103 @@
+"""Unit tests for the rates and heatmaps in analytics.metrics."""
+
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from analytics.grid import SLOTS_PER_DAY, SLOTS_PER_WEEK  # noqa: E402
+from analytics.loader import Dataset  # noqa: E402
+from analytics.metrics import _count, _ratio, peak_forecast, run_batch  # noqa: E402
+
+OPENING_COLUMNS = ["barbearia_id", "dia_semana", "hora_inicio", "hora_fim", "ativo"]
+
+
+def test_ratio_is_nan_where_the_denominator_is_zero():
+    out = _ratio([1, 2, 3], [2, 0, 4])
+    assert out[0] == 0.5
+    assert math.isnan(out[1])
+    assert out[2] == 0.75
+
+
+def test_count_per_tenant_with_mask_and_weights():
+    codes = np.array([0, 1, 1, 0])
+    mask = np.array([True, True, False, True])
+    assert _count(codes, mask, 3).tolist() == [2, 1, 0]
+    assert _count(codes, mask, 3, weights=np.array([1.5, 2.0, 9.0, 0.5])).tolist() == [2.0, 2.0, 0.0]
+
+
+def test_peak_forecast_weights_recent_weeks_more():
+    dates = pd.Series(pd.to_datetime(["2026-01-04", "2026-01-11"]))
+    start = np.array([0, 4])  # Sunday 00:00 and 01:00
+    forecast = peak_forecast(
+        np.array([0, 0]), start, dates, np.array([True, True]), 1, "2026-01-04", halflife_weeks=1.0
+    )
+    assert forecast.shape == (1, 168)
+    assert forecast[0, 0] == pytest.approx(1 / 3)
+    assert forecast[0, 1] == pytest.approx(2 / 3)
+    assert forecast[0, 2:].sum() == 0
+
+
+def _dataset():
+    bookings = pd.DataFrame([
+        # b1, Monday: done at 09:00 (30 min), never closed at 09:30 (no-show)
+        ["b1", "x", "s1", "2026-01-05", "09:00", "concluida", 30, 15.0],
+        ["b1", "x", "s2", "2026-01-05", "09:30", "aceita", 15, 10.0],
+        ["b1", "x", "s1", "2026-01-06", "10:00", "cancelada", 30, 15.0],
+        # Outside the range
+        ["b1", "x", "s1", "2026-02-02", "09:00", "concluida", 30, 15.0],
+        # b2 has no barbers; the booking is after `today`
+        ["b2", "y", "s3", "2026-01-07", "10:00", "pendente", 15, 20.0],
+    ], columns=["barbearia_id", "barbeiro_id", "servico_id", "data", "hora", "status", "duracao", "preco"])
+    barbers = pd.DataFrame({
+        "barbeiro_id": ["x"],
+        "barbearia_id": ["b1"],
+        "horario_trabalho": [{"horario_semanal": {"1": {"ativo": True, "inicio": "09:00", "fim": "10:00"}}}],
+    })
+    return Dataset(bookings, barbers, pd.DataFrame(columns=OPENING_COLUMNS))
+
+
+def test_run_batch_rates():
+    result = run_batch(_dataset(), "2026-01-05", "2026-01-11", today="2026-01-06")
+    summary = result.summary.set_index("barbearia_id")
+
+    b1 = summary.loc["b1"]
+    assert b1["total"] == 3
+    assert b1["concluida"] == 1
+    assert b1["cancelada"] == 1
+    assert b1["taxa_cancelamento"] == pytest.approx(1 / 3)
+    assert b1["no_show"] == 1
+    assert b1["taxa_no_show"] == pytest.approx(0.5)
+    assert b1["receita"] == 15.0
+    assert b1["minutos_marcados"] == 45
+    assert b1["minutos_disponiveis"] == 60
+    assert b1["ocupacao"] == pytest.approx(0.75)
+
+    b2 = summary.loc["b2"]
+    assert b2["total"] == 1
+    assert b2["no_show"] == 0
+    assert math.isnan(b2["taxa_no_show"])
+    assert math.isnan(b2["ocupacao"])
+
+
+def test_run_batch_heatmaps():
+    result = run_batch(_dataset(), "2026-01-05", "2026-01-11", today="2026-01-06")
+    assert result.tenants.tolist() == ["b1", "b2"]
+    assert result.demand.shape == (2, 7, SLOTS_PER_DAY)
+    assert result.occupancy.shape == (2, 7, SLOTS_PER_DAY)
+
+    # Monday 09:00-09:45 in progress; the cancelled booking takes no slots
+    assert result.demand[0, 1, 36:40].tolist() == [1.0, 1.0, 1.0, 0.0]
+    assert result.demand[0].sum() == 3
+    assert result.demand[1, 3, 40] == 1.0
+
+    # Booked / available barber slots, nan where nobody works
+    assert result.occupancy[0, 1, 36:40].tolist() == [1.0, 1.0, 1.0, 0.0]
+    assert math.isnan(result.occupancy[0, 2, 40])
+    assert np.isnan(result.occupancy[1]).all()
+
+    assert result.forecast.shape == (2, 168)
+    assert result.summary.set_index("barbearia_id").loc["b1", "picos_previstos"] == "segunda 09:00"
+    assert result.demand.size == 2 * SLOTS_PER_WEEK